@@ -33,6 +33,22 @@ def django_db_setup(django_db_blocker):
         call_command("migrate", "--run-syncdb", verbosity=0)
 
 
+@pytest.fixture(autouse=True)
+def reset_author_pool():
+    """Testler arasında geri alınan yazarların süreç havuzunda kalmaması için."""
+    from news.author_pool import invalidate_author_pool
+
+    invalidate_author_pool()
+
+
+@pytest.fixture(autouse=True)
+def reset_prompt_registry():
+    """Testler arasında geri alınan prompt şablonlarının süreç belleğinde kalmaması için."""
+    from news.prompt_registry import prompt_registry
+
+    prompt_registry.invalidate()
+
+
 @pytest.fixture
 def sample_author(db):
     """Örnek yazar fixture'ı."""
@@ -31,11 +31,12 @@ class SettingAdmin(admin.ModelAdmin):
                 ("imagen-4.0-fast-generate-001", "Imagen 4 Fast (Hızlı)"),
                 ("imagen-3.0-generate-001", "Imagen 3 Standart (Eski)"),
                 ("imagen-3.0-fast-generate-001", "Imagen 3 Fast (Eski)"),
+                ("gemini-2.5-flash-image", "Gemini 2.5 Flash Image (API anahtarı ile)"),
             ]
             form.base_fields["value"] = forms.ChoiceField(
                 choices=IMAGE_MODEL_CHOICES,
                 widget=forms.Select(attrs={"class": "vTextField"}),
-                help_text="Haber görseli oluşturmak için kullanılacak AI modeli",
+                help_text="Haber görseli oluşturmak için kullanılacak AI modeli (Imagen yalnızca GOOGLE_CLOUD_PROJECT ile, Vertex AI modunda)",
             )
         return form
 
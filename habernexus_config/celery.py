@@ -25,6 +25,21 @@ app.conf.beat_schedule = {
         "task": "news.tasks_v2.score_headlines",
         "schedule": crontab(minute=0),  # Her saat başında
     },
+    # Başarısız / takılmış gelişmiş pipeline çalıştırmalarını kontrol noktalarından devam ettir
+    "resume-pipeline-runs": {
+        "task": "news.tasks_advanced.resume_pipeline_runs",
+        "schedule": crontab(minute="*/10"),  # Her 10 dakikada bir
+    },
+    # Üretim kuyruğunu işle: kaçırılan uyandırmalar ve zaman aşımına uğrayan kayıtlar için
+    "dispatch-generation-queue": {
+        "task": "news.generation_queue.dispatch_generation_queue",
+        "schedule": crontab(),  # Her dakika
+    },
+    # Hiçbir haberin kullanmadığı medya deposu görsellerini sil (her gün)
+    "cleanup-unused-media-assets": {
+        "task": "news.tasks.cleanup_unused_media_assets",
+        "schedule": crontab(hour=3, minute=30),  # Her gün saat 3:30
+    },
     # Sistem loglarını temizle (her hafta)
     "cleanup-old-logs": {
         "task": "core.tasks.cleanup_old_logs",
@@ -222,6 +222,10 @@ CELERY_BROKER_TRANSPORT_OPTIONS = {
     "fanout_prefix": True,
     "fanout_patterns": True,
     "retry_on_timeout": True,
+    # Görev öncelikleri (0 en yüksek, 9 en düşük); üretim kuyruğu skora göre öncelik verir
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
 }
 
 # Celery Broker Connection Settings
@@ -267,6 +271,19 @@ CELERY_TASK_DEFAULT_QUEUE = "default"
 CELERY_TASK_DEFAULT_EXCHANGE = "default"
 CELERY_TASK_DEFAULT_ROUTING_KEY = "default"
 
+# Google Gen AI Configuration
+# Boş bırakılırsa SDK varsayılan uç noktası kullanılır. Yük testleri için yerel
+# sahte sunucuya yönlendirmek amacıyla ayarlanabilir (ör. http://127.0.0.1:8765).
+GENAI_BASE_URL = os.getenv("GENAI_BASE_URL", "")
+
+# AI çağrı kayıtları tamponu: bu sayıya ulaşınca veya bu süre dolunca toplu yazılır
+AI_CALL_LOG_BATCH_SIZE = int(os.getenv("AI_CALL_LOG_BATCH_SIZE", "50"))
+AI_CALL_LOG_FLUSH_SECONDS = float(os.getenv("AI_CALL_LOG_FLUSH_SECONDS", "10"))
+
+# İçerik üretim aşaması kayıtları (ContentGenerationLog) tamponu
+GENERATION_LOG_BATCH_SIZE = int(os.getenv("GENERATION_LOG_BATCH_SIZE", "100"))
+GENERATION_LOG_FLUSH_SECONDS = float(os.getenv("GENERATION_LOG_FLUSH_SECONDS", "10"))
+
 # Tailwind Configuration
 NPM_BIN_PATH = "/usr/local/bin/npm"
 
@@ -49,6 +49,10 @@ CACHES = {
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# AI çağrı kayıtlarını tamponlamadan hemen yaz (testler arası sızıntıyı önler)
+AI_CALL_LOG_BATCH_SIZE = 1
+GENERATION_LOG_BATCH_SIZE = 1
+
 # Disable password hashing for faster tests
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
@@ -0,0 +1,245 @@
+"""
+HaberNexus - Pipeline Kabul Kontrolü (Admission Control)
+
+Tarayıcılar ve puanlama görevleri, AI kotasının ve worker'ların karşılayabileceğinden fazla
+iş üretebilir; kuyruklar büyür, sonuçlar CELERY_RESULT_EXPIRES ile düşer ve Redis belleği
+şişer. Bu modül iş gönderilmeden önce ilgili aşamanın doluluğuna bakar:
+
+- Doluluk: aşamanın broker kuyruklarındaki bekleyen mesaj sayısı (ADMISSION_QUEUE_DEPTH_LIMIT'e
+  oranla) ve üretim aşamasında kuyruktaki + üretimdeki makale sayısı
+  (ADMISSION_GENERATION_BACKLOG_LIMIT'e oranla); en dolu kaynak belirleyicidir.
+- Kabul: boş kapasite kadar iş, puanı yüksekten düşüğe kabul edilir. Puanı
+  ADMISSION_PRIORITY_SCORE ve üzerindeki işler (en iyi haberler) her zaman kabul edilir.
+- Erteleme: kapasiteye sığmayan işler gönderilmez; kaynakta (işlenmemiş başlık, taranmamış
+  RSS girdisi) kalır ve bir sonraki çalıştırmada yeniden değerlendirilir.
+- Atma (shed): doluluk ADMISSION_SHED_FACTOR katını aştığında puanı ADMISSION_SHED_SCORE
+  altındaki işler ertelenmek yerine düşürülür.
+
+Kabul edilen / ertelenen / atılan iş sayıları Prometheus sayaçlarıyla dışa aktarılır.
+
+Kullanım:
+    decision = admit("generation", [(headline, headline.overall_score) for headline in headlines])
+    for headline in decision["admitted"]:
+        ...
+"""
+
+import logging
+
+from django.core.cache import cache
+
+from celery import current_app
+
+from core.models import Setting
+from core.tasks import log_info
+
+from .generation_queue import TOP_STORY_SCORE
+from .models_extended import GenerationQueueItem
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import Counter, Gauge
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+
+# =============================================================================
+# Yapılandırma
+# =============================================================================
+
+# Aşama -> işlerinin bekleyeceği broker kuyrukları
+STAGE_QUEUES = {
+    "classification": ("default",),
+    "generation": ("high_priority", "default"),
+}
+
+# Broker kuyruk uzunluğu bu süre boyunca önbellekte tutulur (her karar için broker'a gidilmez)
+QUEUE_DEPTH_CACHE_SECONDS = 5
+
+DECISIONS = ("admitted", "deferred", "shed")
+
+if PROMETHEUS_AVAILABLE:
+    ADMISSION_ITEMS = Counter(
+        "habernexus_admission_items_total",
+        "Kabul kontrolünden geçen işler",
+        ["stage", "decision"],
+    )
+    ADMISSION_LOAD = Gauge(
+        "habernexus_admission_load_ratio",
+        "Aşama doluluğu (1.0 = sınırda)",
+        ["stage"],
+    )
+
+
+def _get_float_setting(key: str, default: float) -> float:
+    try:
+        return float(Setting.objects.get(key=key).value)
+    except (Setting.DoesNotExist, ValueError):
+        return default
+
+
+def is_admission_enabled() -> bool:
+    """
+    Kabul kontrolünün açık olup olmadığını ayarlardan al.
+
+    Returns:
+        bool: ADMISSION_ENABLED ayarı (varsayılan: True)
+    """
+    try:
+        admission_setting = Setting.objects.get(key="ADMISSION_ENABLED")
+        return admission_setting.value.lower().strip() in ("1", "true", "yes", "on")
+    except Setting.DoesNotExist:
+        return True
+
+
+def get_queue_depth_limit() -> int:
+    """
+    Aşama kuyruklarında bekleyebilecek en fazla mesaj sayısı (ADMISSION_QUEUE_DEPTH_LIMIT, varsayılan: 100).
+    """
+    return max(1, int(_get_float_setting("ADMISSION_QUEUE_DEPTH_LIMIT", 100)))
+
+
+def get_generation_backlog_limit() -> int:
+    """
+    Kuyrukta ve üretimde olabilecek en fazla makale sayısı (ADMISSION_GENERATION_BACKLOG_LIMIT, varsayılan: 50).
+    """
+    return max(1, int(_get_float_setting("ADMISSION_GENERATION_BACKLOG_LIMIT", 50)))
+
+
+def get_priority_score() -> float:
+    """
+    Doluluktan bağımsız her zaman kabul edilen puan eşiği (ADMISSION_PRIORITY_SCORE).
+    """
+    return _get_float_setting("ADMISSION_PRIORITY_SCORE", TOP_STORY_SCORE)
+
+
+def get_shed_score() -> float:
+    """
+    Aşırı dolulukta bu puanın altındaki işler atılır (ADMISSION_SHED_SCORE, varsayılan: 40).
+    """
+    return _get_float_setting("ADMISSION_SHED_SCORE", 40.0)
+
+
+def get_shed_factor() -> float:
+    """
+    Düşük puanlı işlerin atılmaya başlandığı doluluk oranı (ADMISSION_SHED_FACTOR, varsayılan: 2.0).
+    """
+    return max(1.0, _get_float_setting("ADMISSION_SHED_FACTOR", 2.0))
+
+
+# =============================================================================
+# Doluluk Ölçümü
+# =============================================================================
+
+
+def get_queue_depth(queue: str) -> int:
+    """
+    Broker kuyruğunda bekleyen mesaj sayısı.
+    Eager modda (testler) ve broker'a ulaşılamadığında 0 döner; kabul kontrolü işi durdurmaz.
+    """
+    if current_app.conf.task_always_eager:
+        return 0
+
+    cache_key = f"admission:queue_depth:{queue}"
+    depth = cache.get(cache_key)
+    if depth is not None:
+        return depth
+
+    try:
+        with current_app.connection_for_read() as connection:
+            depth = connection.default_channel.queue_declare(queue=queue, passive=True).message_count
+    except Exception as e:
+        logger.warning(f"Kuyruk uzunluğu okunamadı ({queue}): {e!s}")
+        depth = 0
+
+    cache.set(cache_key, depth, timeout=QUEUE_DEPTH_CACHE_SECONDS)
+    return depth
+
+
+def get_generation_backlog() -> int:
+    """
+    Üretim kuyruğunda bekleyen ve üretimde olan makale sayısı.
+    """
+    return GenerationQueueItem.objects.filter(status__in=("queued", "dispatched")).count()
+
+
+def get_stage_capacity(stage: str) -> tuple[int, float]:
+    """
+    Aşamanın boş kapasitesi ve doluluk oranı.
+
+    Returns:
+        tuple: (boş yer sayısı, doluluk oranı); en dolu kaynak belirleyicidir
+    """
+    resources = [(sum(get_queue_depth(queue) for queue in STAGE_QUEUES[stage]), get_queue_depth_limit())]
+    if stage == "generation":
+        resources.append((get_generation_backlog(), get_generation_backlog_limit()))
+
+    free = min(limit - used for used, limit in resources)
+    load = max(used / limit for used, limit in resources)
+    return max(0, free), load
+
+
+# =============================================================================
+# Kabul Kararı
+# =============================================================================
+
+
+def admit(stage: str, items: list) -> dict:
+    """
+    İşleri aşamanın doluluğuna göre kabul et, ertele veya at.
+
+    Args:
+        stage: STAGE_QUEUES'daki aşama adı
+        items: (iş, puan) çiftleri
+
+    Returns:
+        dict: {"admitted": [...], "deferred": [...], "shed": [...], "load": doluluk oranı};
+            listeler puana göre azalan sıradadır
+    """
+    decision = {name: [] for name in DECISIONS}
+    decision["load"] = 0.0
+    if not items:
+        return decision
+
+    ranked = sorted(items, key=lambda pair: pair[1], reverse=True)
+    if not is_admission_enabled():
+        decision["admitted"] = [item for item, _ in ranked]
+        return decision
+
+    free, load = get_stage_capacity(stage)
+    priority_score = get_priority_score()
+    shedding = load >= get_shed_factor()
+    shed_score = get_shed_score()
+
+    for item, score in ranked:
+        if score >= priority_score or free > 0:
+            decision["admitted"].append(item)
+            free -= 1
+        elif shedding and score < shed_score:
+            decision["shed"].append(item)
+        else:
+            decision["deferred"].append(item)
+
+    decision["load"] = round(load, 3)
+    _record(stage, decision)
+    return decision
+
+
+def _record(stage: str, decision: dict):
+    """
+    Karar sayılarını metriklere işle; erteleme / atma olduysa logla.
+    """
+    if PROMETHEUS_AVAILABLE:
+        ADMISSION_LOAD.labels(stage).set(decision["load"])
+        for name in DECISIONS:
+            if decision[name]:
+                ADMISSION_ITEMS.labels(stage, name).inc(len(decision[name]))
+
+    if decision["deferred"] or decision["shed"]:
+        log_info(
+            "admission",
+            f"{stage}: {len(decision['admitted'])} kabul, {len(decision['deferred'])} ertelendi, "
+            f"{len(decision['shed'])} atıldı (doluluk {decision['load']:.2f})",
+        )
@@ -0,0 +1,424 @@
+"""
+HaberNexus - Gen AI Çağrı Enstrümantasyonu
+Her Gen AI çağrısı için model, token (girdi/çıktı/düşünme), gecikme, retry ve sonuç kaydı.
+
+- Kayıtlar bellekte tamponlanır ve AI_CALL_LOG_BATCH_SIZE sayısına ya da
+  AI_CALL_LOG_FLUSH_SECONDS süresine ulaşınca AICallLog tablosuna bulk_create ile yazılır.
+  Worker kapanırken tampon boşaltılır (bkz. news.log_buffer).
+- Gecikme ve token dağılımları Prometheus histogramları olarak dışa aktarılır.
+  Celery worker'ları ile web süreci aynı PROMETHEUS_MULTIPROC_DIR dizinini paylaşırsa
+  worker metrikleri de mevcut /metrics uç noktasından okunur.
+
+Kullanım:
+    with track_ai_call("generate_ai_content", model_name, "text", article_id=article.id) as call:
+        response = retry_with_backoff(call.attempt(generate_content), max_retries=3)
+        call.set_response(response)
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+from django.utils import timezone
+
+from core.models import Setting
+
+from .log_buffer import BulkLogBuffer
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import Counter, Histogram
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+
+# =============================================================================
+# Prometheus Metrikleri
+# =============================================================================
+
+if PROMETHEUS_AVAILABLE:
+    AI_CALL_DURATION = Histogram(
+        "habernexus_ai_call_duration_seconds",
+        "Gen AI çağrı süresi (retry'lar dahil)",
+        ["model", "call_type", "outcome"],
+        buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128),
+    )
+    AI_CALL_TOKENS = Histogram(
+        "habernexus_ai_call_tokens",
+        "Gen AI çağrısı başına token sayısı",
+        ["model", "kind"],
+        buckets=(64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768),
+    )
+    AI_CALL_RETRIES = Counter(
+        "habernexus_ai_call_retries_total",
+        "Gen AI çağrılarında yapılan yeniden deneme sayısı",
+        ["model", "call_type"],
+    )
+    AI_CALL_COST = Counter(
+        "habernexus_ai_call_cost_usd_total",
+        "Gen AI çağrılarının tahmini maliyeti (USD)",
+        ["model"],
+    )
+
+
+# =============================================================================
+# Fiyatlandırma
+# =============================================================================
+
+# USD cinsinden: metin modelleri için 1M token başına, görsel modelleri için görsel başına.
+# Düşünme token'ları çıktı fiyatından ücretlendirilir.
+DEFAULT_MODEL_PRICING = {
+    "gemini-3-pro": {"input": 2.00, "output": 12.00},
+    "gemini-2.5-pro": {"input": 1.25, "output": 10.00},
+    "gemini-2.5-flash-image": {"image": 0.039},
+    "gemini-2.5-flash-lite": {"input": 0.10, "output": 0.40},
+    "gemini-2.5-flash": {"input": 0.30, "output": 2.50},
+    "imagen-4.0-ultra": {"image": 0.06},
+    "imagen-4.0-fast": {"image": 0.02},
+    "imagen-4.0": {"image": 0.04},
+}
+
+
+def get_model_pricing() -> dict:
+    """
+    Model fiyat tablosunu ayarlardan al.
+    AI_MODEL_PRICING ayarı JSON olarak verilirse varsayılan tablonun üzerine yazılır.
+
+    Returns:
+        dict: Model adı öneki -> {"input", "output", "image"} fiyatları
+    """
+    pricing = dict(DEFAULT_MODEL_PRICING)
+    try:
+        pricing_setting = Setting.objects.get(key="AI_MODEL_PRICING")
+        pricing.update(json.loads(pricing_setting.value))
+    except (Setting.DoesNotExist, ValueError, TypeError):
+        pass
+    return pricing
+
+
+def estimate_cost(record: dict, pricing: dict) -> float:
+    """
+    Tek bir çağrı kaydının tahmini maliyeti.
+    Model adı fiyat tablosundaki en uzun önek ile eşleştirilir.
+    """
+    model = record["model"]
+    matches = [prefix for prefix in pricing if model.startswith(prefix)]
+    if not matches:
+        return 0.0
+
+    price = pricing[max(matches, key=len)]
+    cost = record["prompt_tokens"] / 1_000_000 * price.get("input", 0)
+    cost += (record["output_tokens"] + record["thinking_tokens"]) / 1_000_000 * price.get("output", 0)
+    cost += record["images"] * price.get("image", 0)
+    return round(cost, 6)
+
+
+# =============================================================================
+# Toplu Yazma Tamponu
+# =============================================================================
+
+
+class AICallLogBuffer(BulkLogBuffer):
+    """
+    AICallLog kayıtları için tampon (eşikler: AI_CALL_LOG_BATCH_SIZE / AI_CALL_LOG_FLUSH_SECONDS).
+    Yazarken maliyet hesaplanır ve tampondayken silinen makalelerin bağlantısı kaldırılır.
+    """
+
+    def __init__(self):
+        super().__init__("AI_CALL_LOG")
+
+    def write(self, records: list) -> int:
+        from .models import Article
+        from .models_extended import AICallLog
+
+        pricing = get_model_pricing()
+
+        # Tampondayken silinen makaleler tüm partiyi bozmasın
+        article_ids = {r["article_id"] for r in records if r["article_id"]}
+        existing = set(Article.objects.filter(id__in=article_ids).values_list("id", flat=True))
+
+        objs = []
+        for record in records:
+            record["cost_usd"] = estimate_cost(record, pricing)
+            if record["article_id"] not in existing:
+                record["article_id"] = None
+            if PROMETHEUS_AVAILABLE and record["cost_usd"]:
+                AI_CALL_COST.labels(record["model"]).inc(record["cost_usd"])
+            objs.append(AICallLog(**record))
+
+        AICallLog.objects.bulk_create(objs)
+        return len(objs)
+
+    def assign_article(self, article_id: int, match) -> int:
+        """
+        Tampondaki, makalesi olmayan ve match(record) koşulunu sağlayan kayıtları makaleye bağla.
+        """
+        with self._lock:
+            records = [r for r in self._records if not r["article_id"] and match(r)]
+            for record in records:
+                record["article_id"] = article_id
+        return len(records)
+
+
+_buffer = AICallLogBuffer()
+
+
+def flush_ai_call_logs() -> int:
+    """
+    Tampondaki AI çağrı kayıtlarını hemen yaz.
+    """
+    return _buffer.flush()
+
+
+def backfill_article(article_id: int, *, pipeline_run_id: str = "", headline_id: int | None = None) -> int:
+    """
+    Makale oluşmadan yapılan çağrıları (pipeline çalıştırması veya başlık üzerinden) makaleye bağla.
+    Tampondaki kayıtlar yerinde, yazılmış kayıtlar tek UPDATE ile güncellenir.
+
+    Returns:
+        int: Bağlanan kayıt sayısı
+    """
+    from .models_extended import AICallLog
+
+    if pipeline_run_id:
+        lookup = {"pipeline_run_id": pipeline_run_id}
+    elif headline_id:
+        lookup = {"headline_id": headline_id}
+    else:
+        return 0
+
+    buffered = _buffer.assign_article(article_id, lambda record: all(record[k] == v for k, v in lookup.items()))
+    return buffered + AICallLog.objects.filter(article__isnull=True, **lookup).update(article_id=article_id)
+
+
+# =============================================================================
+# Çağrı Takibi
+# =============================================================================
+
+
+def _as_int(value) -> int:
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Hatayı çağrı sonucuna dönüştür (429 / RESOURCE_EXHAUSTED -> rate_limited).
+    """
+    code = getattr(error, "code", None)
+    message = str(error)
+    if code == 429 or "429" in message or "RESOURCE_EXHAUSTED" in message:
+        return "rate_limited"
+    return "error"
+
+
+class AICall:
+    """
+    Tek bir mantıksal Gen AI çağrısının ölçümleri (tüm retry denemeleri dahil).
+    """
+
+    def __init__(
+        self,
+        task_name: str,
+        model: str,
+        call_type: str,
+        article_id: int | None = None,
+        prompt_version: str = "",
+        *,
+        pipeline_run_id: str = "",
+        headline_id: int | None = None,
+        headline_ids: list[int] | None = None,
+    ):
+        self.task_name = task_name
+        self.model = model
+        self.call_type = call_type
+        self.article_id = article_id
+        self.prompt_version = prompt_version
+        self.pipeline_run_id = pipeline_run_id
+        self.headline_id = headline_id
+        self.headline_ids = list(headline_ids or [])
+        self.started = time.monotonic()
+        self.attempts = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.thinking_tokens = 0
+        self.images = 0
+        self.outcome = None
+
+    def attempt(self, func):
+        """
+        Senkron fonksiyonu deneme sayacı ile sar (retry_with_backoff için).
+        """
+
+        def wrapper():
+            self.attempts += 1
+            return func()
+
+        return wrapper
+
+    def attempt_async(self, coro_factory):
+        """
+        Coroutine fabrikasını deneme sayacı ile sar (async_retry_with_backoff için).
+        """
+
+        def wrapper():
+            self.attempts += 1
+            return coro_factory()
+
+        return wrapper
+
+    def set_usage(self, usage_metadata):
+        """
+        usage_metadata'dan token sayılarını al (akışta son parçadaki değer geçerlidir).
+        """
+        if usage_metadata is None:
+            return
+        self.prompt_tokens = _as_int(getattr(usage_metadata, "prompt_token_count", 0))
+        self.output_tokens = _as_int(getattr(usage_metadata, "candidates_token_count", 0))
+        self.thinking_tokens = _as_int(getattr(usage_metadata, "thoughts_token_count", 0))
+
+    def set_response(self, response):
+        """
+        Yanıttan token/görsel sayılarını al; boş yanıtı "empty" olarak işaretle.
+        """
+        if response is None:
+            self.outcome = "empty"
+            return
+
+        if self.call_type == "image":
+            # Imagen: generated_images; Gemini görsel modeli: inline_data içeren parçalar
+            self.images = len(getattr(response, "generated_images", None) or []) or sum(
+                1
+                for candidate in getattr(response, "candidates", None) or []
+                for part in (candidate.content.parts if candidate.content else None) or []
+                if part.inline_data
+            )
+            self.set_usage(getattr(response, "usage_metadata", None))
+            if not self.images:
+                self.outcome = "empty"
+            return
+
+        self.set_usage(getattr(response, "usage_metadata", None))
+        if not getattr(response, "text", None):
+            self.outcome = "empty"
+
+    def finish(self, outcome: str, error_message: str = "", flush: bool = True) -> dict:
+        """
+        Çağrıyı sonlandır: metrikleri güncelle ve kaydı tampona ekle.
+
+        Args:
+            outcome: success / empty / aborted / rate_limited / error
+            error_message: Hata mesajı
+            flush: False ise eşik kontrolü (ve DB yazımı) yapılmaz; async döngü içinden kullanım için
+
+        Returns:
+            dict: Tampona eklenen kayıt
+        """
+        latency = time.monotonic() - self.started
+        retries = max(0, self.attempts - 1)
+        record = {
+            "article_id": self.article_id,
+            "pipeline_run_id": self.pipeline_run_id,
+            "headline_id": self.headline_id,
+            "task_name": self.task_name,
+            "call_type": self.call_type,
+            "model": self.model,
+            "prompt_version": self.prompt_version,
+            "outcome": outcome,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "thinking_tokens": self.thinking_tokens,
+            "total_tokens": self.prompt_tokens + self.output_tokens + self.thinking_tokens,
+            "images": self.images,
+            "latency_ms": int(latency * 1000),
+            "retries": retries,
+            "error_message": error_message[:1000],
+            "created_at": timezone.now(),
+        }
+
+        if PROMETHEUS_AVAILABLE:
+            AI_CALL_DURATION.labels(self.model, self.call_type, outcome).observe(latency)
+            if retries:
+                AI_CALL_RETRIES.labels(self.model, self.call_type).inc(retries)
+            for kind in ("prompt", "output", "thinking"):
+                tokens = record[f"{kind}_tokens"]
+                if tokens:
+                    AI_CALL_TOKENS.labels(self.model, kind).observe(tokens)
+
+        for share in self._headline_shares(record):
+            _buffer.add(share, flush=flush)
+        return record
+
+    def _headline_shares(self, record: dict) -> list:
+        """
+        Toplu çağrı kaydını başlık başına kayıtlara böl (headline_ids verilmişse).
+        Token ve görsel sayıları (dolayısıyla maliyet) paylar toplamı çağrınınkine eşit olacak
+        şekilde bölünür; retry sayısı yalnızca ilk kayıtta tutulur. Her başlık
+        backfill_article ile kendi makalesine bağlanır.
+        """
+        if not self.headline_ids:
+            return [record]
+
+        count = len(self.headline_ids)
+        shares = [{**record, "headline_id": headline_id, "retries": 0} for headline_id in self.headline_ids]
+        shares[0]["retries"] = record["retries"]
+        for key in ("prompt_tokens", "output_tokens", "thinking_tokens", "images"):
+            base, extra = divmod(record[key], count)
+            for index, share in enumerate(shares):
+                share[key] = base + (index < extra)
+        for share in shares:
+            share["total_tokens"] = share["prompt_tokens"] + share["output_tokens"] + share["thinking_tokens"]
+        return shares
+
+
+@contextmanager
+def track_ai_call(
+    task_name: str,
+    model: str,
+    call_type: str,
+    article_id: int | None = None,
+    *,
+    flush: bool = True,
+    prompt_version: str = "",
+    pipeline_run_id: str = "",
+    headline_id: int | None = None,
+    headline_ids: list[int] | None = None,
+):
+    """
+    Gen AI çağrısını ölç ve kaydet.
+    Blok hatasız biterse sonuç "success" (veya set_response ile belirlenen "empty") olur;
+    hata fırlatılırsa sonuç kaydedilir ve hata tekrar fırlatılır.
+
+    Args:
+        task_name: Çağrıyı yapan görev adı
+        model: Model adı
+        call_type: text / stream / image / classify
+        article_id: İlgili makale ID'si (varsa)
+        flush: False ise DB yazımı ertelenir (async döngü içinden kullanım için)
+        prompt_version: Kullanılan prompt şablonunun sürüm etiketi (RenderedPrompt.version)
+        pipeline_run_id: Makale henüz yoksa pipeline çalıştırma kimliği (bkz. backfill_article)
+        headline_id: Sınıflandırılan başlığın ID'si (bkz. backfill_article)
+        headline_ids: Toplu sınıflandırmada başlık ID'leri; çağrı başlık başına kayda bölünür
+
+    Yields:
+        AICall: Deneme sayacı ve yanıt bilgisi için çağrı nesnesi
+    """
+    call = AICall(
+        task_name,
+        model,
+        call_type,
+        article_id=article_id,
+        prompt_version=prompt_version,
+        pipeline_run_id=pipeline_run_id,
+        headline_id=headline_id,
+        headline_ids=headline_ids,
+    )
+    try:
+        yield call
+    except Exception as e:
+        call.finish(call.outcome or classify_error(e), error_message=str(e), flush=flush)
+        raise
+    call.finish(call.outcome or "success", flush=flush)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class NewsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "news"
+
+    def ready(self):
+        # Yazar havuzunu ve prompt kayıt defterini geçersiz kılan sinyalleri,
+        # medya deposu referans sayacını bağla
+        from . import author_pool, media_store, prompt_registry  # noqa: F401
@@ -0,0 +1,203 @@
+"""
+HaberNexus - Ağırlıklı Yazar Havuzu
+Kategori başına önceden hesaplanmış, AuthorCategoryMapping ağırlıklarıyla oluşturulan
+yazar havuzu. Yazar seçimi alias yöntemiyle O(1) ve veritabanı sorgusu olmadan yapılır.
+
+- Havuz süreç belleğinde tutulur ve ilk kullanımda iki sorguyla oluşturulur.
+- Author veya AuthorCategoryMapping kaydedildiğinde / silindiğinde havuz geçersiz kılınır.
+  Diğer worker süreçleri cache'teki sürüm numarası değişince havuzu yeniden oluşturur.
+- Sinyal tetiklemeyen toplu güncellemeler (QuerySet.update) için havuz en fazla
+  AUTHOR_POOL_TTL saniye kullanılır.
+
+Kullanım:
+    author, mapping = select_author(article.category)
+"""
+
+import random
+import threading
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from authors.models import Author
+
+from .models_advanced import AuthorCategoryMapping
+
+POOL_VERSION_KEY = "author_pool:version"
+
+# Sinyalsiz toplu güncellemelere karşı güvenlik süresi (saniye)
+AUTHOR_POOL_TTL = 300
+
+# Birincil kategorisi olan yazarlar bu katsayı ile daha sık seçilir
+PRIMARY_WEIGHT = 2
+
+
+def mapping_weight(mapping) -> float:
+    """
+    Eşleştirmenin seçim ağırlığı: uzmanlık seviyesi, birincil kategoride PRIMARY_WEIGHT katı.
+    """
+    return mapping.expertise_level * (PRIMARY_WEIGHT if mapping.is_primary else 1)
+
+
+class AliasSampler:
+    """
+    Vose alias yöntemiyle ağırlıklı örnekleme.
+    Kurulum O(n), her örnekleme O(1) (bir rastgele indeks + bir karşılaştırma).
+    """
+
+    def __init__(self, items: list, weights: list):
+        if not items:
+            raise ValueError("Örneklenecek öğe yok")
+
+        count = len(items)
+        total = sum(weights)
+        scaled = [w * count / total for w in weights] if total > 0 else [1.0] * count
+
+        self.items = list(items)
+        self.prob = [1.0] * count
+        self.alias = list(range(count))
+
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+
+    def __len__(self):
+        return len(self.items)
+
+    def sample(self, rng=random):
+        index = rng.randrange(len(self.items))
+        return self.items[index] if rng.random() < self.prob[index] else self.items[self.alias[index]]
+
+
+class AuthorPool:
+    """
+    Kategori -> (yazar, eşleştirme) örnekleyicileri.
+    Eşleştirmesi olmayan kategoriler için tüm aktif yazarlar eşit ağırlıkla kullanılır.
+    """
+
+    def __init__(self, authors: list, mappings: list):
+        self.default = AliasSampler([(author, None) for author in authors], [1] * len(authors)) if authors else None
+
+        by_category = defaultdict(list)
+        for mapping in mappings:
+            by_category[mapping.category].append(mapping)
+
+        self.categories = {
+            category: AliasSampler(
+                [(mapping.author, mapping) for mapping in items], [mapping_weight(mapping) for mapping in items]
+            )
+            for category, items in by_category.items()
+        }
+
+    @classmethod
+    def build(cls) -> "AuthorPool":
+        """
+        Aktif yazarlardan ve eşleştirmelerinden havuzu oluştur (iki sorgu).
+        """
+        authors = list(Author.objects.filter(is_active=True))
+        authors_by_id = {author.id: author for author in authors}
+
+        mappings = list(AuthorCategoryMapping.objects.filter(author_id__in=authors_by_id))
+        for mapping in mappings:
+            # Eşleştirmeler aynı Author nesnelerini paylaşır
+            mapping.author = authors_by_id[mapping.author_id]
+
+        return cls(authors, mappings)
+
+    @property
+    def has_authors(self) -> bool:
+        return self.default is not None
+
+    def select(self, category: str | None = None, rng=random) -> tuple:
+        """
+        Kategori için ağırlıklı rastgele yazar seç.
+
+        Returns:
+            tuple: (Author veya None, AuthorCategoryMapping veya None)
+        """
+        sampler = self.categories.get(category) or self.default
+        if sampler is None:
+            return None, None
+        return sampler.sample(rng)
+
+
+# =============================================================================
+# Süreç Havuzu ve Geçersiz Kılma
+# =============================================================================
+
+
+class _ProcessPool:
+    """
+    Süreç içi havuz ve oluşturulduğu sürüm / zaman.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pool = None
+        self.version = None
+        self.built_at = 0.0
+
+    def is_fresh(self, version) -> bool:
+        return self.pool is not None and version == self.version and time.monotonic() - self.built_at < AUTHOR_POOL_TTL
+
+
+_process_pool = _ProcessPool()
+
+
+def get_author_pool() -> AuthorPool:
+    """
+    Süreç havuzunu döndür; geçersiz kılındıysa veya süresi dolduysa yeniden oluştur.
+    """
+    version = cache.get(POOL_VERSION_KEY, 0)
+    pool = _process_pool.pool
+    if pool is not None and _process_pool.is_fresh(version):
+        return pool
+
+    with _process_pool.lock:
+        if not _process_pool.is_fresh(version):
+            _process_pool.pool = AuthorPool.build()
+            _process_pool.version = version
+            _process_pool.built_at = time.monotonic()
+        return _process_pool.pool
+
+
+def select_author(category: str | None = None) -> tuple:
+    """
+    Kategoriye göre ağırlıklı yazar seç (havuz hazırsa sorgu yapılmaz).
+
+    Returns:
+        tuple: (Author veya None, AuthorCategoryMapping veya None)
+    """
+    return get_author_pool().select(category)
+
+
+def invalidate_author_pool():
+    """
+    Bu süreçteki havuzu sil ve diğer süreçler için sürüm numarasını artır.
+    """
+    _process_pool.pool = None
+
+    cache.add(POOL_VERSION_KEY, 0, timeout=None)
+    try:
+        cache.incr(POOL_VERSION_KEY)
+    except ValueError:
+        cache.set(POOL_VERSION_KEY, 1, timeout=None)
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=AuthorCategoryMapping)
+@receiver(post_delete, sender=AuthorCategoryMapping)
+def _invalidate_on_change(**kwargs):
+    invalidate_author_pool()
+    # Commit'ten önce yeniden oluşturan diğer süreçler eski veriyi görmüş olabilir
+    transaction.on_commit(invalidate_author_pool)
@@ -4,6 +4,8 @@ Sınıflandırma, yazı stili seçimi, prompt üretimi, kalite kontrol
 """
 
 import logging
+import re
+import zlib
 from datetime import timedelta
 from difflib import SequenceMatcher
 
@@ -288,23 +290,13 @@ class AuthorStyleSelector:
     @staticmethod
     def select_author_and_style(category: str, importance_level: int) -> tuple:
         """
-        Kategori ve önem seviyesine göre yazar seç
+        Kategori ve önem seviyesine göre yazar seç.
+        Yazar, kategorinin ağırlıklı yazar havuzundan (uzmanlık seviyesi ve birincil
+        kategoriye göre) seçilir; eşleştirme yoksa aktif yazarlardan rastgele seçilir.
         """
-        from authors.models import Author
-        from news.models_advanced import AuthorCategoryMapping
+        from news.author_pool import select_author
 
-        # Kategori-yazar mapping'i kontrol et
-        mappings = AuthorCategoryMapping.objects.filter(category=category, author__is_active=True).order_by(
-            "-expertise_level", "-is_primary"
-        )
-
-        if mappings.exists():
-            author = mappings.first().author
-            mapping = mappings.first()
-        else:
-            # Fallback: Aktif yazarlardan rastgele seç
-            author = Author.objects.filter(is_active=True).first()
-            mapping = None
+        author, mapping = select_author(category)
 
         # Yazı stilini belirle
         style = AuthorStyleSelector._select_style(importance_level, mapping)
@@ -351,84 +343,58 @@ class PromptGenerator:
     Dinamik ve kategori-aware prompt'lar oluştur
     """
 
+    @staticmethod
+    def _build_context(article_data: dict, author, style: dict) -> dict:
+        """
+        Makale şablonlarının kullanabileceği tüm alanlar
+        """
+        min_words, max_words = style["word_count"]
+
+        return {
+            "title": article_data["title"],
+            "summary": article_data["summary"],
+            "link": article_data.get("link", ""),
+            "category": article_data["category"],
+            "importance_level": article_data.get("importance_level", ""),
+            "author_name": author.name,
+            "author_expertise": author.expertise,
+            "tone": style["tone"],
+            "complexity": style["complexity"],
+            "voice": style["voice"],
+            "word_count": min_words,
+            "min_words": min_words,
+            "max_words": max_words,
+            "body_min_words": max_words - 250,
+            "body_max_words": max_words - 150,
+        }
+
     @staticmethod
     def generate_content_prompt(article_data: dict, author, style: dict) -> str:
         """
-        İçerik üretimi için dinamik prompt oluştur
+        İçerik üretimi için dinamik prompt oluştur.
+        Kategori için aktif PromptTemplate varsa o, yoksa varsayılan şablon kullanılır;
+        birden fazla aktif sürüm varsa başlığa göre sabit bir sürüm seçilir (A/B).
+
+        Returns:
+            RenderedPrompt: Prompt metni (şablon sürümüyle)
         """
-        from news.models_advanced import PromptTemplate
+        from news.prompt_registry import prompt_registry
 
-        try:
-            template = PromptTemplate.objects.get(
-                category=article_data["category"], template_type="article", is_active=True
-            )
-
-            prompt = template.template_content.format(
-                title=article_data["title"],
-                summary=article_data["summary"],
-                author_name=author.name,
-                author_expertise=author.expertise,
-                category=article_data["category"],
-                tone=style["tone"],
-                word_count=style["word_count"][0],
-                importance_level=article_data["importance_level"],
-            )
-
-        except PromptTemplate.DoesNotExist:
-            # Varsayılan template kullan
-            prompt = PromptGenerator._get_default_prompt(article_data, author, style)
-
-        return prompt
+        return prompt_registry.render(
+            "article",
+            variant=article_data["category"],
+            bucket=zlib.crc32(article_data["title"].encode()),
+            **PromptGenerator._build_context(article_data, author, style),
+        )
 
     @staticmethod
     def _get_default_prompt(article_data: dict, author, style: dict) -> str:
         """
         Varsayılan prompt template'i
         """
-        min_words, max_words = style["word_count"]
+        from news.prompt_registry import prompt_registry
 
-        return f"""
-Sen {author.name} isimli deneyimli bir {article_data["category"]} gazetecisisin.
-
-HABER BİLGİLERİ:
-Başlık: {article_data["title"]}
-Kategori: {article_data["category"]}
-Özet: {article_data["summary"]}
-Kaynak: {article_data.get("link", "")}
-
-YAZIM TALIMATLAR:
-1. Ton: {style["tone"]}
-2. Uzunluk: {min_words}-{max_words} kelime
-3. Karmaşıklık: {style["complexity"]}
-4. Ses: {style["voice"]}
-
-YAPISI:
-1. Giriş (100-150 kelime)
-   - Haberin özeti
-   - En önemli bilgiler
-   - Neden önemli
-
-2. Gelişme ({max_words - 250}-{max_words - 150} kelime)
-   - Detaylı bilgiler
-   - Bağlam ve arka plan
-   - İlgili veriler
-
-3. Sonuç (100-150 kelime)
-   - Etki ve sonuçlar
-   - Gelecek beklentileri
-
-KURALLAR:
-- HTML format: <h2>, <h3>, <p>, <strong>, <em>, <ul>, <li>
-- Paragraflar: 3-4 cümle
-- Cümleler: 15-20 kelime
-- Teknik terimleri açıkla
-- Kaynak metni doğrudan kopyalama
-- SEO: Ana anahtar kelimeleri doğal kullan
-- Tarafsız ve profesyonel ton
-
-ÇIKTI:
-Sadece HTML formatında haber yazısını yaz.
-        """.strip()
+        return prompt_registry.get("article").render(**PromptGenerator._build_context(article_data, author, style))
 
     @staticmethod
     def generate_image_prompt(title: str, category: str) -> str:
@@ -641,3 +607,128 @@ class ReadabilityMetrics:
             "avg_syllables_per_word": total_syllables / len(words) if words else 0,
             "lix_index": ReadabilityMetrics.calculate_lix_index(content),
         }
+
+
+# ============================================================================
+# AKIŞLI ÜRETİM DOĞRULAMA
+# ============================================================================
+
+
+class StreamingContentValidator:
+    """
+    Akışlı (streaming) üretimde gelen metni parça parça ucuz kontrollerden geçir.
+    Kötü bir üretim tespit edildiğinde erken durdurma nedeni döndürür,
+    böylece geri kalan token'lar için ödeme yapılmaz.
+    """
+
+    REFUSAL_PATTERNS = [
+        r"^\s*(üzgünüm|maalesef)\b",
+        r"\byapay zeka (modeli|asistanı|dil modeli) olarak\b",
+        r"\bbu isteği yerine getiremem\b",
+        r"\bbu konuda yardımcı olamam\b",
+        r"^\s*(i'm sorry|i am sorry|sorry,)",
+        r"\bas an ai\b",
+        r"\bi can(not|'t) (help|assist|provide|write)\b",
+    ]
+
+    TURKISH_MARKERS = (" ve ", " bir ", " bu ", " için ", " ile ", " olarak ", " daha ", " gibi ", " çok ")
+
+    VOID_TAGS = {"br", "hr", "img", "meta", "link", "input", "source", "wbr"}
+
+    TAG_PATTERN = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9]*)\b[^<>]*?(/?)>")
+
+    # ^ ile başlayan ret kalıpları için çıktı başındaki etiketler (<p>, <h2> ...) atlanır
+    LEADING_TAGS_PATTERN = re.compile(r"^(\s*<[^<>]*>)+")
+
+    def __init__(self, probe_length: int = 400, min_length: int = 200):
+        self.probe_length = probe_length
+        self.min_length = min_length
+        self.text = ""
+        self.open_tags = []
+        self.tag_count = 0
+        self._scan_pos = 0
+        self._probed = False
+        self._head_checked = False
+        self._refusal_patterns = [re.compile(p, re.IGNORECASE) for p in self.REFUSAL_PATTERNS]
+
+    def feed(self, chunk: str) -> str | None:
+        """
+        Yeni bir akış parçasını ekle ve kontrol et.
+
+        Returns:
+            str | None: Erken durdurma nedeni (sorun yoksa None)
+        """
+        if not chunk:
+            return None
+
+        self.text += chunk
+
+        # Ret kontrolü baş penceresi (probe_length * 2) dolana kadar her parçada, pencere
+        # dolduğunda parça boyutundan bağımsız olarak son kez yapılır
+        if not self._head_checked:
+            head_length = self.probe_length * 2
+            self._head_checked = len(self.text) >= head_length
+            head = self.LEADING_TAGS_PATTERN.sub("", self.text[:head_length])
+            if any(pattern.search(head) for pattern in self._refusal_patterns):
+                return "Model isteği reddetti"
+
+        reason = self._check_html()
+        if reason:
+            return reason
+
+        if not self._probed and len(self.text) >= self.probe_length:
+            self._probed = True
+            if self.tag_count == 0:
+                return "Çıktı HTML formatında değil"
+            if not self._looks_turkish():
+                return "Çıktı dili Türkçe değil"
+
+        return None
+
+    def finish(self) -> str | None:
+        """
+        Akış bittiğinde son kontrolleri yap.
+
+        Returns:
+            str | None: Geçersizlik nedeni (sorun yoksa None)
+        """
+        if len(self._strip_tags(self.text).strip()) < self.min_length:
+            return "Çıktı boş veya çok kısa"
+        if not self._probed and self.tag_count == 0:
+            return "Çıktı HTML formatında değil"
+        return None
+
+    def _check_html(self) -> str | None:
+        """
+        Tamamlanmış etiketleri tara ve açılış/kapanış dengesini izle.
+        Parça sınırında bölünen etiketler bir sonraki parçada taranır.
+        """
+        end = self.text.rfind(">") + 1
+        if end <= self._scan_pos:
+            return None
+
+        for match in self.TAG_PATTERN.finditer(self.text, self._scan_pos, end):
+            closing, tag, self_closing = match.group(1), match.group(2).lower(), match.group(3)
+            self.tag_count += 1
+            if tag in self.VOID_TAGS or self_closing:
+                continue
+            if not closing:
+                self.open_tags.append(tag)
+            elif tag in self.open_tags:
+                # Kapatılmamış iç etiketleri (örn. <p> içinde <em>) tolere et
+                while self.open_tags and self.open_tags.pop() != tag:
+                    pass
+            else:
+                return f"Geçersiz HTML: açılmamış </{tag}> etiketi"
+
+        self._scan_pos = end
+        return None
+
+    def _looks_turkish(self) -> bool:
+        sample = f" {self._strip_tags(self.text).lower()} "
+        hits = sum(1 for marker in self.TURKISH_MARKERS if marker in sample)
+        return hits >= 2 or any(char in sample for char in "ğşı")
+
+    @staticmethod
+    def _strip_tags(text: str) -> str:
+        return re.sub(r"<[^>]*>", " ", text)
@@ -0,0 +1,463 @@
+"""
+HaberNexus - Sahte Gen AI Sunucusu
+Gemini (generateContent / streamGenerateContent) ve Imagen (predict) uç noktalarını
+yerelde taklit eden hafif HTTP sunucusu. Imagen yalnızca Vertex AI yolunda
+(/v1beta1/publishers/google/models/...:predict) görsel döndürür; Gemini Developer API
+yolunda gerçek SDK'nın API anahtarı modundaki hatasıyla reddedilir. Developer API'de
+görseller generateContent (responseModalities: IMAGE) ile üretilir.
+
+Yük testlerinde gerçek API'ye gitmeden uçtan uca üretim akışını çalıştırmak için
+kullanılır. Gecikme dağılımı, hata ve 429 oranları ayarlanabilir; token kullanımı
+sayılır ve /stats uç noktasından okunabilir. /rss uç noktası ?feed=<ad>&items=<n>
+sorgusuyla n haberlik, tekrarlanabilir bir RSS beslemesi döndürür (varsayılan: boş).
+
+Kullanım:
+    with FakeGenAIServer(FakeGenAIConfig(latency_ms=800, rate_limit_rate=0.05)) as server:
+        # settings.GENAI_BASE_URL = server.url
+        ...
+"""
+
+import base64
+import json
+import math
+import random
+import re
+import threading
+import time
+from email.utils import formatdate
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, quote, urlsplit
+
+from PIL import Image
+
+# Sahte çıktılar için Türkçe paragraf (StreamingContentValidator kontrollerinden geçer)
+SAMPLE_PARAGRAPH = (
+    "<p>Uzmanlar, bu gelişmenin önümüzdeki dönemde sektördeki dengeleri değiştireceğini ve "
+    "şirketlerin yeni stratejiler geliştirmek zorunda kalacağını belirtiyor. Yapılan açıklamada "
+    "çalışmaların büyük bir titizlikle sürdüğü ve ilk sonuçların kısa süre içinde paylaşılacağı ifade edildi.</p>"
+)
+
+SAMPLE_CLASSIFICATION = {
+    "article_type": "news",
+    "confidence": 0.9,
+    "primary_category": "Teknoloji",
+    "secondary_categories": ["Bilim"],
+    "research_depth": 1,
+    "ai_model": "gemini-2.5-flash",
+    "is_time_sensitive": False,
+    "is_controversial": False,
+    "tone": "neutral",
+    "summary": "Sahte sınıflandırma",
+}
+
+SAMPLE_RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Yük Testi</title><link>http://localhost/</link>
+<description>Sahte RSS beslemesi</description>{items}</channel></rss>"""
+
+SAMPLE_RSS_ITEM = """<item><title>{title}</title><link>{link}</link>
+<description>Teknoloji şirketleri yapay zeka yatırımlarını artırıyor.</description><pubDate>{date}</pubDate></item>"""
+
+BATCH_ID_RE = re.compile(r"\[id=(\d+)\]")
+MODEL_PATH_RE = re.compile(
+    r"^/(?P<version>[^/]+)/(?P<publisher>publishers/google/)?models/(?P<model>[^:/]+):(?P<method>\w+)$"
+)
+
+# google-genai SDK'nın Imagen'i Gemini Developer API (API anahtarı) modunda reddederken verdiği hata
+DEVELOPER_API_IMAGEN_ERROR = (
+    "This method is only supported in Gemini Enterprise Agent Platform mode, not in Gemini Developer API mode."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Metin için yaklaşık token sayısı (ortalama 4 karakter = 1 token).
+    """
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+class FakeGenAIConfig:
+    """
+    Sahte sunucu davranış ayarları.
+
+    Args:
+        latency_ms: Metin üretimi için medyan gecikme (ms)
+        latency_sigma: Log-normal dağılım sigması (0 = sabit gecikme)
+        image_latency_ms: Görsel üretimi için medyan gecikme (ms)
+        rss_latency_ms: /rss uç noktası için medyan gecikme (ms)
+        error_rate: 500 döndürülecek isteklerin oranı (0.0 - 1.0)
+        rate_limit_rate: 429 döndürülecek isteklerin oranı (0.0 - 1.0)
+        output_tokens: Üretilecek yaklaşık çıktı token sayısı
+        thinking_tokens: thinkingConfig gönderildiğinde sayılacak düşünme token sayısı
+        stream_chunks: Akışlı yanıtın bölüneceği parça sayısı
+        seed: Tekrarlanabilir testler için rastgelelik tohumu
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 800.0,
+        latency_sigma: float = 0.5,
+        image_latency_ms: float = 3000.0,
+        rss_latency_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        output_tokens: int = 900,
+        thinking_tokens: int = 256,
+        stream_chunks: int = 8,
+        seed: int | None = None,
+    ):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.image_latency_ms = image_latency_ms
+        self.rss_latency_ms = rss_latency_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.output_tokens = output_tokens
+        self.thinking_tokens = thinking_tokens
+        self.stream_chunks = max(1, stream_chunks)
+        self.seed = seed
+
+
+class FakeGenAIStats:
+    """
+    Sahte sunucunun istek ve token sayaçları (thread-safe).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.status_codes = {}
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.thinking_tokens = 0
+        self.images = 0
+
+    def record(self, method: str, status: int, *, prompt_tokens=0, output_tokens=0, thinking_tokens=0, images=0):
+        with self._lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+            self.status_codes[str(status)] = self.status_codes.get(str(status), 0) + 1
+            self.prompt_tokens += prompt_tokens
+            self.output_tokens += output_tokens
+            self.thinking_tokens += thinking_tokens
+            self.images += images
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "status_codes": dict(self.status_codes),
+                "prompt_tokens": self.prompt_tokens,
+                "output_tokens": self.output_tokens,
+                "thinking_tokens": self.thinking_tokens,
+                "total_tokens": self.prompt_tokens + self.output_tokens + self.thinking_tokens,
+                "images": self.images,
+            }
+
+
+class FakeGenAIHandler(BaseHTTPRequestHandler):
+    """
+    Gemini/Imagen REST isteklerini karşılayan handler.
+    Sunucu örneğine (config, stats, rng) self.server üzerinden erişilir.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Yük testinde her isteği konsola yazma
+        pass
+
+    # -------------------------------------------------------------------------
+    # Yardımcılar
+    # -------------------------------------------------------------------------
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, api_status: str, message: str, method: str):
+        self.server.stats.record(method, status)
+        self._send_json(status, {"error": {"code": status, "message": message, "status": api_status}})
+
+    def _sleep(self, median_ms: float):
+        config = self.server.config
+        if median_ms <= 0:
+            return
+        if config.latency_sigma > 0:
+            delay = median_ms * math.exp(self.server.gauss(0, config.latency_sigma))
+        else:
+            delay = median_ms
+        time.sleep(delay / 1000.0)
+
+    def _inject_failure(self, method: str) -> bool:
+        """
+        Ayarlanan oranlara göre 429 veya 500 döndür.
+        """
+        roll = self.server.random()
+        config = self.server.config
+        if roll < config.rate_limit_rate:
+            self._send_error(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota).", method)
+            return True
+        if roll < config.rate_limit_rate + config.error_rate:
+            self._send_error(500, "INTERNAL", "An internal error has occurred.", method)
+            return True
+        return False
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            return {}
+
+    @staticmethod
+    def _prompt_text(body: dict) -> str:
+        parts = []
+        for content in body.get("contents", []):
+            for part in content.get("parts", []):
+                parts.append(part.get("text", ""))
+        return "".join(parts)
+
+    def _build_text(self, prompt: str) -> str:
+        # Sınıflandırma istekleri JSON bekler; toplu istekte her [id=N] için bir kayıt döner
+        if "JSON" in prompt:
+            batch_ids = BATCH_ID_RE.findall(prompt)
+            if batch_ids:
+                return json.dumps([{"id": int(i), **SAMPLE_CLASSIFICATION} for i in batch_ids], ensure_ascii=False)
+            return json.dumps(SAMPLE_CLASSIFICATION, ensure_ascii=False)
+
+        target_chars = self.server.config.output_tokens * 4
+        repeat = max(1, target_chars // len(SAMPLE_PARAGRAPH))
+        return "<h2>Gündemdeki gelişme</h2>" + SAMPLE_PARAGRAPH * repeat
+
+    def _usage(self, body: dict, prompt: str, text: str) -> dict:
+        generation_config = body.get("generationConfig") or {}
+        thinking = self.server.config.thinking_tokens if "thinkingConfig" in generation_config else 0
+        prompt_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(text)
+        return {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "thoughtsTokenCount": thinking,
+            "totalTokenCount": prompt_tokens + output_tokens + thinking,
+        }
+
+    def _build_rss(self) -> str:
+        query = parse_qs(urlsplit(self.path).query)
+        feed = query.get("feed", ["haber"])[0]
+        try:
+            count = max(0, int(query.get("items", ["0"])[0]))
+        except ValueError:
+            count = 0
+
+        host, port = self.server.server_address[:2]
+        date = formatdate(usegmt=True)
+        items = "".join(
+            SAMPLE_RSS_ITEM.format(
+                title=escape(f"{feed} {i}: Yapay zeka ile yeni dönem başlıyor"),
+                link=f"http://{host}:{port}/haber/{quote(feed)}/{i}",
+                date=date,
+            )
+            for i in range(count)
+        )
+        return SAMPLE_RSS.format(items=items)
+
+    @staticmethod
+    def _candidate(text: str, finish_reason: str | None = "STOP") -> dict:
+        candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+        if finish_reason:
+            candidate["finishReason"] = finish_reason
+        return candidate
+
+    # -------------------------------------------------------------------------
+    # Uç noktalar
+    # -------------------------------------------------------------------------
+
+    def do_GET(self):
+        if self.path.startswith("/stats"):
+            self._send_json(200, self.server.stats.as_dict())
+        elif self.path.startswith("/rss"):
+            self._sleep(self.server.config.rss_latency_ms)
+            body = self._build_rss().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+
+    def do_POST(self):
+        match = MODEL_PATH_RE.match(self.path.split("?", 1)[0])
+        body = self._read_body()
+        if not match:
+            self._send_error(404, "NOT_FOUND", f"Bilinmeyen uç nokta: {self.path}", "unknown")
+            return
+
+        method = match.group("method")
+        handlers = {
+            "generateContent": self._generate_content,
+            "streamGenerateContent": self._stream_generate_content,
+            "predict": self._predict,
+        }
+        handler = handlers.get(method)
+        if handler is None:
+            self._send_error(404, "NOT_FOUND", f"Desteklenmeyen metod: {method}", method)
+            return
+
+        if method == "predict" and not match.group("publisher"):
+            self._send_error(400, "INVALID_ARGUMENT", DEVELOPER_API_IMAGEN_ERROR, method)
+            return
+
+        handler(method, body)
+
+    def _generate_content(self, method: str, body: dict):
+        self._sleep(self.server.config.latency_ms)
+        if self._inject_failure(method):
+            return
+
+        prompt = self._prompt_text(body)
+        if "IMAGE" in ((body.get("generationConfig") or {}).get("responseModalities") or []):
+            self._generate_image_content(method, prompt)
+            return
+
+        text = self._build_text(prompt)
+        usage = self._usage(body, prompt, text)
+        self.server.stats.record(
+            method,
+            200,
+            prompt_tokens=usage["promptTokenCount"],
+            output_tokens=usage["candidatesTokenCount"],
+            thinking_tokens=usage["thoughtsTokenCount"],
+        )
+        self._send_json(200, {"candidates": [self._candidate(text)], "usageMetadata": usage})
+
+    def _generate_image_content(self, method: str, prompt: str):
+        """
+        Gemini görsel modeli yanıtı: görsel inlineData parçası olarak döner.
+        """
+        self._sleep(self.server.config.image_latency_ms)
+        part = {"inlineData": {"mimeType": "image/jpeg", "data": self.server.image_base64}}
+        candidate = {"content": {"role": "model", "parts": [part]}, "index": 0, "finishReason": "STOP"}
+        usage = {"promptTokenCount": estimate_tokens(prompt), "candidatesTokenCount": 1290}
+        self.server.stats.record(method, 200, prompt_tokens=usage["promptTokenCount"], images=1)
+        self._send_json(200, {"candidates": [candidate], "usageMetadata": usage})
+
+    def _stream_generate_content(self, method: str, body: dict):
+        config = self.server.config
+        # İlk token gecikmesi toplam gecikmenin yaklaşık dörtte biri
+        self._sleep(config.latency_ms / 4)
+        if self._inject_failure(method):
+            return
+
+        prompt = self._prompt_text(body)
+        text = self._build_text(prompt)
+        usage = self._usage(body, prompt, text)
+        size = math.ceil(len(text) / config.stream_chunks)
+        pieces = [text[i : i + size] for i in range(0, len(text), size)]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        for index, piece in enumerate(pieces):
+            is_last = index == len(pieces) - 1
+            chunk = {"candidates": [self._candidate(piece, "STOP" if is_last else None)]}
+            if is_last:
+                chunk["usageMetadata"] = usage
+            self.wfile.write(f"data: {json.dumps(chunk)}\r\n\r\n".encode())
+            self.wfile.flush()
+            if not is_last:
+                self._sleep(config.latency_ms * 0.75 / len(pieces))
+
+        self.server.stats.record(
+            method,
+            200,
+            prompt_tokens=usage["promptTokenCount"],
+            output_tokens=usage["candidatesTokenCount"],
+            thinking_tokens=usage["thoughtsTokenCount"],
+        )
+
+    def _predict(self, method: str, body: dict):
+        self._sleep(self.server.config.image_latency_ms)
+        if self._inject_failure(method):
+            return
+
+        count = int((body.get("parameters") or {}).get("sampleCount", 1))
+        predictions = [{"bytesBase64Encoded": self.server.image_base64, "mimeType": "image/jpeg"} for _ in range(count)]
+        self.server.stats.record(method, 200, images=count)
+        self._send_json(200, {"predictions": predictions})
+
+
+class FakeGenAIServer:
+    """
+    Arka plan thread'inde çalışan sahte Gen AI sunucusu.
+
+    Args:
+        config: FakeGenAIConfig (varsayılan ayarlar kullanılır)
+        host: Dinlenecek adres
+        port: Dinlenecek port (0 = boş port seç)
+    """
+
+    def __init__(self, config: FakeGenAIConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeGenAIConfig()
+        self.stats = FakeGenAIStats()
+        self._httpd = ThreadingHTTPServer((host, port), FakeGenAIHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.config = self.config
+        self._httpd.stats = self.stats
+
+        rng = random.Random(self.config.seed)
+        rng_lock = threading.Lock()
+
+        def locked(func):
+            def wrapper(*args):
+                with rng_lock:
+                    return func(*args)
+
+            return wrapper
+
+        self._httpd.random = locked(rng.random)
+        self._httpd.gauss = locked(rng.gauss)
+        self._httpd.image_base64 = self._build_image()
+        self._thread = None
+
+    @staticmethod
+    def _build_image() -> str:
+        """
+        Imagen yanıtlarında kullanılacak 16:9 JPEG görsel (bir kez üretilir).
+        """
+        buffer = BytesIO()
+        Image.new("RGB", (1280, 720), (40, 90, 160)).save(buffer, format="JPEG", quality=85)
+        return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGenAIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-genai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeGenAIServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
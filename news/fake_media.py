@@ -0,0 +1,221 @@
+"""
+HaberNexus - Sahte Medya Sunucusu
+Görsel ve video indirmelerini yerelde taklit eden hafif HTTP sunucusu.
+
+Kayıtlı dosyaları HEAD / GET ile sunar: Content-Length, ETag ve Accept-Ranges başlıkları,
+tek aralıklı Range istekleri (206), If-Range ile ETag kontrolü. Kesintili bağlantıları
+denemek için ilk n yanıt belirli bir bayttan sonra kesilebilir. İstek ve gönderilen bayt
+sayıları server.stats üzerinden okunur.
+
+Kullanım:
+    with FakeMediaServer() as server:
+        url = server.add("/video.mp4", data, content_type="video/mp4")
+        server.config.drop_after_bytes, server.config.drop_responses = 256 * 1024, 1
+        ...
+"""
+
+import hashlib
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Yanıt gövdesi yazma parçası
+WRITE_CHUNK = 64 * 1024
+
+
+class FakeMediaConfig:
+    """
+    Sahte medya sunucusu davranış ayarları.
+
+    Args:
+        ranges: Range isteklerini destekle (False: her zaman 200 ve tüm gövde)
+        drop_after_bytes: Kesilecek yanıtlarda gönderilecek en fazla bayt
+        drop_responses: Bağlantısı kesilecek ilk yanıt sayısı
+    """
+
+    def __init__(self, *, ranges: bool = True, drop_after_bytes: int = 0, drop_responses: int = 0):
+        self.ranges = ranges
+        self.drop_after_bytes = drop_after_bytes
+        self.drop_responses = drop_responses
+
+
+class FakeMediaStats:
+    """
+    İstek ve gönderilen bayt sayaçları (thread-safe).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.bytes_sent = 0
+        self.dropped = 0
+
+    def record(self, method: str, status: int, sent: int = 0, dropped: bool = False):
+        with self._lock:
+            key = f"{method} {status}"
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.bytes_sent += sent
+            self.dropped += int(dropped)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {"requests": dict(self.requests), "bytes_sent": self.bytes_sent, "dropped": self.dropped}
+
+
+class FakeMediaHandler(BaseHTTPRequestHandler):
+    """
+    Kayıtlı dosyaları sunan handler. Dosyalar, ayarlar ve sayaçlar self.server üzerindedir.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _file(self) -> dict | None:
+        entry = self.server.files.get(self.path.split("?", 1)[0])
+        if entry is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            self.server.stats.record(self.command, 404)
+        return entry
+
+    def _headers(self, status: int, entry: dict, length: int, content_range: str = ""):
+        self.send_response(status)
+        self.send_header("Content-Type", entry["content_type"])
+        self.send_header("Content-Length", str(length))
+        self.send_header("ETag", entry["etag"])
+        if self.server.config.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if content_range:
+            self.send_header("Content-Range", content_range)
+        self.end_headers()
+
+    def _requested_range(self, entry: dict) -> tuple[int, int] | None:
+        """
+        Geçerli tek aralık (başlangıç, bitiş dahil); Range yoksa, desteklenmiyorsa veya
+        If-Range ETag'i eşleşmiyorsa None (tüm gövde).
+        """
+        header = self.headers.get("Range", "")
+        if not header or not self.server.config.ranges:
+            return None
+        if_range = self.headers.get("If-Range")
+        if if_range and if_range != entry["etag"]:
+            return None
+        match = RANGE_RE.match(header.strip())
+        if not match or match.groups() == ("", ""):
+            return None
+        size = len(entry["data"])
+        first, last = match.groups()
+        if first == "":
+            start, end = max(0, size - int(last)), size - 1
+        else:
+            start, end = int(first), min(int(last), size - 1) if last else size - 1
+        return (start, end) if start <= end < size else None
+
+    def do_HEAD(self):
+        entry = self._file()
+        if entry is not None:
+            self._headers(200, entry, len(entry["data"]))
+            self.server.stats.record("HEAD", 200)
+
+    def do_GET(self):
+        entry = self._file()
+        if entry is None:
+            return
+
+        data = entry["data"]
+        requested = self._requested_range(entry)
+        if requested is None:
+            status, body = 200, memoryview(data)
+            self._headers(status, entry, len(data))
+        else:
+            start, end = requested
+            status, body = 206, memoryview(data)[start : end + 1]
+            self._headers(status, entry, len(body), f"bytes {start}-{end}/{len(data)}")
+
+        limit = len(body)
+        drop = self.server.take_drop()
+        if drop:
+            limit = min(limit, self.server.config.drop_after_bytes)
+
+        sent = 0
+        try:
+            while sent < limit:
+                chunk = body[sent : min(limit, sent + WRITE_CHUNK)]
+                self.wfile.write(chunk)
+                sent += len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            drop = True
+        self.server.stats.record("GET", status, sent, dropped=drop and sent < len(body))
+        if sent < len(body):
+            self.close_connection = True
+
+
+class FakeMediaServer:
+    """
+    Arka plan thread'inde çalışan sahte medya sunucusu.
+
+    Args:
+        config: FakeMediaConfig (varsayılan ayarlar kullanılır)
+        host: Dinlenecek adres
+        port: Dinlenecek port (0 = boş port seç)
+    """
+
+    def __init__(self, config: FakeMediaConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeMediaConfig()
+        self.stats = FakeMediaStats()
+        self._httpd = ThreadingHTTPServer((host, port), FakeMediaHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.config = self.config
+        self._httpd.stats = self.stats
+        self._httpd.files = {}
+
+        drop_lock = threading.Lock()
+        dropped = [0]
+
+        def take_drop() -> bool:
+            with drop_lock:
+                if dropped[0] < self.config.drop_responses:
+                    dropped[0] += 1
+                    return True
+                return False
+
+        self._httpd.take_drop = take_drop
+        self._thread = None
+
+    def add(self, path: str, data: bytes, content_type: str = "application/octet-stream") -> str:
+        """
+        Dosyayı yola kaydet (aynı yol tekrar verilirse içerik ve ETag değişir).
+
+        Returns:
+            str: Dosyanın URL'i
+        """
+        etag = f'"{hashlib.sha256(data).hexdigest()[:16]}"'
+        self._httpd.files[path] = {"data": bytes(data), "content_type": content_type, "etag": etag}
+        return f"{self.url}{path}"
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeMediaServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-media", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeMediaServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
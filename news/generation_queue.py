@@ -0,0 +1,356 @@
+"""
+HaberNexus - Skor Öncelikli İçerik Üretim Kuyruğu
+
+Makaleler üretime geliş sırasıyla değil, önceliklerine göre gönderilir:
+
+- Öncelik puanı HeadlineScore.overall_score'dan (yoksa varsayılan puandan) alınır,
+  son dakika / zamana duyarlı sınıflandırmalar için bonus eklenir.
+- Yaşlandırma: etkin öncelik = puan + GENERATION_AGING_PER_MINUTE * bekleme süresi (dk).
+  "now" tüm kayıtlar için aynı olduğundan sıralama, kuyruğa girişte hesaplanan
+  sabit sort_key = puan - oran * giriş zamanı (dk) ile yapılır; düşük puanlılar da
+  bekledikçe öne geçer ve sorgu indeksli kalır.
+- Aynı anda en fazla GENERATION_MAX_IN_FLIGHT makale üretimde olur. Broker kuyruğunda
+  hiçbir zaman bu sayıdan fazla üretim görevi beklemediği için sıralama burada yapılır;
+  gönderilen görevlere ayrıca Celery önceliği verilir.
+- Üretim görevi bittiğinde (task_postrun) kayıt kapatılır, kuyruğa girişten yayına kadar
+  geçen süre ölçülür ve boşalan yer için kuyruk yeniden işlenir.
+- IN_FLIGHT_TIMEOUT süresince bitmeyen kayıtlar (çöken worker vb.) bekleme süreleri korunarak
+  kuyruğa geri alınır; GENERATION_MAX_ATTEMPTS gönderimden sonra başarısız sayılır.
+"""
+
+import logging
+import uuid
+from datetime import UTC, datetime, timedelta
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from celery import shared_task
+from celery.signals import task_postrun
+
+from core.models import Setting
+from core.tasks import log_error, log_info
+
+from .models_extended import ArticleClassification, GenerationQueueItem, HeadlineScore
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import Histogram
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+
+# =============================================================================
+# Yapılandırma
+# =============================================================================
+
+GENERATION_TASKS = {
+    "v1": "news.tasks.generate_ai_content",
+    "v2": "news.tasks_v2.generate_ai_content_v2",
+}
+
+# Başlık puanı olmayan makaleler (örn. klasik RSS akışı) için öncelik
+DEFAULT_SCORE = 50.0
+
+# Bu puan ve üzerindeki makaleler yayın süresi raporunda "top" sayılır
+TOP_STORY_SCORE = 70.0
+
+# Bu süreden uzun süredir üretimde görünen kayıtlar (çöken worker vb.) yer tutmaz
+IN_FLIGHT_TIMEOUT = timedelta(minutes=30)
+
+# sort_key değerlerini küçük tutmak için sabit başlangıç noktası
+AGING_EPOCH = datetime(2025, 1, 1, tzinfo=UTC)
+
+DISPATCH_LOCK_KEY = "generation_queue:dispatch_lock"
+
+# Kilit doluyken uyandırma kaybolmasın: tek bir tekrar bu kadar saniye sonra planlanır
+DISPATCH_RETRY_KEY = "generation_queue:dispatch_retry"
+DISPATCH_RETRY_SECONDS = 5
+
+if PROMETHEUS_AVAILABLE:
+    TIME_TO_PUBLISH = Histogram(
+        "habernexus_time_to_publish_seconds",
+        "Üretim kuyruğuna girişten yayına kadar geçen süre",
+        ["tier"],
+        buckets=(15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200),
+    )
+
+
+def get_max_in_flight() -> int:
+    """
+    Aynı anda üretimde olabilecek makale sayısını ayarlardan al.
+
+    Returns:
+        int: Eşzamanlı üretim sınırı (varsayılan: 4)
+    """
+    try:
+        limit_setting = Setting.objects.get(key="GENERATION_MAX_IN_FLIGHT")
+        return max(1, int(limit_setting.value))
+    except (Setting.DoesNotExist, ValueError):
+        return 4
+
+
+def get_max_attempts() -> int:
+    """
+    Bir makalenin üretime en fazla kaç kez gönderileceğini ayarlardan al.
+    Zaman aşımına uğrayan kayıtlar bu sayıya ulaşana kadar kuyruğa geri alınır.
+
+    Returns:
+        int: Gönderim sınırı (varsayılan: 3)
+    """
+    try:
+        attempts_setting = Setting.objects.get(key="GENERATION_MAX_ATTEMPTS")
+        return max(1, int(attempts_setting.value))
+    except (Setting.DoesNotExist, ValueError):
+        return 3
+
+
+def get_aging_rate() -> float:
+    """
+    Bekleme dakikası başına eklenen öncelik puanını ayarlardan al.
+    Varsayılan 1.0: 60 dakika bekleyen 0 puanlı başlık, yeni gelen 60 puanlı başlığı yakalar.
+
+    Returns:
+        float: Dakika başına yaşlandırma puanı
+    """
+    try:
+        aging_setting = Setting.objects.get(key="GENERATION_AGING_PER_MINUTE")
+        return max(0.0, float(aging_setting.value))
+    except (Setting.DoesNotExist, ValueError):
+        return 1.0
+
+
+# =============================================================================
+# Öncelik Hesaplama
+# =============================================================================
+
+
+def get_generation_priority(article) -> float:
+    """
+    Makalenin üretim önceliğini hesapla.
+
+    - Başlık puanı varsa temel puan odur, yoksa DEFAULT_SCORE
+    - Son dakika haberleri +20, zamana duyarlı haberler +10
+
+    Returns:
+        float: 0-100 arası öncelik puanı
+    """
+    headline = HeadlineScore.objects.filter(article=article).order_by("-overall_score").first()
+    score = headline.overall_score if headline else DEFAULT_SCORE
+
+    classification = ArticleClassification.objects.filter(article=article).first()
+    if classification:
+        if classification.article_type == "breaking":
+            score += 20
+        if classification.is_time_sensitive:
+            score += 10
+
+    return max(0.0, min(float(score), 100.0))
+
+
+def compute_sort_key(score: float, enqueued_at, aging_rate: float) -> float:
+    """
+    Yaşlandırmalı sıralama anahtarı (büyük olan önce üretilir).
+    """
+    waited_minutes = (enqueued_at - AGING_EPOCH).total_seconds() / 60
+    return score - aging_rate * waited_minutes
+
+
+def to_celery_priority(score: float) -> int:
+    """
+    Öncelik puanını Celery/Redis önceliğine çevir (0 en yüksek, 9 en düşük).
+    """
+    return 9 - min(9, int(score / 100 * 10))
+
+
+# =============================================================================
+# Kuyruk İşlemleri
+# =============================================================================
+
+
+def enqueue_generation(article, pipeline: str = "v1", score: float | None = None, dispatch: bool = True):
+    """
+    Makaleyi üretim kuyruğuna ekle.
+
+    Kuyrukta bekleyen makalenin puanı güncellenir (bekleme süresi korunur),
+    üretimdeki makaleye dokunulmaz, biten makale yeniden kuyruğa alınır.
+
+    Args:
+        article: Üretilecek makale
+        pipeline: "v1" (generate_ai_content) veya "v2" (generate_ai_content_v2)
+        score: Öncelik puanı; verilmezse get_generation_priority ile hesaplanır
+        dispatch: True ise transaction commit olduktan sonra kuyruk işlenir
+
+    Returns:
+        GenerationQueueItem: Kuyruk kaydı
+    """
+    if score is None:
+        score = get_generation_priority(article)
+
+    now = timezone.now()
+    aging_rate = get_aging_rate()
+    item, created = GenerationQueueItem.objects.get_or_create(
+        article=article,
+        defaults={
+            "pipeline": pipeline,
+            "score": score,
+            "sort_key": compute_sort_key(score, now, aging_rate),
+            "enqueued_at": now,
+        },
+    )
+
+    if not created and item.status != "dispatched":
+        if item.status != "queued":
+            item.enqueued_at = now
+            item.dispatched_at = None
+            item.completed_at = None
+            item.task_id = ""
+            item.attempts = 0
+        item.pipeline = pipeline
+        item.score = score
+        item.sort_key = compute_sort_key(score, item.enqueued_at, aging_rate)
+        item.status = "queued"
+        item.save()
+
+    if dispatch:
+        transaction.on_commit(dispatch_generation_queue.delay)
+
+    return item
+
+
+def _claim_items() -> list:
+    """
+    Boş üretim yerleri kadar en öncelikli kaydı "dispatched" olarak işaretle.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        # Zaman aşımına uğrayanlar: hakkı kalan kuyruğa geri döner (sort_key korunur), kalmayan başarısız olur
+        timed_out = GenerationQueueItem.objects.filter(status="dispatched", dispatched_at__lt=now - IN_FLIGHT_TIMEOUT)
+        max_attempts = get_max_attempts()
+        requeued = timed_out.filter(attempts__lt=max_attempts).update(status="queued", dispatched_at=None, task_id="")
+        failed = timed_out.update(status="failed", completed_at=now)
+        if requeued or failed:
+            log_info(
+                "generation_queue",
+                f"Zaman aşımı: {requeued} makale kuyruğa geri alındı, {failed} makale başarısız",
+            )
+
+        slots = get_max_in_flight() - GenerationQueueItem.objects.filter(status="dispatched").count()
+        if slots <= 0:
+            return []
+
+        items = list(
+            GenerationQueueItem.objects.select_for_update(skip_locked=True)
+            .filter(status="queued")
+            .order_by("-sort_key")[:slots]
+        )
+        for item in items:
+            item.status = "dispatched"
+            item.dispatched_at = now
+            item.task_id = str(uuid.uuid4())
+            item.attempts += 1
+        GenerationQueueItem.objects.bulk_update(items, ["status", "dispatched_at", "task_id", "attempts"])
+
+    return items
+
+
+def _send(item):
+    """
+    Kuyruk kaydını ilgili üretim görevine gönder.
+    """
+    from . import tasks, tasks_v2
+
+    task = tasks_v2.generate_ai_content_v2 if item.pipeline == "v2" else tasks.generate_ai_content
+    try:
+        task.apply_async(args=[item.article_id], task_id=item.task_id, priority=to_celery_priority(item.score))
+    except Exception as e:
+        # Görev kuyruğa hiç ulaşmadıysa yerini geri ver
+        GenerationQueueItem.objects.filter(pk=item.pk, status="dispatched").update(
+            status="queued", dispatched_at=None, task_id="", attempts=F("attempts") - 1
+        )
+        log_error(
+            "dispatch_generation_queue",
+            f"Üretim görevi gönderilemedi: {e!s}",
+            traceback=str(e),
+            related_id=item.article_id,
+        )
+
+
+@shared_task
+def dispatch_generation_queue() -> int:
+    """
+    Üretim kuyruğunu işle: boş yer kadar en öncelikli makaleyi üretime gönder.
+    Aynı anda tek bir dağıtıcının çalışması için cache kilidi kullanılır. Kilit doluyken
+    gelen uyandırmalar için kısa süre sonra tek bir tekrar planlanır; ayrıca beat her
+    dakika çalıştırır (zaman aşımına uğrayan kayıtlar başka olay beklemeden geri alınır).
+
+    Returns:
+        int: Gönderilen makale sayısı
+    """
+    if not cache.add(DISPATCH_LOCK_KEY, 1, timeout=30):
+        if cache.add(DISPATCH_RETRY_KEY, 1, timeout=DISPATCH_RETRY_SECONDS * 2):
+            dispatch_generation_queue.apply_async(countdown=DISPATCH_RETRY_SECONDS)
+        return 0
+
+    try:
+        # Bu çalıştırma bekleyen uyandırmaları da karşılar; sonraki kaçırmalar yeniden planlanabilir
+        cache.delete(DISPATCH_RETRY_KEY)
+        items = _claim_items()
+    finally:
+        cache.delete(DISPATCH_LOCK_KEY)
+
+    for item in items:
+        transaction.on_commit(partial(_send, item))
+
+    if items:
+        logger.info(f"Üretim kuyruğundan {len(items)} makale gönderildi")
+    return len(items)
+
+
+def mark_generation_finished(article_id: int):
+    """
+    Üretimdeki kaydı kapat, yayın süresini ölç ve boşalan yer için kuyruğu işle.
+    Kuyruk dışından tetiklenen üretimler (kayıt yoksa) yok sayılır.
+    """
+    item = (
+        GenerationQueueItem.objects.filter(article_id=article_id, status="dispatched").select_related("article").first()
+    )
+    if item is None:
+        return
+
+    article = item.article
+    published = article.status == "published" and article.published_at is not None
+    item.status = "completed" if published else "failed"
+    item.completed_at = timezone.now()
+    item.save(update_fields=["status", "completed_at"])
+
+    if published:
+        seconds = max(0.0, (article.published_at - item.enqueued_at).total_seconds())
+        if PROMETHEUS_AVAILABLE:
+            TIME_TO_PUBLISH.labels("top" if item.score >= TOP_STORY_SCORE else "other").observe(seconds)
+        log_info("generation_queue", f"Yayınlandı ({seconds:.0f}s, puan {item.score:.0f})", related_id=article_id)
+
+    transaction.on_commit(dispatch_generation_queue.delay)
+
+
+@task_postrun.connect(weak=False)
+def _on_generation_finished(task=None, args=None, kwargs=None, state=None, **extra):
+    # RETRY durumları ara denemelerdir; sadece son durum kaydı kapatır
+    if task is None or task.name not in GENERATION_TASKS.values() or state not in {"SUCCESS", "FAILURE"}:
+        return
+
+    article_id = args[0] if args else (kwargs or {}).get("article_id")
+    if article_id is None:
+        return
+
+    try:
+        mark_generation_finished(article_id)
+    except Exception as e:
+        logger.error(f"Üretim kuyruğu kaydı kapatılamadı (ID: {article_id}): {e!s}")
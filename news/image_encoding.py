@@ -0,0 +1,221 @@
+"""
+HaberNexus - Paralel Görsel Encoding Motoru
+
+ImageProcessor'ın format × boyut matrisini (AVIF, WebP, JPEG × responsive boyutlar) tek
+worker'da sırayla encode etmek yerine bir havuzda paralel çalıştırır. 1920x1080 bir AVIF
+tek başına saniyeler sürer; matris havuza bölündüğünde makale başına süre en yavaş işe
+yaklaşır.
+
+- Havuz: varsayılan olarak süreç havuzu (kullanılabilir çekirdek sayısı kadar). Süreç
+  havuzu açılamazsa (örn. daemon worker süreçleri) veya bozulursa thread havuzuna düşülür;
+  Pillow encoder'ları işin büyük kısmında GIL'i bıraktığı için thread'ler de paralel çalışır.
+- Süre sınırı: her iş gönderildiği andan itibaren en fazla `deadline` saniye beklenir.
+  Süresi dolan iş iptal edilir (başlamadıysa) veya sonucu bırakılır; o format atlanır.
+  Çalışmakta olan encode kesilemez: iş bitene kadar worker'ı tutar, ancak süresi dolmuşsa
+  dosyayı yerine taşımaz. Süresi dolduktan sonra sırası gelen işler hiç başlamaz; böylece
+  yavaş bir iş bir worker'ı en fazla kendi encode süresi kadar meşgul eder.
+- Dosyalar geçici adla yazılıp yerine taşınır; yarım kalan iş eksik dosya bırakmaz.
+
+Bu modül Django'ya bağlı değildir; süreç havuzundaki worker'lar yalnızca bu modülü yükler.
+
+Kullanım:
+    encoder = ImageEncoder(workers=4, deadline=60)
+    report = encoder.encode([
+        {"key": "avif", "image": image, "format": "AVIF", "path": ".../featured.avif", "options": {"quality": 80}},
+        ...
+    ])
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("process", "thread", "serial")
+
+
+def available_cores() -> int:
+    """
+    Bu sürecin kullanabileceği çekirdek sayısı (CPU affinity dikkate alınır).
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def encode_job(job: dict, single_threaded: bool = False, expires_at: float | None = None) -> dict:
+    """
+    İşi çalıştır (havuz worker'ında). Dosya geçici adla yazılıp yerine taşınır.
+
+    Args:
+        job: {"key", "image" (PIL.Image), "format" (Pillow format adı), "path", "options" (save argümanları)}
+        single_threaded: True ise AVIF encoder'ı tek thread'le sınırlanır (havuz zaten
+            çekirdekleri dolduruyor)
+        expires_at: Süre sınırı (time.time() cinsinden); geçmişse iş başlamaz, encode sonrası
+            geçmişse dosya yerine taşınmaz (çağıran sonucu zaten bırakmıştır)
+
+    Returns:
+        dict: {"key", "path", "bytes", "seconds"}
+
+    Raises:
+        TimeoutError: Süre sınırı geçtiyse
+    """
+    if expires_at is not None and time.time() > expires_at:
+        raise TimeoutError("deadline")
+
+    start = time.perf_counter()
+    options = dict(job.get("options") or {})
+    if single_threaded and job["format"] == "AVIF":
+        options.setdefault("max_threads", 1)
+
+    path = Path(job["path"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        job["image"].save(temp_path, job["format"], **options)
+        if expires_at is not None and time.time() > expires_at:
+            raise TimeoutError("deadline")
+        temp_path.replace(path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    return {
+        "key": job["key"],
+        "path": job["path"],
+        "bytes": path.stat().st_size,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+# =============================================================================
+# Havuz
+# =============================================================================
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(kind: str, workers: int):
+    """
+    Paylaşılan havuzu döndür (tür ve worker sayısı başına bir tane).
+    Süreç havuzu forkserver ile açılır; çok thread'li worker'dan fork edilmez.
+    """
+    with _pools_lock:
+        pool = _pools.get((kind, workers))
+        if pool is None:
+            if kind == "process":
+                context = multiprocessing.get_context("forkserver")
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            else:
+                pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-encode")
+            _pools[(kind, workers)] = pool
+        return pool
+
+
+def _discard_pool(kind: str, workers: int):
+    with _pools_lock:
+        pool = _pools.pop((kind, workers), None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown_pools():
+    """
+    Açık havuzları kapat.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ImageEncoder:
+    """
+    Encoding işlerini havuzda paralel çalıştırır.
+
+    Args:
+        workers: Havuz boyutu (varsayılan: kullanılabilir çekirdek sayısı); 1 ise sırayla çalışır
+        deadline: İş başına en fazla bekleme süresi (saniye)
+        executor: "process", "thread" veya "serial"
+    """
+
+    def __init__(self, workers: int | None = None, deadline: float = 60.0, executor: str = "process"):
+        if executor not in EXECUTOR_KINDS:
+            raise ValueError(f"Geçersiz executor: {executor}")
+        self.workers = max(1, workers or available_cores())
+        self.deadline = deadline
+        self.executor = "serial" if self.workers == 1 else executor
+
+    def encode(self, jobs: list[dict]) -> dict:
+        """
+        İşleri çalıştır.
+
+        Returns:
+            dict: {"results": {key: sonuç}, "errors": {key: hata}, "wall_seconds": süre,
+                "executor": kullanılan havuz}
+        """
+        start = time.perf_counter()
+        executor = self.executor
+
+        if executor == "serial":
+            results, errors = self._run_serial(jobs)
+        else:
+            try:
+                results, errors = self._run_pool(executor, jobs)
+            except (BrokenProcessPool, OSError, AssertionError) as e:
+                # Süreç havuzu açılamadı / çöktü: thread havuzunda tekrar dene
+                logger.warning(f"Process pool unavailable, falling back to threads: {e!s}")
+                _discard_pool(executor, self.workers)
+                executor = "thread"
+                results, errors = self._run_pool(executor, jobs)
+
+        return {
+            "results": results,
+            "errors": errors,
+            "wall_seconds": time.perf_counter() - start,
+            "executor": executor,
+        }
+
+    def _run_serial(self, jobs: list[dict]) -> tuple[dict, dict]:
+        results, errors = {}, {}
+        for job in jobs:
+            try:
+                results[job["key"]] = encode_job(job)
+            except Exception as e:
+                logger.warning(f"{job['format']} encoding failed ({job['key']}): {e!s}")
+                errors[job["key"]] = str(e)
+        return results, errors
+
+    def _run_pool(self, kind: str, jobs: list[dict]) -> tuple[dict, dict]:
+        pool = _get_pool(kind, self.workers)
+        # Süre sınırı worker'a da iletilir (süreçler arası ortak saat: time.time)
+        submitted = [
+            (job, time.monotonic(), pool.submit(encode_job, job, True, time.time() + self.deadline)) for job in jobs
+        ]
+
+        results, errors = {}, {}
+        for job, submitted_at, future in submitted:
+            remaining = max(0.0, submitted_at + self.deadline - time.monotonic())
+            try:
+                results[job["key"]] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning(f"{job['format']} encoding exceeded {self.deadline}s deadline ({job['key']})")
+                errors[job["key"]] = "deadline"
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                logger.warning(f"{job['format']} encoding failed ({job['key']}): {e!s}")
+                errors[job["key"]] = str(e)
+        return results, errors
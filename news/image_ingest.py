@@ -0,0 +1,173 @@
+"""
+HaberNexus - Sınırlı Bellekle Görsel Alımı
+
+download_article_image ve ImageProcessor görseli response.content ile tamamen belleğe
+alıp doğal çözünürlüğünde çözüyordu; 8000 px bir JPEG ya da büyük bir PNG worker belleğini
+yüzlerce MB şişirebiliyordu. Bu modül alımı sınırlar:
+
+- İndirme: yanıt parça parça okunur; Content-Length veya okunan bayt
+  IMAGE_MAX_DOWNLOAD_BYTES'ı aşarsa indirme kesilir.
+- Çözme: Image.open yalnızca başlığı okur. JPEG'ler draft moduyla çözme sırasında hedef
+  boyuta en yakın 1/2, 1/4, 1/8 ölçeğe küçültülür; diğer formatlar tam çözülüp küçültülür.
+  Animasyonlu görsellerde yalnızca ilk kare çözülür.
+- Dekompresyon bombası koruması: çözülecek piksel sayısı (draft sonrası) IMAGE_MAX_PIXELS'ı
+  aşarsa görsel çözülmeden reddedilir; Pillow'un kendi sınırını aşan dosyalar da aynı
+  hatayla reddedilir.
+
+Her alımın bellek tüketimi (indirilen bayt, çözülen piksel tamponu ve tahmini tepe)
+istatistik olarak döndürülür.
+
+Kullanım:
+    response = requests.get(url, stream=True, timeout=15)
+    data = image_ingest.read_response(response)
+    image, stats = image_ingest.open_image(data, max_size=(1920, 1080))
+"""
+
+import logging
+from io import BytesIO
+
+from PIL import Image
+
+from core.models import Setting
+
+logger = logging.getLogger(__name__)
+
+# İndirme parça boyutu
+CHUNK_SIZE = 64 * 1024
+
+
+class ImageTooLargeError(ValueError):
+    """Görsel bayt veya piksel sınırını aşıyor."""
+
+
+def get_max_download_bytes() -> int:
+    """
+    İndirilecek görselin en fazla boyutu (IMAGE_MAX_DOWNLOAD_BYTES, varsayılan: 15 MB).
+    """
+    try:
+        return int(Setting.objects.get(key="IMAGE_MAX_DOWNLOAD_BYTES").value)
+    except (Setting.DoesNotExist, ValueError):
+        return 15 * 1024 * 1024
+
+
+def get_max_pixels() -> int:
+    """
+    Çözülecek görselin en fazla piksel sayısı (IMAGE_MAX_PIXELS, varsayılan: 25 milyon).
+    """
+    try:
+        return int(Setting.objects.get(key="IMAGE_MAX_PIXELS").value)
+    except (Setting.DoesNotExist, ValueError):
+        return 25_000_000
+
+
+# =============================================================================
+# İndirme
+# =============================================================================
+
+
+def read_response(response, max_bytes: int | None = None) -> bytearray:
+    """
+    stream=True ile açılmış yanıtı bayt sınırıyla oku ve bağlantıyı kapat.
+
+    Raises:
+        requests.HTTPError: HTTP hata durumu
+        ImageTooLargeError: Yanıt max_bytes'ı aşıyor
+    """
+    if max_bytes is None:
+        max_bytes = get_max_download_bytes()
+
+    try:
+        response.raise_for_status()
+
+        content_length = response.headers.get("Content-Length", "")
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            raise ImageTooLargeError(f"Görsel çok büyük: {content_length} bayt (sınır {max_bytes})")
+
+        data = bytearray()
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            data += chunk
+            if len(data) > max_bytes:
+                raise ImageTooLargeError(f"Görsel çok büyük: {max_bytes} bayttan fazla")
+        return data
+    finally:
+        response.close()
+
+
+# =============================================================================
+# Çözme
+# =============================================================================
+
+
+def open_image(
+    data: bytes | bytearray, max_size: tuple[int, int] | None = None, max_pixels: int | None = None
+) -> tuple[Image.Image, dict]:
+    """
+    Görseli sınırlı bellekle çöz.
+
+    Args:
+        data: Kaynak baytlar
+        max_size: Hedef sınır kutusu; verilirse görsel bu kutuya sığacak şekilde (en-boy
+            oranı korunarak) küçültülür, JPEG'ler çözme sırasında küçültülür
+        max_pixels: Çözülecek en fazla piksel (varsayılan: IMAGE_MAX_PIXELS)
+
+    Returns:
+        tuple: (yüklenmiş görsel, {"download_bytes", "source_size", "decoded_size",
+            "decoded_bytes", "peak_bytes"}); peak_bytes, indirilen bayt ile aynı anda bellekte
+            bulunan en büyük piksel tamponlarının toplamıdır (tahmini)
+
+    Raises:
+        ImageTooLargeError: Piksel sınırı aşıldı (görsel çözülmeden)
+    """
+    if max_pixels is None:
+        max_pixels = get_max_pixels()
+
+    image = _open(data)
+    source_size = image.size
+    if max_size is not None and image.format == "JPEG":
+        image.draft("RGB", max_size)
+
+    width, height = image.size
+    if width * height > max_pixels:
+        raise ImageTooLargeError(f"Görsel çok büyük: {width}x{height} piksel (sınır {max_pixels})")
+
+    # Animasyonlu görsellerde yalnızca ilk kare
+    image.load()
+    decoded_size = image.size
+    decoded_bytes = _buffer_bytes(image)
+    peak_bytes = decoded_bytes
+
+    if max_size is not None and (image.width > max_size[0] or image.height > max_size[1]):
+        # Yerinde küçültme: çözülen tampon küçük kopya oluşturulduktan sonra bırakılır
+        image.thumbnail(max_size, Image.Resampling.LANCZOS)
+        peak_bytes = decoded_bytes + _buffer_bytes(image)
+
+    stats = {
+        "download_bytes": len(data),
+        "source_size": source_size,
+        "decoded_size": decoded_size,
+        "decoded_bytes": decoded_bytes,
+        "peak_bytes": len(data) + peak_bytes,
+    }
+    return image, stats
+
+
+def read_size(data: bytes | bytearray) -> tuple[int, int]:
+    """
+    Görsel boyutunu yalnızca başlıktan oku.
+    """
+    return _open(data).size
+
+
+def _open(data: bytes | bytearray) -> Image.Image:
+    try:
+        return Image.open(BytesIO(data))
+    except Image.DecompressionBombError as e:
+        raise ImageTooLargeError(str(e)) from e
+
+
+def _buffer_bytes(image: Image.Image) -> int:
+    """
+    Görselin piksel tamponu boyutu (tobytes() kopyası oluşturmadan).
+    Pillow çok bantlı pikselleri 4 baytta tutar (RGB dahil).
+    """
+    return image.width * image.height * (1 if image.mode in ("1", "L", "P") else 4)
@@ -0,0 +1,340 @@
+"""
+HaberNexus - Yük Testi Yardımcıları
+Celery görevlerinin aşama bazlı sürelerini ölçen zamanlayıcı, mesaj boyutu ölçer,
+ölçüm worker'ı (yüzdelik hesabı: news.stats_utils).
+
+StageTimer, task_prerun/task_postrun sinyallerini dinler. Eager modda zincirlenen
+görevler iç içe çalıştığı için her aşamanın süresi alt görevlerin süresi düşülerek
+(exclusive) kaydedilir; eager retry'lar aynı aşamanın denemesi olarak sayılır.
+
+MessageMeter, broker'a giden görev mesajlarının ve result backend'e yazılan sonuçların
+JSON boyutunu ve serileştirme süresini görev adına göre toplar. QueryCounter, worker
+thread'leri dahil tüm veritabanı bağlantılarında çalışan sorguları sayar.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from celery import current_app
+from celery import result as celery_result
+from celery.contrib.testing.worker import start_worker
+from celery.signals import before_task_publish, task_postrun, task_prerun
+from kombu.serialization import dumps, loads
+
+from .stats_utils import percentile
+
+
+@contextmanager
+def thread_local_join_guard():
+    """
+    Celery'nin "result.get() görev içinde çağrılamaz" bayrağını thread'e özel yap.
+
+    Eager modda bu bayrak process genelinde tutulur; bir thread eager görev çalıştırırken
+    başka bir thread'deki chain.apply() yanlışlıkla RuntimeError alır. Yük testinde
+    her thread ayrı bir worker'ı temsil ettiği için bayrak süre boyunca thread-local tutulur.
+    """
+    local = threading.local()
+    original = (celery_result.task_join_will_block, celery_result._set_task_join_will_block)
+
+    def get_flag():
+        return getattr(local, "blocks", False)
+
+    def set_flag(blocks):
+        local.blocks = blocks
+
+    celery_result.task_join_will_block, celery_result._set_task_join_will_block = get_flag, set_flag
+    try:
+        yield
+    finally:
+        celery_result.task_join_will_block, celery_result._set_task_join_will_block = original
+
+
+class _Frame:
+    __slots__ = ("child_time", "outcome", "retries", "start", "task_id")
+
+    def __init__(self, task_id):
+        self.task_id = task_id
+        self.start = time.perf_counter()
+        self.child_time = 0.0
+        self.retries = 0
+        self.outcome = None
+
+
+class StageTimer:
+    """
+    Celery görevlerinin aşama (task adı) bazında süre, sonuç ve retry sayılarını toplar.
+    Ayrıca her thread'in görev içinde geçirdiği süreyi (worker doluluğu için) tutar.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.records = []
+        self.busy_by_thread = {}
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _on_prerun(self, task_id=None, task=None, **kwargs):
+        self._stack().append(_Frame(task_id))
+
+    def _on_postrun(self, task_id=None, task=None, state=None, **kwargs):
+        stack = self._stack()
+        if not stack:
+            return
+        frame = stack.pop()
+        inclusive = time.perf_counter() - frame.start
+        outcome = frame.outcome or state
+
+        # Eager retry: aynı görev kendi içinde tekrar çalıştı, üst çerçeveye katılır
+        if stack and stack[-1].task_id == task_id:
+            parent = stack[-1]
+            parent.child_time += frame.child_time
+            parent.retries += 1 + frame.retries
+            parent.outcome = outcome
+            return
+
+        with self._lock:
+            self.records.append(
+                {
+                    "stage": task.name if task else "unknown",
+                    "duration": inclusive - frame.child_time,
+                    "outcome": outcome,
+                    "retries": frame.retries,
+                }
+            )
+            if not stack:
+                name = threading.current_thread().name
+                self.busy_by_thread[name] = self.busy_by_thread.get(name, 0.0) + inclusive
+
+        if stack:
+            stack[-1].child_time += inclusive
+
+    def connect(self):
+        task_prerun.connect(self._on_prerun, weak=False)
+        task_postrun.connect(self._on_postrun, weak=False)
+
+    def disconnect(self):
+        task_prerun.disconnect(self._on_prerun)
+        task_postrun.disconnect(self._on_postrun)
+
+    def __enter__(self) -> "StageTimer":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.disconnect()
+
+    def stage_summary(self) -> dict:
+        """
+        Aşama bazlı özet: deneme, başarısızlık, retry sayıları ve p50/p95/p99 (ms).
+        """
+        with self._lock:
+            records = list(self.records)
+
+        summary = {}
+        for record in records:
+            summary.setdefault(record["stage"], []).append(record)
+
+        result = {}
+        for stage, items in summary.items():
+            durations = [item["duration"] * 1000 for item in items]
+            result[stage] = {
+                "count": len(items),
+                "failures": sum(1 for item in items if item["outcome"] == "FAILURE"),
+                "retries": sum(item["retries"] for item in items),
+                "p50_ms": round(percentile(durations, 50), 1),
+                "p95_ms": round(percentile(durations, 95), 1),
+                "p99_ms": round(percentile(durations, 99), 1),
+                "mean_ms": round(sum(durations) / len(durations), 1),
+            }
+        return result
+
+    def worker_utilization(self, workers: int, wall_time: float) -> float:
+        """
+        Worker doluluğu: görevlerde geçen toplam süre / (worker sayısı x duvar saati).
+        """
+        if workers <= 0 or wall_time <= 0:
+            return 0.0
+        with self._lock:
+            busy = sum(self.busy_by_thread.values())
+        return round(min(1.0, busy / (workers * wall_time)), 3)
+
+
+class MessageMeter:
+    """
+    Görev mesajlarının ve sonuçlarının serileştirilmiş boyutunu görev adına göre toplar.
+    Serileştirme süresi, mesajın JSON'a çevrilip geri okunması ile ölçülür (kombu json).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.messages = {}
+        self.results = {}
+
+    @staticmethod
+    def _measure(payload) -> tuple[int, float]:
+        start = time.perf_counter()
+        content_type, encoding, data = dumps(payload, serializer="json")
+        loads(data, content_type, encoding)
+        return len(data), time.perf_counter() - start
+
+    def _add(self, target: dict, name: str, payload):
+        size, seconds = self._measure(payload)
+        with self._lock:
+            entry = target.setdefault(name, {"count": 0, "bytes": 0, "max_bytes": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["bytes"] += size
+            entry["max_bytes"] = max(entry["max_bytes"], size)
+            entry["seconds"] += seconds
+
+    def _on_publish(self, sender=None, body=None, **kwargs):
+        self._add(self.messages, sender or "unknown", body)
+
+    def _on_postrun(self, task=None, retval=None, **kwargs):
+        if task is not None and not task.ignore_result:
+            self._add(self.results, task.name, retval)
+
+    def connect(self):
+        before_task_publish.connect(self._on_publish, weak=False)
+        task_postrun.connect(self._on_postrun, weak=False)
+
+    def disconnect(self):
+        before_task_publish.disconnect(self._on_publish)
+        task_postrun.disconnect(self._on_postrun)
+
+    def __enter__(self) -> "MessageMeter":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.disconnect()
+
+    def reset(self):
+        with self._lock:
+            self.messages, self.results = {}, {}
+
+    def totals(self) -> dict:
+        """
+        Toplam mesaj / sonuç sayısı, bayt ve serileştirme süresi.
+        """
+        with self._lock:
+            messages, results = list(self.messages.values()), list(self.results.values())
+        return {
+            "messages": sum(entry["count"] for entry in messages),
+            "message_bytes": sum(entry["bytes"] for entry in messages),
+            "results": sum(entry["count"] for entry in results),
+            "result_bytes": sum(entry["bytes"] for entry in results),
+            "serialize_seconds": sum(entry["seconds"] for entry in messages + results),
+        }
+
+
+class QueryCounter:
+    """
+    Tüm thread'lerin veritabanı bağlantılarındaki sorguları sayar.
+    Ölçüm başladığında açık olan (bu thread'in) bağlantılara ve ölçüm sırasında açılan
+    bağlantılara (connection_created) execute_wrapper eklenir.
+
+    Args:
+        other_threads_only: True ise ölçümü başlatan thread'in sorguları (örn. ilerleme
+            yoklaması) sayılmaz
+    """
+
+    def __init__(self, other_threads_only: bool = False):
+        self._lock = threading.Lock()
+        self._wrapped = []
+        self._owner = threading.current_thread() if other_threads_only else None
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def _wrap(self, connection):
+        if threading.current_thread() is self._owner:
+            return
+        with self._lock:
+            if self not in connection.execute_wrappers:
+                connection.execute_wrappers.append(self)
+                self._wrapped.append(connection)
+
+    def _on_connection_created(self, sender=None, connection=None, **kwargs):
+        self._wrap(connection)
+
+    def connect(self):
+        connection_created.connect(self._on_connection_created, weak=False)
+        for connection in connections.all():
+            self._wrap(connection)
+
+    def disconnect(self):
+        connection_created.disconnect(self._on_connection_created)
+        with self._lock:
+            for connection in self._wrapped:
+                if self in connection.execute_wrappers:
+                    connection.execute_wrappers.remove(self)
+            self._wrapped = []
+
+    def __enter__(self) -> "QueryCounter":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.disconnect()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+
+
+@contextmanager
+def celery_worker(broker: str = "memory://", concurrency: int = 4):
+    """
+    Eager modu kapatıp bu süreçte gerçek bir Celery worker'ı başlat (ölçüm komutları için).
+    Sonuçlar süreç içi belleğe (cache+memory://) yazılır.
+    """
+    conf = current_app.conf
+    overrides = {
+        "CELERY_BROKER_URL": broker,
+        "CELERY_RESULT_BACKEND": "cache+memory://",
+        "CELERY_TASK_ALWAYS_EAGER": False,
+    }
+    if broker.startswith("memory"):
+        # Bellek içi transport olay döngüsü yerine yoklama kullanır; prefetch sınırı dolunca
+        # bir sonraki yoklamaya (~2 sn) kadar beklememesi için sınır kaldırılır
+        overrides["CELERY_BROKER_TRANSPORT_OPTIONS"] = {"polling_interval": 0.01}
+        overrides["CELERY_WORKER_PREFETCH_MULTIPLIER"] = 0
+
+    # Ayarlar Django'dan CELERY_ önekiyle okunur; broker ve sonuç adresinde ortam değişkeni önceliklidir
+    previous_conf = {key: conf.get(key) for key in overrides}
+    previous_env = {key: os.environ.get(key) for key in ("CELERY_BROKER_URL", "CELERY_RESULT_BACKEND")}
+    for key, value in overrides.items():
+        conf[key] = value
+    for key in previous_env:
+        os.environ[key] = overrides[key]
+
+    try:
+        with start_worker(
+            current_app,
+            pool="threads",
+            concurrency=concurrency,
+            perform_ping_check=False,
+            loglevel="WARNING",
+            shutdown_timeout=30,
+        ):
+            yield
+    finally:
+        for key, value in previous_conf.items():
+            conf[key] = value
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
@@ -0,0 +1,115 @@
+"""
+HaberNexus - Toplu Log Yazma Tamponu
+
+Sıcak yoldaki (görev içi) log kayıtları satır satır INSERT yerine süreç içinde tamponlanır
+ve boyut ya da süre eşiği aşılınca tek bulk_create ile yazılır:
+
+- Eşikler Django ayarlarından okunur (her tampon kendi <ÖNEK>_BATCH_SIZE ve
+  <ÖNEK>_FLUSH_SECONDS ayarlarını kullanır).
+- Düşük trafikte süre eşiğinin bir sonraki kaydı beklememesi için her görevden sonra
+  (task_postrun) süresi dolan tamponlar boşaltılır.
+- Worker (ve prefork alt süreçleri) kapanırken tüm tamponlar boşaltılır; kayıt kaybolmaz.
+
+Alt sınıflar yalnızca write() metodunu uygular.
+"""
+
+import logging
+import threading
+import time
+import weakref
+
+from django.conf import settings
+
+from celery.signals import task_postrun, worker_process_shutdown, worker_shutdown
+
+logger = logging.getLogger(__name__)
+
+
+# Sinyallerde boşaltılacak tamponlar (testlerdeki geçici tamponlar tutulmaz)
+_buffers = weakref.WeakSet()
+
+
+class BulkLogBuffer:
+    """
+    Thread-safe log kayıt tamponu.
+    Boyut veya süre eşiği aşılınca kayıtlar write() ile tek seferde yazılır.
+
+    Args:
+        settings_prefix: Eşik ayarlarının öneki (örn. AI_CALL_LOG)
+        default_batch_size: Ayar yoksa kullanılacak parti boyutu
+        default_flush_seconds: Ayar yoksa kullanılacak en uzun bekleme süresi (sn)
+    """
+
+    def __init__(self, settings_prefix: str, default_batch_size: int = 50, default_flush_seconds: float = 10.0):
+        self.settings_prefix = settings_prefix
+        self.default_batch_size = default_batch_size
+        self.default_flush_seconds = default_flush_seconds
+        self._lock = threading.Lock()
+        self._records = []
+        self._last_flush = time.monotonic()
+        _buffers.add(self)
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def batch_size(self) -> int:
+        return getattr(settings, f"{self.settings_prefix}_BATCH_SIZE", self.default_batch_size)
+
+    @property
+    def flush_seconds(self) -> float:
+        return getattr(settings, f"{self.settings_prefix}_FLUSH_SECONDS", self.default_flush_seconds)
+
+    def add(self, record: dict, flush: bool = True):
+        with self._lock:
+            self._records.append(record)
+        if flush:
+            self.flush_if_due()
+
+    def flush_if_due(self):
+        if len(self._records) >= self.batch_size or (
+            self._records and time.monotonic() - self._last_flush >= self.flush_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Tampondaki tüm kayıtları yaz.
+
+        Returns:
+            int: Yazılan kayıt sayısı
+        """
+        with self._lock:
+            records, self._records = self._records, []
+            self._last_flush = time.monotonic()
+
+        if not records:
+            return 0
+
+        try:
+            return self.write(records)
+        except Exception as e:
+            logger.error(f"{type(self).__name__} kayıtları yazılamadı ({len(records)} kayıt): {e!s}")
+            return 0
+
+    def write(self, records: list) -> int:
+        """
+        Kayıtları veritabanına yaz.
+
+        Returns:
+            int: Yazılan kayıt sayısı
+        """
+        raise NotImplementedError
+
+
+@task_postrun.connect(weak=False)
+def _flush_after_task(**kwargs):
+    for buffer in list(_buffers):
+        buffer.flush_if_due()
+
+
+@worker_shutdown.connect(weak=False)
+@worker_process_shutdown.connect(weak=False)
+def _flush_on_shutdown(**kwargs):
+    for buffer in list(_buffers):
+        buffer.flush()
@@ -0,0 +1,86 @@
+"""
+Gen AI kullanım ve maliyet raporu.
+
+AICallLog kayıtlarını gün / model / makale (ve görev, çağrı tipi) bazında toplayıp
+çağrı, hata, retry, token, görsel, tahmini maliyet ve ortalama gecikmeyi listeler.
+
+Örnek:
+    python manage.py ai_usage_report --days 30 --by day,model
+    python manage.py ai_usage_report --article 42 --by task --json rapor.json
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from news.ai_instrumentation import flush_ai_call_logs
+from news.monitoring import AIUsageMetrics
+
+COLUMNS = (
+    ("calls", "Çağrı"),
+    ("failures", "Hata"),
+    ("retries", "Retry"),
+    ("total_tokens", "Token"),
+    ("images", "Görsel"),
+    ("cost_usd", "Maliyet $"),
+    ("avg_latency_ms", "Ort. ms"),
+)
+
+
+class Command(BaseCommand):
+    help = "Gen AI çağrılarını gün / model / makale bazında toplayıp maliyet raporu üretir"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7, help="Geriye dönük gün sayısı")
+        parser.add_argument(
+            "--by",
+            default="day,model",
+            help=f"Gruplama alanları, virgülle ayrılmış ({', '.join(AIUsageMetrics.GROUP_FIELDS)})",
+        )
+        parser.add_argument("--article", type=int, default=None, help="Sadece bu makalenin çağrıları")
+        parser.add_argument("--json", dest="json_path", default="", help="Raporun yazılacağı JSON dosyası")
+
+    def handle(self, *args, **options):
+        group_by = tuple(name.strip() for name in options["by"].split(",") if name.strip())
+        if not group_by:
+            raise CommandError("--by en az bir alan içermeli")
+
+        # Aynı süreçte tamponda bekleyen kayıtlar da rapora girsin
+        flush_ai_call_logs()
+
+        try:
+            rows = AIUsageMetrics.get_rollup(days=options["days"], group_by=group_by, article_id=options["article"])
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        fields = [AIUsageMetrics.GROUP_FIELDS[name] for name in group_by]
+        header = [*group_by, *(title for _, title in COLUMNS)]
+        table = [header]
+        for row in rows:
+            cells = [str(row[field]) for field in fields]
+            cells += [self._format(row[key], key) for key, _ in COLUMNS]
+            table.append(cells)
+
+        widths = [max(len(line[i]) for line in table) for i in range(len(header))]
+        for line in table:
+            self.stdout.write("  ".join(cell.ljust(width) for cell, width in zip(line, widths, strict=True)))
+
+        total_cost = sum(row["cost_usd"] or 0 for row in rows)
+        total_calls = sum(row["calls"] for row in rows)
+        self.stdout.write(self.style.SUCCESS(f"Toplam: {total_calls} çağrı, ${total_cost:.4f}"))
+
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump(rows, f, cls=DjangoJSONEncoder, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Rapor yazıldı: {options['json_path']}")
+
+    @staticmethod
+    def _format(value, key):
+        if value is None:
+            return "0"
+        if key == "cost_usd":
+            return f"{value:.4f}"
+        if key == "avg_latency_ms":
+            return f"{value:.0f}"
+        return str(value)
@@ -0,0 +1,109 @@
+"""
+Toplu başlık sınıflandırma ölçümü.
+
+Yerel sahte Gemini sunucusu başlatır ve aynı başlık kümesini farklı grup boyutlarıyla
+(1 = her başlık için ayrı çağrı) sınıflandırır. Her boyut için API çağrı sayısını,
+tek tek sınıflandırmaya düşen başlıkları, süreyi ve başlık/sn değerini raporlar.
+
+Örnek:
+    python manage.py classification_benchmark --headlines 40 --batch-sizes 1,5,10,20 --latency-ms 800
+"""
+
+import json
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from core.models import Setting
+from news.fake_genai import FakeGenAIConfig, FakeGenAIServer
+from news.models import RssSource
+from news.models_extended import HeadlineScore
+from news.tasks_v2 import classify_headline_with_ai, classify_headlines_in_batches
+
+
+class Command(BaseCommand):
+    help = "Başlık sınıflandırmasını farklı grup boyutlarıyla sahte Gen AI sunucusuna karşı ölçer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--headlines", type=int, default=40, help="Sınıflandırılacak başlık sayısı")
+        parser.add_argument("--batch-sizes", default="1,5,10,20", help="Virgülle ayrılmış grup boyutları")
+        parser.add_argument("--latency-ms", type=float, default=800.0, help="İstek başına medyan gecikme")
+        parser.add_argument("--seed", type=int, default=None, help="Tekrarlanabilir gecikme dizisi için tohum")
+        parser.add_argument("--json", dest="json_path", default="", help="Raporun yazılacağı JSON dosyası")
+
+    def handle(self, *args, **options):
+        try:
+            batch_sizes = [int(size) for size in options["batch_sizes"].split(",") if size.strip()]
+        except ValueError as e:
+            raise CommandError("--batch-sizes virgülle ayrılmış tam sayılar olmalı") from e
+        if options["headlines"] < 1 or not batch_sizes or min(batch_sizes) < 1:
+            raise CommandError("--headlines ve grup boyutları en az 1 olmalı")
+
+        config = FakeGenAIConfig(latency_ms=options["latency_ms"], seed=options["seed"])
+        run_id = uuid.uuid4().hex[:8]
+        rows = []
+
+        with FakeGenAIServer(config) as server, override_settings(GENAI_BASE_URL=server.url):
+            created_setting = None
+            if not Setting.objects.filter(key="GOOGLE_GEMINI_API_KEY").exclude(value="").exists():
+                created_setting, _ = Setting.objects.update_or_create(
+                    key="GOOGLE_GEMINI_API_KEY", defaults={"value": "benchmark-fake-key"}
+                )
+            source = RssSource.objects.create(
+                name=f"Sınıflandırma ölçümü {run_id}", url=f"{server.url}/rss?run={run_id}", category="Teknoloji"
+            )
+            try:
+                headlines = [
+                    HeadlineScore.objects.create(rss_source=source, original_headline=f"Ölçüm başlığı {run_id} {i}")
+                    for i in range(options["headlines"])
+                ]
+                for batch_size in batch_sizes:
+                    rows.append(self._measure(server, headlines, batch_size))
+            finally:
+                source.delete()
+                if created_setting:
+                    created_setting.delete()
+
+        baseline = next((row for row in rows if row["batch_size"] == 1), rows[0])
+        for row in rows:
+            row["speedup"] = round(row["headlines_per_sec"] / baseline["headlines_per_sec"], 2)
+            row["calls_saved"] = options["headlines"] - row["api_calls"]
+
+        self.stdout.write(
+            f"{'Grup':>6}{'Çağrı':>8}{'Yedek':>8}{'Süre (s)':>10}{'Başlık/sn':>12}{'Hızlanma':>10}{'Tasarruf':>10}"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['batch_size']:>6}{row['api_calls']:>8}{row['fallbacks']:>8}{row['seconds']:>10.2f}"
+                f"{row['headlines_per_sec']:>12.1f}{row['speedup']:>10.2f}{row['calls_saved']:>10}"
+            )
+
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump({"headlines": options["headlines"], "config": vars(config), "results": rows}, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Rapor kaydedildi: {options['json_path']}"))
+
+    @staticmethod
+    def _measure(server, headlines, batch_size):
+        """
+        Başlıkları verilen grup boyutuyla sınıflandır; eksik kalanları tek tek sınıflandır.
+        """
+        calls_before = server.stats.as_dict()["requests"].get("generateContent", 0)
+        start = time.perf_counter()
+
+        classifications, _ = classify_headlines_in_batches(headlines, batch_size)
+        fallbacks = [headline for headline in headlines if headline.id not in classifications]
+        for headline in fallbacks:
+            classify_headline_with_ai(headline)
+
+        seconds = time.perf_counter() - start
+        calls = server.stats.as_dict()["requests"].get("generateContent", 0) - calls_before
+        return {
+            "batch_size": batch_size,
+            "api_calls": calls,
+            "fallbacks": len(fallbacks) if batch_size > 1 else 0,
+            "seconds": round(seconds, 3),
+            "headlines_per_sec": round(len(headlines) / seconds, 2) if seconds > 0 else 0.0,
+        }
@@ -0,0 +1,249 @@
+"""
+Gen AI üretim hattı yük testi.
+
+Yerel sahte Gemini/Imagen sunucusu başlatır, N makaleyi seçilen pipeline'dan
+(v1: generate_ai_content -> generate_article_image, v2: sınıflandırma -> içerik -> görsel,
+advanced: 10 aşamalı zincir) geçirir ve aşama bazlı gecikme yüzdeliklerini,
+throughput'u ve worker doluluğunu raporlar.
+
+Görevler Celery eager modunda, --workers sayıda thread üzerinde çalıştırılır;
+her thread bir Celery worker process'ini temsil eder.
+
+Örnek:
+    python manage.py genai_loadtest --articles 50 --workers 8 --pipeline all --rate-limit-rate 0.05
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+
+from celery import current_app
+
+from authors.models import Author
+from core.models import Setting
+from news.fake_genai import FakeGenAIConfig, FakeGenAIServer
+from news.load_testing import StageTimer, thread_local_join_guard
+from news.models import Article, RssSource
+from news.models_extended import HeadlineScore
+
+PIPELINES = ("v1", "v2", "advanced")
+
+
+class Command(BaseCommand):
+    help = "Sahte Gen AI sunucusuna karşı üretim pipeline'ları için yük testi çalıştırır"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=20, help="Pipeline başına makale sayısı")
+        parser.add_argument("--workers", type=int, default=4, help="Eşzamanlı worker (thread) sayısı")
+        parser.add_argument("--pipeline", choices=[*PIPELINES, "all"], default="v1", help="Test edilecek pipeline")
+        parser.add_argument("--latency-ms", type=float, default=800.0, help="Metin üretimi medyan gecikmesi")
+        parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal gecikme sigması")
+        parser.add_argument("--image-latency-ms", type=float, default=3000.0, help="Görsel üretimi medyan gecikmesi")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="500 hata oranı (0-1)")
+        parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 hata oranı (0-1)")
+        parser.add_argument("--output-tokens", type=int, default=900, help="Yanıt başına çıktı token sayısı")
+        parser.add_argument("--seed", type=int, default=None, help="Tekrarlanabilir gecikme/hata dizisi için tohum")
+        parser.add_argument("--keep", action="store_true", help="Oluşturulan kayıtları ve dosyaları silme")
+        parser.add_argument("--json", dest="json_path", default="", help="Raporun yazılacağı JSON dosyası")
+
+    def handle(self, *args, **options):
+        if options["articles"] < 1 or options["workers"] < 1:
+            raise CommandError("--articles ve --workers en az 1 olmalı")
+
+        config = FakeGenAIConfig(
+            latency_ms=options["latency_ms"],
+            latency_sigma=options["latency_sigma"],
+            image_latency_ms=options["image_latency_ms"],
+            error_rate=options["error_rate"],
+            rate_limit_rate=options["rate_limit_rate"],
+            output_tokens=options["output_tokens"],
+            seed=options["seed"],
+        )
+        pipelines = PIPELINES if options["pipeline"] == "all" else (options["pipeline"],)
+        run_id = uuid.uuid4().hex[:8]
+
+        # Üretilen görseller --keep verilmedikçe geçici dizine yazılır
+        media_root = None if options["keep"] else tempfile.mkdtemp(prefix="genai_loadtest_")
+        media_override = override_settings(MEDIA_ROOT=media_root) if media_root else override_settings()
+
+        report = {"run_id": run_id, "config": vars(config), "workers": options["workers"], "pipelines": {}}
+        created_setting = created_author = None
+
+        with FakeGenAIServer(config) as server, override_settings(GENAI_BASE_URL=server.url), media_override:
+            self.stdout.write(f"Sahte Gen AI sunucusu: {server.url}")
+            created_setting, created_author = self._ensure_prerequisites()
+
+            conf = current_app.conf
+            previous_eager = (conf.task_always_eager, conf.task_eager_propagates)
+            conf.task_always_eager, conf.task_eager_propagates = True, False
+            try:
+                for pipeline in pipelines:
+                    report["pipelines"][pipeline] = self._run_pipeline(pipeline, run_id, server, options)
+            finally:
+                conf.task_always_eager, conf.task_eager_propagates = previous_eager
+                if not options["keep"]:
+                    self._cleanup(run_id, created_setting, created_author)
+
+            report["fake_server"] = server.stats.as_dict()
+
+        if media_root:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        self._print_report(report)
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Rapor kaydedildi: {options['json_path']}"))
+
+    # -------------------------------------------------------------------------
+    # Hazırlık ve temizlik
+    # -------------------------------------------------------------------------
+
+    def _ensure_prerequisites(self):
+        """
+        API anahtarı ve aktif yazar yoksa geçici olarak oluştur.
+        """
+        created_setting = created_author = None
+        if not Setting.objects.filter(key="GOOGLE_GEMINI_API_KEY").exclude(value="").exists():
+            created_setting, _ = Setting.objects.update_or_create(
+                key="GOOGLE_GEMINI_API_KEY", defaults={"value": "loadtest-fake-key"}
+            )
+        if not Author.objects.filter(is_active=True).exists():
+            created_author = Author.objects.create(
+                name="Yük Testi Yazarı", slug="yuk-testi-yazari", expertise="Teknoloji", is_active=True
+            )
+        return created_setting, created_author
+
+    def _cleanup(self, run_id, created_setting, created_author):
+        Article.objects.filter(title__startswith=self._prefix(run_id)).delete()
+        RssSource.objects.filter(name=self._prefix(run_id)).delete()
+        if created_setting:
+            created_setting.delete()
+        if created_author:
+            created_author.delete()
+
+    @staticmethod
+    def _prefix(run_id):
+        return f"Yük testi {run_id}"
+
+    # -------------------------------------------------------------------------
+    # Pipeline çalıştırma
+    # -------------------------------------------------------------------------
+
+    def _build_jobs(self, pipeline, run_id, server, count):
+        """
+        Pipeline için giriş kayıtlarını oluştur ve her makale için çalıştırılacak fonksiyonları döndür.
+        """
+        prefix = self._prefix(run_id)
+
+        if pipeline == "v1":
+            from news.tasks import generate_ai_content
+
+            articles = [
+                Article.objects.create(
+                    title=f"{prefix} v1 haberi {i}",
+                    slug=f"yuk-testi-{run_id}-v1-{i}",
+                    content="Yapay zeka alanında yeni bir gelişme yaşandı.",
+                    category="Teknoloji",
+                    status="draft",
+                )
+                for i in range(count)
+            ]
+            return [lambda article_id=a.id: generate_ai_content.delay(article_id) for a in articles]
+
+        if pipeline == "v2":
+            from news.tasks_v2 import classify_and_create_article
+
+            source = RssSource.objects.create(name=prefix, url=f"{server.url}/rss?run={run_id}", category="Teknoloji")
+            headlines = [
+                HeadlineScore.objects.create(rss_source=source, original_headline=f"{prefix} v2 haberi {i}")
+                for i in range(count)
+            ]
+            return [lambda headline_id=h.id: classify_and_create_article.delay(headline_id) for h in headlines]
+
+        from news.tasks_advanced import process_article_pipeline
+
+        payloads = [
+            {
+                "title": f"{prefix} advanced {i}: Yapay zeka ile yeni dönem başlıyor",
+                "summary": "Teknoloji şirketleri yapay zeka yatırımlarını artırıyor.",
+                "category": "Teknoloji",
+                "link": f"{server.url}/haber/{run_id}/{i}",
+                "source_url": f"{server.url}/rss",
+            }
+            for i in range(count)
+        ]
+        return [lambda data=payload: process_article_pipeline.delay(data) for payload in payloads]
+
+    def _run_pipeline(self, pipeline, run_id, server, options):
+        self.stdout.write(f"[{pipeline}] {options['articles']} makale, {options['workers']} worker...")
+        jobs = self._build_jobs(pipeline, run_id, server, options["articles"])
+
+        errors = []
+
+        def run(job):
+            try:
+                job()
+            except Exception as e:
+                # Eager modda retry/hata istisnaları çağırana kadar yükselir; makale başarısız sayılır
+                errors.append(type(e).__name__)
+            finally:
+                # Her thread kendi DB bağlantısını kullanır
+                connections.close_all()
+
+        with StageTimer() as timer, thread_local_join_guard():
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options["workers"], thread_name_prefix="loadtest-worker") as pool:
+                list(pool.map(run, jobs))
+            wall_time = time.perf_counter() - start
+
+        published = Article.objects.filter(
+            title__startswith=f"{self._prefix(run_id)} {pipeline}", status="published"
+        ).count()
+
+        return {
+            "articles": len(jobs),
+            "published": published,
+            "errors": len(errors),
+            "wall_time_s": round(wall_time, 3),
+            "throughput_per_min": round(published / wall_time * 60, 2) if wall_time else 0.0,
+            "worker_utilization": timer.worker_utilization(options["workers"], wall_time),
+            "stages": timer.stage_summary(),
+        }
+
+    # -------------------------------------------------------------------------
+    # Raporlama
+    # -------------------------------------------------------------------------
+
+    def _print_report(self, report):
+        for pipeline, data in report["pipelines"].items():
+            self.stdout.write("")
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Pipeline: {pipeline}"))
+            self.stdout.write(
+                f"  Yayınlanan: {data['published']}/{data['articles']}  Hata: {data['errors']}  "
+                f"Süre: {data['wall_time_s']}s  "
+                f"Throughput: {data['throughput_per_min']} makale/dk  "
+                f"Worker doluluğu: {data['worker_utilization']:.0%}"
+            )
+            self.stdout.write(f"  {'Aşama':<50}{'adet':>6}{'hata':>6}{'retry':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+            for stage, stats in data["stages"].items():
+                self.stdout.write(
+                    f"  {stage:<50}{stats['count']:>6}{stats['failures']:>6}{stats['retries']:>7}"
+                    f"{stats['p50_ms']:>9.0f}{stats['p95_ms']:>9.0f}{stats['p99_ms']:>9.0f}"
+                )
+
+        server = report["fake_server"]
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("Sahte Gen AI sunucusu"))
+        self.stdout.write(f"  İstekler: {server['requests']}  Durum kodları: {server['status_codes']}")
+        self.stdout.write(
+            f"  Token: prompt={server['prompt_tokens']} çıktı={server['output_tokens']} "
+            f"düşünme={server['thinking_tokens']} toplam={server['total_tokens']}  Görsel: {server['images']}"
+        )
@@ -0,0 +1,42 @@
+"""
+Üretim kuyruğu ve yayın süresi raporu.
+
+Kuyruktaki / üretimdeki makale sayılarını ve kuyruğa girişten yayına kadar geçen
+sürenin p50 / p95 değerlerini en iyi haberler ("top") ve diğerleri için ayrı listeler.
+
+Örnek:
+    python manage.py generation_queue_report --hours 6 --top-score 75
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from news.generation_queue import TOP_STORY_SCORE
+from news.monitoring import GenerationQueueMetrics
+
+
+class Command(BaseCommand):
+    help = "Skor öncelikli üretim kuyruğunun durumunu ve yayın süresi yüzdeliklerini raporlar"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=24, help="Son kaç saatte yayınlananlar")
+        parser.add_argument("--top-score", type=float, default=TOP_STORY_SCORE, help="En iyi haber puan eşiği")
+        parser.add_argument("--json", dest="json_path", default="", help="Raporun yazılacağı JSON dosyası")
+
+    def handle(self, *args, **options):
+        status = GenerationQueueMetrics.get_queue_status()
+        stats = GenerationQueueMetrics.get_time_to_publish_stats(hours=options["hours"], top_score=options["top_score"])
+
+        self.stdout.write(
+            f"Kuyrukta: {status['queued']}  Üretimde: {status['dispatched']}  "
+            f"Yayınlandı: {status['completed']}  Başarısız: {status['failed']}"
+        )
+        self.stdout.write(f"{'Katman':<8}{'Adet':>8}{'p50 (s)':>12}{'p95 (s)':>12}{'max (s)':>12}")
+        for tier, row in stats.items():
+            self.stdout.write(f"{tier:<8}{row['count']:>8}{row['p50']:>12.1f}{row['p95']:>12.1f}{row['max']:>12.1f}")
+
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump({"queue": status, "time_to_publish": stats}, f, indent=2)
+            self.stdout.write(f"Rapor yazıldı: {options['json_path']}")
@@ -0,0 +1,140 @@
+"""
+Görsel encoding ölçümü.
+
+Sentetik 1920x1080 görseller üretir ve ImageProcessor'ın makale başına format × boyut
+matrisini (ana görsel AVIF/WebP/JPEG + responsive boyutlar × AVIF/WebP) farklı
+havuzlarla encode eder: serial (eski davranış: tek worker'da sırayla), thread ve process.
+Her havuz için makale başına duvar saati süresi (ortalama, p50, p95), toplam encoder
+süresi, boyutlandırma süresi, makale başına CPU (boyutlandırma + encoder), zaman aşımına
+düşen iş sayısı ve serial'e göre hızlanma raporlanır.
+
+--direct-resize her boyutu tam çözünürlüklü kaynaktan küçültür (piramit öncesi davranış);
+iki çalıştırmanın cpu_seconds değerleri karşılaştırılabilir.
+
+Örnek:
+    python manage.py image_encoding_benchmark --articles 5 --workers 4 --executors serial,process --json enc.json
+    python manage.py image_encoding_benchmark --executors serial --direct-resize
+"""
+
+import json
+import shutil
+import statistics
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from PIL import Image
+
+from news.image_encoding import EXECUTOR_KINDS, ImageEncoder, available_cores
+from news.media_processor import ImageProcessor
+from news.stats_utils import percentile
+
+
+def synthetic_image(seed: int, size: tuple[int, int] = (1920, 1080)) -> Image.Image:
+    """
+    Fotoğrafa benzer sıkıştırılabilirlikte sentetik görsel (gürültü + gradyanlar).
+    """
+    noise = Image.effect_noise(size, 30 + seed % 20)
+    linear = Image.linear_gradient("L").resize(size).rotate(seed * 37 % 360)
+    radial = Image.radial_gradient("L").resize(size)
+    return Image.merge("RGB", [noise, linear, radial])
+
+
+class Command(BaseCommand):
+    help = "Görsel format × boyut matrisinin makale başına encode süresini havuz türlerine göre ölçer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=5, help="Havuz başına makale sayısı")
+        parser.add_argument("--workers", type=int, default=0, help="Havuz boyutu (0 = kullanılabilir çekirdek)")
+        parser.add_argument("--executors", default="serial,thread,process", help="Virgülle ayrılmış havuz türleri")
+        parser.add_argument("--quality", default="high", choices=list(ImageProcessor.QUALITY_LEVELS))
+        parser.add_argument("--deadline", type=float, default=60.0, help="İş başına süre sınırı (sn)")
+        parser.add_argument(
+            "--direct-resize", action="store_true", help="Her boyutu kaynaktan küçült (piramit kullanma)"
+        )
+        parser.add_argument("--json", dest="json_path", default="", help="Raporun yazılacağı JSON dosyası")
+
+    def handle(self, *args, **options):
+        executors = [name.strip() for name in options["executors"].split(",") if name.strip()]
+        if not executors or set(executors) - set(EXECUTOR_KINDS):
+            raise CommandError(f"--executors şunlardan oluşmalı: {', '.join(EXECUTOR_KINDS)}")
+        if options["articles"] < 1:
+            raise CommandError("--articles en az 1 olmalı")
+
+        workers = options["workers"] or available_cores()
+        images = [synthetic_image(seed) for seed in range(options["articles"])]
+        output_dir = tempfile.mkdtemp(prefix="image_encoding_")
+        rows = []
+
+        try:
+            for executor in executors:
+                self.stdout.write(f"[{executor}] {options['articles']} makale...")
+                encoder = ImageEncoder(
+                    workers=1 if executor == "serial" else workers, deadline=options["deadline"], executor=executor
+                )
+                processor = ImageProcessor(output_dir, encoder=encoder)
+                processor.RESIZE_PYRAMID = not options["direct_resize"]
+                rows.append(self._run(executor, processor, images, options["quality"]))
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+        baseline = next((row for row in rows if row["executor"] == "serial"), rows[0])
+        for row in rows:
+            row["speedup"] = round(baseline["mean_seconds"] / row["mean_seconds"], 2) if row["mean_seconds"] else 0.0
+
+        self.stdout.write("")
+        resize = "direct" if options["direct_resize"] else "pyramid"
+        self.stdout.write(
+            f"Çekirdek: {available_cores()}, havuz boyutu: {workers}, iş/makale: {rows[0]['jobs']}, "
+            f"boyutlandırma: {resize}"
+        )
+        self.stdout.write(
+            f"{'Havuz':<10}{'Kullanılan':<12}{'Ort. (s)':>10}{'p50 (s)':>10}{'p95 (s)':>10}"
+            f"{'Encoder (s)':>13}{'Resize (s)':>12}{'CPU (s)':>10}{'Zaman aşımı':>13}{'Hızlanma':>10}"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['executor']:<10}{row['used']:<12}{row['mean_seconds']:>10.2f}{row['p50_seconds']:>10.2f}"
+                f"{row['p95_seconds']:>10.2f}{row['encoder_seconds']:>13.2f}{row['resize_seconds']:>12.3f}"
+                f"{row['cpu_seconds']:>10.2f}{row['deadline_misses']:>13}{row['speedup']:>10.2f}"
+            )
+
+        if options["json_path"]:
+            report = {
+                "cores": available_cores(),
+                "workers": workers,
+                "quality": options["quality"],
+                "resize": resize,
+                "results": rows,
+            }
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Rapor kaydedildi: {options['json_path']}"))
+
+    @staticmethod
+    def _run(executor, processor, images, quality):
+        walls, encoder_seconds, resize_seconds, misses, used, jobs = [], 0.0, 0.0, 0, executor, 0
+        for index, image in enumerate(images):
+            encoded = processor.encode_article_images(image, f"{executor}-{index}", quality)
+            encoding = encoded["encoding"]
+            walls.append(encoding["wall_seconds"])
+            encoder_seconds += encoding["encoder_seconds"]
+            resize_seconds += encoding["resize_seconds"]
+            misses += sum(error == "deadline" for error in encoding["errors"].values())
+            used = encoding["executor"]
+            jobs = len(encoded["formats"]) + sum(len(entry) - 1 for entry in encoded["responsive"].values())
+
+        return {
+            "executor": executor,
+            "used": used,
+            "articles": len(images),
+            "jobs": jobs,
+            "mean_seconds": round(statistics.mean(walls), 3),
+            "p50_seconds": round(percentile(walls, 50), 3),
+            "p95_seconds": round(percentile(walls, 95), 3),
+            "encoder_seconds": round(encoder_seconds / len(images), 3),
+            "resize_seconds": round(resize_seconds / len(images), 4),
+            # Makale başına CPU: encoder işleri tek iş parçacıklı olduğundan iş süreleri + boyutlandırma
+            "cpu_seconds": round((encoder_seconds + resize_seconds) / len(images), 3),
+            "deadline_misses": misses,
+        }
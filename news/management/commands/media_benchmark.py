@@ -0,0 +1,214 @@
+"""
+Medya işleme maliyeti ölçümü.
+
+Sentetik girdiler üretir (çözünürlük × JPEG / PNG / RGBA PNG / animasyonlu GIF görseller ve
+ffmpeg lavfi ile kısa test videoları), bunları yerel bir HTTP sunucusundan (FakeMediaServer)
+sunar ve medya yollarını uçtan uca çalıştırır:
+
+- optimize: ImageProcessor.download_and_optimize (indirme + ana görsel AVIF/WebP/JPEG)
+- responsive: ImageProcessor.create_responsive_images (girdi önceden indirilmiş dosyadan)
+- article_image: tasks.download_article_image (haber görseli, WebP)
+- video: VideoProcessor.download_and_encode (indirme + profiller + HLS); ffmpeg yoksa atlanır
+
+Her ölçüm ayrı bir süreçte çalışır (bkz. news.media_benchmark.measure): süre, tepe RSS ve
+ffmpeg'in tepe RSS'i ile çıktı baytları formata (uzantıya) göre raporlanır. Görsel
+encoder'ı varsayılan olarak thread havuzuyla çalışır; process havuzunun worker'ları
+forkserver'dan doğduğu için bellekleri ölçüme girmez (--executor process). Çıktılar
+geçici MEDIA_ROOT'a yazılır, veritabanı değişiklikleri geri alınır. Sonuçlar JSON'a
+kaydedilir; --baseline ile önceki bir raporla karşılaştırılır.
+
+Örnek:
+    python manage.py media_benchmark --resolutions 640x360,1920x1080,4000x3000 --json media.json
+    python manage.py media_benchmark --cases optimize,video --baseline media.json --json media-new.json
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+from core.models import Setting
+from news import media_benchmark
+from news.fake_media import FakeMediaServer
+from news.image_encoding import EXECUTOR_KINDS, ImageEncoder
+from news.media_processor import ImageProcessor, VideoProcessor
+from news.models import Article
+from news.tasks import download_article_image
+
+CASES = ("optimize", "responsive", "article_image", "video")
+
+
+def parse_sizes(value: str) -> list[tuple[int, int]]:
+    sizes = []
+    for item in value.split(","):
+        width, _, height = item.strip().partition("x")
+        if not (width.isdigit() and height.isdigit()):
+            raise CommandError(f"Geçersiz çözünürlük: {item!r} (GxY bekleniyor)")
+        sizes.append((int(width), int(height)))
+    return sizes
+
+
+class Command(BaseCommand):
+    help = "Sentetik görsel ve videolarla medya yollarının süre, bellek ve çıktı boyutunu ölçer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--resolutions", default="640x360,1920x1080,4000x3000", help="Görsel çözünürlükleri")
+        parser.add_argument("--formats", default="jpeg,png,rgba,gif", help="Görsel girdi türleri")
+        parser.add_argument("--video-resolutions", default="1280x720,1920x1080", help="Video çözünürlükleri")
+        parser.add_argument("--video-seconds", type=float, default=5, help="Test videosu süresi (sn)")
+        parser.add_argument("--cases", default=",".join(CASES), help="Virgülle ayrılmış ölçümler")
+        parser.add_argument("--media-store", action="store_true", help="Medya deposu açık ölç (varsayılan: kapalı)")
+        parser.add_argument("--executor", default="thread", choices=EXECUTOR_KINDS, help="Görsel encoder havuzu")
+        parser.add_argument("--baseline", default="", help="Karşılaştırılacak önceki JSON raporu")
+        parser.add_argument("--json", dest="json_path", default="media_benchmark.json", help="Rapor dosyası")
+
+    def handle(self, *args, **options):
+        cases = [name.strip() for name in options["cases"].split(",") if name.strip()]
+        if not cases or set(cases) - set(CASES):
+            raise CommandError(f"--cases şunlardan oluşmalı: {', '.join(CASES)}")
+        kinds = [name.strip() for name in options["formats"].split(",") if name.strip()]
+        if set(kinds) - set(media_benchmark.IMAGE_KINDS):
+            raise CommandError(f"--formats şunlardan oluşmalı: {', '.join(media_benchmark.IMAGE_KINDS)}")
+
+        work_dir = tempfile.mkdtemp(prefix="media_benchmark_")
+        rows = []
+        try:
+            with FakeMediaServer() as server:
+                inputs = self._prepare_inputs(server, work_dir, kinds, options)
+                for case in cases:
+                    for item in inputs["video" if case == "video" else "image"]:
+                        self.stdout.write(f"[{case}] {item['input']}...")
+                        rows.append(self._run(case, item, work_dir, options))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        self._print(rows)
+        report = {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "cores": os.cpu_count(),
+            "media_store": options["media_store"],
+            "executor": options["executor"],
+            "ffmpeg": shutil.which("ffmpeg") is not None,
+            "results": rows,
+        }
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as f:
+                report["comparison"] = media_benchmark.compare(rows, json.load(f)["results"])
+            self._print_comparison(report["comparison"])
+
+        with open(options["json_path"], "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Rapor kaydedildi: {options['json_path']}"))
+
+    # -------------------------------------------------------------------------
+    # Girdiler
+    # -------------------------------------------------------------------------
+
+    def _prepare_inputs(self, server, work_dir: str, kinds: list[str], options: dict) -> dict:
+        input_dir = Path(work_dir) / "inputs"
+        input_dir.mkdir()
+        images, videos = [], []
+
+        for seed, (width, height) in enumerate(parse_sizes(options["resolutions"])):
+            for kind in kinds:
+                _, content_type, extension = media_benchmark.IMAGE_KINDS[kind]
+                data = media_benchmark.synthetic_image_bytes(kind, (width, height), seed)
+                name = f"{kind}-{width}x{height}.{extension}"
+                (input_dir / name).write_bytes(data)
+                images.append(
+                    {
+                        "input": f"{kind} {width}x{height}",
+                        "url": server.add(f"/{name}", data, content_type=content_type),
+                        "path": str(input_dir / name),
+                        "input_bytes": len(data),
+                    }
+                )
+
+        for width, height in parse_sizes(options["video_resolutions"]):
+            path = str(input_dir / f"video-{width}x{height}.mp4")
+            if media_benchmark.synthetic_video(path, (width, height), options["video_seconds"]) is None:
+                self.stdout.write(self.style.WARNING(f"ffmpeg yok veya başarısız; video {width}x{height} atlandı"))
+                continue
+            data = Path(path).read_bytes()
+            videos.append(
+                {
+                    "input": f"mp4 {width}x{height}",
+                    "url": server.add(f"/video-{width}x{height}.mp4", data, content_type="video/mp4"),
+                    "path": path,
+                    "input_bytes": len(data),
+                }
+            )
+
+        return {"image": images, "video": videos}
+
+    # -------------------------------------------------------------------------
+    # Ölçüm
+    # -------------------------------------------------------------------------
+
+    def _run(self, case: str, item: dict, work_dir: str, options: dict) -> dict:
+        output_dir = tempfile.mkdtemp(prefix=f"{case}-", dir=work_dir)
+
+        def job(root):
+            with override_settings(MEDIA_ROOT=root), transaction.atomic():
+                Setting.objects.update_or_create(
+                    key="MEDIA_STORE_ENABLED", defaults={"value": "true" if options["media_store"] else "false"}
+                )
+                self._call(case, item, root, ImageEncoder(executor=options["executor"]))
+                transaction.set_rollback(True)
+
+        result = media_benchmark.measure(job, output_dir)
+        if result["error"]:
+            self.stdout.write(self.style.ERROR(f"  hata: {result['error'].splitlines()[0]}"))
+        return {"case": case, "input": item["input"], "input_bytes": item["input_bytes"], **result}
+
+    @staticmethod
+    def _call(case: str, item: dict, root: str, encoder: ImageEncoder):
+        # Medya deposu yalnızca görseli kullanan bir haber varken kullanılır
+        article = Article.objects.create(title="Ölçüm", slug="olcum", content="x")
+        if case == "optimize":
+            ImageProcessor(root, encoder=encoder).download_and_optimize(item["url"], "bench", article=article)
+        elif case == "responsive":
+            ImageProcessor(root, encoder=encoder).create_responsive_images(item["path"], "bench", article=article)
+        elif case == "article_image":
+            download_article_image(article, item["url"])
+        elif case == "video":
+            VideoProcessor(root).download_and_encode(item["url"], "bench")
+
+    # -------------------------------------------------------------------------
+    # Rapor
+    # -------------------------------------------------------------------------
+
+    def _print(self, rows: list[dict]):
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'Ölçüm':<15}{'Girdi':<18}{'Girdi (KB)':>11}{'Süre (s)':>10}{'RSS artışı (MB)':>17}"
+            f"{'ffmpeg (MB)':>13}{'Çıktı (KB)':>12}  Formatlar (KB)"
+        )
+        for row in rows:
+            if row["error"]:
+                self.stdout.write(f"{row['case']:<15}{row['input']:<18}  hata: {row['error'].splitlines()[0]}")
+                continue
+            formats = ", ".join(f"{fmt} {size / 1024:.0f}" for fmt, size in row["output_bytes"].items())
+            self.stdout.write(
+                f"{row['case']:<15}{row['input']:<18}{row['input_bytes'] / 1024:>11.0f}{row['seconds']:>10.2f}"
+                f"{row['rss_growth_mb']:>17.1f}{row['child_peak_rss_mb']:>13.1f}"
+                f"{row['total_output_bytes'] / 1024:>12.0f}  {formats}"
+            )
+
+    def _print_comparison(self, changes: list[dict]):
+        def pct(value):
+            return "-" if value is None else f"{value:+.1%}"
+
+        self.stdout.write("")
+        self.stdout.write(f"{'Ölçüm':<15}{'Girdi':<18}{'Süre':>10}{'RSS':>10}{'Çıktı':>10}")
+        for change in changes:
+            self.stdout.write(
+                f"{change['case']:<15}{change['input']:<18}{pct(change['seconds_change']):>10}"
+                f"{pct(change['rss_change']):>10}{pct(change['bytes_change']):>10}"
+            )
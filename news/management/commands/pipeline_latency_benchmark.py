@@ -0,0 +1,211 @@
+"""
+Gelişmiş pipeline uçtan uca gecikme ölçümü.
+
+process_article_pipeline'ı gerçek bir Celery worker'ı üzerinden (eager mod değil) farklı
+düzenlerle çalıştırır ve karşılaştırır:
+
+- chain: her aşama ayrı görev, sıralı (10 görev)
+- chain-dag: her aşama ayrı görev; medya, görsel ve SEO paralel (group + chord)
+- fused: ucuz aşamalar birleştirilmiş, sıralı (5 görev)
+- fused-dag: ucuz aşamalar birleştirilmiş; medya ve görsel paralel
+
+Worker bu süreç içinde --concurrency thread ile başlatılır; Gen AI çağrıları yerel
+sahte sunucuya gider. Varsayılan broker bellek içidir (memory://); gerçek atlama
+maliyetini görmek için --broker redis://... verilebilir.
+
+Her mod için uçtan uca gecikme yüzdeliklerini, aşama sürelerinden hesaplanan kritik yolu
+(paralel dallarda en yavaş dal) ve aradaki farkı (broker, serileştirme ve kuyruk bekleme
+süresi) raporlar.
+
+Örnek:
+    python manage.py pipeline_latency_benchmark --articles 20 --concurrency 4 --json pipeline_latency.json
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from celery.result import AsyncResult
+
+from authors.models import Author
+from core.models import Setting
+from news.fake_genai import FakeGenAIConfig, FakeGenAIServer
+from news.load_testing import celery_worker
+from news.models import Article
+from news.models_extended import PipelineRun
+from news.stats_utils import percentile
+from news.tasks_advanced import PARALLEL_STAGES, PIPELINE_LAYOUTS, get_pipeline_layout, process_article_pipeline
+
+
+class Command(BaseCommand):
+    help = "Gelişmiş pipeline'ın uçtan uca gecikmesini ayrı görevli ve birleştirilmiş aşamalarla ölçer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=20, help="Mod başına makale sayısı")
+        parser.add_argument("--concurrency", type=int, default=4, help="Worker thread sayısı")
+        parser.add_argument("--modes", default=",".join(PIPELINE_LAYOUTS), help="Virgülle ayrılmış düzenler")
+        parser.add_argument("--broker", default="memory://", help="Ölçümde kullanılacak broker adresi")
+        parser.add_argument("--latency-ms", type=float, default=300.0, help="Metin üretimi medyan gecikmesi")
+        parser.add_argument("--image-latency-ms", type=float, default=600.0, help="Görsel üretimi medyan gecikmesi")
+        parser.add_argument("--rss-latency-ms", type=float, default=400.0, help="RSS kaynağı medyan gecikmesi")
+        parser.add_argument("--seed", type=int, default=None, help="Tekrarlanabilir gecikme dizisi için tohum")
+        parser.add_argument("--timeout", type=float, default=300.0, help="Makale başına en fazla bekleme (sn)")
+        parser.add_argument("--json", dest="json_path", default="", help="Raporun yazılacağı JSON dosyası")
+
+    def handle(self, *args, **options):
+        if options["articles"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--articles ve --concurrency en az 1 olmalı")
+        modes = [mode.strip() for mode in options["modes"].split(",") if mode.strip()]
+        unknown = set(modes) - set(PIPELINE_LAYOUTS)
+        if not modes or unknown:
+            raise CommandError(
+                f"Geçersiz düzen: {', '.join(sorted(unknown)) or '-'} (seçenekler: {', '.join(PIPELINE_LAYOUTS)})"
+            )
+
+        config = FakeGenAIConfig(
+            latency_ms=options["latency_ms"],
+            image_latency_ms=options["image_latency_ms"],
+            rss_latency_ms=options["rss_latency_ms"],
+            seed=options["seed"],
+        )
+        run_id = uuid.uuid4().hex[:8]
+        media_root = tempfile.mkdtemp(prefix="pipeline_latency_")
+        rows = []
+
+        with (
+            FakeGenAIServer(config) as server,
+            override_settings(GENAI_BASE_URL=server.url, MEDIA_ROOT=media_root),
+        ):
+            created = self._ensure_prerequisites()
+            try:
+                with celery_worker(options["broker"], options["concurrency"]):
+                    for mode in modes:
+                        self.stdout.write(f"[{mode}] {options['articles']} makale...")
+                        rows.append(self._run(mode, run_id, server, options))
+            finally:
+                Article.objects.filter(title__startswith=self._prefix(run_id)).delete()
+                PipelineRun.objects.filter(title__startswith=self._prefix(run_id)).delete()
+                for obj in created:
+                    obj.delete()
+                shutil.rmtree(media_root, ignore_errors=True)
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'Mod':<11}{'Görev':>7}{'Yayın':>7}{'Hata':>6}{'p50 (s)':>10}{'p95 (s)':>10}"
+            f"{'Kritik yol (s)':>16}{'Ek yük (s)':>12}{'Makale/dk':>11}"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['mode']:<11}{row['hops']:>7}{row['published']:>7}{row['errors']:>6}"
+                f"{row['p50_s']:>10.3f}{row['p95_s']:>10.3f}{row['critical_path_s']:>16.3f}"
+                f"{row['overhead_s']:>12.3f}{row['throughput_per_min']:>11.1f}"
+            )
+
+        if options["json_path"]:
+            report = {"run_id": run_id, "config": vars(config), "broker": options["broker"], "results": rows}
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Rapor kaydedildi: {options['json_path']}"))
+
+    # -------------------------------------------------------------------------
+    # Hazırlık
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _prefix(run_id):
+        return f"Gecikme ölçümü {run_id}"
+
+    @staticmethod
+    def _ensure_prerequisites():
+        """
+        API anahtarı ve aktif yazar yoksa geçici olarak oluştur.
+        """
+        created = []
+        if not Setting.objects.filter(key="GOOGLE_GEMINI_API_KEY").exclude(value="").exists():
+            setting, _ = Setting.objects.update_or_create(
+                key="GOOGLE_GEMINI_API_KEY", defaults={"value": "benchmark-fake-key"}
+            )
+            created.append(setting)
+        if not Author.objects.filter(is_active=True).exists():
+            created.append(
+                Author.objects.create(name="Ölçüm Yazarı", slug="olcum-yazari", expertise="Teknoloji", is_active=True)
+            )
+        return created
+
+    # -------------------------------------------------------------------------
+    # Ölçüm
+    # -------------------------------------------------------------------------
+
+    def _run(self, mode, run_id, server, options):
+        payloads = [
+            {
+                "title": f"{self._prefix(run_id)} {mode} {i}: Yapay zeka ile yeni dönem başlıyor",
+                "summary": "Teknoloji şirketleri yapay zeka yatırımlarını artırıyor.",
+                "category": "Teknoloji",
+                "link": f"{server.url}/haber/{run_id}/{mode}/{i}",
+                "source_url": f"{server.url}/rss",
+            }
+            for i in range(options["articles"])
+        ]
+
+        fused, parallel = PIPELINE_LAYOUTS[mode]
+        parallel_stages = PARALLEL_STAGES[fused] if parallel else ()
+
+        start = time.perf_counter()
+        orchestrators = []
+        for payload in payloads:
+            # Gönderim anı: orkestrasyon görevinin kuyrukta beklemesi de ölçülür
+            payload["pipeline_started_at"] = time.time()
+            orchestrators.append(process_article_pipeline.delay(payload, fused=fused, parallel=parallel))
+
+        results, errors = [], []
+        for orchestrator in orchestrators:
+            try:
+                task_id = orchestrator.get(timeout=options["timeout"])["task_id"]
+                results.append(AsyncResult(task_id).get(timeout=options["timeout"]))
+            except Exception as e:
+                errors.append(type(e).__name__)
+        wall_time = time.perf_counter() - start
+
+        published = [result for result in results if result.get("published")]
+        latencies = [result["pipeline_seconds"] for result in published]
+        critical_paths = [self._critical_path(result.get("stage_timings", {}), parallel_stages) for result in published]
+
+        stages = {}
+        for result in published:
+            for stage, ms in result.get("stage_timings", {}).items():
+                stages.setdefault(stage, []).append(ms)
+
+        mean_latency = sum(latencies) / len(latencies) if latencies else 0.0
+        mean_critical_path = sum(critical_paths) / len(critical_paths) if critical_paths else 0.0
+        return {
+            "mode": mode,
+            # Orkestrasyon görevi + DAG'daki görevler
+            "hops": 1
+            + sum(len(layer) if isinstance(layer, tuple) else 1 for layer in get_pipeline_layout(fused, parallel)),
+            "articles": len(payloads),
+            "published": len(published),
+            "errors": len(errors),
+            "wall_time_s": round(wall_time, 3),
+            "throughput_per_min": round(len(published) / wall_time * 60, 2) if wall_time else 0.0,
+            "p50_s": round(percentile(latencies, 50), 3),
+            "p95_s": round(percentile(latencies, 95), 3),
+            "mean_s": round(mean_latency, 3),
+            "critical_path_s": round(mean_critical_path, 3),
+            "overhead_s": round(mean_latency - mean_critical_path, 3),
+            "stages_mean_ms": {stage: round(sum(values) / len(values), 2) for stage, values in stages.items()},
+        }
+
+    @staticmethod
+    def _critical_path(timings: dict, parallel_stages) -> float:
+        """
+        Aşama sürelerinden kritik yol (sn): paralel dallar için yalnızca en yavaş dal sayılır.
+        """
+        branches = [timings[stage] for stage in parallel_stages if stage in timings]
+        total = sum(timings.values()) - sum(branches) + max(branches, default=0.0)
+        return total / 1000
@@ -0,0 +1,198 @@
+"""
+Gelişmiş pipeline mesaj boyutu ölçümü.
+
+process_article_pipeline'ı gerçek bir Celery worker'ı üzerinden iki taşıma biçimiyle
+çalıştırır ve broker atlaması başına taşınan veriyi karşılaştırır:
+
+- full: her görev tam article_data'yı alır ve döndürür
+- slim: görevler bağlam referansı taşır, veri pipeline bağlam deposundadır
+  (bkz. news.pipeline_context, PIPELINE_SLIM_PAYLOADS)
+
+Her biçim için makale başına görev mesajı sayısı ve baytı, atlama başına ortalama ve en
+büyük mesaj, result backend'e yazılan sonuç baytı ve mesajların JSON serileştirme süresi
+raporlanır. Gen AI çağrıları yerel sahte sunucuya gider; içerik boyutu --output-tokens ile
+ayarlanır.
+
+Örnek:
+    python manage.py pipeline_payload_benchmark --articles 10 --layout fused-dag --json payloads.json
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from celery.result import AsyncResult
+
+from authors.models import Author
+from core.models import Setting
+from news.fake_genai import FakeGenAIConfig, FakeGenAIServer
+from news.load_testing import MessageMeter, celery_worker
+from news.models import Article
+from news.models_extended import PipelineRun
+from news.tasks_advanced import PIPELINE_LAYOUTS, process_article_pipeline
+
+PAYLOAD_MODES = ("full", "slim")
+
+
+class Command(BaseCommand):
+    help = "Gelişmiş pipeline'da atlama başına taşınan veriyi tam veri ve bağlam referansıyla ölçer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=10, help="Biçim başına makale sayısı")
+        parser.add_argument("--concurrency", type=int, default=4, help="Worker thread sayısı")
+        parser.add_argument("--layout", default="fused-dag", choices=list(PIPELINE_LAYOUTS), help="Pipeline düzeni")
+        parser.add_argument("--broker", default="memory://", help="Ölçümde kullanılacak broker adresi")
+        parser.add_argument("--output-tokens", type=int, default=900, help="Sahte içerik uzunluğu (token)")
+        parser.add_argument("--latency-ms", type=float, default=50.0, help="Sahte Gen AI medyan gecikmesi")
+        parser.add_argument("--timeout", type=float, default=300.0, help="Makale başına en fazla bekleme (sn)")
+        parser.add_argument("--json", dest="json_path", default="", help="Raporun yazılacağı JSON dosyası")
+
+    def handle(self, *args, **options):
+        if options["articles"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--articles ve --concurrency en az 1 olmalı")
+
+        config = FakeGenAIConfig(
+            latency_ms=options["latency_ms"],
+            image_latency_ms=options["latency_ms"],
+            rss_latency_ms=options["latency_ms"],
+            output_tokens=options["output_tokens"],
+        )
+        run_id = uuid.uuid4().hex[:8]
+        media_root = tempfile.mkdtemp(prefix="pipeline_payload_")
+        previous = Setting.objects.filter(key="PIPELINE_SLIM_PAYLOADS").values_list("value", flat=True).first()
+        rows = []
+
+        with (
+            FakeGenAIServer(config) as server,
+            override_settings(GENAI_BASE_URL=server.url, MEDIA_ROOT=media_root),
+        ):
+            created = self._ensure_prerequisites()
+            try:
+                with celery_worker(options["broker"], options["concurrency"]), MessageMeter() as meter:
+                    for mode in PAYLOAD_MODES:
+                        self.stdout.write(f"[{mode}] {options['articles']} makale...")
+                        Setting.objects.update_or_create(
+                            key="PIPELINE_SLIM_PAYLOADS", defaults={"value": str(mode == "slim").lower()}
+                        )
+                        meter.reset()
+                        rows.append(self._run(mode, run_id, server, meter, options))
+            finally:
+                if previous is None:
+                    Setting.objects.filter(key="PIPELINE_SLIM_PAYLOADS").delete()
+                else:
+                    Setting.objects.filter(key="PIPELINE_SLIM_PAYLOADS").update(value=previous)
+                Article.objects.filter(title__startswith=self._prefix(run_id)).delete()
+                PipelineRun.objects.filter(title__startswith=self._prefix(run_id)).delete()
+                for obj in created:
+                    obj.delete()
+                shutil.rmtree(media_root, ignore_errors=True)
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'Biçim':<7}{'Yayın':>7}{'Mesaj/makale':>14}{'Bayt/atlama':>13}{'En büyük':>10}"
+            f"{'Mesaj KB/makale':>17}{'Sonuç KB/makale':>17}{'Serileştirme ms/makale':>24}"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['mode']:<7}{row['published']:>7}{row['messages_per_article']:>14.1f}"
+                f"{row['bytes_per_hop']:>13.0f}{row['max_message_bytes']:>10}"
+                f"{row['message_bytes_per_article'] / 1024:>17.1f}{row['result_bytes_per_article'] / 1024:>17.1f}"
+                f"{row['serialize_ms_per_article']:>24.2f}"
+            )
+
+        if len(rows) == 2 and rows[0]["message_bytes_per_article"]:
+            full, slim = rows
+            reduction = 1 - slim["message_bytes_per_article"] / full["message_bytes_per_article"]
+            self.stdout.write(self.style.SUCCESS(f"Broker trafiği azalması: %{reduction * 100:.1f}"))
+
+        if options["json_path"]:
+            report = {
+                "run_id": run_id,
+                "layout": options["layout"],
+                "config": vars(config),
+                "broker": options["broker"],
+                "results": rows,
+            }
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Rapor kaydedildi: {options['json_path']}"))
+
+    # -------------------------------------------------------------------------
+    # Hazırlık
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _prefix(run_id):
+        return f"Mesaj ölçümü {run_id}"
+
+    @staticmethod
+    def _ensure_prerequisites():
+        """
+        API anahtarı ve aktif yazar yoksa geçici olarak oluştur.
+        """
+        created = []
+        if not Setting.objects.filter(key="GOOGLE_GEMINI_API_KEY").exclude(value="").exists():
+            setting, _ = Setting.objects.update_or_create(
+                key="GOOGLE_GEMINI_API_KEY", defaults={"value": "benchmark-fake-key"}
+            )
+            created.append(setting)
+        if not Author.objects.filter(is_active=True).exists():
+            created.append(
+                Author.objects.create(name="Ölçüm Yazarı", slug="olcum-yazari", expertise="Teknoloji", is_active=True)
+            )
+        return created
+
+    # -------------------------------------------------------------------------
+    # Ölçüm
+    # -------------------------------------------------------------------------
+
+    def _run(self, mode, run_id, server, meter, options):
+        fused, parallel = PIPELINE_LAYOUTS[options["layout"]]
+        orchestrators = []
+        for i in range(options["articles"]):
+            payload = {
+                "title": f"{self._prefix(run_id)} {mode} {i}: Yapay zeka ile yeni dönem başlıyor",
+                "summary": "Teknoloji şirketleri yapay zeka yatırımlarını artırıyor.",
+                "category": "Teknoloji",
+                "link": f"{server.url}/haber/{run_id}/{mode}/{i}",
+                "source_url": f"{server.url}/rss",
+                "pipeline_started_at": time.time(),
+            }
+            orchestrators.append(process_article_pipeline.delay(payload, fused=fused, parallel=parallel))
+
+        published, errors = 0, 0
+        for orchestrator in orchestrators:
+            try:
+                task_id = orchestrator.get(timeout=options["timeout"])["task_id"]
+                published += bool(AsyncResult(task_id).get(timeout=options["timeout"]).get("published"))
+            except Exception:
+                errors += 1
+
+        totals = meter.totals()
+        articles = options["articles"]
+        per_task = {
+            name: {
+                "count": entry["count"],
+                "mean_bytes": round(entry["bytes"] / entry["count"]),
+                "max_bytes": entry["max_bytes"],
+            }
+            for name, entry in sorted(meter.messages.items())
+        }
+        return {
+            "mode": mode,
+            "articles": articles,
+            "published": published,
+            "errors": errors,
+            "messages_per_article": round(totals["messages"] / articles, 2),
+            "bytes_per_hop": round(totals["message_bytes"] / totals["messages"]) if totals["messages"] else 0,
+            "max_message_bytes": max((entry["max_bytes"] for entry in meter.messages.values()), default=0),
+            "message_bytes_per_article": round(totals["message_bytes"] / articles),
+            "result_bytes_per_article": round(totals["result_bytes"] / articles),
+            "serialize_ms_per_article": round(totals["serialize_seconds"] * 1000 / articles, 3),
+            "messages_by_task": per_task,
+        }
@@ -0,0 +1,300 @@
+"""
+Üretim pipeline'ları için uçtan uca verim (throughput) ölçümü.
+
+Üç akışı gerçek bir Celery worker'ı üzerinden (eager mod değil) baştan sona çalıştırır:
+
+- advanced: process_article_pipeline (gelişmiş DAG, varsayılan ayarlarla)
+- v2: fetch_rss_feeds_v2 -> score_headlines -> classify_headlines -> generate_ai_content_v2
+- v1: fetch_rss_feeds -> dispatch_generation_queue -> generate_ai_content
+
+Gen AI çağrıları ve RSS kaynakları yerel sahte sunucuya gider (bkz. news.fake_genai).
+v1 ve v2 için ölçüm süresince yalnızca ölçüm kaynakları aktif tutulur; zamanlanmış görevlerin
+(beat) yerini --beat-seconds aralıkla yeniden tetiklenen tarama / puanlama görevleri alır.
+Varsayılan broker bellek içidir; yerel Redis ile ölçmek için --broker redis://localhost:6379/0.
+
+Her akış için raporlanır:
+- throughput (yayınlanan makale / dk) ve gönderimden yayına süre yüzdelikleri
+- görev (aşama) bazında süre yüzdelikleri
+- makale başına veritabanı sorgusu, broker mesajı ve mesaj baytı
+
+Sonuçlar regresyon karşılaştırması için --json ile kaydedilir.
+
+Örnek:
+    python manage.py pipeline_throughput_benchmark --articles 20 --concurrency 4 --json throughput.json
+"""
+
+import json
+import math
+import shutil
+import tempfile
+import time
+import uuid
+from urllib.parse import quote
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from authors.models import Author
+from core.models import Setting
+from news.fake_genai import FakeGenAIConfig, FakeGenAIServer
+from news.load_testing import MessageMeter, QueryCounter, StageTimer, celery_worker
+from news.models import Article, RssSource
+from news.models_extended import PipelineRun
+from news.stats_utils import percentile
+from news.tasks import fetch_rss_feeds
+from news.tasks_advanced import process_article_pipeline
+from news.tasks_v2 import fetch_rss_feeds_v2, score_headlines
+
+PIPELINES = ("advanced", "v2", "v1")
+
+# fetch_single_rss her taramada son 10 girdiye baktığı için kaynak başına en fazla bu kadar haber
+ITEMS_PER_SOURCE = 10
+
+
+class Command(BaseCommand):
+    help = "advanced, v2 ve v1 üretim akışlarının uçtan uca verimini sahte dış servislerle ölçer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pipelines", default=",".join(PIPELINES), help="Virgülle ayrılmış akışlar")
+        parser.add_argument("--articles", type=int, default=20, help="Akış başına makale sayısı")
+        parser.add_argument("--concurrency", type=int, default=4, help="Worker thread sayısı")
+        parser.add_argument("--broker", default="memory://", help="Ölçümde kullanılacak broker adresi")
+        parser.add_argument("--latency-ms", type=float, default=300.0, help="Metin üretimi medyan gecikmesi")
+        parser.add_argument("--image-latency-ms", type=float, default=600.0, help="Görsel üretimi medyan gecikmesi")
+        parser.add_argument("--rss-latency-ms", type=float, default=50.0, help="RSS kaynağı medyan gecikmesi")
+        parser.add_argument("--seed", type=int, default=None, help="Tekrarlanabilir gecikme dizisi için tohum")
+        parser.add_argument("--beat-seconds", type=float, default=2.0, help="Tarama / puanlama tetikleme aralığı")
+        parser.add_argument("--timeout", type=float, default=600.0, help="Akış başına en fazla bekleme (sn)")
+        parser.add_argument("--json", dest="json_path", default="", help="Raporun yazılacağı JSON dosyası")
+
+    def handle(self, *args, **options):
+        if options["articles"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--articles ve --concurrency en az 1 olmalı")
+        pipelines = [name.strip() for name in options["pipelines"].split(",") if name.strip()]
+        unknown = set(pipelines) - set(PIPELINES)
+        if not pipelines or unknown:
+            raise CommandError(
+                f"Geçersiz akış: {', '.join(sorted(unknown)) or '-'} (seçenekler: {', '.join(PIPELINES)})"
+            )
+
+        config = FakeGenAIConfig(
+            latency_ms=options["latency_ms"],
+            image_latency_ms=options["image_latency_ms"],
+            rss_latency_ms=options["rss_latency_ms"],
+            seed=options["seed"],
+        )
+        run_id = uuid.uuid4().hex[:8]
+        media_root = tempfile.mkdtemp(prefix="pipeline_throughput_")
+        report = {
+            "run_id": run_id,
+            "config": vars(config),
+            "broker": options["broker"],
+            "concurrency": options["concurrency"],
+            "pipelines": {},
+        }
+
+        with (
+            FakeGenAIServer(config) as server,
+            override_settings(GENAI_BASE_URL=server.url, MEDIA_ROOT=media_root),
+        ):
+            created = self._ensure_prerequisites()
+            # Ölçüm kaynakları dışındaki aktif kaynaklar taranmasın
+            paused_sources = list(RssSource.objects.filter(is_active=True).values_list("id", flat=True))
+            RssSource.objects.filter(id__in=paused_sources).update(is_active=False)
+            try:
+                with (
+                    celery_worker(options["broker"], options["concurrency"]),
+                    StageTimer() as timer,
+                    MessageMeter() as meter,
+                    QueryCounter(other_threads_only=True) as queries,
+                ):
+                    for pipeline in pipelines:
+                        self.stdout.write(f"[{pipeline}] {options['articles']} makale...")
+                        timer.records, timer.busy_by_thread = [], {}
+                        meter.reset()
+                        queries.reset()
+                        self.meters = (timer, meter, queries)
+                        report["pipelines"][pipeline] = self._run(pipeline, run_id, server, options)
+            finally:
+                RssSource.objects.filter(id__in=paused_sources).update(is_active=True)
+                self._cleanup(run_id, created)
+                shutil.rmtree(media_root, ignore_errors=True)
+
+            report["fake_server"] = server.stats.as_dict()
+
+        self._print_report(report)
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Rapor kaydedildi: {options['json_path']}"))
+
+    # -------------------------------------------------------------------------
+    # Hazırlık ve temizlik
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _prefix(run_id, pipeline=""):
+        return f"Verim ölçümü {run_id} {pipeline}".strip()
+
+    @staticmethod
+    def _ensure_prerequisites():
+        """
+        API anahtarı ve aktif yazar yoksa geçici olarak oluştur.
+        """
+        created = []
+        if not Setting.objects.filter(key="GOOGLE_GEMINI_API_KEY").exclude(value="").exists():
+            setting, _ = Setting.objects.update_or_create(
+                key="GOOGLE_GEMINI_API_KEY", defaults={"value": "benchmark-fake-key"}
+            )
+            created.append(setting)
+        if not Author.objects.filter(is_active=True).exists():
+            created.append(
+                Author.objects.create(name="Ölçüm Yazarı", slug="olcum-yazari", expertise="Teknoloji", is_active=True)
+            )
+        return created
+
+    def _cleanup(self, run_id, created):
+        prefix = self._prefix(run_id)
+        Article.objects.filter(title__startswith=prefix).delete()
+        PipelineRun.objects.filter(title__startswith=prefix).delete()
+        # Başlık puanları kaynaklarla birlikte silinir
+        RssSource.objects.filter(name__startswith=prefix).delete()
+        for obj in created:
+            obj.delete()
+
+    def _create_sources(self, prefix, server, count):
+        """
+        Makaleleri sahte RSS beslemelerine dağıt (kaynak başına en fazla ITEMS_PER_SOURCE).
+        """
+        sources = []
+        for index in range(math.ceil(count / ITEMS_PER_SOURCE)):
+            name = f"{prefix} {index}"
+            items = min(ITEMS_PER_SOURCE, count - index * ITEMS_PER_SOURCE)
+            sources.append(
+                RssSource.objects.create(
+                    name=name,
+                    url=f"{server.url}/rss?feed={quote(name)}&items={items}",
+                    category="Teknoloji",
+                    is_active=True,
+                )
+            )
+        return sources
+
+    # -------------------------------------------------------------------------
+    # Ölçüm
+    # -------------------------------------------------------------------------
+
+    def _start(self, pipeline, prefix, server, count):
+        """
+        Akışı başlat ve zamanlanmış görevlerin yerine periyodik tetiklenecek fonksiyonu döndür.
+        """
+        if pipeline == "advanced":
+            for i in range(count):
+                process_article_pipeline.delay(
+                    {
+                        "title": f"{prefix} {i}: Yapay zeka ile yeni dönem başlıyor",
+                        "summary": "Teknoloji şirketleri yapay zeka yatırımlarını artırıyor.",
+                        "category": "Teknoloji",
+                        "link": f"{server.url}/haber/{quote(prefix)}/{i}",
+                        "source_url": f"{server.url}/rss",
+                    }
+                )
+            return None
+
+        self._create_sources(prefix, server, count)
+        if pipeline == "v2":
+            fetch_rss_feeds_v2.delay()
+            # Puanlama her çalıştırmada en iyi 10 başlığı seçer; kalanlar sonraki çalıştırmayı bekler
+            return score_headlines.delay
+
+        fetch_rss_feeds.delay()
+        # Kabul kontrolünün ertelediği girdiler bir sonraki taramada eklenir
+        return fetch_rss_feeds.delay
+
+    def _run(self, pipeline, run_id, server, options):
+        timer, meter, queries = self.meters
+        prefix = self._prefix(run_id, pipeline)
+        count = options["articles"]
+        published = Article.objects.filter(title__startswith=prefix, status="published")
+
+        start_wall = time.time()
+        start = time.perf_counter()
+        tick = self._start(pipeline, prefix, server, count)
+
+        deadline = start + options["timeout"]
+        next_tick = start + options["beat_seconds"]
+        done = 0
+        while time.perf_counter() < deadline:
+            done = published.count()
+            if done >= count:
+                break
+            if tick and time.perf_counter() >= next_tick:
+                tick()
+                next_tick = time.perf_counter() + options["beat_seconds"]
+            time.sleep(0.1)
+        wall_time = time.perf_counter() - start
+
+        # Yayından sonra çalışan görevler (görsel üretimi vb.) bir sonraki akışa karışmasın
+        self._wait_idle(timer, meter, deadline=time.perf_counter() + 60)
+
+        latencies = [
+            (published_at or created_at).timestamp() - start_wall
+            for published_at, created_at in published.values_list("published_at", "created_at")
+        ]
+        totals = meter.totals()
+        per_article = max(done, 1)
+        return {
+            "articles": count,
+            "published": done,
+            "timed_out": done < count,
+            "wall_time_s": round(wall_time, 3),
+            "throughput_per_min": round(done / wall_time * 60, 2) if wall_time else 0.0,
+            "publish_p50_s": round(percentile(latencies, 50), 3),
+            "publish_p95_s": round(percentile(latencies, 95), 3),
+            "publish_p99_s": round(percentile(latencies, 99), 3),
+            "db_queries_per_article": round(queries.count / per_article, 1),
+            "broker_messages_per_article": round(totals["messages"] / per_article, 2),
+            "message_bytes_per_article": round(totals["message_bytes"] / per_article),
+            "result_bytes_per_article": round(totals["result_bytes"] / per_article),
+            "worker_utilization": timer.worker_utilization(options["concurrency"], wall_time),
+            "stages": timer.stage_summary(),
+            "messages_by_task": {name: entry["count"] for name, entry in sorted(meter.messages.items())},
+        }
+
+    @staticmethod
+    def _wait_idle(timer, meter, deadline):
+        """
+        Yayınlanan her mesajın görevi bitene kadar bekle.
+        """
+        while time.perf_counter() < deadline:
+            if len(timer.records) >= meter.totals()["messages"]:
+                return
+            time.sleep(0.1)
+
+    # -------------------------------------------------------------------------
+    # Raporlama
+    # -------------------------------------------------------------------------
+
+    def _print_report(self, report):
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'Akış':<10}{'Yayın':>8}{'Makale/dk':>11}{'p50 (s)':>10}{'p95 (s)':>10}"
+            f"{'Sorgu/makale':>14}{'Mesaj/makale':>14}{'KB/makale':>11}"
+        )
+        for pipeline, data in report["pipelines"].items():
+            self.stdout.write(
+                f"{pipeline:<10}{data['published']:>4}/{data['articles']:<3}{data['throughput_per_min']:>11.1f}"
+                f"{data['publish_p50_s']:>10.2f}{data['publish_p95_s']:>10.2f}"
+                f"{data['db_queries_per_article']:>14.1f}{data['broker_messages_per_article']:>14.2f}"
+                f"{data['message_bytes_per_article'] / 1024:>11.1f}"
+            )
+
+        for pipeline, data in report["pipelines"].items():
+            self.stdout.write("")
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Görevler: {pipeline}"))
+            self.stdout.write(f"  {'Görev':<50}{'adet':>6}{'hata':>6}{'retry':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+            for stage, stats in data["stages"].items():
+                self.stdout.write(
+                    f"  {stage:<50}{stats['count']:>6}{stats['failures']:>6}{stats['retries']:>7}"
+                    f"{stats['p50_ms']:>9.0f}{stats['p95_ms']:>9.0f}{stats['p99_ms']:>9.0f}"
+                )
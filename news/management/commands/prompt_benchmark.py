@@ -0,0 +1,134 @@
+"""
+Prompt oluşturma maliyeti ölçümü.
+
+Geçici bir PromptTemplate kaydıyla aynı makale kümesi için promptu iki yolla oluşturur:
+
+- legacy: her makalede PromptTemplate sorgusu + str.format (kayıt defteri öncesi davranış)
+- registry: süreç içi derlenmiş şablon (news.prompt_registry)
+
+Her yol için makale başına süre (µs) ve veritabanı sorgu sayısını raporlar.
+
+Örnek:
+    python manage.py prompt_benchmark --articles 1000 --json prompt_benchmark.json
+"""
+
+import json
+import time
+import uuid
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from news.content_utils import PromptGenerator
+from news.models_advanced import PromptTemplate
+from news.prompt_registry import prompt_registry
+
+BENCHMARK_TEMPLATE = """
+Sen {author_name} isimli bir {author_expertise} yazarısın.
+Başlık: {title}
+Özet: {summary}
+Kategori: {category}
+Ton: {tone}, en az {word_count} kelime, önem seviyesi {importance_level}.
+Sadece HTML formatında haber yazısını yaz.
+"""
+
+
+class Command(BaseCommand):
+    help = "Makale başına prompt oluşturma süresini ve sorgu sayısını ölçer (sorgu + format / derlenmiş şablon)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=1000, help="Prompt oluşturulacak makale sayısı")
+        parser.add_argument("--json", dest="json_path", default="", help="Raporun yazılacağı JSON dosyası")
+
+    def handle(self, *args, **options):
+        count = options["articles"]
+        if count < 1:
+            raise CommandError("--articles en az 1 olmalı")
+
+        category = f"Ölçüm {uuid.uuid4().hex[:8]}"
+        author = SimpleNamespace(name="Ölçüm Yazarı", expertise=category)
+        style = {"tone": "formal", "word_count": (600, 800), "complexity": "medium", "voice": "professional"}
+        articles = [
+            {
+                "title": f"Ölçüm başlığı {i}",
+                "summary": "Kısa özet " * 20,
+                "category": category,
+                "link": f"https://example.com/{i}",
+                "importance_level": i % 5 + 1,
+            }
+            for i in range(count)
+        ]
+
+        template = PromptTemplate.objects.create(
+            name=f"Prompt ölçümü {category}",
+            category=category,
+            template_type="article",
+            template_content=BENCHMARK_TEMPLATE,
+        )
+        try:
+            # İlk yükleme (derleme) ölçümün dışında tutulur ve ayrıca raporlanır
+            start = time.perf_counter()
+            compiled = prompt_registry.get("article", category)
+            load_ms = (time.perf_counter() - start) * 1000
+            if compiled.source == "builtin":
+                raise CommandError("Ölçüm şablonu kayıt defterine yüklenemedi")
+
+            rows = [
+                self._measure("legacy", articles, lambda data: self._legacy_prompt(data, author, style)),
+                self._measure(
+                    "registry", articles, lambda data: PromptGenerator.generate_content_prompt(data, author, style)
+                ),
+            ]
+        finally:
+            template.delete()
+
+        baseline = rows[0]["us_per_article"]
+        for row in rows:
+            row["speedup"] = round(baseline / row["us_per_article"], 1) if row["us_per_article"] else 0.0
+
+        self.stdout.write(f"Kayıt defteri ilk yükleme: {load_ms:.2f} ms ({compiled.tag})")
+        self.stdout.write(f"{'Yol':<10}{'µs/makale':>12}{'Sorgu/makale':>14}{'Hızlanma':>10}")
+        for row in rows:
+            self.stdout.write(
+                f"{row['path']:<10}{row['us_per_article']:>12.1f}{row['queries_per_article']:>14.2f}{row['speedup']:>10}"
+            )
+
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump({"articles": count, "registry_load_ms": round(load_ms, 3), "results": rows}, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Rapor kaydedildi: {options['json_path']}"))
+
+    @staticmethod
+    def _legacy_prompt(article_data, author, style):
+        """
+        Kayıt defteri öncesi yol: makale başına şablon sorgusu ve format.
+        """
+        template = PromptTemplate.objects.get(
+            category=article_data["category"], template_type="article", is_active=True
+        )
+        return template.template_content.format(
+            title=article_data["title"],
+            summary=article_data["summary"],
+            author_name=author.name,
+            author_expertise=author.expertise,
+            category=article_data["category"],
+            tone=style["tone"],
+            word_count=style["word_count"][0],
+            importance_level=article_data["importance_level"],
+        )
+
+    @staticmethod
+    def _measure(path, articles, build):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for data in articles:
+                build(data)
+            seconds = time.perf_counter() - start
+
+        return {
+            "path": path,
+            "us_per_article": round(seconds / len(articles) * 1_000_000, 2),
+            "queries_per_article": round(len(queries) / len(articles), 3),
+        }
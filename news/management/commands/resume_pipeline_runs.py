@@ -0,0 +1,67 @@
+"""
+Başarısız ya da yarım kalan gelişmiş pipeline çalıştırmalarını devam ettirir.
+
+Çalıştırmalar kontrol noktalarından kurulur ve ilk tamamlanmamış aşamadan yeni zincir
+başlatılır; tamamlanmış aşamalar (içerik üretimi dahil) tekrarlanmaz.
+
+Örnek:
+    python manage.py resume_pipeline_runs --dry-run
+    python manage.py resume_pipeline_runs --limit 200 --stale-minutes 15
+    python manage.py resume_pipeline_runs --run-id 3f2a... --run-id 9bc1...
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from news import pipeline_runs
+from news.models_extended import PipelineRun
+from news.tasks_advanced import STAGE_FUNCTIONS, load_run_state, resume_run
+
+
+class Command(BaseCommand):
+    help = "Başarısız / takılmış pipeline çalıştırmalarını ilk tamamlanmamış aşamadan devam ettirir"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--run-id", action="append", default=[], help="Devam ettirilecek çalıştırma (tekrarlanabilir)"
+        )
+        parser.add_argument("--limit", type=int, default=50, help="En fazla kaç çalıştırma devam ettirilsin")
+        parser.add_argument(
+            "--stale-minutes",
+            type=int,
+            default=int(pipeline_runs.STALE_RUN_TIMEOUT.total_seconds() // 60),
+            help="Kirası bu süredir dolmuş 'running' çalıştırmalar da devam ettirilir",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Sadece listele, devam ettirme")
+
+    def handle(self, *args, **options):
+        if options["run_id"]:
+            runs = list(PipelineRun.objects.filter(run_id__in=options["run_id"]))
+            missing = set(options["run_id"]) - {run.run_id for run in runs}
+            if missing:
+                raise CommandError(f"Çalıştırma bulunamadı: {', '.join(sorted(missing))}")
+        else:
+            runs = list(
+                pipeline_runs.get_resumable_runs(
+                    limit=options["limit"], stale_after=timedelta(minutes=options["stale_minutes"])
+                )
+            )
+
+        if not runs:
+            self.stdout.write("Devam ettirilecek çalıştırma yok.")
+            return
+
+        self.stdout.write(f"{'Çalıştırma':<34}{'Durum':<11}{'Hata aşaması':<20}{'Devam':>6}  Sonraki aşama")
+        resumed = 0
+        for run in runs:
+            completed = load_run_state(run).get("stage_timings", {})
+            next_stage = next((stage for stage in STAGE_FUNCTIONS if stage not in completed), "-")
+            self.stdout.write(
+                f"{run.run_id:<34}{run.status:<11}{run.failed_stage or '-':<20}{run.resume_count:>6}  {next_stage}"
+            )
+            if not options["dry_run"] and resume_run(run)["status"] == "resumed":
+                resumed += 1
+
+        if not options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"{resumed}/{len(runs)} çalıştırma devam ettirildi"))
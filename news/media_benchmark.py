@@ -0,0 +1,230 @@
+"""
+HaberNexus - Medya Ölçüm Yardımcıları
+media_benchmark komutunun sentetik girdileri ve ölçüm altyapısı.
+
+- Sentetik görseller: istenen çözünürlükte fotoğrafa benzer sıkıştırılabilirlikte
+  JPEG, PNG, saydam PNG (RGBA) ve animasyonlu GIF.
+- Sentetik videolar: ffmpeg lavfi (testsrc2 + sine) ile kısa H.264 / AAC MP4; ffmpeg
+  yoksa None döner (video ölçümleri atlanır).
+- measure(): işi fork edilmiş ayrı bir süreçte çalıştırır; süre, tepe RSS (süreç ve
+  ffmpeg gibi alt süreçler ayrı) ve çıktı dizinindeki dosyaların formata göre boyutu
+  ölçülür. Her iş kendi sürecinde çalıştığından bir işin tepe belleği sonrakine taşınmaz.
+- compare(): iki raporun aynı ölçümleri için değişim oranları (regresyon takibi).
+"""
+
+import multiprocessing
+import os
+import resource
+import shutil
+import subprocess
+import time
+import traceback
+from io import BytesIO
+from pathlib import Path
+
+from django.db import connections
+
+from PIL import Image
+
+# Girdi türü -> (Pillow formatı, Content-Type, dosya uzantısı)
+IMAGE_KINDS = {
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+    "png": ("PNG", "image/png", "png"),
+    "rgba": ("PNG", "image/png", "png"),
+    "gif": ("GIF", "image/gif", "gif"),
+}
+
+# Animasyonlu GIF kare sayısı
+GIF_FRAMES = 8
+
+# Kaynak kopyaları (indirilen orijinaller) çıktı boyutuna sayılmaz
+SOURCE_PREFIX = "original"
+
+
+def synthetic_image(size: tuple[int, int], seed: int = 0) -> Image.Image:
+    """
+    Fotoğrafa benzer sıkıştırılabilirlikte sentetik RGB görsel (gürültü + gradyanlar).
+    """
+    noise = Image.effect_noise(size, 30 + seed % 20)
+    linear = Image.linear_gradient("L").resize(size).rotate(seed * 37 % 360)
+    radial = Image.radial_gradient("L").resize(size)
+    return Image.merge("RGB", [noise, linear, radial])
+
+
+def synthetic_image_bytes(kind: str, size: tuple[int, int], seed: int = 0) -> bytes:
+    """
+    Sentetik görseli istenen türde encode et.
+
+    Args:
+        kind: IMAGE_KINDS anahtarı (jpeg, png, rgba, gif)
+        size: (genişlik, yükseklik)
+        seed: Görsel çeşitliliği için tohum
+    """
+    image = synthetic_image(size, seed)
+    buffer = BytesIO()
+    if kind == "jpeg":
+        image.save(buffer, "JPEG", quality=90)
+    elif kind == "png":
+        image.save(buffer, "PNG")
+    elif kind == "rgba":
+        image.putalpha(Image.linear_gradient("L").resize(size))
+        image.save(buffer, "PNG")
+    elif kind == "gif":
+        frames = [image.rotate(index * 360 / GIF_FRAMES).quantize(64) for index in range(GIF_FRAMES)]
+        frames[0].save(buffer, "GIF", save_all=True, append_images=frames[1:], duration=100, loop=0)
+    else:
+        raise ValueError(f"Bilinmeyen görsel türü: {kind}")
+    return buffer.getvalue()
+
+
+def synthetic_video(path: str, size: tuple[int, int], seconds: float = 5, fps: int = 30) -> str | None:
+    """
+    ffmpeg lavfi ile sentetik test videosu üret (testsrc2 görüntü + sine ses).
+
+    Returns:
+        str | None: Video yolu; ffmpeg yoksa veya başarısızsa None
+    """
+    if shutil.which("ffmpeg") is None:
+        return None
+
+    width, height = size
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-y",
+        "-f",
+        "lavfi",
+        "-i",
+        f"testsrc2=size={width}x{height}:rate={fps}:duration={seconds}",
+        "-f",
+        "lavfi",
+        "-i",
+        f"sine=frequency=440:duration={seconds}",
+        "-c:v",
+        "libx264",
+        "-preset",
+        "veryfast",
+        "-pix_fmt",
+        "yuv420p",
+        "-c:a",
+        "aac",
+        "-shortest",
+        path,
+    ]
+    result = subprocess.run(cmd, check=False, capture_output=True, text=True, timeout=600)
+    return path if result.returncode == 0 else None
+
+
+# =============================================================================
+# Ölçüm
+# =============================================================================
+
+
+def _current_rss_kb() -> int:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def output_bytes(root: str) -> dict:
+    """
+    Dizindeki dosyaların uzantıya göre toplam boyutu (kaynak kopyaları hariç).
+
+    Returns:
+        dict: {uzantı: bayt}, örn. {"avif": 120000, "webp": 90000, "m4s": 2000000}
+    """
+    totals = {}
+    for path in Path(root).rglob("*"):
+        if not path.is_file() or path.name.startswith(SOURCE_PREFIX):
+            continue
+        suffix = path.suffix.lstrip(".").lower() or "other"
+        totals[suffix] = totals.get(suffix, 0) + path.stat().st_size
+    return dict(sorted(totals.items()))
+
+
+def _child(func, output_dir: str, conn):
+    try:
+        start_rss = _current_rss_kb()
+        started = time.perf_counter()
+        func(output_dir)
+        seconds = time.perf_counter() - started
+        self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        children_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        conn.send(
+            {
+                "seconds": round(seconds, 3),
+                "peak_rss_mb": round(self_peak / 1024, 1),
+                "rss_growth_mb": round(max(0, self_peak - start_rss) / 1024, 1),
+                "child_peak_rss_mb": round(children_peak / 1024, 1),
+                "output_bytes": output_bytes(output_dir),
+                "error": "",
+            }
+        )
+    except Exception as e:
+        conn.send({"error": f"{e!s}\n{traceback.format_exc(limit=3)}"})
+    finally:
+        conn.close()
+        # Django / atexit temizliği üst süreçte yapılır
+        os._exit(0)
+
+
+def measure(func, output_dir: str) -> dict:
+    """
+    func(output_dir) çağrısını fork edilmiş süreçte çalıştır ve ölç.
+
+    Alt süreç veritabanına kendi bağlantısını açar (bağlantılar fork öncesi kapatılır).
+
+    Returns:
+        dict: {"seconds", "peak_rss_mb" (süreç tepe RSS), "rss_growth_mb" (iş başındaki
+            RSS'e göre artış), "child_peak_rss_mb" (ffmpeg gibi alt süreçlerin tepe RSS'i),
+            "output_bytes" ({uzantı: bayt}), "total_output_bytes", "error"}
+    """
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    connections.close_all()
+
+    process = context.Process(target=_child, args=(func, output_dir, sender), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = {"error": "Ölçüm süreci sonuç göndermeden çıktı"}
+    process.join()
+
+    result.setdefault("output_bytes", {})
+    result["total_output_bytes"] = sum(result["output_bytes"].values())
+    return result
+
+
+def compare(current: list[dict], baseline: list[dict], key_fields: tuple[str, ...] = ("case", "input")) -> list[dict]:
+    """
+    Aynı (case, input) ölçümleri için süre, tepe RSS ve çıktı boyutu değişimleri.
+
+    Returns:
+        list: [{"case", "input", "seconds_change", "rss_change", "bytes_change"}]; değişim
+            oranı (0.10 = %10 artış), temel değeri 0 olan ölçüt için None
+    """
+
+    def change(new, old):
+        return round(new / old - 1, 3) if old else None
+
+    previous = {tuple(row[field] for field in key_fields): row for row in baseline if not row.get("error")}
+    changes = []
+    for row in current:
+        old = previous.get(tuple(row[field] for field in key_fields))
+        if old is None or row.get("error"):
+            continue
+        changes.append(
+            {
+                **{field: row[field] for field in key_fields},
+                "seconds_change": change(row["seconds"], old["seconds"]),
+                "rss_change": change(row["rss_growth_mb"], old["rss_growth_mb"]),
+                "bytes_change": change(row["total_output_bytes"], old["total_output_bytes"]),
+            }
+        )
+    return changes
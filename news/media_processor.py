@@ -6,13 +6,23 @@ Medya indirme, optimizasyon, multi-format encoding
 import logging
 import os
 import subprocess
+import time
 from datetime import datetime
-from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
 
 import cv2
 import requests
 from PIL import Image
 
+from core.models import Setting
+
+from . import image_ingest, media_store, media_variants
+from .image_encoding import ImageEncoder
+from .media_scheduler import VIDEO_ENCODE_TIMEOUT
+from .range_download import RangeDownloader
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,9 +31,50 @@ logger = logging.getLogger(__name__)
 # ============================================================================
 
 
+def get_image_encoding_workers() -> int | None:
+    """
+    Görsel encoding havuzunun boyutunu ayarlardan al.
+
+    Returns:
+        int | None: IMAGE_ENCODING_WORKERS ayarı; ayar yoksa veya 0 ise None
+            (kullanılabilir çekirdek sayısı)
+    """
+    try:
+        return int(Setting.objects.get(key="IMAGE_ENCODING_WORKERS").value) or None
+    except (Setting.DoesNotExist, ValueError):
+        return None
+
+
+def get_image_encoding_deadline() -> float:
+    """
+    Tek bir encoding işi için en fazla bekleme süresini ayarlardan al.
+
+    Returns:
+        float: IMAGE_ENCODING_DEADLINE ayarı, saniye (varsayılan: 60)
+    """
+    try:
+        return float(Setting.objects.get(key="IMAGE_ENCODING_DEADLINE").value)
+    except (Setting.DoesNotExist, ValueError):
+        return 60.0
+
+
+def get_video_download_parts() -> int:
+    """
+    Kaynak videonun paralel indirileceği aralık sayısını ayarlardan al.
+
+    Returns:
+        int: VIDEO_DOWNLOAD_PARTS ayarı (varsayılan: 4; sunucu Range desteklemiyorsa 1)
+    """
+    try:
+        return max(1, int(Setting.objects.get(key="VIDEO_DOWNLOAD_PARTS").value))
+    except (Setting.DoesNotExist, ValueError):
+        return 4
+
+
 class ImageProcessor:
     """
-    Görselleri indir, optimize et ve çoklu formatlara dönüştür
+    Görselleri indir, optimize et ve çoklu formatlara dönüştür.
+    Format × boyut matrisi ImageEncoder havuzunda paralel encode edilir.
     """
 
     SUPPORTED_FORMATS = ["AVIF", "WebP", "JPEG"]
@@ -34,29 +85,84 @@ class ImageProcessor:
         "low": {"avif": {"quality": 70, "crf": 35}, "webp": {"quality": 65}, "jpeg": {"quality": 70}},
     }
 
-    def __init__(self, output_dir: str = "/media"):
+    # Ana görsel boyutu; kaynak görseller en fazla bu kutuya sığacak şekilde çözülür
+    MAX_IMAGE_SIZE = (1920, 1080)
+
+    # Responsive görsel boyutları ve formatları
+    RESPONSIVE_SIZES = [(600, 400), (1024, 683), (1920, 1080)]  # Mobil, Tablet, Desktop
+    RESPONSIVE_FORMATS = {"avif": ("AVIF", {"quality": 85}), "webp": ("WEBP", {"quality": 80})}
+
+    # Boyutlar büyükten küçüğe, her biri bir öncekinden küçültülür (False: her boyut kaynaktan)
+    RESIZE_PYRAMID = True
+
+    def __init__(self, output_dir: str = "/media", encoder: ImageEncoder | None = None):
         self.output_dir = output_dir
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "HaberNexus/2.0 (+http://habernexus.com)"})
+        self._encoder = encoder
+
+    @property
+    def encoder(self) -> ImageEncoder:
+        """
+        Encoding havuzu (ilk kullanımda ayarlardan oluşturulur).
+        """
+        if self._encoder is None:
+            self._encoder = ImageEncoder(workers=get_image_encoding_workers(), deadline=get_image_encoding_deadline())
+        return self._encoder
+
+    def _uses_media_store(self, article) -> bool:
+        """
+        Medya deposu yalnızca görseli kullanan haber belli olduğunda (referans sayılır, bkz.
+        media_store.attach) ve çıktılar MEDIA_ROOT'a yazıldığında kullanılır; depo varyantları
+        default_storage üzerinden okunur ve silinir.
+        """
+        if article is None or not media_store.is_media_store_enabled():
+            return False
+        if os.path.realpath(self.output_dir) != os.path.realpath(settings.MEDIA_ROOT):
+            logger.warning(f"Media store skipped: output dir {self.output_dir} is not MEDIA_ROOT")
+            return False
+        return True
 
     def download_and_optimize(
-        self, image_url: str, article_id: str, quality: str = "high", max_retries: int = 3
+        self,
+        image_url: str,
+        article_id: str,
+        quality: str = "high",
+        max_retries: int = 3,
+        responsive_sizes: list[tuple[int, int]] | None = None,
+        *,
+        article=None,
     ) -> dict:
         """
-        Görseli indir ve optimize et
+        Görseli indir ve optimize et.
+        responsive_sizes verilirse responsive boyutlar da aynı havuz çalıştırmasında üretilir.
+        Medya deposu açıksa ve article verildiyse çıktılar görselin depo dizinine yazılır ve
+        haber görsele bağlanır; aynı / neredeyse aynı görselin daha önce üretilmiş varyantları
+        yeniden encode edilmez.
         """
         try:
             # Görseli indir
-            image = self._download_image(image_url, max_retries)
+            data = self._download_bytes(image_url, max_retries)
+            image, ingest_stats = self._open_image(data)
 
-            # Boyutlandır
-            image = self._resize_image(image, (1920, 1080))
+            asset = None
+            if self._uses_media_store(article):
+                asset, _ = media_store.register(data, image=image, source_url=image_url)
+                media_store.attach(asset, article)
 
-            # Optimize et
-            optimized_paths = self._optimize_image(image, article_id, quality)
+            # Boyutlandır ve optimize et (ana görsel piramidin ilk seviyesi, format × boyut matrisi)
+            encoded = self.encode_article_images(
+                image, article_id, quality, responsive_sizes or [], asset=asset, featured_size=self.MAX_IMAGE_SIZE
+            )
 
             # Metadata oluştur
-            metadata = self._create_metadata(image, image_url, optimized_paths, quality)
+            metadata = self._create_metadata(encoded["featured_image"], image_url, encoded["formats"], quality)
+            metadata["encoding"] = encoded["encoding"]
+            metadata["ingest"] = ingest_stats
+            if asset is not None:
+                metadata["asset"] = asset.sha256
+            if responsive_sizes:
+                metadata["responsive"] = encoded["responsive"]
 
             return metadata
 
@@ -64,89 +170,245 @@ class ImageProcessor:
             logger.error(f"Image processing failed: {e!s}")
             raise
 
-    def _download_image(self, url: str, max_retries: int = 3) -> Image.Image:
+    def _download_bytes(self, url: str, max_retries: int = 3) -> bytearray:
         """
-        Görseli indir
+        Görseli bayt sınırıyla parça parça indir (sınırı aşan görsel tekrar denenmez)
         """
         for attempt in range(max_retries):
             try:
-                response = self.session.get(url, timeout=10)
-                response.raise_for_status()
+                response = self.session.get(url, stream=True, timeout=10)
+                data = image_ingest.read_response(response)
 
-                image = Image.open(BytesIO(response.content))
-
-                # RGB'ye dönüştür (RGBA varsa)
-                if image.mode in ("RGBA", "LA", "P"):
-                    rgb_image = Image.new("RGB", image.size, (255, 255, 255))
-                    rgb_image.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
-                    image = rgb_image
-
-                logger.info(f"Image downloaded: {url}")
-                return image
+                logger.info(f"Image downloaded: {url} ({len(data)} bytes)")
+                return data
 
+            except image_ingest.ImageTooLargeError:
+                raise
             except Exception as e:
                 if attempt == max_retries - 1:
                     raise
                 logger.warning(f"Retry {attempt + 1}/{max_retries}: {e!s}")
                 continue
 
+    def _open_image(self, data: bytes, max_size: tuple[int, int] = MAX_IMAGE_SIZE) -> tuple[Image.Image, dict]:
+        """
+        Görseli sınırlı bellekle max_size kutusuna küçülterek çöz ve RGB'ye dönüştür
+        (RGBA varsa beyaz zemine yerleştir)
+
+        Returns:
+            tuple: (görsel, alım istatistikleri; bkz. image_ingest.open_image)
+        """
+        image, stats = image_ingest.open_image(data, max_size=max_size)
+
+        if image.mode in ("RGBA", "LA", "P"):
+            rgb_image = Image.new("RGB", image.size, (255, 255, 255))
+            rgb_image.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
+            image = rgb_image
+
+        return image, stats
+
+    def _download_image(self, url: str, max_retries: int = 3) -> Image.Image:
+        """
+        Görseli indir ve çöz
+        """
+        return self._open_image(self._download_bytes(url, max_retries))[0]
+
     def _resize_image(self, image: Image.Image, size: tuple[int, int]) -> Image.Image:
         """
-        Görseli belirtilen boyuta yeniden boyutlandır
+        Görseli belirtilen boyuta yeniden boyutlandır (girdi görseli değiştirilmez)
         """
+        image = image.copy()
         image.thumbnail(size, Image.Resampling.LANCZOS)
+        return self._pad_image(image, size)
 
-        # Padding ekle (aspect ratio'yu koru)
+    def _pad_image(self, image: Image.Image, size: tuple[int, int]) -> Image.Image:
+        """
+        Padding ekle (aspect ratio'yu koru)
+        """
+        if image.size == size and image.mode == "RGB":
+            return image
         new_image = Image.new("RGB", size, (255, 255, 255))
         offset = ((size[0] - image.width) // 2, (size[1] - image.height) // 2)
         new_image.paste(image, offset)
-
         return new_image
 
+    def _resize_pyramid(self, image: Image.Image, sizes: list[tuple[int, int]]) -> dict[tuple[int, int], Image.Image]:
+        """
+        Tüm boyutları tek kaynaktan piramit olarak üret: boyutlar büyükten küçüğe sıralanır,
+        her seviye bir önceki (padding'siz) seviyeden küçültülür; böylece her küçültme tam
+        çözünürlüklü kaynak yerine bir önceki seviyenin piksellerini okur.
+
+        Returns:
+            dict: {(genişlik, yükseklik): tam boyuta padding'lenmiş görsel}
+        """
+        levels = {}
+        source = image
+        for size in sorted(set(sizes), key=lambda size: size[0] * size[1], reverse=True):
+            fitted = (source if self.RESIZE_PYRAMID else image).copy()
+            fitted.thumbnail(size, Image.Resampling.LANCZOS)
+            levels[size] = self._pad_image(fitted, size)
+            source = fitted
+        return levels
+
     def _optimize_image(self, image: Image.Image, article_id: str, quality: str = "high") -> dict[str, str]:
         """
         Görseli AVIF, WebP ve JPEG formatlarında kaydet
         """
-        article_dir = os.path.join(self.output_dir, f"articles/{article_id}/featured")
-        os.makedirs(article_dir, exist_ok=True)
+        return self.encode_article_images(image, article_id, quality, sizes=[])["formats"]
 
-        paths = {}
+    def _featured_jobs(self, image: Image.Image, article_dir: str, quality: str, stem: str = "featured") -> list[dict]:
+        """
+        Ana görselin AVIF (en iyi sıkıştırma), WebP (fallback) ve JPEG (legacy) işleri.
+        """
         quality_settings = self.QUALITY_LEVELS.get(quality, self.QUALITY_LEVELS["medium"])
+        formats = {
+            "avif": ("AVIF", f"{stem}.avif"),
+            "webp": ("WEBP", f"{stem}.webp"),
+            "jpeg": ("JPEG", f"{stem}.jpg"),
+        }
+        return [
+            {
+                "key": f"featured:{name}",
+                "image": image,
+                "format": pillow_format,
+                "path": os.path.join(article_dir, filename),
+                "options": {"quality": quality_settings[name]["quality"]},
+            }
+            for name, (pillow_format, filename) in formats.items()
+        ]
 
-        # AVIF formatı (en iyi sıkıştırma)
-        try:
-            avif_path = os.path.join(article_dir, "featured.avif")
-            image.save(avif_path, "AVIF", quality=quality_settings["avif"]["quality"])
-            paths["avif"] = avif_path
-            logger.info(f"AVIF saved: {avif_path}")
-        except Exception as e:
-            logger.warning(f"AVIF encoding failed: {e!s}")
+    def _responsive_jobs(self, levels: dict, article_dir: str, sizes: list[tuple[int, int]]) -> list[dict]:
+        """
+        Piramit seviyelerinden (bkz. _resize_pyramid) RESPONSIVE_FORMATS işlerini oluştur.
+        """
+        jobs = []
+        for width, height in sizes:
+            size_name = f"{width}x{height}"
+            resized = levels[(width, height)]
+            for name, (pillow_format, options) in self.RESPONSIVE_FORMATS.items():
+                jobs.append(
+                    {
+                        "key": f"{size_name}:{name}",
+                        "image": resized,
+                        "format": pillow_format,
+                        "path": os.path.join(article_dir, f"featured-{size_name}.{name}"),
+                        "options": options,
+                    }
+                )
+        return jobs
+
+    def encode_article_images(
+        self,
+        image: Image.Image,
+        article_id: str,
+        quality: str = "high",
+        sizes: list[tuple[int, int]] | None = None,
+        *,
+        asset=None,
+        featured_size: tuple[int, int] | None = None,
+    ) -> dict:
+        """
+        Ana görsel formatlarını ve responsive boyutları tek havuz çalıştırmasında encode et.
+
+        Görsel bir kez çözülmüş olarak gelir; ana görsel (featured_size verilirse bu boyuta
+        padding'lenir) ve responsive boyutlar aynı küçültme piramidinden üretilir ve encoder'a
+        bellekten verilir (ara dosya yazılmaz).
+
+        asset (MediaAsset) verilirse çıktılar haber dizini yerine görselin depo dizinine
+        (output_dir/v/<sha256>/) yazılır, zaten var olan varyantlar encode edilmez ve yazılanlar
+        görselin varyant kaydına eklenir; istek üzerine varyantlar için padding'siz ana kopya
+        (featured.webp) da yazılır. MEDIA_VARIANT_SIZES'taki responsive boyutlar encode
+        edilmez; bunlar için ilk istekte üretilecek varyant URL'leri döner (bkz. news.media_variants).
+
+        Returns:
+            dict: {"formats": {format: yol}, "responsive": {boyut: {format: yol veya URL, "dimensions"}},
+                "featured_image": encode edilen ana görsel,
+                "encoding": {"wall_seconds", "encoder_seconds", "resize_seconds", "executor", "errors", "reused"}}
+        """
+        if sizes is None:
+            sizes = self.RESPONSIVE_SIZES
 
-        # WebP formatı (fallback)
-        try:
-            webp_path = os.path.join(article_dir, "featured.webp")
-            image.save(webp_path, "WEBP", quality=quality_settings["webp"]["quality"])
-            paths["webp"] = webp_path
-            logger.info(f"WebP saved: {webp_path}")
-        except Exception as e:
-            logger.warning(f"WebP encoding failed: {e!s}")
+        lazy_sizes = []
+        if asset is not None:
+            allowed = media_variants.get_variant_sizes()
+            lazy_sizes = [size for size in sizes if size in allowed]
+            sizes = [size for size in sizes if size not in allowed]
 
-        # JPEG formatı (legacy)
-        try:
-            jpeg_path = os.path.join(article_dir, "featured.jpg")
-            image.save(jpeg_path, "JPEG", quality=quality_settings["jpeg"]["quality"])
-            paths["jpeg"] = jpeg_path
-            logger.info(f"JPEG saved: {jpeg_path}")
-        except Exception as e:
-            logger.warning(f"JPEG encoding failed: {e!s}")
+        resize_started = time.perf_counter()
+        levels = self._resize_pyramid(image, [featured_size, *sizes] if featured_size else sizes)
+        featured = levels[featured_size] if featured_size else image
+        resize_seconds = time.perf_counter() - resize_started
 
-        return paths
+        if asset is None:
+            article_dir = os.path.join(self.output_dir, f"articles/{article_id}/featured")
+            jobs = self._featured_jobs(featured, article_dir, quality)
+        else:
+            article_dir = os.path.join(self.output_dir, media_store.asset_dir(asset))
+            jobs = self._featured_jobs(featured, article_dir, quality, stem=f"featured-{quality}")
+            # İstek üzerine varyantlar padding'siz ana kopyadan üretilir (ana görsel padding'lidir)
+            jobs.append(
+                {
+                    "key": "master:webp",
+                    "image": media_variants.master_image(image),
+                    "format": "WEBP",
+                    "path": os.path.join(article_dir, media_store.FEATURED_VARIANT),
+                    "options": media_variants.MASTER_OPTIONS,
+                }
+            )
+        jobs += self._responsive_jobs(levels, article_dir, sizes)
+
+        reused = {}
+        if asset is not None:
+            reused = {job["key"]: job["path"] for job in jobs if os.path.exists(job["path"])}
+            jobs = [job for job in jobs if job["key"] not in reused]
+
+        report = self.encoder.encode(jobs)
+        if asset is not None and report["results"]:
+            media_store.record_variants(
+                asset,
+                {
+                    Path(result["path"]).name: os.path.relpath(result["path"], self.output_dir)
+                    for result in report["results"].values()
+                },
+            )
+
+        report["results"].update(
+            {key: {"path": path, "bytes": os.path.getsize(path), "seconds": 0.0} for key, path in reused.items()}
+        )
+
+        formats = {}
+        responsive = {f"{width}x{height}": {"dimensions": (width, height)} for width, height in sizes}
+        if lazy_sizes:
+            responsive.update(media_variants.responsive_urls(asset, lazy_sizes, tuple(self.RESPONSIVE_FORMATS)))
+        for key, result in report["results"].items():
+            group, name = key.split(":")
+            if group == "featured":
+                formats[name] = result["path"]
+            elif group != "master":
+                responsive[group][name] = result["path"]
+            if key not in reused:
+                logger.info(f"{name.upper()} saved: {result['path']} ({result['seconds']:.2f}s)")
+
+        return {
+            "formats": formats,
+            "responsive": responsive,
+            "featured_image": featured,
+            "encoding": {
+                "wall_seconds": round(report["wall_seconds"], 3),
+                "encoder_seconds": round(sum(result["seconds"] for result in report["results"].values()), 3),
+                "resize_seconds": round(resize_seconds, 3),
+                "executor": report["executor"],
+                "errors": report["errors"],
+                "reused": len(reused),
+            },
+        }
 
     def _create_metadata(self, image: Image.Image, source_url: str, optimized_paths: dict, quality: str) -> dict:
         """
         Görsel metadata'sı oluştur
         """
-        original_size = len(image.tobytes())
+        # Ham RGB boyutu (tobytes() kopyası oluşturmadan)
+        original_size = image.width * image.height * len(image.getbands())
         optimized_size = sum(os.path.getsize(path) for path in optimized_paths.values() if os.path.exists(path))
 
         compression_ratio = (original_size - optimized_size) / original_size * 100 if original_size > 0 else 0
@@ -162,31 +424,38 @@ class ImageProcessor:
             "created_at": datetime.now().isoformat(),
         }
 
-    def create_responsive_images(self, image_path: str, article_id: str, sizes: list[tuple[int, int]] = None) -> dict:
+    def create_responsive_images(
+        self, image_path: str, article_id: str, sizes: list[tuple[int, int]] = None, *, article=None
+    ) -> dict:
         """
         Responsive görseller oluştur (mobil, tablet, desktop)
+
+        Medya deposu açıksa ve article verildiyse görsel depoya kaydedilip habere bağlanır ve
+        encode edilmez; boyutlar için ilk istekte üretilecek varyant URL'leri döner (bkz.
+        news.media_variants).
         """
         if sizes is None:
-            sizes = [(600, 400), (1024, 683), (1920, 1080)]  # Mobil  # Tablet  # Desktop
-
-        image = Image.open(image_path)
-        responsive_images = {}
-
-        for width, height in sizes:
-            size_name = f"{width}x{height}"
-            resized = self._resize_image(image, (width, height))
-
-            article_dir = os.path.join(self.output_dir, f"articles/{article_id}/featured")
+            sizes = self.RESPONSIVE_SIZES
 
-            # AVIF
-            avif_path = os.path.join(article_dir, f"featured-{size_name}.avif")
-            resized.save(avif_path, "AVIF", quality=85)
+        if self._uses_media_store(article) and set(sizes) <= media_variants.get_variant_sizes():
+            data = Path(image_path).read_bytes()
+            asset, _ = media_store.register(data)
+            media_store.attach(asset, article)
+            if media_variants.find_master(asset) is None:
+                image, _ = image_ingest.open_image(data, max_size=media_variants.MASTER_MAX_SIZE)
+                media_variants.ensure_master(asset, image)
+            return media_variants.responsive_urls(asset, sizes, tuple(self.RESPONSIVE_FORMATS))
 
-            # WebP
-            webp_path = os.path.join(article_dir, f"featured-{size_name}.webp")
-            resized.save(webp_path, "WEBP", quality=80)
+        article_dir = os.path.join(self.output_dir, f"articles/{article_id}/featured")
+        largest = (max(width for width, _ in sizes), max(height for _, height in sizes))
+        image, _ = image_ingest.open_image(Path(image_path).read_bytes(), max_size=largest)
+        jobs = self._responsive_jobs(self._resize_pyramid(image, sizes), article_dir, sizes)
+        report = self.encoder.encode(jobs)
 
-            responsive_images[size_name] = {"avif": avif_path, "webp": webp_path, "dimensions": (width, height)}
+        responsive_images = {f"{width}x{height}": {"dimensions": (width, height)} for width, height in sizes}
+        for key, result in report["results"].items():
+            size_name, name = key.split(":")
+            responsive_images[size_name][name] = result["path"]
 
         return responsive_images
 
@@ -199,15 +468,33 @@ class ImageProcessor:
 class VideoProcessor:
     """
     Videoları indir, encode et ve HLS streaming için hazırla
+
+    Tüm profiller tek ffmpeg çalıştırmasında encode edilir: kaynak bir kez çözülür, görüntü
+    akışı split filtresiyle profil sayısı kadar kopyalanır ve her kopya kendi ölçek / fps
+    filtresiyle ayrı bir x264 çıktısına verilir (çıktılar aynı süreçte paralel encode edilir).
+    Preset'ler kuyruk verimi için seçilmiştir; kalite CRF ile korunur.
+
+    Her profil aynı encode'dan tee muxer ile iki kez paketlenir: HLS (fMP4/CMAF segmentleri
+    ve medya playlist'i, <profil>/playlist.m3u8) ve progresif indirme için faststart MP4.
+    Anahtar kareler her HLS_SEGMENT_SECONDS saniyede bir sabitlenir (sahne değişimi anahtar
+    karesi yok); böylece segment sınırları profiller arasında hizalıdır ve oynatıcı segment
+    sınırında profil değiştirebilir. Tepe bitrate profilin bitrate değeriyle sınırlanır
+    (master playlist'teki BANDWIDTH gerçeği yansıtsın).
     """
 
+    # HLS segment süresi (sn)
+    HLS_SEGMENT_SECONDS = 4
+
+    # Master playlist'te profile eklenen ses bitrate'i (bps)
+    AUDIO_BITRATE = 128000
+
     ENCODING_PROFILES = {
         "1080p": {
             "resolution": "1920x1080",
             "bitrate": "5128k",
             "fps": 30,
             "codec": "libx264",
-            "preset": "slow",
+            "preset": "faster",
             "crf": 23,
         },
         "720p": {
@@ -215,7 +502,7 @@ class VideoProcessor:
             "bitrate": "2596k",
             "fps": 30,
             "codec": "libx264",
-            "preset": "medium",
+            "preset": "faster",
             "crf": 28,
         },
         "480p": {
@@ -223,7 +510,7 @@ class VideoProcessor:
             "bitrate": "1064k",
             "fps": 24,
             "codec": "libx264",
-            "preset": "fast",
+            "preset": "veryfast",
             "crf": 32,
         },
         "360p": {
@@ -231,14 +518,26 @@ class VideoProcessor:
             "bitrate": "548k",
             "fps": 24,
             "codec": "libx264",
-            "preset": "fast",
+            "preset": "veryfast",
             "crf": 35,
         },
     }
 
-    def __init__(self, output_dir: str = "/media"):
+    # Ses tüm profillerde aynı
+    AUDIO_OPTIONS = ["-c:a", "aac", "-b:a", "128k"]
+
+    def __init__(self, output_dir: str = "/media", progress=None, threads: int = 0):
+        """
+        Args:
+            output_dir: Çıktı dizini
+            progress: İndirme ilerlemesi için progress(inen_bayt, toplam_bayt | None) geri çağrısı
+            threads: ffmpeg thread sayısı (0 = ffmpeg'in varsayılanı, tüm çekirdekler);
+                medya zamanlayıcısının verdiği CPU yuvası kadar
+        """
         self.output_dir = output_dir
         self.session = requests.Session()
+        self.progress = progress
+        self.threads = threads
 
     def download_and_encode(
         self, video_url: str, article_id: str, profiles: list[str] = None, max_retries: int = 3
@@ -251,7 +550,7 @@ class VideoProcessor:
 
         try:
             # Videoyu indir
-            video_path = self._download_video(video_url, article_id, max_retries)
+            video_path, download_stats = self._download_video(video_url, article_id, max_retries)
 
             # Encode et
             encoded_videos = self._encode_video(video_path, article_id, profiles)
@@ -261,6 +560,12 @@ class VideoProcessor:
 
             # Metadata oluştur
             metadata = self._create_video_metadata(video_path, encoded_videos, hls_manifest)
+            metadata["download"] = download_stats
+            metadata["hls_playlists"] = {
+                profile: self._hls_playlist_path(path, profile)
+                for profile, path in encoded_videos.items()
+                if os.path.exists(self._hls_playlist_path(path, profile))
+            }
 
             return metadata
 
@@ -268,51 +573,68 @@ class VideoProcessor:
             logger.error(f"Video processing failed: {e!s}")
             raise
 
-    def _download_video(self, url: str, article_id: str, max_retries: int = 3) -> str:
+    def _download_video(self, url: str, article_id: str, max_retries: int = 3) -> tuple[str, dict]:
         """
-        Videoyu indir
+        Videoyu indir: Range ile kaldığı yerden devam eder, sunucu destekliyorsa aralıkları
+        paralel indirir (bkz. news.range_download)
+
+        Returns:
+            tuple: (video yolu, indirme istatistikleri)
         """
         article_dir = os.path.join(self.output_dir, f"articles/{article_id}/video")
         os.makedirs(article_dir, exist_ok=True)
 
         video_path = os.path.join(article_dir, "original.mp4")
 
-        for attempt in range(max_retries):
-            try:
-                response = self.session.get(url, stream=True, timeout=30)
-                response.raise_for_status()
-
-                with open(video_path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+        downloader = RangeDownloader(
+            self.session, parts=get_video_download_parts(), max_retries=max_retries, progress=self.progress
+        )
+        stats = downloader.download(url, video_path)
 
-                logger.info(f"Video downloaded: {video_path}")
-                return video_path
-
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise
-                logger.warning(f"Retry {attempt + 1}/{max_retries}: {e!s}")
-                continue
+        logger.info(
+            f"Video downloaded: {video_path} ({stats['bytes']} bytes, {stats['seconds']:.1f}s, "
+            f"{stats['parts']} parts, {stats['retries']} retries)"
+        )
+        return video_path, stats
 
     def _encode_video(self, video_path: str, article_id: str, profiles: list[str]) -> dict[str, str]:
         """
-        Videoyu farklı çözünürlüklerde encode et
+        Videoyu farklı çözünürlüklerde tek ffmpeg çalıştırmasında encode et.
+        Tek geçiş başarısız olursa profiller ayrı ayrı denenir (bozuk bir profil diğerlerini
+        düşürmesin). Tüm denemeler VIDEO_ENCODE_TIMEOUT bütçesini paylaşır; yedek denemeler
+        görevin süre limitini ve medya kirasını aşmaz.
         """
+        deadline = time.monotonic() + VIDEO_ENCODE_TIMEOUT
         article_dir = os.path.join(self.output_dir, f"articles/{article_id}/video")
-        encoded_videos = {}
+        renditions = {}
 
         for profile in profiles:
             if profile not in self.ENCODING_PROFILES:
                 logger.warning(f"Unknown profile: {profile}")
                 continue
+            renditions[profile] = os.path.join(article_dir, f"summary-{profile}.mp4")
+
+        if not renditions:
+            return {}
 
-            settings = self.ENCODING_PROFILES[profile]
-            output_path = os.path.join(article_dir, f"summary-{profile}.mp4")
+        try:
+            self._run_ffmpeg(self._multi_rendition_command(video_path, renditions), article_dir, deadline=deadline)
+            for profile, output_path in renditions.items():
+                logger.info(f"Video encoded: {profile} -> {output_path}")
+            return renditions
+        except Exception as e:
+            if len(renditions) == 1:
+                logger.error(f"Encoding failed for {next(iter(renditions))}: {e!s}")
+                return {}
+            logger.error(f"Single-pass encoding failed, retrying per profile: {e!s}")
 
+        encoded_videos = {}
+        for profile, output_path in renditions.items():
+            if time.monotonic() >= deadline:
+                logger.error(f"Encoding budget exhausted, skipping {profile}")
+                continue
             try:
-                self._run_ffmpeg_encoding(video_path, output_path, settings)
+                self._run_ffmpeg_encoding(video_path, output_path, profile, deadline=deadline)
 
                 encoded_videos[profile] = output_path
                 logger.info(f"Video encoded: {profile} -> {output_path}")
@@ -323,61 +645,150 @@ class VideoProcessor:
 
         return encoded_videos
 
-    def _run_ffmpeg_encoding(self, input_path: str, output_path: str, settings: dict):
+    def _multi_rendition_command(self, input_path: str, renditions: dict[str, str]) -> list[str]:
         """
-        FFmpeg ile video encode et
+        Tek çözme + split filtresiyle tüm profilleri üreten ffmpeg komutu.
+
+        Args:
+            input_path: Kaynak video
+            renditions: {profil: çıktı yolu}
         """
-        cmd = [
-            "ffmpeg",
-            "-i",
-            input_path,
+        labels = [f"v{index}" for index in range(len(renditions))]
+        filters = [f"[0:v]split={len(labels)}" + "".join(f"[{label}in]" for label in labels)]
+        for label, profile in zip(labels, renditions, strict=True):
+            filters.append(f"[{label}in]{self._video_filter(self.ENCODING_PROFILES[profile])}[{label}]")
+
+        cmd = ["ffmpeg", "-hide_banner", "-y", *self._thread_options("-filter_complex_threads")]
+        cmd += ["-i", input_path, "-filter_complex", ";".join(filters)]
+        for label, (profile, output_path) in zip(labels, renditions.items(), strict=True):
+            cmd += ["-map", f"[{label}]", "-map", "0:a?"]
+            cmd += self._video_options(self.ENCODING_PROFILES[profile])
+            cmd += [*self.AUDIO_OPTIONS, *self._output_options(output_path, profile)]
+        return cmd
+
+    @staticmethod
+    def _video_filter(settings: dict) -> str:
+        width, height = settings["resolution"].split("x")
+        return f"scale={width}:{height},fps={settings['fps']}"
+
+    def _video_options(self, settings: dict) -> list[str]:
+        """
+        x264 seçenekleri: CRF + tepe bitrate sınırı, segment süresine sabitlenmiş GOP.
+        """
+        gop = str(settings["fps"] * self.HLS_SEGMENT_SECONDS)
+        bitrate_kbps = int(settings["bitrate"].rstrip("k"))
+        return [
             "-c:v",
             settings["codec"],
             "-preset",
             settings["preset"],
             "-crf",
             str(settings["crf"]),
-            "-s",
-            settings["resolution"],
-            "-r",
-            str(settings["fps"]),
-            "-c:a",
-            "aac",
-            "-b:a",
-            "128k",
+            "-maxrate",
+            settings["bitrate"],
+            "-bufsize",
+            f"{bitrate_kbps * 2}k",
+            "-g",
+            gop,
+            "-keyint_min",
+            gop,
+            "-sc_threshold",
+            "0",
+            *self._thread_options(),
+        ]
+
+    def _thread_options(self, option: str = "-threads") -> list[str]:
+        return [option, str(self.threads)] if self.threads else []
+
+    @staticmethod
+    def _hls_playlist_path(output_path: str, profile: str) -> str:
+        return str(Path(output_path).parent / profile / "playlist.m3u8")
+
+    def _output_options(self, output_path: str, profile: str) -> list[str]:
+        """
+        Tek encode'u HLS (fMP4 segmentler + medya playlist'i) ve faststart MP4 olarak yazan
+        tee muxer çıktısı. HLS dizini yoksa oluşturulur (hls muxer dizin oluşturmaz).
+        tee, kodlayıcı başlığını (avcC/esds) kendisi çıkaramaz; MP4/fMP4 çıktıları için
+        global_header bayrağı her çıktıda ayrıca verilir.
+        """
+        playlist_path = self._hls_playlist_path(output_path, profile)
+        hls_dir = str(Path(playlist_path).parent)
+        os.makedirs(hls_dir, exist_ok=True)
+
+        hls = ":".join(
+            [
+                "f=hls",
+                f"hls_time={self.HLS_SEGMENT_SECONDS}",
+                "hls_playlist_type=vod",
+                "hls_segment_type=fmp4",
+                "hls_flags=independent_segments",
+                "hls_fmp4_init_filename=init.mp4",
+                f"hls_segment_filename={os.path.join(hls_dir, 'segment_%05d.m4s')}",
+            ]
+        )
+        return ["-flags", "+global_header", "-f", "tee", f"[{hls}]{playlist_path}|[f=mp4:movflags=+faststart]{output_path}"]
+
+    def _run_ffmpeg_encoding(self, input_path: str, output_path: str, profile: str, deadline: float | None = None):
+        """
+        FFmpeg ile video tek profilde encode et (HLS + MP4)
+        """
+        settings = self.ENCODING_PROFILES[profile]
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
             "-y",  # Overwrite
-            output_path,
+            *self._thread_options("-filter_threads"),
+            "-i",
+            input_path,
+            "-map",
+            "0:v:0",
+            "-map",
+            "0:a?",
+            "-vf",
+            self._video_filter(settings),
+            *self._video_options(settings),
+            *self.AUDIO_OPTIONS,
+            *self._output_options(output_path, profile),
         ]
+        self._run_ffmpeg(cmd, output_path, deadline=deadline)
 
+    def _run_ffmpeg(self, cmd: list[str], target: str, deadline: float | None = None):
+        """
+        FFmpeg komutunu çalıştır (deadline'a, verilmezse VIDEO_ENCODE_TIMEOUT'a kadar)
+        """
+        timeout = VIDEO_ENCODE_TIMEOUT if deadline is None else max(1, deadline - time.monotonic())
         try:
-            result = subprocess.run(cmd, check=False, capture_output=True, text=True, timeout=3600)  # 1 saat timeout
+            result = subprocess.run(cmd, check=False, capture_output=True, text=True, timeout=timeout)
 
             if result.returncode != 0:
                 raise Exception(f"FFmpeg error: {result.stderr}")
 
         except subprocess.TimeoutExpired as timeout_err:
-            raise Exception(f"FFmpeg timeout for {output_path}") from timeout_err
+            raise Exception(f"FFmpeg timeout for {target}") from timeout_err
 
     def _create_hls_manifest(self, encoded_videos: dict, article_id: str) -> str:
         """
-        HLS master manifest oluştur
+        HLS master manifest oluştur (yalnızca medya playlist'i yazılmış profiller, yüksekten
+        düşüğe). BANDWIDTH: profilin tepe video bitrate'i + ses.
         """
         article_dir = os.path.join(self.output_dir, f"articles/{article_id}/video")
         manifest_path = os.path.join(article_dir, "master.m3u8")
 
-        # Bitrate'leri belirle
-        bitrates = {"1080p": 5128000, "720p": 2596000, "480p": 1064000, "360p": 548000}
-
-        manifest_content = "#EXTM3U\n#EXT-X-VERSION:3\n"
+        # fMP4 segmentler sürüm 7 gerektirir
+        manifest_content = "#EXTM3U\n#EXT-X-VERSION:7\n#EXT-X-INDEPENDENT-SEGMENTS\n"
 
+        variants = []
         for profile, video_path in encoded_videos.items():
-            if profile in bitrates:
-                bitrate = bitrates[profile]
-                resolution = self.ENCODING_PROFILES[profile]["resolution"]
+            if profile in self.ENCODING_PROFILES and os.path.exists(self._hls_playlist_path(video_path, profile)):
+                settings = self.ENCODING_PROFILES[profile]
+                bandwidth = int(settings["bitrate"].rstrip("k")) * 1000 + self.AUDIO_BITRATE
+                variants.append((bandwidth, profile, settings))
 
-                manifest_content += (
-                    f"#EXT-X-STREAM-INF:BANDWIDTH={bitrate},RESOLUTION={resolution}\n{profile}/playlist.m3u8\n"
-                )
+        for bandwidth, profile, settings in sorted(variants, key=lambda variant: variant[0], reverse=True):
+            manifest_content += (
+                f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION={settings['resolution']},"
+                f"FRAME-RATE={settings['fps']:.3f}\n{profile}/playlist.m3u8\n"
+            )
 
         with open(manifest_path, "w") as f:
             f.write(manifest_content)
@@ -430,10 +841,10 @@ class MediaManager:
         self.video_processor = VideoProcessor(output_dir)
 
     def process_article_media(
-        self, article_id: str, image_urls: list[str] = None, video_urls: list[str] = None
+        self, article_id: str, image_urls: list[str] = None, video_urls: list[str] = None, *, article=None
     ) -> dict:
         """
-        Makale için tüm medyayı işle
+        Makale için tüm medyayı işle (article verilirse görseller medya deposunda paylaşılır)
         """
         result = {"article_id": article_id, "images": [], "videos": [], "errors": []}
 
@@ -442,7 +853,7 @@ class MediaManager:
             for idx, image_url in enumerate(image_urls[:3]):  # İlk 3 görseli al
                 try:
                     image_metadata = self.image_processor.download_and_optimize(
-                        image_url, article_id, quality="high" if idx == 0 else "medium"
+                        image_url, article_id, quality="high" if idx == 0 else "medium", article=article
                     )
                     result["images"].append(image_metadata)
                 except Exception as e:
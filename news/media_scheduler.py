@@ -0,0 +1,345 @@
+"""
+HaberNexus - Medya İşi Zamanlayıcısı (CPU / Bellek Kabulü)
+
+video_processing kuyruğundaki görevler worker eşzamanlılığı kadar ffmpeg başlatıyordu. Her
+ffmpeg zaten çok thread'lidir; birkaç encode aynı anda çalışınca çekirdekler paylaşılır,
+bellek şişer ve encode'lar zaman aşımına uğrar. Bu modül çalışan işlerin kaynaklarını sayar:
+
+- Kapasite: MEDIA_CPU_SLOTS (varsayılan: çekirdek sayısı) CPU yuvası ve MEDIA_MEMORY_MB
+  (varsayılan: fiziksel belleğin yarısı) bellek.
+- İş talebi: video işi MEDIA_VIDEO_JOB_CPU yuvası (varsayılan: yuvaların yarısı) ister ve
+  ffmpeg bu kadar thread ile çalıştırılır; bellek talebi profillerin çözünürlüğünden
+  tahmin edilir (bkz. estimate_video_memory_mb).
+- Kabul: yalnızca yuvalar ve bellek boşsa iş başlar (kiralama, lease). Sığmayan iş worker'ı
+  bloke etmeden MEDIA_ADMISSION_RETRY_SECONDS sonra yeniden kuyruğa girer; MEDIA_MAX_QUEUE_WAIT
+  süresince kabul edilmeyen iş başarısız sayılır. Toplam kapasiteden büyük talep hiç
+  kabul edilemeyeceğinden baştan reddedilir (MediaJobTooLargeError).
+- Kiralar cache'te tutulur (Redis: tüm worker'lar aynı defteri görür) ve LEASE_TIMEOUT
+  sonunda düşer; çöken bir worker kapasiteyi kalıcı olarak tutmaz.
+
+Her iş için kuyrukta bekleme ve işleme süreleri ayrı ölçülür: Prometheus histogramları,
+log ve MediaProcessingLog kaydı. get_usage() dolulukla birlikte çalışan işlerin bekleme
+sürelerini döndürür.
+
+Kullanım:
+    if not try_acquire(job_id, cpu=2, memory_mb=600, enqueued_at=enqueued_at):
+        raise self.retry(countdown=get_admission_retry_seconds())
+    try:
+        ...
+    finally:
+        release(job_id)
+"""
+
+import logging
+import os
+import time
+import uuid
+
+from django.core.cache import cache
+
+from core.models import Setting
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import Gauge, Histogram
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+
+# =============================================================================
+# Yapılandırma
+# =============================================================================
+
+LEASES_KEY = "media_scheduler:leases"
+LOCK_KEY = "media_scheduler:lock"
+
+# Defter kilidi süresi ve kilit beklerken yoklama aralığı (sn)
+LOCK_TIMEOUT = 5
+LOCK_POLL_INTERVAL = 0.02
+
+# Video işinin tüm encode'ları (tek geçiş + profil başına yedek denemeler) için toplam ffmpeg
+# süresi ve indirme payı (sn)
+VIDEO_ENCODE_TIMEOUT = 3600
+VIDEO_DOWNLOAD_MARGIN = 600
+
+# Video görevinin Celery süre limitleri: soft limit encode + indirme bütçesini kapsar (genel
+# 25 / 30 dakikalık limitler uzun encode'ları yarıda keserdi); hard limit temizlik payı bırakır
+VIDEO_JOB_SOFT_TIME_LIMIT = VIDEO_ENCODE_TIMEOUT + VIDEO_DOWNLOAD_MARGIN
+VIDEO_JOB_TIME_LIMIT = VIDEO_JOB_SOFT_TIME_LIMIT + 120
+
+# Kira süresi: görev hard limit'le öldürülmeden kira düşmez (iş kirasından uzun yaşayamaz)
+LEASE_TIMEOUT = VIDEO_JOB_TIME_LIMIT + 60
+
+# Video işi bellek tahmini: ffmpeg / x264 sabit payı ve profil başına tutulan kare sayısı
+# (lookahead + referans kareleri)
+VIDEO_BASE_MEMORY_MB = 256
+VIDEO_BUFFERED_FRAMES = 60
+
+if PROMETHEUS_AVAILABLE:
+    MEDIA_QUEUE_WAIT = Histogram(
+        "habernexus_media_queue_wait_seconds",
+        "Medya işinin kuyruğa girişten kaynak kabulüne kadar beklediği süre",
+        ["kind"],
+        buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+    )
+    MEDIA_JOB_DURATION = Histogram(
+        "habernexus_media_job_seconds",
+        "Medya işinin kaynak kabulünden sonra işlenme süresi",
+        ["kind"],
+        buckets=(5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+    )
+    MEDIA_RESOURCES_USED = Gauge(
+        "habernexus_media_resources_used_ratio",
+        "Medya işlerinin kullandığı kapasite oranı",
+        ["resource"],
+    )
+
+
+class MediaJobTooLargeError(ValueError):
+    """İşin CPU / bellek talebi toplam kapasiteyi aşıyor; hiçbir zaman kabul edilemez."""
+
+
+def get_cpu_slots() -> int:
+    """
+    Medya işlerine ayrılan CPU yuvası sayısını ayarlardan al.
+
+    Returns:
+        int: MEDIA_CPU_SLOTS ayarı (varsayılan: çekirdek sayısı)
+    """
+    try:
+        return max(1, int(Setting.objects.get(key="MEDIA_CPU_SLOTS").value))
+    except (Setting.DoesNotExist, ValueError):
+        return os.cpu_count() or 1
+
+
+def get_memory_budget_mb() -> int:
+    """
+    Medya işlerine ayrılan belleği ayarlardan al.
+
+    Returns:
+        int: MEDIA_MEMORY_MB ayarı, MB (varsayılan: fiziksel belleğin yarısı; okunamazsa 2048)
+    """
+    try:
+        return max(1, int(Setting.objects.get(key="MEDIA_MEMORY_MB").value))
+    except (Setting.DoesNotExist, ValueError):
+        pass
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (2 * 1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return 2048
+
+
+def get_video_job_cpu() -> int:
+    """
+    Bir video işinin istediği CPU yuvası (ffmpeg thread) sayısını ayarlardan al.
+
+    Returns:
+        int: MEDIA_VIDEO_JOB_CPU ayarı (varsayılan: yuvaların yarısı, en az 1);
+            yuva sayısını aşamaz
+    """
+    slots = get_cpu_slots()
+    try:
+        return min(slots, max(1, int(Setting.objects.get(key="MEDIA_VIDEO_JOB_CPU").value)))
+    except (Setting.DoesNotExist, ValueError):
+        return max(1, slots // 2)
+
+
+def get_admission_retry_seconds() -> int:
+    """
+    Kaynak bekleyen işin yeniden deneme aralığını ayarlardan al.
+
+    Returns:
+        int: MEDIA_ADMISSION_RETRY_SECONDS ayarı (varsayılan: 15)
+    """
+    try:
+        return max(1, int(Setting.objects.get(key="MEDIA_ADMISSION_RETRY_SECONDS").value))
+    except (Setting.DoesNotExist, ValueError):
+        return 15
+
+
+def get_max_queue_wait() -> int:
+    """
+    Bir işin kaynak bekleyebileceği en uzun süreyi ayarlardan al.
+
+    Returns:
+        int: MEDIA_MAX_QUEUE_WAIT ayarı, saniye (varsayılan: 3600); aşılınca iş başarısız sayılır
+    """
+    try:
+        return max(1, int(Setting.objects.get(key="MEDIA_MAX_QUEUE_WAIT").value))
+    except (Setting.DoesNotExist, ValueError):
+        return 3600
+
+
+def estimate_video_memory_mb(profiles: dict) -> int:
+    """
+    Video işinin bellek ihtiyacını profil çözünürlüklerinden tahmin et.
+
+    Args:
+        profiles: {profil: {"resolution": "GxY", ...}} (VideoProcessor.ENCODING_PROFILES biçimi)
+
+    Returns:
+        int: MB; sabit pay + profil başına VIDEO_BUFFERED_FRAMES adet YUV420 kare
+    """
+    frames_bytes = 0
+    for settings in profiles.values():
+        width, _, height = settings["resolution"].partition("x")
+        frames_bytes += int(width) * int(height) * 3 // 2 * VIDEO_BUFFERED_FRAMES
+    return VIDEO_BASE_MEMORY_MB + -(-frames_bytes // (1024 * 1024))
+
+
+# =============================================================================
+# Kira Defteri
+# =============================================================================
+
+
+class _LedgerLock:
+    """
+    Kira defteri için cache kilidi (tüm worker'lar arasında).
+
+    Kilit değeri sahibine özgü bir jetondur; süresi dolup başka worker'a geçen kilit,
+    eski sahibi tarafından silinmez.
+    """
+
+    def __init__(self):
+        self.token = uuid.uuid4().hex
+
+    def __enter__(self):
+        deadline = time.monotonic() + LOCK_TIMEOUT + 1
+        # Sahibi çökmüş kilit LOCK_TIMEOUT sonunda kendiliğinden düşer
+        while not cache.add(LOCK_KEY, self.token, timeout=LOCK_TIMEOUT):
+            if time.monotonic() > deadline:
+                raise TimeoutError("Medya zamanlayıcı kilidi alınamadı")
+            time.sleep(LOCK_POLL_INTERVAL)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if cache.get(LOCK_KEY) == self.token:
+            cache.delete(LOCK_KEY)
+
+
+def _active_leases(now: float) -> dict:
+    leases = cache.get(LEASES_KEY) or {}
+    return {job_id: lease for job_id, lease in leases.items() if lease["expires_at"] > now}
+
+
+def _totals(leases: dict) -> tuple[int, int]:
+    return (
+        sum(lease["cpu"] for lease in leases.values()),
+        sum(lease["memory_mb"] for lease in leases.values()),
+    )
+
+
+def try_acquire(job_id: str, cpu: int, memory_mb: int, kind: str = "video", enqueued_at: float | None = None) -> bool:
+    """
+    Kaynaklar boşsa iş için kira al.
+
+    Args:
+        job_id: İşin kimliği (örn. Celery görev ID'si); aynı iş ikinci kez kira almaz
+        cpu: İstenen CPU yuvası
+        memory_mb: İstenen bellek (MB)
+        kind: İş türü (metrik etiketi)
+        enqueued_at: İşin kuyruğa girdiği an (time.time()); bekleme süresi buna göre ölçülür
+
+    Returns:
+        bool: Kira alındıysa True
+
+    Raises:
+        MediaJobTooLargeError: Talep toplam kapasiteyi aşıyor (beklemek işe yaramaz)
+    """
+    cpu_total, memory_total = get_cpu_slots(), get_memory_budget_mb()
+    if cpu > cpu_total or memory_mb > memory_total:
+        raise MediaJobTooLargeError(
+            f"Medya işi kapasiteyi aşıyor: cpu {cpu}/{cpu_total}, bellek {memory_mb}/{memory_total} MB"
+        )
+    now = time.time()
+
+    with _LedgerLock():
+        leases = _active_leases(now)
+        if job_id not in leases:
+            cpu_used, memory_used = _totals(leases)
+            if cpu_used + cpu > cpu_total or memory_used + memory_mb > memory_total:
+                logger.info(
+                    f"Media job {job_id} waiting for resources "
+                    f"(cpu {cpu_used}+{cpu}/{cpu_total}, memory {memory_used}+{memory_mb}/{memory_total} MB)"
+                )
+                return False
+            leases[job_id] = {
+                "kind": kind,
+                "cpu": cpu,
+                "memory_mb": memory_mb,
+                "enqueued_at": enqueued_at or now,
+                "started_at": now,
+                "expires_at": now + LEASE_TIMEOUT,
+            }
+            cache.set(LEASES_KEY, leases, timeout=LEASE_TIMEOUT)
+
+    if PROMETHEUS_AVAILABLE:
+        MEDIA_QUEUE_WAIT.labels(kind=kind).observe(now - (enqueued_at or now))
+    _update_gauges(leases, cpu_total, memory_total)
+    return True
+
+
+def release(job_id: str) -> dict | None:
+    """
+    İşin kirasını bırak.
+
+    Returns:
+        dict | None: {"queue_wait_seconds", "run_seconds"}; kira yoksa (süresi dolmuş) None
+    """
+    now = time.time()
+    with _LedgerLock():
+        leases = _active_leases(now)
+        lease = leases.pop(job_id, None)
+        cache.set(LEASES_KEY, leases, timeout=LEASE_TIMEOUT)
+
+    _update_gauges(leases, get_cpu_slots(), get_memory_budget_mb())
+    if lease is None:
+        return None
+
+    timings = {
+        "queue_wait_seconds": round(lease["started_at"] - lease["enqueued_at"], 3),
+        "run_seconds": round(now - lease["started_at"], 3),
+    }
+    if PROMETHEUS_AVAILABLE:
+        MEDIA_JOB_DURATION.labels(kind=lease["kind"]).observe(timings["run_seconds"])
+    return timings
+
+
+def get_usage() -> dict:
+    """
+    Medya kaynaklarının doluluğu ve çalışan işler.
+
+    Returns:
+        dict: {"cpu_used", "cpu_total", "memory_used_mb", "memory_total_mb",
+            "jobs": {job_id: {"kind", "cpu", "memory_mb", "queue_wait_seconds", "running_seconds"}}}
+    """
+    now = time.time()
+    leases = _active_leases(now)
+    cpu_used, memory_used = _totals(leases)
+    return {
+        "cpu_used": cpu_used,
+        "cpu_total": get_cpu_slots(),
+        "memory_used_mb": memory_used,
+        "memory_total_mb": get_memory_budget_mb(),
+        "jobs": {
+            job_id: {
+                "kind": lease["kind"],
+                "cpu": lease["cpu"],
+                "memory_mb": lease["memory_mb"],
+                "queue_wait_seconds": round(lease["started_at"] - lease["enqueued_at"], 3),
+                "running_seconds": round(now - lease["started_at"], 3),
+            }
+            for job_id, lease in leases.items()
+        },
+    }
+
+
+def _update_gauges(leases: dict, cpu_total: int, memory_total: int):
+    if not PROMETHEUS_AVAILABLE:
+        return
+    cpu_used, memory_used = _totals(leases)
+    MEDIA_RESOURCES_USED.labels(resource="cpu").set(cpu_used / cpu_total)
+    MEDIA_RESOURCES_USED.labels(resource="memory").set(memory_used / memory_total)
@@ -0,0 +1,368 @@
+"""
+HaberNexus - İçerik Adresli Medya Deposu
+
+Ajans fotoğrafları onlarca haberle aynı anda gelir; download_article_image ve
+ImageProcessor her seferinde görseli indirip çözüyor, yeniden encode ediyor ve haber
+başına ayrı dosyalar yazıyordu. Bu modül görselleri içeriklerine göre saklar:
+
+- Anahtar: kaynak baytların SHA-256 özeti. Aynı bayt tekrar geldiğinde görsel çözülmez,
+  mevcut varyantlar kullanılır.
+- Neredeyse aynı görseller (yeniden sıkıştırma, küçük kırpım, filigran): 64 bit algısal özet
+  (DCT pHash). Son MEDIA_PHASH_WINDOW_DAYS gün içindeki asıl görsellerle Hamming uzaklığı
+  MEDIA_PHASH_MAX_DISTANCE ve altındaysa yeni görsel dosyasız bir takma kayıt olarak asıl
+  görsele bağlanır. Küçük bir kopya daha büyük bir görselin yerine geçmez.
+- Varyantlar: v/<sha256>/<ad> yolunda, varsayılan depolamada; haberler bu ortak dosyaları
+  kullanır (featured_image yalnızca yolu gösterir).
+- Referans sayımı: MediaAssetReference kayıtları (haber başına görsel) eklendikçe /
+  silindikçe MediaAsset.ref_count güncellenir (haber silindiğinde de). Referansı kalmayan
+  görseller MEDIA_ASSET_GRACE_HOURS sonra cleanup_unused_media_assets ile dosyalarıyla
+  birlikte silinir.
+
+Kullanım:
+    asset, created = media_store.register(data, source_url=url)
+    path = media_store.get_variant(asset, FEATURED_VARIANT) or media_store.save_variant(asset, FEATURED_VARIANT, webp)
+    media_store.attach(asset, article, exclusive=True)
+"""
+
+import hashlib
+import logging
+import posixpath
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+import numpy as np
+from PIL import Image
+
+from core.models import Setting
+
+from . import image_ingest
+from .models_extended import MediaAsset, MediaAssetReference
+
+logger = logging.getLogger(__name__)
+
+
+# Varyantların depolamadaki kök dizini (MEDIA_URL altında /media/v/<sha256>/...)
+STORE_DIR = "v"
+
+# download_article_image'ın ürettiği başlık görseli varyantı
+FEATURED_VARIANT = "featured.webp"
+
+# pHash: 32x32 gri görselin DCT'sinin sol üst 8x8 bloğu
+PHASH_SIZE = 32
+PHASH_BLOCK = 8
+
+# pHash için görsel en fazla bu boyutta çözülür
+PHASH_DECODE_SIZE = 256
+
+
+def _get_int_setting(key: str, default: int) -> int:
+    try:
+        return int(Setting.objects.get(key=key).value)
+    except (Setting.DoesNotExist, ValueError):
+        return default
+
+
+def is_media_store_enabled() -> bool:
+    """
+    Görsellerin içerik adresli depoda paylaşılıp paylaşılmayacağını ayarlardan al.
+
+    Returns:
+        bool: MEDIA_STORE_ENABLED ayarı (varsayılan: True)
+    """
+    try:
+        store_setting = Setting.objects.get(key="MEDIA_STORE_ENABLED")
+        return store_setting.value.lower().strip() in ("1", "true", "yes", "on")
+    except Setting.DoesNotExist:
+        return True
+
+
+def get_phash_max_distance() -> int:
+    """
+    Neredeyse aynı sayılacak en büyük pHash Hamming uzaklığı (MEDIA_PHASH_MAX_DISTANCE, varsayılan: 6).
+    0 verilirse yalnızca birebir aynı baytlar paylaşılır.
+    """
+    return _get_int_setting("MEDIA_PHASH_MAX_DISTANCE", 6)
+
+
+def get_phash_window_days() -> int:
+    """
+    Neredeyse aynı görselin aranacağı süre (MEDIA_PHASH_WINDOW_DAYS, varsayılan: 30 gün).
+    """
+    return _get_int_setting("MEDIA_PHASH_WINDOW_DAYS", 30)
+
+
+def get_grace_hours() -> int:
+    """
+    Referansı kalmayan görselin silinmeden önce bekleyeceği süre (MEDIA_ASSET_GRACE_HOURS, varsayılan: 24).
+    """
+    return _get_int_setting("MEDIA_ASSET_GRACE_HOURS", 24)
+
+
+# =============================================================================
+# Özetler
+# =============================================================================
+
+
+def sha256_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """
+    Ortonormal DCT-II dönüşüm matrisi.
+    """
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.sqrt(2 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+def compute_phash(image: Image.Image) -> str:
+    """
+    64 bit algısal özet: 32x32 gri görselin DCT'sindeki düşük frekanslı 8x8 katsayının
+    (DC hariç) medyandan büyük olanları 1.
+
+    Returns:
+        str: 16 karakter hex
+    """
+    gray = np.asarray(image.convert("L").resize((PHASH_SIZE, PHASH_SIZE), Image.Resampling.LANCZOS), dtype=float)
+    block = (_DCT @ gray @ _DCT.T)[:PHASH_BLOCK, :PHASH_BLOCK].flatten()
+    bits = block > np.median(block[1:])
+    return f"{int(''.join('1' if bit else '0' for bit in bits), 2):016x}"
+
+
+def hamming_distance(first: str, second: str) -> int:
+    return (int(first, 16) ^ int(second, 16)).bit_count()
+
+
+def asset_dir(asset: MediaAsset) -> str:
+    """
+    Görselin varyantlarının depolama dizini (MEDIA_ROOT'a göre).
+    """
+    return posixpath.join(STORE_DIR, asset.sha256)
+
+
+# =============================================================================
+# Kayıt
+# =============================================================================
+
+
+def find_near_duplicate(phash: str, width: int, height: int) -> MediaAsset | None:
+    """
+    Pencere içindeki asıl görseller arasında en yakın pHash'e sahip olanı bul.
+    Aday, yeni görselden küçükse (kalite kaybı) eşleşme sayılmaz.
+    """
+    max_distance = get_phash_max_distance()
+    if max_distance <= 0 or not phash:
+        return None
+
+    since = timezone.now() - timedelta(days=get_phash_window_days())
+    candidates = (
+        MediaAsset.objects.filter(canonical__isnull=True, created_at__gte=since)
+        .exclude(phash="")
+        .values_list("id", "phash", "width", "height")
+    )
+
+    best_id, best_distance = None, max_distance + 1
+    for asset_id, candidate_phash, candidate_width, candidate_height in candidates.iterator():
+        if candidate_width * candidate_height < width * height:
+            continue
+        distance = hamming_distance(phash, candidate_phash)
+        if distance < best_distance:
+            best_id, best_distance = asset_id, distance
+
+    if best_id is None:
+        return None
+    logger.info(f"Near-duplicate image found (distance {best_distance}): {best_id}")
+    return MediaAsset.objects.get(pk=best_id)
+
+
+def register(data: bytes, image: Image.Image | None = None, source_url: str = "") -> tuple[MediaAsset, bool]:
+    """
+    Görseli depoya kaydet veya mevcut kaydını bul.
+
+    Args:
+        data: Kaynak baytlar
+        image: Çözülmüş görsel (yoksa gerektiğinde baytlardan küçültülerek çözülür)
+        source_url: Kaynak URL
+
+    Returns:
+        tuple: (asıl MediaAsset, yeni asıl görsel oluşturuldu mu); yeni görsel oluşturulduysa
+            varyantları henüz yoktur
+    """
+    digest = sha256_digest(data)
+    existing = MediaAsset.objects.select_related("canonical").filter(sha256=digest).first()
+    if existing is not None:
+        return existing.canonical or existing, False
+
+    # Boyut başlıktan okunur; pHash için küçük (JPEG'de draft ile çözülmüş) bir kopya yeter
+    width, height = image_ingest.read_size(data)
+    if image is None:
+        image, _ = image_ingest.open_image(data, max_size=(PHASH_DECODE_SIZE, PHASH_DECODE_SIZE))
+    phash = compute_phash(image)
+    canonical = find_near_duplicate(phash, width, height)
+
+    try:
+        with transaction.atomic():
+            asset = MediaAsset.objects.create(
+                sha256=digest,
+                phash=phash,
+                canonical=canonical,
+                source_url=source_url[:1000],
+                width=width,
+                height=height,
+                byte_size=len(data),
+            )
+    except IntegrityError:
+        # Aynı görsel başka bir worker'da aynı anda kaydedildi
+        existing = MediaAsset.objects.select_related("canonical").get(sha256=digest)
+        return existing.canonical or existing, False
+
+    if canonical is not None:
+        return canonical, False
+    return asset, True
+
+
+# =============================================================================
+# Varyantlar
+# =============================================================================
+
+
+def get_variant(asset: MediaAsset, name: str) -> str | None:
+    """
+    Varyantın depolama yolu; kayıtlı değilse veya dosyası yoksa None.
+    """
+    path = asset.variants.get(name)
+    if path and default_storage.exists(path):
+        return path
+    return None
+
+
+def save_variant(asset: MediaAsset, name: str, content: bytes) -> str:
+    """
+    Varyantı v/<sha256>/<ad> yoluna yaz ve kaydına ekle.
+
+    Returns:
+        str: Depolama yolu
+    """
+    path = posixpath.join(asset_dir(asset), name)
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    path = default_storage.save(path, ContentFile(content))
+    record_variants(asset, {name: path})
+    return path
+
+
+def record_variants(asset: MediaAsset, new_variants: dict) -> None:
+    """
+    Yazılmış varyantları (ad -> depolama yolu) görselin kaydına ekle; örn. ImageProcessor
+    havuzunda doğrudan dosyaya yazılanlar.
+    """
+    with transaction.atomic():
+        variants = MediaAsset.objects.select_for_update().values_list("variants", flat=True).get(pk=asset.pk)
+        variants.update(new_variants)
+        MediaAsset.objects.filter(pk=asset.pk).update(variants=variants)
+    asset.variants = variants
+
+
+# =============================================================================
+# Referans Sayımı
+# =============================================================================
+
+
+def attach(asset: MediaAsset, article, exclusive: bool = False) -> bool:
+    """
+    Haberi görsele bağla (tekrar çağrılırsa sayı artmaz).
+
+    Args:
+        asset: Asıl görsel
+        article: Haber
+        exclusive: True ise haberin diğer görsel referansları bırakılır (tek öne çıkan görsel)
+
+    Returns:
+        bool: Yeni referans oluşturuldu mu
+    """
+    with transaction.atomic():
+        if exclusive:
+            release(article, exclude=asset)
+        _, created = MediaAssetReference.objects.get_or_create(asset=asset, article=article)
+        if created:
+            MediaAsset.objects.filter(pk=asset.pk).update(ref_count=F("ref_count") + 1, last_used_at=timezone.now())
+    return created
+
+
+def release(article, exclude: MediaAsset | None = None) -> int:
+    """
+    Haberin görsel referanslarını bırak.
+
+    Returns:
+        int: Bırakılan referans sayısı
+    """
+    references = MediaAssetReference.objects.filter(article=article)
+    if exclude is not None:
+        references = references.exclude(asset=exclude)
+    count = 0
+    for reference in references:
+        reference.delete()
+        count += 1
+    return count
+
+
+@receiver(post_delete, sender=MediaAssetReference)
+def _decrement_ref_count(**kwargs):
+    """
+    Referans silindiğinde (haber silinmesi dahil) sayacı azalt.
+    """
+    MediaAsset.objects.filter(pk=kwargs["instance"].asset_id).update(
+        ref_count=F("ref_count") - 1, last_used_at=timezone.now()
+    )
+
+
+def delete_asset_files(asset: MediaAsset) -> int:
+    """
+    Görselin depolama dizinindeki dosyaları sil.
+
+    Returns:
+        int: Silinen dosya sayısı
+    """
+    directory = asset_dir(asset)
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    for filename in files:
+        default_storage.delete(posixpath.join(directory, filename))
+    return len(files)
+
+
+def collect_unreferenced(grace_hours: int | None = None) -> dict:
+    """
+    Referansı kalmamış ve bekleme süresi dolmuş asıl görselleri dosyalarıyla sil.
+    Takma kayıtlar asıl görselle birlikte silinir.
+
+    Returns:
+        dict: {"assets": silinen görsel, "files": silinen dosya}
+    """
+    if grace_hours is None:
+        grace_hours = get_grace_hours()
+    cutoff = timezone.now() - timedelta(hours=grace_hours)
+
+    deleted_assets, deleted_files = 0, 0
+    unused = MediaAsset.objects.filter(canonical__isnull=True, ref_count__lte=0, last_used_at__lt=cutoff)
+    for asset in unused.iterator():
+        deleted_files += delete_asset_files(asset)
+        asset.delete()
+        deleted_assets += 1
+
+    return {"assets": deleted_assets, "files": deleted_files}
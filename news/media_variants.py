@@ -0,0 +1,263 @@
+"""
+HaberNexus - İstek Üzerine Görsel Varyantları
+
+create_responsive_images her haber için (boyut × format) dosyalarını, hiç istenmeseler de
+alım sırasında encode ediyordu. Bu modül responsive varyantları ilk istendiklerinde üretir:
+
+- URL: /media/v/<sha256>/<genişlik>x<yükseklik>.<format>; dosya yolu URL ile aynıdır
+  (MEDIA_ROOT/v/<sha256>/...). Dosya varsa Nginx doğrudan sunar, yoksa istek Django'ya
+  düşer (media_variant görünümü).
+- Varyant, depodaki ana kopyadan (bkz. find_master) boyutlandırılır, encode edilir ve medya
+  deposuna varyant olarak kaydedilir; sonraki istekler statik dosyadır.
+- Tek uçuş: aynı varyant için eşzamanlı istekler cache kilidini alamazsa üretimi bekler,
+  aynı varyantı ikinci kez encode etmez.
+- Yalnızca MEDIA_VARIANT_SIZES ayarındaki boyutlar ve VARIANT_FORMATS'taki formatlar
+  üretilir (rastgele boyut istekleriyle CPU / disk tüketilmesin).
+
+Kullanım:
+    url = media_variants.variant_url(asset, 600, 400, "webp")
+    path = media_variants.get_or_render(asset, 600, 400, "webp")
+"""
+
+import logging
+import posixpath
+import time
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+from PIL import Image, ImageChops
+
+from core.models import Setting
+
+from . import image_ingest, media_store
+from .models_extended import MediaAsset
+
+logger = logging.getLogger(__name__)
+
+# Format -> (Pillow formatı, encode seçenekleri, Content-Type)
+VARIANT_FORMATS = {
+    "avif": ("AVIF", {"quality": 85}, "image/avif"),
+    "webp": ("WEBP", {"quality": 80}, "image/webp"),
+    "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}, "image/jpeg"),
+}
+
+# Mobil, tablet, masaüstü (ImageProcessor.RESPONSIVE_SIZES ile aynı)
+DEFAULT_VARIANT_SIZES = "600x400,1024x683,1920x1080"
+
+# Ana kopya olarak kullanılabilecek varyantlar (tercih sırasıyla). featured.webp padding'siz
+# küçültülmüş kopyadır; ImageProcessor'ın featured-<kalite>.jpg dosyaları 1920x1080'e
+# padding'lenmiştir ve yalnızca ana kopyası olmayan eski görsellerde, padding kırpılarak kullanılır
+MASTER_VARIANTS = (
+    media_store.FEATURED_VARIANT,
+    "featured-high.jpg",
+    "featured-medium.jpg",
+    "featured-low.jpg",
+)
+PADDED_MASTER_VARIANTS = frozenset(MASTER_VARIANTS[1:])
+
+# Ana kopyanın en fazla boyutu ve encode seçenekleri
+MASTER_MAX_SIZE = (1920, 1080)
+MASTER_OPTIONS = {"quality": 85, "optimize": True}
+
+# Padding kırpılırken beyaz zemin sayılan en büyük piksel farkı (JPEG gürültüsü)
+PADDING_TOLERANCE = 24
+
+# Üretim kilidi süresi ve bekleyen isteklerin yoklama aralığı (sn)
+RENDER_LOCK_TIMEOUT = 30
+RENDER_POLL_INTERVAL = 0.05
+
+
+class VariantNotFoundError(Exception):
+    """Görsel, boyut, format veya ana kopya bulunamadı."""
+
+
+class VariantRenderTimeoutError(Exception):
+    """Aynı varyantı üreten başka istek süre sınırında bitirmedi."""
+
+
+def get_variant_sizes() -> set[tuple[int, int]]:
+    """
+    Üretilmesine izin verilen varyant boyutlarını ayarlardan al.
+
+    Returns:
+        set: {(genişlik, yükseklik)}; MEDIA_VARIANT_SIZES ayarı, virgülle ayrılmış "GxY"
+            (varsayılan: 600x400,1024x683,1920x1080)
+    """
+    try:
+        value = Setting.objects.get(key="MEDIA_VARIANT_SIZES").value
+    except Setting.DoesNotExist:
+        value = DEFAULT_VARIANT_SIZES
+
+    sizes = set()
+    for item in value.split(","):
+        width, _, height = item.strip().partition("x")
+        if width.isdigit() and height.isdigit():
+            sizes.add((int(width), int(height)))
+    return sizes
+
+
+def variant_name(width: int, height: int, fmt: str) -> str:
+    return f"{width}x{height}.{fmt}"
+
+
+def variant_url(asset: MediaAsset, width: int, height: int, fmt: str) -> str:
+    """
+    Varyantın herkese açık URL'i (henüz üretilmemiş olabilir; ilk istekte üretilir).
+    """
+    return default_storage.url(f"{media_store.asset_dir(asset)}/{variant_name(width, height, fmt)}")
+
+
+def responsive_urls(
+    asset: MediaAsset, sizes: list[tuple[int, int]], formats: tuple[str, ...] = ("avif", "webp")
+) -> dict:
+    """
+    Boyut × format varyant URL'leri (encode etmeden).
+
+    Returns:
+        dict: {"GxY": {format: url, "dimensions": (G, Y)}}
+    """
+    return {
+        f"{width}x{height}": {
+            "dimensions": (width, height),
+            **{fmt: variant_url(asset, width, height, fmt) for fmt in formats},
+        }
+        for width, height in sizes
+    }
+
+
+# =============================================================================
+# Ana Kopya
+# =============================================================================
+
+
+def find_master(asset: MediaAsset) -> str | None:
+    """
+    Varyantların üretileceği ana kopyanın depolama yolu (yoksa None).
+    """
+    for name in MASTER_VARIANTS:
+        path = media_store.get_variant(asset, name)
+        if path is not None:
+            return path
+    return None
+
+
+def master_image(image: Image.Image) -> Image.Image:
+    """
+    Ana kopya görseli: MASTER_MAX_SIZE'a sığdırılmış, padding'siz RGB kopya.
+    """
+    master = image.copy()
+    master.thumbnail(MASTER_MAX_SIZE, Image.Resampling.LANCZOS)
+    if master.mode != "RGB":
+        master = master.convert("RGB")
+    return master
+
+
+def ensure_master(asset: MediaAsset, image: Image.Image) -> str:
+    """
+    Görselin padding'siz ana kopyası yoksa verilen görselden (WebP) oluştur.
+
+    Returns:
+        str: Ana kopyanın depolama yolu
+    """
+    path = media_store.get_variant(asset, media_store.FEATURED_VARIANT)
+    if path is not None:
+        return path
+
+    buffer = BytesIO()
+    master_image(image).save(buffer, "WEBP", **MASTER_OPTIONS)
+    return media_store.save_variant(asset, media_store.FEATURED_VARIANT, buffer.getvalue())
+
+
+def trim_padding(image: Image.Image) -> Image.Image:
+    """
+    Beyaz padding'i kırp (padding'lenmiş eski ana kopyalar için). JPEG gürültüsü
+    PADDING_TOLERANCE'a kadar zemin sayılır.
+    """
+    image = image.convert("RGB")
+    background = Image.new("RGB", image.size, (255, 255, 255))
+    difference = ImageChops.difference(image, background).convert("L")
+    bbox = difference.point(lambda value: 255 if value > PADDING_TOLERANCE else 0).getbbox()
+    return image.crop(bbox) if bbox else image
+
+
+# =============================================================================
+# Üretim
+# =============================================================================
+
+
+def render_variant(asset: MediaAsset, width: int, height: int, fmt: str) -> str:
+    """
+    Varyantı ana kopyadan üret ve depoya kaydet (kilit almadan; bkz. get_or_render).
+    Görsel oranı korunarak küçültülür ve beyaz zeminle tam boyuta tamamlanır
+    (ImageProcessor responsive boyutlarıyla aynı).
+
+    Returns:
+        str: Depolama yolu
+    """
+    master_path = find_master(asset)
+    if master_path is None:
+        raise VariantNotFoundError(f"Ana kopya yok: {asset.sha256}")
+
+    started = time.perf_counter()
+    with default_storage.open(master_path, "rb") as f:
+        data = f.read()
+    if posixpath.basename(master_path) in PADDED_MASTER_VARIANTS:
+        # Padding tekrar padding'lenmesin: önce kırpılır, sonra hedef boyuta sığdırılır
+        image, _ = image_ingest.open_image(data, max_size=MASTER_MAX_SIZE)
+        image = trim_padding(image)
+        image.thumbnail((width, height), Image.Resampling.LANCZOS)
+    else:
+        image, _ = image_ingest.open_image(data, max_size=(width, height))
+
+    canvas = Image.new("RGB", (width, height), (255, 255, 255))
+    canvas.paste(image.convert("RGB"), ((width - image.width) // 2, (height - image.height) // 2))
+
+    pillow_format, options, _ = VARIANT_FORMATS[fmt]
+    buffer = BytesIO()
+    canvas.save(buffer, pillow_format, **options)
+
+    path = media_store.save_variant(asset, variant_name(width, height, fmt), buffer.getvalue())
+    logger.info(f"Image variant rendered: {path} ({time.perf_counter() - started:.2f}s)")
+    return path
+
+
+def get_or_render(asset: MediaAsset, width: int, height: int, fmt: str) -> str:
+    """
+    Varyantın depolama yolunu döndür; yoksa tek uçuşla üret.
+
+    Aynı varyantı aynı anda isteyenlerden yalnızca kilidi alan üretir, diğerleri varyant
+    kaydedilene kadar bekler. Kilit sahibi hata verirse bekleyenlerden biri kilidi alıp
+    yeniden dener.
+
+    Raises:
+        VariantNotFoundError: Boyut / format izinli değil veya ana kopya yok
+        VariantRenderTimeoutError: RENDER_LOCK_TIMEOUT içinde üretilemedi
+    """
+    if fmt not in VARIANT_FORMATS or (width, height) not in get_variant_sizes():
+        raise VariantNotFoundError(f"Desteklenmeyen varyant: {variant_name(width, height, fmt)}")
+
+    name = variant_name(width, height, fmt)
+    path = media_store.get_variant(asset, name)
+    if path is not None:
+        return path
+
+    lock_key = f"media_variant:{asset.sha256}:{name}"
+    deadline = time.monotonic() + RENDER_LOCK_TIMEOUT
+    while True:
+        if cache.add(lock_key, 1, timeout=RENDER_LOCK_TIMEOUT):
+            try:
+                # Kilit beklenirken başka istek üretmiş olabilir
+                asset.refresh_from_db(fields=["variants"])
+                return media_store.get_variant(asset, name) or render_variant(asset, width, height, fmt)
+            finally:
+                cache.delete(lock_key)
+
+        time.sleep(RENDER_POLL_INTERVAL)
+        asset.refresh_from_db(fields=["variants"])
+        path = media_store.get_variant(asset, name)
+        if path is not None:
+            return path
+        if time.monotonic() > deadline:
+            raise VariantRenderTimeoutError(f"Varyant üretimi zaman aşımına uğradı: {lock_key}")
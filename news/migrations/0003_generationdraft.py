@@ -0,0 +1,56 @@
+# Generated by Django 5.1.3 on 2026-10-19 16:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0002_articleclassification_contentqualitymetrics_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GenerationDraft",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("content", models.TextField(blank=True, help_text="Şu ana kadar üretilen metin")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("streaming", "Akış Devam Ediyor"),
+                            ("completed", "Tamamlandı"),
+                            ("aborted", "Erken Durduruldu"),
+                        ],
+                        default="streaming",
+                        help_text="Taslak durumu",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "abort_reason",
+                    models.CharField(blank=True, help_text="Erken durdurma nedeni (varsa)", max_length=255),
+                ),
+                ("chunk_count", models.IntegerField(default=0, help_text="Alınan akış parçası sayısı")),
+                ("ai_model_used", models.CharField(blank=True, help_text="Kullanılan AI modeli", max_length=50)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "article",
+                    models.OneToOneField(
+                        help_text="İlgili makale",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="generation_draft",
+                        to="news.article",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Üretim Taslağı",
+                "verbose_name_plural": "Üretim Taslakları",
+                "ordering": ["-updated_at"],
+                "indexes": [models.Index(fields=["status", "-updated_at"], name="news_genera_status_b1f892_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,400 @@
+# Generated by Django 5.1.3 on 2026-10-19 16:52
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authors", "0001_initial"),
+        ("news", "0003_generationdraft"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArticleMedia",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "featured_image_original",
+                    models.ImageField(
+                        blank=True, help_text="Orijinal görsel dosyası", null=True, upload_to="articles/original/"
+                    ),
+                ),
+                (
+                    "featured_image_avif",
+                    models.ImageField(
+                        blank=True,
+                        help_text="AVIF format (en iyi sıkıştırma)",
+                        null=True,
+                        upload_to="articles/featured/",
+                    ),
+                ),
+                (
+                    "featured_image_webp",
+                    models.ImageField(
+                        blank=True, help_text="WebP format (fallback)", null=True, upload_to="articles/featured/"
+                    ),
+                ),
+                (
+                    "featured_image_jpeg",
+                    models.ImageField(
+                        blank=True, help_text="JPEG format (legacy)", null=True, upload_to="articles/featured/"
+                    ),
+                ),
+                (
+                    "featured_image_alt",
+                    models.CharField(blank=True, help_text="Görsel alt text (SEO ve accessibility)", max_length=255),
+                ),
+                (
+                    "featured_image_credit",
+                    models.CharField(blank=True, help_text="Görsel kaynağı/fotoğrafçı", max_length=255),
+                ),
+                ("featured_image_width", models.IntegerField(blank=True, null=True)),
+                ("featured_image_height", models.IntegerField(blank=True, null=True)),
+                (
+                    "summary_video_original",
+                    models.FileField(
+                        blank=True, help_text="Orijinal video dosyası", null=True, upload_to="articles/video/"
+                    ),
+                ),
+                (
+                    "summary_video_1080p",
+                    models.FileField(
+                        blank=True, help_text="1080p video (yüksek kalite)", null=True, upload_to="articles/video/"
+                    ),
+                ),
+                (
+                    "summary_video_720p",
+                    models.FileField(
+                        blank=True, help_text="720p video (orta kalite)", null=True, upload_to="articles/video/"
+                    ),
+                ),
+                (
+                    "summary_video_480p",
+                    models.FileField(
+                        blank=True, help_text="480p video (mobil)", null=True, upload_to="articles/video/"
+                    ),
+                ),
+                (
+                    "summary_video_hls_manifest",
+                    models.FileField(
+                        blank=True, help_text="HLS manifest dosyası", null=True, upload_to="articles/video/hls/"
+                    ),
+                ),
+                ("video_duration", models.IntegerField(blank=True, help_text="Video uzunluğu (saniye)", null=True)),
+                ("video_width", models.IntegerField(blank=True, null=True)),
+                ("video_height", models.IntegerField(blank=True, null=True)),
+                (
+                    "image_quality_score",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Görsel kalite puanı (0-100)",
+                        null=True,
+                        validators=[
+                            django.core.validators.MinValueValidator(0),
+                            django.core.validators.MaxValueValidator(100),
+                        ],
+                    ),
+                ),
+                (
+                    "video_quality_score",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Video kalite puanı (0-100)",
+                        null=True,
+                        validators=[
+                            django.core.validators.MinValueValidator(0),
+                            django.core.validators.MaxValueValidator(100),
+                        ],
+                    ),
+                ),
+                (
+                    "image_processing_status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Beklemede"),
+                            ("processing", "İşleniyor"),
+                            ("completed", "Tamamlandı"),
+                            ("failed", "Başarısız"),
+                        ],
+                        default="pending",
+                        help_text="Görsel işleme durumu",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "video_processing_status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Beklemede"),
+                            ("processing", "İşleniyor"),
+                            ("completed", "Tamamlandı"),
+                            ("failed", "Başarısız"),
+                        ],
+                        default="pending",
+                        help_text="Video işleme durumu",
+                        max_length=50,
+                    ),
+                ),
+                ("image_processing_error", models.TextField(blank=True, help_text="Görsel işleme hatası")),
+                ("video_processing_error", models.TextField(blank=True, help_text="Video işleme hatası")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "article",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="media", to="news.article"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Makale Medyası",
+                "verbose_name_plural": "Makale Medyaları",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArticleSEO",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "meta_description",
+                    models.CharField(help_text="Google'da görünecek açıklama (max 160 karakter)", max_length=160),
+                ),
+                ("meta_keywords", models.CharField(help_text="Anahtar kelimeler (virgülle ayrılmış)", max_length=255)),
+                (
+                    "canonical_url",
+                    models.URLField(blank=True, help_text="Canonical URL (duplicate content'i önlemek için)"),
+                ),
+                ("og_title", models.CharField(help_text="Sosyal medyada görünecek başlık", max_length=95)),
+                ("og_description", models.CharField(help_text="Sosyal medyada görünecek açıklama", max_length=200)),
+                ("og_image", models.URLField(blank=True, help_text="Sosyal medyada görünecek görsel URL")),
+                ("twitter_title", models.CharField(blank=True, help_text="Twitter'da görünecek başlık", max_length=70)),
+                (
+                    "twitter_description",
+                    models.CharField(blank=True, help_text="Twitter'da görünecek açıklama", max_length=200),
+                ),
+                (
+                    "schema_type",
+                    models.CharField(
+                        choices=[
+                            ("NewsArticle", "Haber Makalesi"),
+                            ("BlogPosting", "Blog Yazısı"),
+                            ("Report", "Rapor"),
+                        ],
+                        default="NewsArticle",
+                        help_text="Structured data türü",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "seo_score",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Genel SEO puanı (0-100)",
+                        validators=[
+                            django.core.validators.MinValueValidator(0),
+                            django.core.validators.MaxValueValidator(100),
+                        ],
+                    ),
+                ),
+                (
+                    "readability_score",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Okunabilirlik puanı (0-100)",
+                        validators=[
+                            django.core.validators.MinValueValidator(0),
+                            django.core.validators.MaxValueValidator(100),
+                        ],
+                    ),
+                ),
+                (
+                    "keyword_optimization_score",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Anahtar kelime optimizasyonu puanı (0-100)",
+                        validators=[
+                            django.core.validators.MinValueValidator(0),
+                            django.core.validators.MaxValueValidator(100),
+                        ],
+                    ),
+                ),
+                ("has_h1", models.BooleanField(default=False, help_text="H1 tag'ı var mı?")),
+                ("has_meta_description", models.BooleanField(default=False, help_text="Meta description var mı?")),
+                ("has_alt_text", models.BooleanField(default=False, help_text="Görsellerde alt text var mı?")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "article",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="seo", to="news.article"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Makale SEO",
+                "verbose_name_plural": "Makale SEO'ları",
+                "ordering": ["-seo_score", "-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="PromptTemplate",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "name",
+                    models.CharField(help_text="Template adı (örn: 'Teknoloji Makalesi')", max_length=255, unique=True),
+                ),
+                ("category", models.CharField(help_text="Hangi kategoriye ait", max_length=100)),
+                (
+                    "template_type",
+                    models.CharField(
+                        choices=[
+                            ("article", "Makale"),
+                            ("summary", "Özet"),
+                            ("headline", "Başlık"),
+                            ("social", "Sosyal Medya"),
+                        ],
+                        default="article",
+                        help_text="Template türü",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "template_content",
+                    models.TextField(
+                        help_text="\n        Template değişkenleri:\n        {title} - Başlık\n        {summary} - Özet\n        {author_name} - Yazar adı\n        {author_expertise} - Yazar uzmanlığı\n        {category} - Kategori\n        {tone} - Ton\n        {word_count} - Kelime sayısı\n        {importance_level} - Önem seviyesi\n        "
+                    ),
+                ),
+                ("is_active", models.BooleanField(default=True, help_text="Bu template aktif mi?")),
+                ("version", models.IntegerField(default=1, help_text="Template versiyonu")),
+                ("usage_count", models.IntegerField(default=0, help_text="Kaç kez kullanıldı")),
+                ("average_quality_score", models.FloatField(default=0, help_text="Ortalama kalite puanı")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Prompt Template",
+                "verbose_name_plural": "Prompt Template'leri",
+                "ordering": ["-is_active", "-usage_count", "category"],
+                "indexes": [
+                    models.Index(
+                        fields=["category", "template_type", "-is_active"], name="news_prompt_categor_a793bb_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="AuthorCategoryMapping",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("category", models.CharField(help_text="Kategori adı (Teknoloji, Sağlık, vb.)", max_length=100)),
+                (
+                    "expertise_level",
+                    models.IntegerField(
+                        choices=[(1, "Başlangıç"), (2, "Orta"), (3, "İyi"), (4, "Çok İyi"), (5, "Uzman")],
+                        default=1,
+                        help_text="Yazarın bu kategorideki uzmanlık seviyesi",
+                    ),
+                ),
+                ("is_primary", models.BooleanField(default=False, help_text="Bu yazarın birincil kategorisi mi?")),
+                (
+                    "preferred_tone",
+                    models.CharField(
+                        choices=[
+                            ("formal", "Resmi"),
+                            ("professional", "Profesyonel"),
+                            ("casual", "Rahat"),
+                            ("academic", "Akademik"),
+                        ],
+                        default="professional",
+                        help_text="Yazarın tercih ettiği ton",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "average_word_count",
+                    models.IntegerField(
+                        default=700,
+                        help_text="Yazarın ortalama yazı uzunluğu (kelime)",
+                        validators=[
+                            django.core.validators.MinValueValidator(300),
+                            django.core.validators.MaxValueValidator(2000),
+                        ],
+                    ),
+                ),
+                ("articles_written", models.IntegerField(default=0, help_text="Bu kategoride yazılan makale sayısı")),
+                ("average_engagement", models.FloatField(default=0, help_text="Ortalama engagement oranı")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="category_mappings",
+                        to="authors.author",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Yazar Kategori Eşleştirmesi",
+                "verbose_name_plural": "Yazar Kategori Eşleştirmeleri",
+                "ordering": ["-expertise_level", "-is_primary", "-articles_written"],
+                "indexes": [
+                    models.Index(fields=["category", "-expertise_level"], name="news_author_categor_8c9569_idx"),
+                    models.Index(fields=["author", "category"], name="news_author_author__9330cf_idx"),
+                ],
+                "unique_together": {("author", "category")},
+            },
+        ),
+        migrations.CreateModel(
+            name="MediaProcessingLog",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "media_type",
+                    models.CharField(
+                        choices=[("image", "Görsel"), ("video", "Video")], help_text="Medya türü", max_length=50
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("processing", "İşleniyor"), ("completed", "Tamamlandı"), ("failed", "Başarısız")],
+                        help_text="İşleme durumu",
+                        max_length=50,
+                    ),
+                ),
+                ("original_size", models.BigIntegerField(help_text="Orijinal dosya boyutu (bytes)")),
+                (
+                    "optimized_size",
+                    models.BigIntegerField(blank=True, help_text="Optimize edilmiş dosya boyutu (bytes)", null=True),
+                ),
+                ("compression_ratio", models.FloatField(blank=True, help_text="Sıkıştırma oranı (%)", null=True)),
+                ("processing_time", models.FloatField(help_text="İşleme süresi (saniye)")),
+                ("error_message", models.TextField(blank=True, help_text="Hata mesajı (varsa)")),
+                ("source_url", models.URLField(blank=True, help_text="Medya kaynağı URL")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "article",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="media_logs", to="news.article"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Medya İşleme Log'u",
+                "verbose_name_plural": "Medya İşleme Log'ları",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["article", "media_type", "-created_at"], name="news_mediap_article_659789_idx"
+                    ),
+                    models.Index(fields=["status", "-created_at"], name="news_mediap_status_101cb3_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.1.3 on 2026-10-19 17:01
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0004_advanced_models"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AICallLog",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("task_name", models.CharField(help_text="Çağrıyı yapan görev", max_length=100)),
+                (
+                    "call_type",
+                    models.CharField(
+                        choices=[
+                            ("text", "Metin Üretimi"),
+                            ("stream", "Akışlı Metin Üretimi"),
+                            ("image", "Görsel Üretimi"),
+                            ("classify", "Sınıflandırma"),
+                        ],
+                        help_text="Çağrı tipi",
+                        max_length=20,
+                    ),
+                ),
+                ("model", models.CharField(help_text="Kullanılan AI modeli", max_length=100)),
+                (
+                    "outcome",
+                    models.CharField(
+                        choices=[
+                            ("success", "Başarılı"),
+                            ("empty", "Boş Yanıt"),
+                            ("aborted", "Erken Durduruldu"),
+                            ("rate_limited", "Hız Limiti (429)"),
+                            ("error", "Hata"),
+                        ],
+                        help_text="Çağrı sonucu",
+                        max_length=20,
+                    ),
+                ),
+                ("prompt_tokens", models.IntegerField(default=0, help_text="Girdi token sayısı")),
+                ("output_tokens", models.IntegerField(default=0, help_text="Çıktı token sayısı")),
+                ("thinking_tokens", models.IntegerField(default=0, help_text="Düşünme (thinking) token sayısı")),
+                ("total_tokens", models.IntegerField(default=0, help_text="Toplam token sayısı")),
+                ("images", models.IntegerField(default=0, help_text="Üretilen görsel sayısı")),
+                ("latency_ms", models.IntegerField(default=0, help_text="Retry'lar dahil toplam süre (milisaniye)")),
+                ("retries", models.IntegerField(default=0, help_text="Yeniden deneme sayısı")),
+                ("cost_usd", models.FloatField(default=0, help_text="Tahmini maliyet (USD)")),
+                ("error_message", models.TextField(blank=True, help_text="Hata mesajı (varsa)")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now, help_text="Çağrı zamanı")),
+                (
+                    "article",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="İlgili makale (çağrı anında makale yoksa boş)",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="ai_calls",
+                        to="news.article",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "AI Çağrı Kaydı",
+                "verbose_name_plural": "AI Çağrı Kayıtları",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(fields=["model", "-created_at"], name="news_aicall_model_477c3d_idx"),
+                    models.Index(fields=["article", "-created_at"], name="news_aicall_article_4c90d7_idx"),
+                    models.Index(fields=["-created_at"], name="news_aicall_created_d7d236_idx"),
+                ],
+            },
+        ),
+    ]
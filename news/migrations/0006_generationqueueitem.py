@@ -0,0 +1,78 @@
+# Generated by Django 5.1.3 on 2026-10-19 17:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0005_aicalllog"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GenerationQueueItem",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "pipeline",
+                    models.CharField(
+                        choices=[
+                            ("v1", "Klasik (generate_ai_content)"),
+                            ("v2", "Geliştirilmiş (generate_ai_content_v2)"),
+                        ],
+                        default="v1",
+                        help_text="Üretim pipeline'ı",
+                        max_length=10,
+                    ),
+                ),
+                ("score", models.FloatField(default=0, help_text="Öncelik puanı (0-100)")),
+                (
+                    "sort_key",
+                    models.FloatField(
+                        db_index=True, default=0, help_text="Yaşlandırma dahil sıralama anahtarı (büyük olan önce)"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Kuyrukta"),
+                            ("dispatched", "Üretimde"),
+                            ("completed", "Yayınlandı"),
+                            ("failed", "Başarısız"),
+                        ],
+                        default="queued",
+                        help_text="Kuyruk durumu",
+                        max_length=20,
+                    ),
+                ),
+                ("task_id", models.CharField(blank=True, help_text="Gönderilen Celery görev ID'si", max_length=255)),
+                (
+                    "enqueued_at",
+                    models.DateTimeField(default=django.utils.timezone.now, help_text="Kuyruğa girme zamanı"),
+                ),
+                ("dispatched_at", models.DateTimeField(blank=True, help_text="Üretime gönderilme zamanı", null=True)),
+                ("completed_at", models.DateTimeField(blank=True, help_text="Üretimin bitiş zamanı", null=True)),
+                (
+                    "article",
+                    models.OneToOneField(
+                        help_text="Üretilecek makale",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="generation_queue_item",
+                        to="news.article",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Üretim Kuyruğu Kaydı",
+                "verbose_name_plural": "Üretim Kuyruğu Kayıtları",
+                "ordering": ["-sort_key"],
+                "indexes": [
+                    models.Index(fields=["status", "-sort_key"], name="news_genera_status_5bfba4_idx"),
+                    models.Index(fields=["status", "-completed_at"], name="news_genera_status_7d16c9_idx"),
+                ],
+            },
+        ),
+    ]
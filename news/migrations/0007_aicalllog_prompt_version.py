@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-19 17:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0006_generationqueueitem"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="aicalllog",
+            name="prompt_version",
+            field=models.CharField(
+                blank=True, db_index=True, help_text="Prompt şablonu sürümü (örn. news:default:v1)", max_length=150
+            ),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.1.3 on 2026-10-19 17:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0007_aicalllog_prompt_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PipelineRun",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("run_id", models.CharField(help_text="Çalıştırma kimliği", max_length=32, unique=True)),
+                ("title", models.CharField(blank=True, help_text="Haber başlığı", max_length=300)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("running", "Çalışıyor"), ("failed", "Başarısız"), ("completed", "Tamamlandı")],
+                        default="running",
+                        help_text="Çalıştırma durumu",
+                        max_length=20,
+                    ),
+                ),
+                ("fused", models.BooleanField(default=True, help_text="Ucuz aşamalar birleştirilmiş mi")),
+                ("parallel", models.BooleanField(default=True, help_text="Bağımsız aşamalar paralel mi")),
+                ("input_data", models.JSONField(blank=True, default=dict, help_text="Pipeline'a gelen ilk veri")),
+                ("last_stage", models.CharField(blank=True, help_text="Son tamamlanan aşama", max_length=50)),
+                ("failed_stage", models.CharField(blank=True, help_text="Son hata alan aşama", max_length=50)),
+                ("error_message", models.TextField(blank=True, help_text="Son hata mesajı (varsa)")),
+                ("resume_count", models.IntegerField(default=0, help_text="Devam ettirilme sayısı")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "article",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Yayınlanan makale",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="pipeline_runs",
+                        to="news.article",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Pipeline Çalıştırması",
+                "verbose_name_plural": "Pipeline Çalıştırmaları",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="PipelineCheckpoint",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("stage", models.CharField(help_text="Tamamlanan aşama", max_length=50)),
+                ("data", models.JSONField(blank=True, default=dict, help_text="Aşama sonrası article_data")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "run",
+                    models.ForeignKey(
+                        help_text="İlgili çalıştırma",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="checkpoints",
+                        to="news.pipelinerun",
+                        to_field="run_id",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Pipeline Kontrol Noktası",
+                "verbose_name_plural": "Pipeline Kontrol Noktaları",
+                "ordering": ["created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="pipelinerun",
+            index=models.Index(fields=["status", "updated_at"], name="news_pipeli_status_e2af9e_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="pipelinecheckpoint",
+            constraint=models.UniqueConstraint(fields=("run", "stage"), name="unique_pipeline_checkpoint"),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.1.3 on 2026-10-19 18:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0008_pipelinerun"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaAsset",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("sha256", models.CharField(help_text="Kaynak baytların SHA-256 özeti", max_length=64, unique=True)),
+                ("phash", models.CharField(blank=True, help_text="64 bit algısal özet (hex)", max_length=16)),
+                ("source_url", models.URLField(blank=True, help_text="İlk görülen kaynak URL", max_length=1000)),
+                ("width", models.IntegerField(default=0, help_text="Kaynak genişliği (px)")),
+                ("height", models.IntegerField(default=0, help_text="Kaynak yüksekliği (px)")),
+                ("byte_size", models.IntegerField(default=0, help_text="Kaynak boyutu (bayt)")),
+                ("variants", models.JSONField(blank=True, default=dict, help_text="Varyant adı -> depolama yolu")),
+                ("ref_count", models.IntegerField(default=0, help_text="Görseli kullanan haber sayısı")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "last_used_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, help_text="Son bağlanma / bırakılma zamanı"
+                    ),
+                ),
+                (
+                    "canonical",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Neredeyse aynı olduğu asıl görsel (varsa)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="aliases",
+                        to="news.mediaasset",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Medya Varlığı",
+                "verbose_name_plural": "Medya Varlıkları",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="MediaAssetReference",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "article",
+                    models.ForeignKey(
+                        help_text="Görseli kullanan haber",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="media_asset_references",
+                        to="news.article",
+                    ),
+                ),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        help_text="Kullanılan görsel",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="references",
+                        to="news.mediaasset",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Medya Varlığı Referansı",
+                "verbose_name_plural": "Medya Varlığı Referansları",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="mediaasset",
+            index=models.Index(fields=["canonical", "created_at"], name="news_mediaa_canonic_981c2d_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="mediaasset",
+            index=models.Index(fields=["ref_count", "last_used_at"], name="news_mediaa_ref_cou_95f376_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="mediaassetreference",
+            constraint=models.UniqueConstraint(fields=("asset", "article"), name="unique_media_asset_reference"),
+        ),
+    ]
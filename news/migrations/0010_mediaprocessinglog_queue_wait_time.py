@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-19 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0009_mediaasset"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mediaprocessinglog",
+            name="queue_wait_time",
+            field=models.FloatField(
+                blank=True, help_text="Kuyrukta kaynak (CPU / bellek) bekleme süresi (saniye)", null=True
+            ),
+        ),
+    ]
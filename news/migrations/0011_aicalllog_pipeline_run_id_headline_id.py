@@ -0,0 +1,29 @@
+# Generated by Django 5.1.3 on 2026-10-19 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0010_mediaprocessinglog_queue_wait_time"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="aicalllog",
+            name="pipeline_run_id",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="Pipeline çalıştırma kimliği (makale yayından önce)",
+                max_length=32,
+            ),
+        ),
+        migrations.AddField(
+            model_name="aicalllog",
+            name="headline_id",
+            field=models.IntegerField(
+                blank=True, db_index=True, help_text="Sınıflandırılan başlık (HeadlineScore) ID'si", null=True
+            ),
+        ),
+    ]
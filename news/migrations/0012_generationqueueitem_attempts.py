@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-19 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0011_aicalllog_pipeline_run_id_headline_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="generationqueueitem",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0, help_text="Üretime gönderilme sayısı"),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-19 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0012_generationqueueitem_attempts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pipelinerun",
+            name="lease_expires_at",
+            field=models.DateTimeField(
+                blank=True, help_text="Çalışan aşamanın retry'larıyla en geç bitmesi gereken zaman", null=True
+            ),
+        ),
+    ]
@@ -411,6 +411,10 @@ class MediaProcessingLog(models.Model):
     # Performans
     processing_time = models.FloatField(help_text="İşleme süresi (saniye)")
 
+    queue_wait_time = models.FloatField(
+        null=True, blank=True, help_text="Kuyrukta kaynak (CPU / bellek) bekleme süresi (saniye)"
+    )
+
     # Hata
     error_message = models.TextField(blank=True, help_text="Hata mesajı (varsa)")
 
@@ -4,6 +4,7 @@ Geliştirilmiş İçerik Üretim Sistemi için Genişletilmiş Modeller
 
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 from .models import Article, RssSource
 
@@ -376,3 +377,354 @@ class ContentGenerationLog(models.Model):
 
     def __str__(self):
         return f"{self.get_stage_display()} - {self.get_status_display()}"
+
+
+class GenerationDraft(models.Model):
+    """
+    Akışlı (streaming) içerik üretimi sırasında gelen metni parça parça saklar.
+    Worker çökse bile ücreti ödenmiş yanıt kaybolmaz; tekrar denemede kullanılır.
+    """
+
+    STATUS_CHOICES = [
+        ("streaming", "Akış Devam Ediyor"),
+        ("completed", "Tamamlandı"),
+        ("aborted", "Erken Durduruldu"),
+    ]
+
+    article = models.OneToOneField(
+        Article, on_delete=models.CASCADE, related_name="generation_draft", help_text="İlgili makale"
+    )
+
+    content = models.TextField(blank=True, help_text="Şu ana kadar üretilen metin")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="streaming", help_text="Taslak durumu")
+
+    abort_reason = models.CharField(max_length=255, blank=True, help_text="Erken durdurma nedeni (varsa)")
+
+    chunk_count = models.IntegerField(default=0, help_text="Alınan akış parçası sayısı")
+
+    ai_model_used = models.CharField(max_length=50, blank=True, help_text="Kullanılan AI modeli")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Üretim Taslağı"
+        verbose_name_plural = "Üretim Taslakları"
+        ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["status", "-updated_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.get_status_display()} - {self.article.title[:50]}"
+
+
+class AICallLog(models.Model):
+    """
+    Her Gen AI çağrısının (metin, akış, görsel, sınıflandırma) kaydı.
+    Model, token kullanımı, gecikme, retry sayısı, sonuç ve tahmini maliyet tutulur.
+    Kayıtlar news.ai_instrumentation tarafından toplu (bulk_create) yazılır.
+    """
+
+    CALL_TYPE_CHOICES = [
+        ("text", "Metin Üretimi"),
+        ("stream", "Akışlı Metin Üretimi"),
+        ("image", "Görsel Üretimi"),
+        ("classify", "Sınıflandırma"),
+    ]
+
+    OUTCOME_CHOICES = [
+        ("success", "Başarılı"),
+        ("empty", "Boş Yanıt"),
+        ("aborted", "Erken Durduruldu"),
+        ("rate_limited", "Hız Limiti (429)"),
+        ("error", "Hata"),
+    ]
+
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="ai_calls",
+        help_text="İlgili makale (çağrı anında makale yoksa boş)",
+    )
+
+    pipeline_run_id = models.CharField(
+        max_length=32, blank=True, db_index=True, help_text="Pipeline çalıştırma kimliği (makale yayından önce)"
+    )
+
+    headline_id = models.IntegerField(
+        null=True, blank=True, db_index=True, help_text="Sınıflandırılan başlık (HeadlineScore) ID'si"
+    )
+
+    task_name = models.CharField(max_length=100, help_text="Çağrıyı yapan görev")
+
+    call_type = models.CharField(max_length=20, choices=CALL_TYPE_CHOICES, help_text="Çağrı tipi")
+
+    model = models.CharField(max_length=100, help_text="Kullanılan AI modeli")
+
+    prompt_version = models.CharField(
+        max_length=150, blank=True, db_index=True, help_text="Prompt şablonu sürümü (örn. news:default:v1)"
+    )
+
+    outcome = models.CharField(max_length=20, choices=OUTCOME_CHOICES, help_text="Çağrı sonucu")
+
+    prompt_tokens = models.IntegerField(default=0, help_text="Girdi token sayısı")
+
+    output_tokens = models.IntegerField(default=0, help_text="Çıktı token sayısı")
+
+    thinking_tokens = models.IntegerField(default=0, help_text="Düşünme (thinking) token sayısı")
+
+    total_tokens = models.IntegerField(default=0, help_text="Toplam token sayısı")
+
+    images = models.IntegerField(default=0, help_text="Üretilen görsel sayısı")
+
+    latency_ms = models.IntegerField(default=0, help_text="Retry'lar dahil toplam süre (milisaniye)")
+
+    retries = models.IntegerField(default=0, help_text="Yeniden deneme sayısı")
+
+    cost_usd = models.FloatField(default=0, help_text="Tahmini maliyet (USD)")
+
+    error_message = models.TextField(blank=True, help_text="Hata mesajı (varsa)")
+
+    created_at = models.DateTimeField(default=timezone.now, help_text="Çağrı zamanı")
+
+    class Meta:
+        verbose_name = "AI Çağrı Kaydı"
+        verbose_name_plural = "AI Çağrı Kayıtları"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["model", "-created_at"]),
+            models.Index(fields=["article", "-created_at"]),
+            models.Index(fields=["-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.task_name} - {self.model} - {self.get_outcome_display()}"
+
+
+class GenerationQueueItem(models.Model):
+    """
+    Skor öncelikli içerik üretim kuyruğu kaydı.
+    Makaleler geliş sırasına göre değil, başlık puanı / sınıflandırma önemine göre
+    (bekleme süresiyle yaşlandırılarak) üretime gönderilir. Bkz. news.generation_queue.
+    """
+
+    PIPELINE_CHOICES = [
+        ("v1", "Klasik (generate_ai_content)"),
+        ("v2", "Geliştirilmiş (generate_ai_content_v2)"),
+    ]
+
+    STATUS_CHOICES = [
+        ("queued", "Kuyrukta"),
+        ("dispatched", "Üretimde"),
+        ("completed", "Yayınlandı"),
+        ("failed", "Başarısız"),
+    ]
+
+    article = models.OneToOneField(
+        Article, on_delete=models.CASCADE, related_name="generation_queue_item", help_text="Üretilecek makale"
+    )
+
+    pipeline = models.CharField(max_length=10, choices=PIPELINE_CHOICES, default="v1", help_text="Üretim pipeline'ı")
+
+    score = models.FloatField(default=0, help_text="Öncelik puanı (0-100)")
+
+    sort_key = models.FloatField(
+        default=0, db_index=True, help_text="Yaşlandırma dahil sıralama anahtarı (büyük olan önce)"
+    )
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued", help_text="Kuyruk durumu")
+
+    task_id = models.CharField(max_length=255, blank=True, help_text="Gönderilen Celery görev ID'si")
+
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="Üretime gönderilme sayısı")
+
+    enqueued_at = models.DateTimeField(default=timezone.now, help_text="Kuyruğa girme zamanı")
+
+    dispatched_at = models.DateTimeField(null=True, blank=True, help_text="Üretime gönderilme zamanı")
+
+    completed_at = models.DateTimeField(null=True, blank=True, help_text="Üretimin bitiş zamanı")
+
+    class Meta:
+        verbose_name = "Üretim Kuyruğu Kaydı"
+        verbose_name_plural = "Üretim Kuyruğu Kayıtları"
+        ordering = ["-sort_key"]
+        indexes = [
+            models.Index(fields=["status", "-sort_key"]),
+            models.Index(fields=["status", "-completed_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.score:.1f} - {self.get_status_display()} - {self.article.title[:50]}"
+
+
+class PipelineRun(models.Model):
+    """
+    Gelişmiş içerik pipeline'ının (news.tasks_advanced) bir çalıştırması.
+    Aşama çıktıları PipelineCheckpoint olarak saklanır; başarısız ya da yarım kalan
+    çalıştırmalar tamamlanan aşamaları (ve ücretli AI çağrılarını) tekrarlamadan devam ettirilir.
+    """
+
+    STATUS_CHOICES = [
+        ("running", "Çalışıyor"),
+        ("failed", "Başarısız"),
+        ("completed", "Tamamlandı"),
+    ]
+
+    run_id = models.CharField(max_length=32, unique=True, help_text="Çalıştırma kimliği")
+
+    title = models.CharField(max_length=300, blank=True, help_text="Haber başlığı")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running", help_text="Çalıştırma durumu")
+
+    fused = models.BooleanField(default=True, help_text="Ucuz aşamalar birleştirilmiş mi")
+
+    parallel = models.BooleanField(default=True, help_text="Bağımsız aşamalar paralel mi")
+
+    input_data = models.JSONField(default=dict, blank=True, help_text="Pipeline'a gelen ilk veri")
+
+    last_stage = models.CharField(max_length=50, blank=True, help_text="Son tamamlanan aşama")
+
+    failed_stage = models.CharField(max_length=50, blank=True, help_text="Son hata alan aşama")
+
+    error_message = models.TextField(blank=True, help_text="Son hata mesajı (varsa)")
+
+    resume_count = models.IntegerField(default=0, help_text="Devam ettirilme sayısı")
+
+    lease_expires_at = models.DateTimeField(
+        null=True, blank=True, help_text="Çalışan aşamanın retry'larıyla en geç bitmesi gereken zaman"
+    )
+
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="pipeline_runs",
+        help_text="Yayınlanan makale",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Pipeline Çalıştırması"
+        verbose_name_plural = "Pipeline Çalıştırmaları"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "updated_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.run_id} - {self.get_status_display()} - {self.title[:50]}"
+
+
+class PipelineCheckpoint(models.Model):
+    """
+    Bir pipeline aşamasının tamamlandıktan sonraki article_data çıktısı.
+    Çalıştırma ve aşama başına tek kayıt tutulur.
+    """
+
+    run = models.ForeignKey(
+        PipelineRun,
+        on_delete=models.CASCADE,
+        to_field="run_id",
+        related_name="checkpoints",
+        help_text="İlgili çalıştırma",
+    )
+
+    stage = models.CharField(max_length=50, help_text="Tamamlanan aşama")
+
+    data = models.JSONField(default=dict, blank=True, help_text="Aşama sonrası article_data")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Pipeline Kontrol Noktası"
+        verbose_name_plural = "Pipeline Kontrol Noktaları"
+        ordering = ["created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["run", "stage"], name="unique_pipeline_checkpoint"),
+        ]
+
+    def __str__(self):
+        return f"{self.run.run_id} - {self.stage}"
+
+
+class MediaAsset(models.Model):
+    """
+    İçerik adresli medya deposundaki görsel (bkz. news.media_store).
+    Aynı görsel (aynı bayt: SHA-256, neredeyse aynı kırpım: pHash) birden çok haberle gelse
+    de bir kez indirilip encode edilir; haberler ortak varyant dosyalarını kullanır.
+    Neredeyse aynı görseller dosyasız birer takma kayıt olarak asıl görsele (canonical) bağlanır.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True, help_text="Kaynak baytların SHA-256 özeti")
+
+    phash = models.CharField(max_length=16, blank=True, help_text="64 bit algısal özet (hex)")
+
+    canonical = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="aliases",
+        help_text="Neredeyse aynı olduğu asıl görsel (varsa)",
+    )
+
+    source_url = models.URLField(max_length=1000, blank=True, help_text="İlk görülen kaynak URL")
+
+    width = models.IntegerField(default=0, help_text="Kaynak genişliği (px)")
+
+    height = models.IntegerField(default=0, help_text="Kaynak yüksekliği (px)")
+
+    byte_size = models.IntegerField(default=0, help_text="Kaynak boyutu (bayt)")
+
+    variants = models.JSONField(default=dict, blank=True, help_text="Varyant adı -> depolama yolu")
+
+    ref_count = models.IntegerField(default=0, help_text="Görseli kullanan haber sayısı")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    last_used_at = models.DateTimeField(default=timezone.now, help_text="Son bağlanma / bırakılma zamanı")
+
+    class Meta:
+        verbose_name = "Medya Varlığı"
+        verbose_name_plural = "Medya Varlıkları"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["canonical", "created_at"]),
+            models.Index(fields=["ref_count", "last_used_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} - {self.width}x{self.height} - {self.ref_count} haber"
+
+
+class MediaAssetReference(models.Model):
+    """
+    Bir haberin depodaki bir görseli kullanması. MediaAsset.ref_count bu kayıtlarla tutulur.
+    """
+
+    asset = models.ForeignKey(
+        MediaAsset, on_delete=models.CASCADE, related_name="references", help_text="Kullanılan görsel"
+    )
+
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="media_asset_references", help_text="Görseli kullanan haber"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Medya Varlığı Referansı"
+        verbose_name_plural = "Medya Varlığı Referansları"
+        constraints = [
+            models.UniqueConstraint(fields=["asset", "article"], name="unique_media_asset_reference"),
+        ]
+
+    def __str__(self):
+        return f"{self.asset.sha256[:12]} - {self.article.title[:50]}"
@@ -7,10 +7,19 @@ from datetime import timedelta
 
 from django.core.cache import cache
 from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 
+from .generation_queue import TOP_STORY_SCORE
 from .models import Article, RssSource
-from .models_extended import ArticleClassification, ContentGenerationLog, HeadlineScore
+from .models_extended import (
+    AICallLog,
+    ArticleClassification,
+    ContentGenerationLog,
+    GenerationQueueItem,
+    HeadlineScore,
+)
+from .stats_utils import percentile
 
 
 class ContentGenerationMetrics:
@@ -446,3 +455,124 @@ class PerformanceMonitor:
             "metrics": metrics,
             "bottlenecks": bottlenecks,
         }
+
+
+class AIUsageMetrics:
+    """
+    Gen AI çağrı kayıtlarından (AICallLog) maliyet ve kapasite raporları.
+    """
+
+    GROUP_FIELDS = {
+        "day": "day",
+        "model": "model",
+        "article": "article_id",
+        "task": "task_name",
+        "call_type": "call_type",
+        "prompt": "prompt_version",
+    }
+
+    @staticmethod
+    def get_rollup(days=7, group_by=("day", "model"), article_id=None):
+        """
+        AI çağrılarını makale / model / gün (ve görev, çağrı tipi) bazında topla.
+
+        Args:
+            days: Geriye dönük gün sayısı
+            group_by: Gruplama alanları (day, model, article, task, call_type)
+            article_id: Sadece bu makalenin çağrıları
+
+        Returns:
+            list: Grup başına çağrı, hata, retry, token, görsel, maliyet ve ortalama gecikme
+        """
+        unknown = set(group_by) - set(AIUsageMetrics.GROUP_FIELDS)
+        if unknown:
+            raise ValueError(f"Geçersiz gruplama alanı: {', '.join(sorted(unknown))}")
+
+        since = timezone.now() - timedelta(days=days)
+        calls = AICallLog.objects.filter(created_at__gte=since)
+        if article_id is not None:
+            calls = calls.filter(article_id=article_id)
+
+        fields = [AIUsageMetrics.GROUP_FIELDS[name] for name in group_by]
+        rollup = (
+            calls.annotate(day=TruncDate("created_at"))
+            .values(*fields)
+            .annotate(
+                calls=Count("id"),
+                failures=Count("id", filter=~Q(outcome="success")),
+                rate_limited=Count("id", filter=Q(outcome="rate_limited")),
+                retries=Sum("retries"),
+                prompt_tokens=Sum("prompt_tokens"),
+                output_tokens=Sum("output_tokens"),
+                thinking_tokens=Sum("thinking_tokens"),
+                total_tokens=Sum("total_tokens"),
+                images=Sum("images"),
+                cost_usd=Sum("cost_usd"),
+                avg_latency_ms=Avg("latency_ms"),
+            )
+            .order_by(*fields)
+        )
+
+        return list(rollup)
+
+    @staticmethod
+    def get_article_cost(article_id):
+        """
+        Tek bir makalenin toplam AI maliyeti ve token kullanımı.
+        """
+        totals = AICallLog.objects.filter(article_id=article_id).aggregate(
+            calls=Count("id"),
+            total_tokens=Sum("total_tokens"),
+            images=Sum("images"),
+            cost_usd=Sum("cost_usd"),
+            latency_ms=Sum("latency_ms"),
+        )
+
+        return {key: value or 0 for key, value in totals.items()}
+
+
+class GenerationQueueMetrics:
+    """
+    Skor öncelikli üretim kuyruğu durumu ve yayın süresi (time-to-publish) raporları.
+    """
+
+    @staticmethod
+    def get_queue_status():
+        """
+        Kuyruktaki ve üretimdeki makale sayıları.
+        """
+        counts = dict(GenerationQueueItem.objects.values_list("status").annotate(count=Count("id")))
+        return {status: counts.get(status, 0) for status, _ in GenerationQueueItem.STATUS_CHOICES}
+
+    @staticmethod
+    def get_time_to_publish_stats(hours=24, top_score=TOP_STORY_SCORE):
+        """
+        Kuyruğa girişten yayına kadar geçen sürenin yüzdelikleri.
+        Makaleler öncelik puanına göre "top" (>= top_score) ve "other" olarak ayrılır.
+
+        Args:
+            hours: Son kaç saatte yayınlananlar
+            top_score: En iyi haber eşiği
+
+        Returns:
+            dict: Katman başına count, p50, p95 ve max (saniye)
+        """
+        since = timezone.now() - timedelta(hours=hours)
+        rows = GenerationQueueItem.objects.filter(
+            status="completed", completed_at__gte=since, article__published_at__isnull=False
+        ).values_list("score", "enqueued_at", "article__published_at")
+
+        durations = {"top": [], "other": []}
+        for score, enqueued_at, published_at in rows:
+            tier = "top" if score >= top_score else "other"
+            durations[tier].append(max(0.0, (published_at - enqueued_at).total_seconds()))
+
+        return {
+            tier: {
+                "count": len(values),
+                "p50": round(percentile(values, 50), 1),
+                "p95": round(percentile(values, 95), 1),
+                "max": round(max(values, default=0.0), 1),
+            }
+            for tier, values in durations.items()
+        }
@@ -0,0 +1,168 @@
+"""
+HaberNexus - Pipeline Bağlam Deposu
+
+Gelişmiş pipeline'da (news.tasks_advanced) her aşama tam article_data'yı alıp döndürdüğünde
+içerik, SEO ve medya bilgisi eklendikçe büyüyen sözlük her broker atlamasında yeniden
+JSON'a çevrilir ve her görevin sonucu olarak result backend'de (Redis) tekrar saklanır.
+
+Bu modülle görevler arasında yalnızca küçük bir referans taşınır:
+
+- Başlangıç verisi ve her aşamanın değiştirdiği alanlar (delta) Django cache'ine (Redis)
+  çalıştırma + aşama başına ayrı anahtarla yazılır; paralel dallar birbirinin üzerine yazmaz.
+- Referans; çalıştırma kimliği, aşama süreleri ve deltalardaki küçük skaler alanlardan
+  (yayın durumu, makale kimliği, filtre bayrakları...) oluşur.
+- Aşama çalışmadan önce bağlam tek get_many ile kurulur. Cache'te eksik anahtar varsa
+  (süre dolumu, Redis yeniden başlatma) bağlam PipelineRun kontrol noktalarından kurulur
+  ve cache yeniden doldurulur.
+- Yayından sonra çalıştırmanın cache anahtarları silinir.
+
+Aşama fonksiyonları article_data alanlarına yeni değer atamalıdır; iç içe değerlerin yerinde
+değiştirilmesi deltaya yansımaz.
+"""
+
+import logging
+
+from django.core.cache import cache
+
+from core.models import Setting
+
+from . import pipeline_runs
+from .models_extended import PipelineRun
+
+logger = logging.getLogger(__name__)
+
+
+# Referansı tam veriden ayıran işaret alanı
+CONTEXT_MARKER = "pipeline_context"
+
+# Bağlam anahtarlarının cache'te kalma süresi; sonrasında kontrol noktalarından kurulur
+CONTEXT_TTL = 6 * 60 * 60
+
+# Deltadaki bu tipteki alanlar referansla da taşınır (küçük ve zincir sonucunda okunur)
+INLINE_TYPES = (bool, int, float, type(None))
+
+
+def is_slim_payloads_enabled() -> bool:
+    """
+    Görevler arasında tam veri yerine bağlam referansı taşınıp taşınmayacağını ayarlardan al.
+
+    Returns:
+        bool: PIPELINE_SLIM_PAYLOADS ayarı (varsayılan: True)
+    """
+    try:
+        slim_setting = Setting.objects.get(key="PIPELINE_SLIM_PAYLOADS")
+        return slim_setting.value.lower().strip() in ("1", "true", "yes", "on")
+    except Setting.DoesNotExist:
+        return True
+
+
+def _key(run_id: str, part: str) -> str:
+    return f"pipeline:ctx:{run_id}:{part}"
+
+
+def is_ref(article_data) -> bool:
+    """
+    Verinin bağlam referansı olup olmadığı.
+    """
+    return isinstance(article_data, dict) and article_data.get(CONTEXT_MARKER) is True
+
+
+def make_ref(run_id: str, stage_timings: dict | None = None, **inline) -> dict:
+    """
+    Bağlam referansı oluştur.
+    """
+    return {"pipeline_run_id": run_id, CONTEXT_MARKER: True, "stage_timings": dict(stage_timings or {}), **inline}
+
+
+def create(article_data: dict) -> dict:
+    """
+    Başlangıç verisini depoya yaz ve referansını döndür.
+    article_data'da pipeline_run_id bulunmalıdır (bkz. pipeline_runs.start_run).
+    """
+    run_id = article_data["pipeline_run_id"]
+    cache.set(_key(run_id, "input"), article_data, timeout=CONTEXT_TTL)
+    return make_ref(run_id, article_data.get("stage_timings"))
+
+
+def compute_delta(before: dict, after: dict, stage: str) -> dict:
+    """
+    Aşamanın eklediği veya değiştirdiği alanlar; aşama süresi stage_timings altında eklenir.
+    """
+    delta = {
+        key: value
+        for key, value in after.items()
+        if key != "stage_timings" and (key not in before or before[key] != value)
+    }
+    delta["stage_timings"] = {stage: after["stage_timings"][stage]}
+    return delta
+
+
+def advance(ref: dict, stage: str, delta: dict) -> dict:
+    """
+    Aşama deltasını depoya yaz ve aşamayı içeren yeni referansı döndür.
+    Yayınlanan çalıştırmanın anahtarları silinir.
+    """
+    run_id = ref["pipeline_run_id"]
+    timings = {**ref.get("stage_timings", {}), **delta["stage_timings"]}
+    inline = {key: value for key, value in delta.items() if isinstance(value, INLINE_TYPES)}
+
+    if delta.get("published"):
+        clear(run_id, timings)
+    else:
+        cache.set(_key(run_id, stage), delta, timeout=CONTEXT_TTL)
+
+    return {**ref, **inline, "stage_timings": timings}
+
+
+def load(ref: dict) -> dict:
+    """
+    Referanstan tam article_data'yı kur: başlangıç verisi, tamamlanan aşamaların deltaları
+    (tamamlanma sırasıyla) ve referansta taşınan alanlar.
+
+    Raises:
+        LookupError: Bağlam ne cache'te ne kontrol noktalarında bulunabildiyse
+    """
+    run_id = ref["pipeline_run_id"]
+    stages = list(ref.get("stage_timings", {}))
+    keys = [_key(run_id, "input")] + [_key(run_id, stage) for stage in stages]
+
+    values = cache.get_many(keys)
+    if len(values) == len(keys):
+        parts = [values[key] for key in keys]
+    else:
+        parts = _load_from_checkpoints(run_id, stages)
+        cache.set_many(dict(zip(keys, parts, strict=True)), timeout=CONTEXT_TTL)
+
+    article_data = dict(parts[0])
+    for delta in parts[1:]:
+        article_data.update(delta)
+    article_data.update(
+        {key: value for key, value in ref.items() if key not in (CONTEXT_MARKER, "stage_timings")},
+        stage_timings=dict(ref.get("stage_timings", {})),
+    )
+    return article_data
+
+
+def _load_from_checkpoints(run_id: str, stages: list) -> list:
+    """
+    Başlangıç verisi ve aşama deltalarını PipelineRun kontrol noktalarından oku.
+    """
+    try:
+        run = PipelineRun.objects.get(run_id=run_id)
+    except PipelineRun.DoesNotExist as e:
+        raise LookupError(f"Pipeline bağlamı bulunamadı: {run_id}") from e
+
+    checkpoints = pipeline_runs.load_checkpoints(run)
+    missing = [stage for stage in stages if stage not in checkpoints]
+    if missing:
+        raise LookupError(f"Pipeline bağlamında eksik aşamalar ({run_id}): {', '.join(missing)}")
+
+    logger.info(f"Pipeline context rebuilt from checkpoints: {run_id}")
+    return [run.input_data] + [checkpoints[stage] for stage in stages]
+
+
+def clear(run_id: str, stages) -> None:
+    """
+    Çalıştırmanın cache anahtarlarını sil.
+    """
+    cache.delete_many([_key(run_id, "input")] + [_key(run_id, stage) for stage in stages])
@@ -0,0 +1,188 @@
+"""
+HaberNexus - Gelişmiş Pipeline Kontrol Noktaları
+
+Gelişmiş pipeline'ın (news.tasks_advanced) her çalıştırması bir PipelineRun kaydı alır;
+kimliği article_data["pipeline_run_id"] ile aşamadan aşamaya taşınır:
+
+- Her aşama tamamlandığında aşamanın değiştirdiği alanlar (delta) PipelineCheckpoint olarak
+  yazılır (çalıştırma + aşama başına tek kayıt, paralel dallar birbirinin üzerine yazmaz).
+- Retry'lar tükenip zincir durduğunda article_data kaybolmaz; devam ettirme, kontrol
+  noktalarını aşama sırasıyla birleştirip ilk tamamlanmamış aşamadan yeni zincir kurar.
+- Tamamlanmış aşamalar (stage_timings'te kaydı olanlar) tekrar çalıştırılmaz; içerik
+  üretimi gibi ücretli adımlar yeniden ödenmez.
+- Çöken worker'lar hatayı kaydedemediği için kirası (lease) dolan "running" çalıştırmalar
+  da devam ettirilebilir sayılır. Her aşama başlarken kira, görevin kalan retry'larıyla en
+  kötü durumdaki süresine uzatılır (bkz. extend_lease); kontrol noktası kirayı kapatır ve
+  sonraki görevin kuyrukta beklemesi için STALE_RUN_TIMEOUT kadar pay kalır. Böylece
+  retry bekleyen ya da kuyrukta sırası gelmemiş zincirin yanına ikinci zincir kurulmaz.
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import Setting
+
+from .models_extended import PipelineCheckpoint, PipelineRun
+
+logger = logging.getLogger(__name__)
+
+
+# Kirası bu süreden uzun süredir dolmuş "running" çalıştırmalar takılmış sayılır
+# (aşamalar arası kuyruk beklemesi payı)
+STALE_RUN_TIMEOUT = timedelta(hours=2)
+
+# Tamamlanan çalıştırmalar bu süre sonunda kontrol noktalarıyla birlikte silinir
+COMPLETED_RUN_RETENTION = timedelta(days=7)
+
+
+def get_max_resumes() -> int:
+    """
+    Bir çalıştırmanın en fazla kaç kez devam ettirileceğini ayarlardan al.
+
+    Returns:
+        int: PIPELINE_MAX_RESUMES ayarı (varsayılan: 3)
+    """
+    try:
+        max_resumes_setting = Setting.objects.get(key="PIPELINE_MAX_RESUMES")
+        return max(0, int(max_resumes_setting.value))
+    except (Setting.DoesNotExist, ValueError):
+        return 3
+
+
+def start_run(article_data: dict, fused: bool, parallel: bool) -> str:
+    """
+    Yeni çalıştırma kaydı oluştur ve kimliğini article_data'ya yaz.
+
+    Returns:
+        str: Çalıştırma kimliği
+    """
+    run_id = uuid.uuid4().hex
+    article_data["pipeline_run_id"] = run_id
+    PipelineRun.objects.create(
+        run_id=run_id,
+        title=str(article_data.get("title", ""))[:300],
+        fused=fused,
+        parallel=parallel,
+        input_data=article_data,
+        lease_expires_at=timezone.now(),
+    )
+    return run_id
+
+
+def extend_lease(article_data: dict, seconds: int):
+    """
+    Aşama başlarken çalıştırmanın kirasını uzat; kira dolmadan çalıştırma devam ettirilmez.
+
+    Args:
+        article_data: Aşama girdisi (çalıştırma kimliği yoksa bir şey yapılmaz)
+        seconds: Aşamanın retry'larıyla birlikte en kötü durumda sürebileceği süre
+    """
+    run_id = article_data.get("pipeline_run_id")
+    if not run_id:
+        return
+
+    PipelineRun.objects.filter(run_id=run_id, status="running").update(
+        lease_expires_at=timezone.now() + timedelta(seconds=seconds)
+    )
+
+
+def save_checkpoint(stage: str, article_data: dict, data: dict | None = None):
+    """
+    Tamamlanan aşamanın çıktısını kaydet, çalıştırmanın ilerlemesini güncelle ve kirayı kapat.
+    Çalıştırma kimliği olmayan veriler (doğrudan çağrılan görevler) ve tamamlanmış
+    çalıştırmalar (geç kalan ikinci zincir) için bir şey yapmaz.
+
+    Args:
+        stage: Tamamlanan aşama
+        article_data: Aşama sonrası tam veri
+        data: Saklanacak veri (verilmezse article_data); genellikle aşamanın deltası
+    """
+    run_id = article_data.get("pipeline_run_id")
+    if not run_id:
+        return
+
+    now = timezone.now()
+    updates = {"last_stage": stage, "status": "running", "updated_at": now, "lease_expires_at": now}
+    if article_data.get("published"):
+        updates.update(status="completed", article_id=article_data.get("article_id"))
+    if not PipelineRun.objects.filter(run_id=run_id).exclude(status="completed").update(**updates):
+        logger.warning(f"Pipeline run not found or already completed, checkpoint skipped: {run_id}")
+        return
+
+    # Kontrol noktası anahtarı çalıştırma kimliğidir; çalıştırma satırını ayrıca okumaya gerek yok
+    PipelineCheckpoint.objects.bulk_create(
+        [PipelineCheckpoint(run_id=run_id, stage=stage, data=article_data if data is None else data)],
+        update_conflicts=True,
+        unique_fields=["run", "stage"],
+        update_fields=["data"],
+    )
+
+
+def mark_failed(stage: str, article_data: dict, error: Exception):
+    """
+    Aşama hatasını çalıştırmaya işle. Yalnızca retry hakkı tükendiğinde çağrılır (bkz.
+    tasks_advanced.run_stage); "failed" çalıştırmalar hemen devam ettirilebilir sayılır.
+    """
+    run_id = article_data.get("pipeline_run_id")
+    if not run_id:
+        return
+
+    PipelineRun.objects.filter(run_id=run_id).exclude(status="completed").update(
+        status="failed", failed_stage=stage, error_message=str(error)[:2000], updated_at=timezone.now()
+    )
+
+
+def load_checkpoints(run: PipelineRun) -> dict:
+    """
+    Çalıştırmanın kontrol noktalarını aşama adına göre döndür.
+
+    Returns:
+        dict: {aşama: article_data}
+    """
+    return dict(run.checkpoints.values_list("stage", "data"))
+
+
+def get_resumable_runs(limit: int = 50, stale_after: timedelta = STALE_RUN_TIMEOUT):
+    """
+    Devam ettirilebilecek çalıştırmalar: başarısız olanlar ve kirası stale_after'dan uzun
+    süredir dolmuş "running" çalıştırmalar (kirası olmayan eski kayıtlarda updated_at).
+    En fazla devam ettirme sayısına ulaşanlar dahil edilmez.
+    """
+    stale_before = timezone.now() - stale_after
+    return (
+        PipelineRun.objects.alias(lease=Coalesce("lease_expires_at", "updated_at"))
+        .filter(Q(status="failed") | Q(status="running", lease__lt=stale_before))
+        .filter(resume_count__lt=get_max_resumes())
+        .order_by("updated_at")[:limit]
+    )
+
+
+def claim_run(run: PipelineRun) -> bool:
+    """
+    Çalıştırmayı devam ettirmek için sahiplen. Aynı anda iki devam ettirme yarışırsa
+    yalnızca biri kazanır (koşullu UPDATE).
+
+    Returns:
+        bool: Sahiplenme başarılıysa True
+    """
+    now = timezone.now()
+    claimed = PipelineRun.objects.filter(pk=run.pk, status=run.status, updated_at=run.updated_at).update(
+        status="running", resume_count=F("resume_count") + 1, updated_at=now, lease_expires_at=now
+    )
+    return claimed == 1
+
+
+def prune_completed_runs(retention: timedelta = COMPLETED_RUN_RETENTION) -> int:
+    """
+    Saklama süresi dolan tamamlanmış çalıştırmaları kontrol noktalarıyla birlikte sil.
+
+    Returns:
+        int: Silinen çalıştırma sayısı
+    """
+    _, per_model = PipelineRun.objects.filter(status="completed", updated_at__lt=timezone.now() - retention).delete()
+    return per_model.get(PipelineRun._meta.label, 0)
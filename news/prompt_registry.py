@@ -0,0 +1,211 @@
+"""
+HaberNexus - Derlenmiş Prompt Şablonu Kayıt Defteri
+
+Prompt şablonları süreç başına bir kez derlenir ve (tür, varyant, sürüm) anahtarıyla
+bellekte tutulur; makale başına veritabanından okunmaz.
+
+- Tür: rss_article (klasik pipeline), article (gelişmiş pipeline),
+  news / analysis / feature / opinion / tutorial (makale türleri)
+- Varyant: yazı stili veya kategori (PromptTemplate.category); bulunamazsa "default"
+- Sürüm: yerleşik şablonlar için BUILTIN_VERSION, veritabanı şablonları için PromptTemplate.version
+
+Aynı tür ve varyant için birden fazla aktif sürüm varsa makaleler bucket değerine göre
+sürümlere dağıtılır (A/B testi). Oluşturulan prompt, sürüm etiketini taşıyan bir str'dir
+(RenderedPrompt.version); bu etiket AI çağrı kayıtlarına ve üretim loglarına işlenir.
+
+PromptTemplate kaydedildiğinde / silindiğinde kayıt defteri geçersiz kılınır; diğer
+süreçler cache'teki sürüm numarası değişince şablonları yeniden yükler.
+
+Kullanım:
+    prompt = prompt_registry.render("news", variant=tone, bucket=article.id, title=..., category=...)
+    prompt.version  # "news:default:v1"
+"""
+
+import logging
+import string
+import threading
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models_advanced import PromptTemplate
+from .prompt_templates import BUILTIN_TEMPLATES, BUILTIN_VERSION
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_VERSION_KEY = "prompt_registry:version"
+
+# Sinyalsiz toplu güncellemelere karşı güvenlik süresi (saniye)
+REGISTRY_TTL = 300
+
+DEFAULT_VARIANT = "default"
+
+
+class RenderedPrompt(str):
+    """
+    Şablon sürüm etiketini taşıyan prompt metni.
+    """
+
+    version = ""
+
+    def __new__(cls, text: str, version: str):
+        prompt = super().__new__(cls, text)
+        prompt.version = version
+        return prompt
+
+
+class CompiledPrompt:
+    """
+    Ayrıştırılmış ve doğrulanmış prompt şablonu.
+    Derleme sırasında alanlar çıkarılır; desteklenmeyen alanlar (nitelik / indeks
+    erişimi, konumsal alanlar) reddedilir. Oluşturma tek bir format_map çağrısıdır.
+    """
+
+    def __init__(self, kind: str, variant: str, version: int, text: str, source: str = "builtin"):
+        self.kind = kind
+        self.variant = variant
+        self.version = version
+        self.source = source
+        self.text = text.strip()
+        self.tag = f"{kind}:{variant}:v{version}"
+
+        fields = set()
+        for _, field, _, _ in string.Formatter().parse(self.text):
+            if field is None:
+                continue
+            if not field.isidentifier():
+                raise ValueError(f"Desteklenmeyen şablon alanı: {{{field}}}")
+            fields.add(field)
+        self.fields = frozenset(fields)
+
+    def render(self, **context) -> RenderedPrompt:
+        """
+        Şablonu verilen değerlerle doldur.
+
+        Raises:
+            KeyError: Şablondaki bir alan context'te yoksa
+        """
+        return RenderedPrompt(self.text.format_map(context), self.tag)
+
+
+class PromptRegistry:
+    """
+    Süreç içi derlenmiş şablon kayıt defteri.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._compiled = None
+        self._active = None
+        self._version = None
+        self._built_at = 0.0
+
+    def _is_fresh(self, version) -> bool:
+        return (
+            self._compiled is not None and version == self._version and time.monotonic() - self._built_at < REGISTRY_TTL
+        )
+
+    def _load(self):
+        """
+        Yerleşik şablonları ve aktif PromptTemplate kayıtlarını derle (tek sorgu).
+        """
+        compiled = {}
+        active = defaultdict(list)
+
+        def add(prompt):
+            compiled[(prompt.kind, prompt.variant, prompt.version)] = prompt
+            active[(prompt.kind, prompt.variant)].append(prompt.version)
+
+        for kind, text in BUILTIN_TEMPLATES.items():
+            add(CompiledPrompt(kind, DEFAULT_VARIANT, BUILTIN_VERSION, text))
+
+        for template in PromptTemplate.objects.filter(is_active=True):
+            try:
+                add(
+                    CompiledPrompt(
+                        template.template_type,
+                        template.category,
+                        template.version,
+                        template.template_content,
+                        source=f"db:{template.id}",
+                    )
+                )
+            except ValueError as e:
+                logger.warning(f"Prompt şablonu derlenemedi ({template.name}): {e!s}")
+
+        return compiled, {key: sorted(set(versions)) for key, versions in active.items()}
+
+    def _ensure_loaded(self):
+        version = cache.get(REGISTRY_VERSION_KEY, 0)
+        if self._is_fresh(version):
+            return
+
+        with self._lock:
+            if not self._is_fresh(version):
+                self._compiled, self._active = self._load()
+                self._version = version
+                self._built_at = time.monotonic()
+
+    def get(self, kind: str, variant: str | None = None, bucket: int | None = None) -> CompiledPrompt:
+        """
+        Tür ve varyant için aktif şablonu döndür (varyant yoksa "default").
+
+        Args:
+            kind: Şablon türü
+            variant: Stil veya kategori
+            bucket: A/B dağıtımı için sabit değer (örn. makale ID'si); yoksa en yüksek sürüm
+
+        Raises:
+            KeyError: Tür için hiç şablon yoksa
+        """
+        self._ensure_loaded()
+        compiled, active = self._compiled, self._active
+
+        key = (kind, variant or DEFAULT_VARIANT)
+        if key not in active:
+            key = (kind, DEFAULT_VARIANT)
+        versions = active[key]
+
+        version = versions[bucket % len(versions)] if bucket is not None else versions[-1]
+        return compiled[(*key, version)]
+
+    def render(self, kind: str, variant: str | None = None, bucket: int | None = None, **context) -> RenderedPrompt:
+        """
+        Şablonu bul ve doldur. Veritabanı şablonu context ile oluşturulamazsa
+        (bilinmeyen alan) yerleşik şablona düşülür.
+        """
+        prompt = self.get(kind, variant, bucket)
+        try:
+            return prompt.render(**context)
+        except (KeyError, ValueError, IndexError) as e:
+            if prompt.source == "builtin":
+                raise
+            logger.warning(f"Prompt şablonu oluşturulamadı ({prompt.tag}): {e!s}")
+            return self.get(kind).render(**context)
+
+    def invalidate(self):
+        """
+        Bu süreçteki şablonları sil ve diğer süreçler için sürüm numarasını artır.
+        """
+        self._compiled = None
+
+        cache.add(REGISTRY_VERSION_KEY, 0, timeout=None)
+        try:
+            cache.incr(REGISTRY_VERSION_KEY)
+        except ValueError:
+            cache.set(REGISTRY_VERSION_KEY, 1, timeout=None)
+
+
+prompt_registry = PromptRegistry()
+
+
+@receiver(post_save, sender=PromptTemplate)
+@receiver(post_delete, sender=PromptTemplate)
+def _invalidate_on_change(**kwargs):
+    prompt_registry.invalidate()
+    # Commit'ten önce yeniden yükleyen diğer süreçler eski şablonu görmüş olabilir
+    transaction.on_commit(prompt_registry.invalidate)
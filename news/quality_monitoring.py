@@ -142,6 +142,7 @@ class QualityMetrics:
                     "processing_time__avg"
                 ]
                 or 0,
+                "avg_queue_wait_time": video_logs.aggregate(Avg("queue_wait_time"))["queue_wait_time__avg"] or 0,
             },
         }
 
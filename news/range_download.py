@@ -0,0 +1,283 @@
+"""
+HaberNexus - Devam Ettirilebilir, Aralıklı İndirme
+
+VideoProcessor kaynak videoyu 8 KB parçalarla indiriyor ve her denemede sıfırdan
+başlıyordu; kararsız bağlantılarda büyük videolar defalarca baştan iniyordu. RangeDownloader:
+
+- HEAD ile boyutu (Content-Length), doğrulayıcıyı (ETag / Last-Modified) ve Range desteğini öğrenir.
+- Dosyayı <hedef>.part'a büyük parçalarla (varsayılan 1 MB) yazar; hangi aralıkların
+  indiğini <hedef>.part.json'da tutar.
+- Deneme başarısız olursa kalan aralıkları Range + If-Range ile ister; inen baytlar tekrar
+  indirilmez. Durum dosyası sayesinde sonraki bir çalıştırma (örn. görev yeniden denemesi)
+  da kaldığı yerden devam eder; doğrulayıcı veya boyut değiştiyse baştan başlar.
+- Sunucu Range destekliyorsa ve dosya yeterince büyükse parts kadar aralığı paralel indirir.
+- Sonunda boyutu Content-Length ile doğrular; yanıt ETag'i değişirse (dosya güncellendi)
+  baştan indirir. Çöpe giden baytlar (wasted_bytes) raporlanır.
+- progress(inen, toplam) her parçadan sonra çağrılır (toplam bilinmiyorsa None).
+
+Django'ya bağımlı değildir.
+
+Kullanım:
+    stats = RangeDownloader(session, parts=4, progress=print).download(url, "/media/original.mp4")
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Okuma / yazma parça boyutu
+CHUNK_SIZE = 1024 * 1024
+
+# Paralel indirmede aralık başına en küçük boyut
+MIN_PART_SIZE = 4 * 1024 * 1024
+
+
+class DownloadError(Exception):
+    """İndirme tamamlanamadı veya doğrulanamadı."""
+
+
+class IncompleteRangeError(DownloadError):
+    """Aralık beklenenden kısa geldi (yeniden denenebilir)."""
+
+
+class RestartRequiredError(DownloadError):
+    """Sunucu aralığı yok saydı veya dosya değişti; indirme baştan başlamalı."""
+
+
+class RangeDownloader:
+    """
+    Devam ettirilebilir, isteğe bağlı paralel HTTP indirici.
+
+    Args:
+        session: requests.Session (varsayılan: yeni oturum)
+        parts: Paralel aralık sayısı (Range desteklenmiyorsa veya dosya küçükse 1)
+        chunk_size: Okuma / yazma parça boyutu
+        max_retries: Deneme sayısı
+        timeout: İstek zaman aşımı (sn)
+        progress: progress(inen_bayt, toplam_bayt | None) geri çağrısı
+    """
+
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        *,
+        parts: int = 1,
+        chunk_size: int = CHUNK_SIZE,
+        max_retries: int = 3,
+        timeout: float = 30,
+        progress=None,
+    ):
+        self.session = session or requests.Session()
+        self.parts = max(1, parts)
+        self.chunk_size = chunk_size
+        self.max_retries = max(1, max_retries)
+        self.timeout = timeout
+        self.progress = progress
+        self._lock = threading.Lock()
+
+    def download(self, url: str, path: str) -> dict:
+        """
+        URL'i path'e indir.
+
+        Returns:
+            dict: {"path", "bytes", "seconds", "downloaded_bytes" (bu çalıştırmada ağdan inen),
+                "resumed_bytes" (önceki çalıştırmadan devralınan), "wasted_bytes" (baştan
+                başlarken atılan), "retries", "parts", "etag"}
+
+        Raises:
+            DownloadError: Doğrulama başarısız veya denemeler tükendi
+            requests.RequestException: Son denemedeki ağ / HTTP hatası
+        """
+        started = time.perf_counter()
+        part_path = Path(f"{path}.part")
+        state_path = Path(f"{path}.part.json")
+
+        info = self._probe(url)
+        state = self._load_state(state_path, part_path, url, info)
+        resumed = sum(segment[2] for segment in state["segments"])
+        stats = {"downloaded_bytes": 0, "wasted_bytes": 0, "retries": 0}
+        if resumed:
+            logger.info(f"Resuming download from {resumed} bytes: {url}")
+
+        for attempt in range(self.max_retries):
+            try:
+                self._fetch_segments(url, part_path, state, info, stats)
+                break
+            except (requests.RequestException, IncompleteRangeError, RestartRequiredError) as e:
+                if isinstance(e, RestartRequiredError):
+                    # Dosya değişmiş olabilir: bilgileri yenile ve tek aralıkla baştan indir
+                    stats["wasted_bytes"] += sum(segment[2] for segment in state["segments"])
+                    info = self._probe(url)
+                    state = self._new_state(part_path, url, info, parts=1)
+                if attempt == self.max_retries - 1:
+                    raise
+                stats["retries"] += 1
+                logger.warning(f"Retry {attempt + 1}/{self.max_retries}: {e!s}")
+            finally:
+                self._save_state(state_path, state)
+
+        # .part önceden tam boyuta açıldığından dosya boyutu değil, inen bayt doğrulanır
+        size = sum(segment[2] for segment in state["segments"])
+        if info["length"] is not None and size != info["length"]:
+            raise DownloadError(f"Boyut uyuşmuyor: {size} != {info['length']}")
+
+        part_path.replace(path)
+        state_path.unlink(missing_ok=True)
+
+        return {
+            "path": path,
+            "bytes": size,
+            "seconds": round(time.perf_counter() - started, 3),
+            "downloaded_bytes": stats["downloaded_bytes"],
+            "resumed_bytes": resumed,
+            "wasted_bytes": stats["wasted_bytes"],
+            "retries": stats["retries"],
+            "parts": len(state["segments"]),
+            "etag": info["validator"],
+        }
+
+    # -------------------------------------------------------------------------
+    # Durum
+    # -------------------------------------------------------------------------
+
+    def _probe(self, url: str) -> dict:
+        """
+        HEAD ile boyut, doğrulayıcı ve Range desteği (HEAD başarısızsa bilinmiyor sayılır;
+        ilk GET yanıtından doldurulur).
+        """
+        info = {"length": None, "validator": "", "ranges": False}
+        try:
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.ok:
+                self._update_info(info, response)
+        except requests.RequestException as e:
+            logger.warning(f"HEAD failed, falling back to GET: {e!s}")
+        return info
+
+    @staticmethod
+    def _update_info(info: dict, response) -> None:
+        length = response.headers.get("Content-Length", "")
+        info["length"] = int(length) if length.isdigit() else None
+        info["validator"] = response.headers.get("ETag") or response.headers.get("Last-Modified", "")
+        info["ranges"] = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+
+    def _new_state(self, part_path: Path, url: str, info: dict, parts: int | None = None) -> dict:
+        """
+        Boş .part dosyası ve aralıklar ([başlangıç, bitiş (dahil) | None, inen]).
+        """
+        length = info["length"]
+        parts = self.parts if parts is None else parts
+        if not info["ranges"] or not length:
+            parts = 1
+        parts = max(1, min(parts, (length or 0) // MIN_PART_SIZE))
+
+        with part_path.open("wb") as f:
+            if length:
+                f.truncate(length)
+
+        if not length:
+            segments = [[0, None, 0]]
+        else:
+            size = -(-length // parts)
+            segments = [[start, min(start + size, length) - 1, 0] for start in range(0, length, size)]
+        return {"url": url, "validator": info["validator"], "length": length, "segments": segments}
+
+    def _load_state(self, state_path: Path, part_path: Path, url: str, info: dict) -> dict:
+        """
+        Önceki çalıştırmanın durumu aynı dosyayı gösteriyorsa devam et, yoksa baştan başla.
+        """
+        try:
+            state = json.loads(state_path.read_text())
+        except (OSError, ValueError):
+            state = None
+
+        if (
+            state
+            and part_path.exists()
+            and info["validator"]
+            and info["ranges"]
+            and state.get("url") == url
+            and state.get("validator") == info["validator"]
+            and state.get("length") == info["length"]
+        ):
+            return state
+        return self._new_state(part_path, url, info)
+
+    @staticmethod
+    def _save_state(state_path: Path, state: dict) -> None:
+        state_path.write_text(json.dumps(state))
+
+    # -------------------------------------------------------------------------
+    # İndirme
+    # -------------------------------------------------------------------------
+
+    def _fetch_segments(self, url: str, part_path: Path, state: dict, info: dict, stats: dict) -> None:
+        pending = [
+            segment for segment in state["segments"] if segment[1] is None or segment[2] < segment[1] - segment[0] + 1
+        ]
+        if len(pending) <= 1:
+            for segment in pending:
+                self._fetch_segment(url, part_path, segment, state=state, info=info, stats=stats)
+            return
+
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="range-download") as executor:
+            futures = [
+                executor.submit(self._fetch_segment, url, part_path, segment, state=state, info=info, stats=stats)
+                for segment in pending
+            ]
+        # Tüm aralıklar bittikten sonra ilk hatayı yükselt (diğerlerinin ilerlemesi korunur)
+        for future in futures:
+            future.result()
+
+    def _fetch_segment(self, url: str, part_path: Path, segment: list, *, state: dict, info: dict, stats: dict) -> None:
+        start, end, done = segment
+        offset = start + done
+        whole = offset == 0 and (end is None or end == (info["length"] or 0) - 1)
+
+        headers = {}
+        if not whole:
+            headers["Range"] = f"bytes={offset}-{'' if end is None else end}"
+            if info["validator"]:
+                headers["If-Range"] = info["validator"]
+
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            self._check_response(response, offset, whole, info)
+            if whole and info["length"] is None:
+                # HEAD yoktu: boyut ve doğrulayıcı ilk yanıttan
+                self._update_info(info, response)
+                state["length"], state["validator"] = info["length"], info["validator"]
+
+            with part_path.open("r+b") as f:
+                f.seek(offset)
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+                    with self._lock:
+                        segment[2] += len(chunk)
+                        stats["downloaded_bytes"] += len(chunk)
+                        downloaded = sum(part[2] for part in state["segments"])
+                    if self.progress is not None:
+                        self.progress(downloaded, info["length"])
+
+        expected = None if end is None else end - start + 1
+        if expected is not None and segment[2] != expected:
+            raise IncompleteRangeError(f"Aralık eksik: {start}-{end} ({segment[2]}/{expected} bayt)")
+
+    @staticmethod
+    def _check_response(response, offset: int, whole: bool, info: dict) -> None:
+        etag = response.headers.get("ETag")
+        if info["validator"].startswith('"') and etag and etag != info["validator"]:
+            raise RestartRequiredError(f"Dosya değişti (ETag {info['validator']} -> {etag})")
+        if whole:
+            return
+        if response.status_code != 206:
+            raise RestartRequiredError(f"Sunucu aralığı yok saydı (HTTP {response.status_code})")
+        if not response.headers.get("Content-Range", "").startswith(f"bytes {offset}-"):
+            raise RestartRequiredError(f"Beklenmeyen Content-Range: {response.headers.get('Content-Range')}")
@@ -0,0 +1,24 @@
+"""
+HaberNexus - İstatistik Yardımcıları
+İzleme ve ölçüm kodunun ortak kullandığı küçük hesaplar (bağımlılıksız).
+"""
+
+import math
+
+
+def percentile(values: list, pct: float) -> float:
+    """
+    Yüzdelik değer (nearest-rank yöntemi).
+
+    Args:
+        values: Sayı listesi
+        pct: Yüzdelik (0-100)
+
+    Returns:
+        float: Yüzdelik değer (boş listede 0.0)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
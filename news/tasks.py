@@ -9,10 +9,14 @@ Author: Salih TANRISEVEN
 Updated: December 2025
 """
 
+import asyncio
 import logging
+import math
 import time
 from io import BytesIO
+from pathlib import Path
 
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 from django.utils.text import slugify
@@ -26,7 +30,16 @@ from authors.models import Author
 from core.models import Setting
 from core.tasks import log_error, log_info
 
+from . import image_ingest, media_store
+from .admission import admit
+from .ai_instrumentation import flush_ai_call_logs, track_ai_call
+from .author_pool import get_author_pool, select_author
+from .content_utils import StreamingContentValidator
+from .generation_queue import dispatch_generation_queue, enqueue_generation
+from .media_scheduler import VIDEO_JOB_SOFT_TIME_LIMIT, VIDEO_JOB_TIME_LIMIT
 from .models import Article, RssSource
+from .models_extended import GenerationDraft
+from .prompt_registry import prompt_registry
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +71,10 @@ def get_genai_client():
 
     from google import genai
 
+    # Yük testleri için yerel sahte sunucuya yönlendirme
+    if settings.GENAI_BASE_URL:
+        return genai.Client(api_key=api_key, http_options={"base_url": settings.GENAI_BASE_URL})
+
     return genai.Client(api_key=api_key)
 
 
@@ -89,6 +106,100 @@ def get_image_model_name() -> str:
         return "imagen-4.0-generate-001"
 
 
+# Gemini Developer API (API anahtarı) modunda Imagen yerine kullanılan görsel modeli
+GEMINI_IMAGE_MODEL = "gemini-2.5-flash-image"
+
+
+def get_image_client():
+    """
+    Görsel üretimi için Gen AI client.
+    GOOGLE_CLOUD_PROJECT ayarı varsa Vertex AI modunda client döner (Imagen yalnızca bu
+    modda destekleniyor); yoksa API anahtarlı client (bkz. get_genai_client).
+
+    Returns:
+        genai.Client: Yapılandırılmış Google Gen AI client
+    """
+    try:
+        project = Setting.objects.get(key="GOOGLE_CLOUD_PROJECT").value
+    except Setting.DoesNotExist:
+        project = ""
+    if not project:
+        return get_genai_client()
+
+    try:
+        location = Setting.objects.get(key="GOOGLE_CLOUD_LOCATION").value or "us-central1"
+    except Setting.DoesNotExist:
+        location = "us-central1"
+
+    from google import genai
+
+    return genai.Client(vertexai=True, project=project, location=location)
+
+
+def resolve_image_model(client, image_model: str) -> str:
+    """
+    Client moduna göre kullanılabilir görsel modeli.
+    Imagen modelleri API anahtarlı client'ta desteklenmediğinden GEMINI_IMAGE_MODEL'e düşülür.
+    """
+    if not getattr(client, "vertexai", False) and image_model.startswith("imagen"):
+        return GEMINI_IMAGE_MODEL
+    return image_model
+
+
+def generate_image(client, image_model: str, prompt: str, aspect_ratio: str = "16:9") -> tuple:
+    """
+    Tek görsel üret.
+
+    Vertex AI modunda Imagen (generate_images), API anahtarlı modda görsel modeliyle
+    generate_content (response_modalities=["IMAGE"]) kullanılır. Çıktı JPEG'e çevrilir.
+
+    Args:
+        client: get_image_client() ile alınan client
+        image_model: resolve_image_model() ile seçilmiş model adı
+        prompt: Görsel promptu
+
+    Returns:
+        tuple: (ham yanıt, JPEG baytları veya görsel yoksa None)
+    """
+    from google.genai import types
+
+    if getattr(client, "vertexai", False):
+        response = client.models.generate_images(
+            model=image_model,
+            prompt=prompt,
+            config=types.GenerateImagesConfig(
+                number_of_images=1, aspect_ratio=aspect_ratio, output_mime_type="image/jpeg"
+            ),
+        )
+        images = response.generated_images or []
+        data = images[0].image.image_bytes if images else None
+    else:
+        response = client.models.generate_content(
+            model=image_model,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                response_modalities=["IMAGE"], image_config=types.ImageConfig(aspect_ratio=aspect_ratio)
+            ),
+        )
+        data = next(
+            (
+                part.inline_data.data
+                for candidate in response.candidates or []
+                for part in (candidate.content.parts if candidate.content else None) or []
+                if part.inline_data and part.inline_data.data
+            ),
+            None,
+        )
+
+    if not data:
+        return response, None
+
+    buffer = BytesIO()
+    with Image.open(BytesIO(data)) as image:
+        image.convert("RGB").save(buffer, format="JPEG", quality=95)
+    return response, buffer.getvalue()
+
+
 def get_thinking_level() -> str | None:
     """
     Thinking level değerini ayarlardan al.
@@ -210,6 +321,43 @@ def retry_with_backoff(func, max_retries: int = 3, initial_delay: float = 1.0, m
     raise last_exception
 
 
+async def async_retry_with_backoff(
+    coro_factory, max_retries: int = 3, initial_delay: float = 1.0, max_delay: float = 60.0
+):
+    """
+    retry_with_backoff'un asyncio karşılığı.
+    Bekleme asyncio.sleep ile yapılır, böylece diğer eşzamanlı istekler bloklanmaz.
+
+    Args:
+        coro_factory: Her denemede yeni bir coroutine döndüren fonksiyon
+        max_retries: Maksimum deneme sayısı
+        initial_delay: İlk bekleme süresi (saniye)
+        max_delay: Maksimum bekleme süresi (saniye)
+
+    Returns:
+        Coroutine sonucu
+
+    Raises:
+        Exception: Tüm denemeler başarısız olduğunda
+    """
+    last_exception = None
+    delay = initial_delay
+
+    for attempt in range(max_retries):
+        try:
+            return await coro_factory()
+        except Exception as e:
+            last_exception = e
+            if attempt < max_retries - 1:
+                logger.warning(f"Attempt {attempt + 1} failed: {e!s}. Retrying in {delay}s...")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_delay)
+            else:
+                logger.error(f"All {max_retries} attempts failed. Last error: {e!s}")
+
+    raise last_exception
+
+
 # =============================================================================
 # RSS Feed Tasks
 # =============================================================================
@@ -280,11 +428,18 @@ def fetch_single_rss(source: RssSource) -> int:
         if feed.bozo:
             logger.warning(f"RSS feed parsing hatası: {source.url} - {feed.bozo_exception}")
 
-        for entry in feed.entries[:10]:  # Son 10 haberi al
-            # Haber zaten var mı kontrol et
-            if Article.objects.filter(original_url=entry.link).exists():
-                continue
+        # Son 10 haberden daha önce eklenmemiş olanlar
+        entries = [entry for entry in feed.entries[:10] if not Article.objects.filter(original_url=entry.link).exists()]
 
+        # Girdiler kabulden önce başlıklarına göre puanlanır: üretim aşaması doluysa en iyi haberler
+        # alınır, düşük puanlılar bu taramada eklenmez (hâlâ akıştaysa sonraki taramada yeniden
+        # değerlendirilir) veya aşırı dolulukta atılır.
+        from .tasks_v2 import score_title
+
+        scores = {id(entry): score_title(entry.get("title", "Başlıksız"), source.category) for entry in entries}
+        decision = admit("generation", [(entry, scores[id(entry)]) for entry in entries])
+
+        for entry in decision["admitted"]:
             # Yeni makale oluştur
             title = entry.get("title", "Başlıksız")
             content = entry.get("summary", entry.get("description", ""))
@@ -318,13 +473,17 @@ def fetch_single_rss(source: RssSource) -> int:
 
             fetched_count += 1
 
-            # AI ile içerik üretimini tetikle (transaction commit olduktan sonra)
-            transaction.on_commit(lambda article_id=article.id: generate_ai_content.delay(article_id))
+            # AI ile içerik üretimi için öncelikli kuyruğa ekle (kabuldeki başlık puanıyla)
+            enqueue_generation(article, pipeline="v1", score=scores[id(entry)], dispatch=False)
 
         # Son tarama zamanını güncelle
         source.last_checked = timezone.now()
         source.save()
 
+        # Kuyruğu transaction commit olduktan sonra işle
+        if fetched_count:
+            transaction.on_commit(dispatch_generation_queue.delay)
+
         return fetched_count
 
     except Exception as e:
@@ -335,6 +494,10 @@ def download_article_image(article: Article, image_url: str) -> None:
     """
     Haber için görseli indir ve optimize et.
 
+    Görsel içerik adresli medya deposunda (news.media_store) tutulur: aynı veya neredeyse
+    aynı görsel daha önce işlendiyse yeniden çözülmez / encode edilmez, haber ortak WebP
+    dosyasını kullanır. İndirme ve çözme bellek sınırlıdır (bkz. news.image_ingest).
+
     Args:
         article: Haber makalesi
         image_url: Görsel URL'i
@@ -345,26 +508,29 @@ def download_article_image(article: Article, image_url: str) -> None:
     try:
         response = requests.get(
             image_url,
+            stream=True,
             timeout=15,
             headers={"User-Agent": "HaberNexus/10.3 (News Aggregator)"},
         )
-        response.raise_for_status()
+        data = image_ingest.read_response(response)
 
-        # Görseli aç ve optimize et
-        img = Image.open(BytesIO(response.content))
-
-        # RGB'ye dönüştür (RGBA veya P modundaysa)
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
+        if media_store.is_media_store_enabled():
+            asset, _ = media_store.register(data, source_url=image_url)
+            path = media_store.get_variant(asset, media_store.FEATURED_VARIANT)
+            if path is None:
+                path = media_store.save_variant(asset, media_store.FEATURED_VARIANT, _encode_featured_webp(data))
+            else:
+                log_info("download_article_image", f"Görsel depodan kullanıldı: {path}", related_id=article.id)
 
-        # WebP formatına dönüştür
-        webp_buffer = BytesIO()
-        img.save(webp_buffer, format="WebP", quality=85, optimize=True)
-        webp_buffer.seek(0)
+            article.featured_image.name = path
+            article.featured_image_alt = article.title
+            article.save()
+            media_store.attach(asset, article, exclusive=True)
+            return
 
         # Dosyayı kaydet
         filename = f"{article.slug}.webp"
-        article.featured_image.save(filename, webp_buffer, save=True)
+        article.featured_image.save(filename, BytesIO(_encode_featured_webp(data)), save=True)
         article.featured_image_alt = article.title
         article.save()
 
@@ -376,6 +542,238 @@ def download_article_image(article: Article, image_url: str) -> None:
         raise
 
 
+# Başlık görseli bu kutuya sığacak şekilde küçültülür (JPEG'lerde çözme sırasında)
+FEATURED_IMAGE_MAX_SIZE = (1920, 1080)
+
+
+def _encode_featured_webp(data: bytes) -> bytes:
+    """
+    Kaynak görseli başlık görseli olarak WebP'ye dönüştür.
+    """
+    # Görseli sınırlı bellekle aç ve küçült
+    img, stats = image_ingest.open_image(data, max_size=FEATURED_IMAGE_MAX_SIZE)
+    logger.info(
+        f"Görsel çözüldü: {stats['source_size']} -> {img.size}, "
+        f"tepe bellek ~{stats['peak_bytes'] / (1024 * 1024):.1f} MB"
+    )
+
+    # RGB'ye dönüştür (RGBA, LA veya P modundaysa)
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGB")
+
+    # WebP formatına dönüştür
+    webp_buffer = BytesIO()
+    img.save(webp_buffer, format="WebP", quality=85, optimize=True)
+    return webp_buffer.getvalue()
+
+
+@shared_task
+def cleanup_unused_media_assets() -> str:
+    """
+    Hiçbir haberin kullanmadığı depo görsellerini (bekleme süresi dolduktan sonra) sil.
+
+    Returns:
+        str: İşlem sonucu mesajı
+    """
+    result = media_store.collect_unreferenced()
+    if result["assets"]:
+        log_info(
+            "cleanup_unused_media_assets", f"{result['assets']} kullanılmayan görsel, {result['files']} dosya silindi"
+        )
+    return f"{result['assets']} görsel, {result['files']} dosya silindi"
+
+
+# =============================================================================
+# Prompt & Generation Config Helpers
+# =============================================================================
+
+
+def build_article_prompt(article: Article, author: Author) -> str:
+    """
+    Haber makalesi üretimi için SEO odaklı promptu oluştur.
+
+    Args:
+        article: Kaynak makale (RSS'den gelen ham veri)
+        author: Makaleyi yazacak yazar
+
+    Returns:
+        RenderedPrompt: Gen AI modeline gönderilecek prompt (şablon sürümüyle)
+    """
+    return prompt_registry.render(
+        "rss_article",
+        bucket=article.id,
+        author_name=author.name,
+        author_expertise=author.expertise,
+        title=article.title,
+        source_content=article.content[:800],
+        category=article.category,
+    )
+
+
+def build_generation_config() -> dict:
+    """
+    İçerik üretimi için GenerateContentConfig parametrelerini oluştur.
+    Tekil ve toplu üretim aynı parametreleri kullanır.
+
+    Returns:
+        dict: GenerateContentConfig'e verilecek parametreler
+    """
+    thinking_config = create_thinking_config()
+
+    config_params = {
+        "temperature": 0.7,
+        "top_p": 0.95,
+        "top_k": 40,
+        "max_output_tokens": 2048,
+    }
+
+    # Thinking config ekle (varsa)
+    if thinking_config:
+        config_params["thinking_config"] = thinking_config
+
+    return config_params
+
+
+# =============================================================================
+# Streaming Generation Helpers
+# =============================================================================
+
+# Taslak kaydı için eşikler: bu kadar yeni karakter veya süre geçince yaz
+DRAFT_FLUSH_CHARS = 1000
+DRAFT_FLUSH_SECONDS = 2.0
+
+
+class GenerationAborted(Exception):
+    """Akışlı üretim, doğrulama kontrolleri nedeniyle erken durduruldu."""
+
+
+def is_streaming_enabled() -> bool:
+    """
+    Akışlı (streaming) üretimin açık olup olmadığını ayarlardan al.
+
+    Returns:
+        bool: AI_STREAMING_ENABLED ayarı (varsayılan: False)
+    """
+    try:
+        streaming_setting = Setting.objects.get(key="AI_STREAMING_ENABLED")
+        return streaming_setting.value.lower().strip() in ("1", "true", "yes", "on")
+    except Setting.DoesNotExist:
+        return False
+
+
+def build_continuation_prompt(prompt: str, partial_text: str) -> str:
+    """
+    Yarıda kalmış bir üretimi kaldığı yerden tamamlatmak için prompt oluştur.
+
+    Args:
+        prompt: Orijinal prompt
+        partial_text: Daha önce üretilip taslağa kaydedilmiş metin
+
+    Returns:
+        str: Devam promptu
+    """
+    return f"""{prompt}
+
+**DEVAM:** Aşağıdaki metin bu makalenin daha önce üretilmiş ilk kısmıdır. Metni tekrar etme, tam olarak kaldığı yerden devam ederek makaleyi tamamla.
+
+{partial_text}"""
+
+
+def _save_draft(draft_id: int, content: str, chunk_count: int, status: str = "streaming", abort_reason: str = ""):
+    GenerationDraft.objects.filter(pk=draft_id).update(
+        content=content,
+        chunk_count=chunk_count,
+        status=status,
+        abort_reason=abort_reason,
+        updated_at=timezone.now(),
+    )
+
+
+def stream_generate_content(client, model_name: str, prompt: str, config, article: Article) -> str:
+    """
+    İçeriği akışlı olarak üret, gelen metni taslağa kaydet ve erken doğrula.
+
+    - Tamamlanmış bir taslak varsa API çağrılmadan o kullanılır
+      (örn. worker yanıtı aldıktan sonra, makaleyi kaydetmeden çöktüyse).
+    - Yarıda kalmış bir taslak varsa model kaldığı yerden devam ettirilir.
+    - StreamingContentValidator sorun bulursa akış kesilir ve
+      GenerationAborted fırlatılır; kalan token'lar için ödeme yapılmaz.
+
+    Args:
+        client: genai.Client
+        model_name: Model adı
+        prompt: Üretim promptu
+        config: GenerateContentConfig
+        article: Üretilen makale
+
+    Returns:
+        str: Üretilen tam metin
+
+    Raises:
+        GenerationAborted: Doğrulama kontrolü başarısız olduğunda
+    """
+    draft, _ = GenerationDraft.objects.get_or_create(article=article)
+
+    if draft.status == "completed" and draft.content:
+        logger.info(f"Tamamlanmış taslak yeniden kullanılıyor: {article.title}")
+        return draft.content
+
+    # Yarıda kalmış akış: kaldığı yerden devam et; iptal edilmiş taslak: baştan başla
+    text = draft.content if draft.status == "streaming" else ""
+    chunk_count = draft.chunk_count if text else 0
+    contents = build_continuation_prompt(prompt, text) if text else prompt
+
+    GenerationDraft.objects.filter(pk=draft.pk).update(ai_model_used=model_name)
+    _save_draft(draft.pk, text, chunk_count)
+
+    validator = StreamingContentValidator()
+    validator.feed(text)
+    flushed_length = len(text)
+    flushed_at = time.monotonic()
+
+    with track_ai_call(
+        "generate_ai_content",
+        model_name,
+        "stream",
+        article_id=article.id,
+        prompt_version=getattr(prompt, "version", ""),
+    ) as call:
+        stream = client.models.generate_content_stream(model=model_name, contents=contents, config=config)
+        try:
+            for chunk in stream:
+                piece = chunk.text or ""
+                text += piece
+                chunk_count += 1
+                call.set_usage(getattr(chunk, "usage_metadata", None))
+
+                reason = validator.feed(piece)
+                if reason:
+                    _save_draft(draft.pk, text, chunk_count, status="aborted", abort_reason=reason)
+                    call.outcome = "aborted"
+                    raise GenerationAborted(reason)
+
+                if (
+                    len(text) - flushed_length >= DRAFT_FLUSH_CHARS
+                    or time.monotonic() - flushed_at >= DRAFT_FLUSH_SECONDS
+                ):
+                    _save_draft(draft.pk, text, chunk_count)
+                    flushed_length = len(text)
+                    flushed_at = time.monotonic()
+        finally:
+            close = getattr(stream, "close", None)
+            if callable(close):
+                close()
+
+        reason = validator.finish()
+        if reason:
+            _save_draft(draft.pk, text, chunk_count, status="aborted", abort_reason=reason)
+            call.outcome = "aborted"
+            raise GenerationAborted(reason)
+
+    _save_draft(draft.pk, text, chunk_count, status="completed")
+    return text
+
+
 # =============================================================================
 # AI Content Generation Tasks
 # =============================================================================
@@ -416,15 +814,12 @@ def generate_ai_content(self, article_id: int) -> str:
             )
             return f"Makale zaten işlenmiş: {article.title}"
 
-        # Rastgele bir yazar seç
-        authors = Author.objects.filter(is_active=True)
-        if not authors.exists():
+        # Kategori ağırlıklı yazar havuzundan yazar seç
+        author, _ = select_author(article.category)
+        if author is None:
             log_error("generate_ai_content", "Aktif yazar bulunamadı", related_id=article_id)
             return "Hata: Aktif yazar bulunamadı"
 
-        import random
-
-        author = random.choice(list(authors))
         article.author = author
 
         try:
@@ -435,83 +830,50 @@ def generate_ai_content(self, article_id: int) -> str:
             model_name = get_ai_model_name()
 
             # Gelişmiş SEO ve Profesyonellik Promptu
-            prompt = f"""
-Sen {author.name} isimli deneyimli bir {author.expertise} yazarısın. Aşağıdaki haber kaynağını kullanarak, profesyonel bir haber makalesi yazacaksın.
-
-**KAYNAK BİLGİLERİ:**
-Başlık: {article.title}
-Kaynak İçerik: {article.content[:800]}
-Kategori: {article.category}
-
-**YAZIM KURALLARI:**
-
-1. **İçerik Yapısı:**
-   - Giriş paragrafı: Haberin özeti ve en önemli bilgiler (5W1H: Kim, Ne, Nerede, Ne zaman, Neden, Nasıl)
-   - Gelişme paragrafları: Detaylı bilgiler, bağlam, arka plan
-   - Sonuç paragrafı: Önem, etki, gelecek beklentileri
-
-2. **SEO Optimizasyonu:**
-   - Ana anahtar kelimeleri doğal bir şekilde kullan
-   - İlk 100 kelimede ana konuyu net bir şekilde belirt
-   - Alt başlıklar kullan (H2, H3 etiketleriyle)
-   - Uzun kuyruk anahtar kelimeleri entegre et
-
-3. **Profesyonellik:**
-   - Objektif ve tarafsız dil kullan
-   - Kaynak göstermeden doğrulanabilir bilgiler sun
-   - Teknik terimleri gerektiğinde açıkla
-   - Akıcı ve okunabilir cümleler kur
-
-4. **Uzunluk ve Format:**
-   - 500-700 kelime arası (optimal SEO uzunluğu)
-   - HTML formatında yaz: <h2>, <h3>, <p>, <strong>, <em> etiketlerini kullan
-   - Her paragraf 3-4 cümle olsun
-
-5. **Özgünlük:**
-   - Kaynak metni doğrudan kopyalama, tamamen yeniden yaz
-   - Kendi analizini ve yorumunu kat
-   - Farklı bakış açıları sun
-   - Yazının sonunda "yapay zeka" veya benzeri ifadeler kullanma
-
-6. **Okuyucu Etkileşimi:**
-   - İlgi çekici bir giriş yap
-   - Sorular sorarak okuyucuyu düşündür
-   - Somut örnekler ve veriler kullan
-
-**ÖNEMLİ:** Sadece haber makalesini yaz, başka hiçbir açıklama ekleme. Doğrudan HTML formatında içeriği döndür.
-            """
+            prompt = build_article_prompt(article, author)
 
             # Config oluştur - ThinkingConfig ile
-            thinking_config = create_thinking_config()
-
-            config_params = {
-                "temperature": 0.7,
-                "top_p": 0.95,
-                "top_k": 40,
-                "max_output_tokens": 2048,
-            }
-
-            # Thinking config ekle (varsa)
-            if thinking_config:
-                config_params["thinking_config"] = thinking_config
-
-            # Yeni SDK ile içerik üretimi (retry ile)
-            def generate_content():
-                return client.models.generate_content(
-                    model=model_name,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(**config_params),
-                )
-
-            response = retry_with_backoff(generate_content, max_retries=3)
+            config_params = build_generation_config()
 
-            if response and response.text:
-                article.content = response.text
+            if is_streaming_enabled():
+                # Akışlı üretim: taslak kaydı ve erken durdurma ile
+                try:
+                    content = stream_generate_content(
+                        client, model_name, prompt, types.GenerateContentConfig(**config_params), article
+                    )
+                except GenerationAborted as e:
+                    log_error("generate_ai_content", f"Üretim erken durduruldu: {e!s}", related_id=article_id)
+                    return f"Hata: Üretim erken durduruldu ({e!s})"
+            else:
+                # Yeni SDK ile içerik üretimi (retry ile)
+                def generate_content():
+                    return client.models.generate_content(
+                        model=model_name,
+                        contents=prompt,
+                        config=types.GenerateContentConfig(**config_params),
+                    )
+
+                with track_ai_call(
+                    "generate_ai_content",
+                    model_name,
+                    "text",
+                    article_id=article_id,
+                    prompt_version=getattr(prompt, "version", ""),
+                ) as call:
+                    response = retry_with_backoff(call.attempt(generate_content), max_retries=3)
+                    call.set_response(response)
+                content = response.text if response else None
+
+            if content:
+                article.content = content
                 article.is_ai_generated = True
                 article.status = "published"
                 article.published_at = timezone.now()
                 article.save()
 
+                # Yayınlanan içeriğin taslağına artık gerek yok
+                GenerationDraft.objects.filter(article=article).delete()
+
                 log_info(
                     "generate_ai_content",
                     f"Haber başarıyla oluşturuldu: {article.title}",
@@ -556,35 +918,144 @@ Kategori: {article.category}
 # =============================================================================
 
 
-@shared_task(queue="video_processing")
-def process_video_content(article_id: int, video_url: str) -> str:
+# Video özetleri için encode edilen profiller
+VIDEO_PROFILES = ("1080p", "720p", "480p")
+
+
+@shared_task(
+    bind=True,
+    queue="video_processing",
+    soft_time_limit=VIDEO_JOB_SOFT_TIME_LIMIT,
+    time_limit=VIDEO_JOB_TIME_LIMIT,
+)
+def process_video_content(self, article_id: int, video_url: str, enqueued_at: float | None = None) -> str:
     """
-    Video içeriğini işle ve optimize et.
-    Bu görev 'video_processing' kuyruğunda çalışır ve aynı anda sadece bir tane çalışır.
+    Video içeriğini indir, profillere encode et ve HLS olarak paketle.
+
+    İş, medya zamanlayıcısı (news.media_scheduler) CPU yuvası ve bellek ayırana kadar
+    başlamaz: kaynaklar doluysa worker'ı tutmadan yeniden kuyruğa girer. ffmpeg ayrılan yuva
+    kadar thread ile çalışır. Kuyrukta bekleme ve işleme süreleri MediaProcessingLog'a
+    yazılır. Süre limitleri ffmpeg bütçesi ve indirme payından, medya kirası da bu
+    limitlerden türetilir (bkz. media_scheduler.VIDEO_JOB_TIME_LIMIT).
 
     Args:
         article_id: Makale ID'si
         video_url: Video URL'i
+        enqueued_at: İşin ilk kuyruğa girdiği an (time.time()); verilmezse ilk çalıştırma anı
 
     Returns:
         str: İşlem sonucu mesajı
     """
+    from .media_processor import VideoProcessor
+    from .media_scheduler import (
+        MediaJobTooLargeError,
+        estimate_video_memory_mb,
+        get_admission_retry_seconds,
+        get_max_queue_wait,
+        get_video_job_cpu,
+        release,
+        try_acquire,
+    )
+
+    enqueued_at = enqueued_at or time.time()
     try:
         article = Article.objects.get(id=article_id)
-
-        # Video indirme ve işleme (ffmpeg ile)
-        # Bu kısım daha sonra detaylı olarak geliştirilecek
-
-        log_info("process_video_content", f"Video işleme başladı: {article.title}", related_id=article_id)
-
-        return f"Video işleme tamamlandı: {article.title}"
-
     except Article.DoesNotExist:
         log_error("process_video_content", f"Makale bulunamadı (ID: {article_id})", related_id=article_id)
         return f"Hata: Makale bulunamadı (ID: {article_id})"
+
+    job_id = self.request.id or f"video:{article_id}"
+    cpu = get_video_job_cpu()
+    memory_mb = estimate_video_memory_mb(
+        {profile: VideoProcessor.ENCODING_PROFILES[profile] for profile in VIDEO_PROFILES}
+    )
+    try:
+        admitted = try_acquire(job_id, cpu, memory_mb, kind="video", enqueued_at=enqueued_at)
+    except MediaJobTooLargeError as e:
+        return _fail_video_job(article, video_url, str(e), queue_wait=time.time() - enqueued_at)
+
+    if not admitted:
+        waited = time.time() - enqueued_at
+        if waited >= get_max_queue_wait():
+            return _fail_video_job(
+                article, video_url, f"Kaynak bekleme süresi aşıldı ({waited:.0f}s)", queue_wait=waited
+            )
+        # Worker'ı bekletmeden sonra tekrar dene; bekleme süresi ilk kuyruğa girişten ölçülür
+        raise self.retry(
+            kwargs={"article_id": article_id, "video_url": video_url, "enqueued_at": enqueued_at},
+            countdown=get_admission_retry_seconds(),
+            max_retries=None,
+        )
+
+    started_at = time.time()
+    log_info("process_video_content", f"Video işleme başladı: {article.title}", related_id=article_id)
+    metadata, error = {}, ""
+    try:
+        processor = VideoProcessor(str(settings.MEDIA_ROOT), threads=cpu)
+        metadata = processor.download_and_encode(video_url, str(article_id), profiles=list(VIDEO_PROFILES))
     except Exception as e:
-        log_error("process_video_content", f"Video işleme hatası: {e!s}", traceback=str(e), related_id=article_id)
-        return f"Hata: {e!s}"
+        error = str(e)
+    finally:
+        # Kira süresi dolmuşsa süreler yerel ölçümden; bekleme işleme süresine karışmaz
+        timings = release(job_id) or {
+            "queue_wait_seconds": round(started_at - enqueued_at, 3),
+            "run_seconds": round(time.time() - started_at, 3),
+        }
+
+    if error:
+        return _fail_video_job(
+            article, video_url, error, queue_wait=timings["queue_wait_seconds"], run_seconds=timings["run_seconds"]
+        )
+
+    _log_video_job(
+        article,
+        video_url,
+        metadata=metadata,
+        queue_wait=timings["queue_wait_seconds"],
+        run_seconds=timings["run_seconds"],
+    )
+    summary = f"bekleme {timings['queue_wait_seconds']}s, işleme {timings['run_seconds']}s"
+    log_info("process_video_content", f"Video işleme tamamlandı: {article.title} ({summary})", related_id=article_id)
+    return f"Video işleme tamamlandı: {article.title} ({summary})"
+
+
+def _log_video_job(
+    article, video_url: str, *, metadata: dict | None = None, error: str = "", queue_wait: float, run_seconds: float = 0
+):
+    """
+    Video işinin sonucunu, kuyrukta bekleme ve işleme süreleriyle MediaProcessingLog'a yaz.
+    """
+    from .models_advanced import MediaProcessingLog
+
+    metadata = metadata or {}
+    original_size = metadata.get("download", {}).get("bytes", 0)
+    optimized_size = sum(
+        Path(path).stat().st_size for path in metadata.get("encoded_videos", {}).values() if Path(path).exists()
+    )
+    MediaProcessingLog.objects.create(
+        article=article,
+        media_type="video",
+        status="failed" if error else "completed",
+        original_size=original_size,
+        optimized_size=optimized_size or None,
+        compression_ratio=round((1 - optimized_size / original_size) * 100, 2)
+        if original_size and optimized_size
+        else None,
+        processing_time=run_seconds,
+        queue_wait_time=queue_wait,
+        error_message=error,
+        source_url=video_url,
+    )
+
+
+def _fail_video_job(article, video_url: str, error: str, *, queue_wait: float, run_seconds: float = 0) -> str:
+    _log_video_job(article, video_url, error=error, queue_wait=round(queue_wait, 3), run_seconds=run_seconds)
+    log_error(
+        "process_video_content",
+        f"Video işleme hatası: {error} (bekleme {queue_wait:.1f}s, işleme {run_seconds}s)",
+        related_id=article.id,
+    )
+    return f"Hata: {error}"
 
 
 # =============================================================================
@@ -622,10 +1093,8 @@ def generate_article_image(self, article_id: int) -> str:
             return f"Görsel zaten mevcut: {article.title}"
 
         try:
-            from google.genai import types
-
-            client = get_genai_client()
-            image_model_name = get_image_model_name()
+            client = get_image_client()
+            image_model_name = resolve_image_model(client, get_image_model_name())
 
             # Görsel promptu oluştur
             image_prompt = f"""
@@ -643,27 +1112,14 @@ Requirements:
 - Visually engaging and relevant to the topic
             """.strip()
 
-            # Yeni SDK ile görsel üretimi (retry ile)
-            def generate_image():
-                return client.models.generate_images(
-                    model=image_model_name,
-                    prompt=image_prompt,
-                    config=types.GenerateImagesConfig(
-                        number_of_images=1,
-                        aspect_ratio="16:9",
-                        output_mime_type="image/jpeg",
-                    ),
+            with track_ai_call("generate_article_image", image_model_name, "image", article_id=article_id) as call:
+                response, image_bytes = retry_with_backoff(
+                    call.attempt(lambda: generate_image(client, image_model_name, image_prompt)), max_retries=3
                 )
+                call.set_response(response)
 
-            response = retry_with_backoff(generate_image, max_retries=3)
-
-            if response.generated_images:
-                generated_image = response.generated_images[0]
-
-                # PIL Image'ı BytesIO'ya dönüştür
-                img_buffer = BytesIO()
-                generated_image.image._pil_image.save(img_buffer, format="JPEG", quality=95)
-                img_buffer.seek(0)
+            if image_bytes:
+                img_buffer = BytesIO(image_bytes)
 
                 # Dosya adı oluştur
                 filename = f"{article.slug}_ai_generated.jpg"
@@ -715,17 +1171,286 @@ Requirements:
 # =============================================================================
 
 
+def get_batch_concurrency() -> int:
+    """
+    Toplu üretimde aynı anda açık tutulacak Gen AI istek sayısını ayarlardan al.
+
+    Returns:
+        int: Eşzamanlı istek sayısı (varsayılan: 5)
+    """
+    try:
+        concurrency_setting = Setting.objects.get(key="AI_BATCH_CONCURRENCY")
+        return max(1, int(concurrency_setting.value))
+    except (Setting.DoesNotExist, ValueError):
+        return 5
+
+
+def get_requests_per_minute() -> int:
+    """
+    Gen AI API için dakika başına istek limitini (RPM) ayarlardan al.
+    Toplu üretim bu değeri parça (chunk) boyutu olarak kullanır.
+
+    Returns:
+        int: Dakika başına istek limiti (varsayılan: 60)
+    """
+    try:
+        rpm_setting = Setting.objects.get(key="AI_REQUESTS_PER_MINUTE")
+        return max(1, int(rpm_setting.value))
+    except (Setting.DoesNotExist, ValueError):
+        return 60
+
+
+async def generate_contents_concurrently(client, model_name: str, jobs: list, config, concurrency: int) -> list:
+    """
+    Birden fazla promptu async Gen AI client üzerinden eşzamanlı olarak çalıştır.
+    Aynı anda en fazla `concurrency` istek açık tutulur (asyncio.Semaphore).
+
+    Args:
+        client: genai.Client (client.aio kullanılır)
+        model_name: Model adı
+        jobs: (article_id, prompt) listesi
+        config: GenerateContentConfig
+        concurrency: Eşzamanlı istek üst sınırı
+
+    Returns:
+        list: Her iş için {"article_id", "status", "text", "error", "duration_ms"} sözlükleri
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_job(article_id, prompt):
+        async with semaphore:
+            started = time.monotonic()
+            result = {"article_id": article_id, "status": "succeeded", "text": None, "error": ""}
+            try:
+                # DB yazımı event loop dışında, toplu üretim sonunda yapılır (flush=False)
+                with track_ai_call(
+                    "batch_generate_content",
+                    model_name,
+                    "text",
+                    article_id,
+                    flush=False,
+                    prompt_version=getattr(prompt, "version", ""),
+                ) as call:
+                    response = await async_retry_with_backoff(
+                        call.attempt_async(
+                            lambda: client.aio.models.generate_content(model=model_name, contents=prompt, config=config)
+                        ),
+                        max_retries=3,
+                    )
+                    call.set_response(response)
+                if response and response.text:
+                    result["text"] = response.text
+                else:
+                    result["status"] = "failed"
+                    result["error"] = "AI yanıt boş"
+            except Exception as e:
+                result["status"] = "failed"
+                result["error"] = str(e)
+            result["duration_ms"] = int((time.monotonic() - started) * 1000)
+            return result
+
+    return await asyncio.gather(*(run_job(article_id, prompt) for article_id, prompt in jobs))
+
+
+# Toplu üretimde iki parçanın başlangıçları arasındaki en kısa süre (sn); RPM penceresi
+BATCH_CHUNK_INTERVAL = 60
+
+
+def run_chunks_paced(
+    client, model_name: str, chunks: list, config, concurrency: int, *, on_chunk, interval: float = BATCH_CHUNK_INTERVAL
+) -> float:
+    """
+    İş parçalarını tek event loop üzerinde sırayla çalıştır; parçalar arasında RPM limiti için bekle.
+
+    client.aio tek bir event loop'a bağlı kaldığından tüm parçalar aynı asyncio.Runner
+    içinde işlenir. Her parçanın sonuçları bir sonraki parçaya geçmeden on_chunk ile
+    (event loop dışında, senkron) verilir; böylece yazımlar parça parça yapılır. Bir parça
+    `interval` saniyeden kısa sürerse kalan süre beklenir.
+
+    Args:
+        chunks: Her biri (article_id, prompt) listesi olan parçalar
+        on_chunk: Parça sonuçlarıyla (generate_contents_concurrently çıktısı) çağrılır
+        interval: İki parçanın başlangıçları arasındaki en kısa süre (sn)
+
+    Returns:
+        float: Sonraki parçanın en erken başlayabileceği zaman (time.monotonic)
+    """
+    next_start = time.monotonic()
+    with asyncio.Runner() as runner:
+        for index, jobs in enumerate(chunks):
+            if index:
+                time.sleep(max(0.0, next_start - time.monotonic()))
+            next_start = time.monotonic() + interval
+            on_chunk(runner.run(generate_contents_concurrently(client, model_name, jobs, config, concurrency)))
+    return next_start
+
+
+def get_max_batch_chunks() -> int | None:
+    """
+    Bir toplu üretim görevinin görev süre limitine sığan en fazla parça sayısı.
+    Her parça en az bir dakika sürer; son bir dakika DB yazımı için pay bırakılır.
+
+    Returns:
+        int | None: Parça sayısı; süre limiti tanımlı değilse None
+    """
+    time_limit = getattr(settings, "CELERY_TASK_SOFT_TIME_LIMIT", None) or getattr(
+        settings, "CELERY_TASK_TIME_LIMIT", None
+    )
+    if not time_limit:
+        return None
+    return max(1, int(time_limit // 60) - 1)
+
+
 @shared_task(bind=True)
-def batch_regenerate_content(self, article_ids: list) -> str:
+def batch_generate_content(self, article_ids: list, concurrency: int | None = None) -> dict:
+    """
+    Birden fazla makale için eşzamanlı toplu içerik üretimi.
+
+    Makaleler RPM limitine göre parçalara bölünür; tüm parçalar tek event loop
+    içinde async Gen AI client ile eşzamanlı işlenir ve her parçanın başarılı sonuçları
+    parça biter bitmez bulk_update ile yazılır (görev yarıda kesilse de ödenmiş üretimler
+    kaybolmaz). Bir parça bir dakikadan kısa sürerse sonraki parça için kalan süre
+    beklenir, böylece dakika başına istek limiti aşılmaz. Görev süre limitine sığmayan
+    makaleler, bu görevin parçaları bittikten sonra RPM aralığı dolunca başlayacak yeni
+    bir batch_generate_content görevine devredilir.
+
+    Args:
+        article_ids: Makale ID listesi
+        concurrency: Eşzamanlı istek sayısı (varsayılan: AI_BATCH_CONCURRENCY ayarı)
+
+    Returns:
+        dict: Toplam/başarılı/başarısız/atlanan/devredilen sayıları, makale bazında durum ve toplam süre
+    """
+    from google.genai import types
+
+    started = time.monotonic()
+    concurrency = concurrency or get_batch_concurrency()
+    chunk_size = get_requests_per_minute()
+
+    items = []
+    articles = {article.id: article for article in Article.objects.filter(id__in=article_ids)}
+    pending = []
+
+    for article_id in article_ids:
+        article = articles.get(article_id)
+        if article is None:
+            items.append({"article_id": article_id, "status": "skipped", "error": "Makale bulunamadı"})
+        elif article.is_ai_generated and article.status == "published":
+            items.append({"article_id": article_id, "status": "skipped", "error": "Makale zaten işlenmiş"})
+        else:
+            pending.append(article)
+
+    author_pool = get_author_pool()
+    if pending and not author_pool.has_authors:
+        log_error("batch_generate_content", "Aktif yazar bulunamadı")
+        items.extend({"article_id": a.id, "status": "failed", "error": "Aktif yazar bulunamadı"} for a in pending)
+        pending = []
+
+    if pending:
+        client = get_genai_client()
+        model_name = get_ai_model_name()
+        config = types.GenerateContentConfig(**build_generation_config())
+
+        # Görev süre limitine sığmayan makaleler bu görevin parçalarından sonra devredilir
+        deferred = []
+        max_chunks = get_max_batch_chunks()
+        if max_chunks is not None and len(pending) > max_chunks * chunk_size:
+            deferred = pending[max_chunks * chunk_size :]
+            pending = pending[: max_chunks * chunk_size]
+            items.extend(
+                {"article_id": article.id, "status": "deferred", "error": "Sonraki toplu göreve devredildi"}
+                for article in deferred
+            )
+
+        chunks = []
+        for offset in range(0, len(pending), chunk_size):
+            jobs = []
+            for article in pending[offset : offset + chunk_size]:
+                article.author, _ = author_pool.select(article.category)
+                jobs.append((article.id, build_article_prompt(article, article.author)))
+            chunks.append(jobs)
+
+        by_id = {article.id: article for article in pending}
+
+        def save_chunk(results):
+            flush_ai_call_logs()
+            now = timezone.now()
+            updated = []
+            for result in results:
+                text = result.pop("text")
+                if result["status"] == "succeeded":
+                    article = by_id[result["article_id"]]
+                    article.content = text
+                    article.is_ai_generated = True
+                    article.status = "published"
+                    article.published_at = now
+                    article.updated_at = now
+                    updated.append(article)
+                else:
+                    log_error(
+                        "batch_generate_content",
+                        f"Toplu üretim hatası (ID: {result['article_id']}): {result['error']}",
+                        related_id=result["article_id"],
+                    )
+                items.append(result)
+
+            if updated:
+                with transaction.atomic():
+                    Article.objects.bulk_update(
+                        updated, ["author", "content", "is_ai_generated", "status", "published_at", "updated_at"]
+                    )
+                    for article in updated:
+                        transaction.on_commit(lambda article_id=article.id: generate_article_image.delay(article_id))
+
+        # Tüm parçalar tek event loop'ta; parçalar arası RPM beklemesi, yazım her parçadan sonra
+        next_start = time.monotonic() + BATCH_CHUNK_INTERVAL
+        try:
+            next_start = run_chunks_paced(client, model_name, chunks, config, concurrency, on_chunk=save_chunk)
+        finally:
+            # Devredilen görev bu görevle aynı anda çalışıp RPM limitini aşmasın
+            if deferred:
+                batch_generate_content.apply_async(
+                    ([article.id for article in deferred], concurrency),
+                    countdown=max(0, math.ceil(next_start - time.monotonic())),
+                )
+
+    summary = {
+        "total": len(article_ids),
+        "succeeded": sum(1 for item in items if item["status"] == "succeeded"),
+        "failed": sum(1 for item in items if item["status"] == "failed"),
+        "skipped": sum(1 for item in items if item["status"] == "skipped"),
+        "deferred": sum(1 for item in items if item["status"] == "deferred"),
+        "wall_time": round(time.monotonic() - started, 3),
+        "items": items,
+    }
+
+    log_info(
+        "batch_generate_content",
+        f"Toplu üretim tamamlandı: {summary['succeeded']} başarılı, {summary['failed']} başarısız, "
+        f"{summary['skipped']} atlandı ({summary['wall_time']}s)",
+    )
+    return summary
+
+
+@shared_task(bind=True)
+def batch_regenerate_content(self, article_ids: list, concurrent: bool = False) -> str:
     """
     Birden fazla makale için toplu içerik yeniden üretimi.
 
     Args:
         article_ids: Makale ID listesi
+        concurrent: True ise makaleler tek tek kuyruğa atılmaz,
+            batch_generate_content ile eşzamanlı olarak üretilir
 
     Returns:
         str: İşlem sonucu mesajı
     """
+    if concurrent:
+        batch_generate_content.delay(article_ids)
+        result_msg = f"Eşzamanlı toplu üretim başlatıldı: {len(article_ids)} makale"
+        log_info("batch_regenerate_content", result_msg)
+        return result_msg
+
     success_count = 0
     failed_count = 0
 
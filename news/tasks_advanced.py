@@ -3,13 +3,20 @@ HaberNexus - Geliştirilmiş Celery Task'ları (v2.0)
 Pipeline orchestration, AI content generation, media processing
 """
 
-import json
 import logging
 import time
 
-import google.generativeai as genai
-from celery import chain, shared_task
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.text import slugify
 
+from celery import chain, chord, current_task, group, shared_task
+
+from core.models import Setting
+from news import pipeline_context, pipeline_runs
+from news.ai_instrumentation import backfill_article, track_ai_call
 from news.content_utils import (
     ArticleClassifier,
     AuthorStyleSelector,
@@ -19,23 +26,140 @@ from news.content_utils import (
     ReadabilityMetrics,
     RSSMediaExtractor,
 )
+from news.log_buffer import BulkLogBuffer
 from news.models import Article
 from news.models_advanced import ArticleMedia, ArticleSEO
-from news.models_extended import ContentGenerationLog
+from news.models_extended import ContentGenerationLog, PipelineRun
+from news.tasks import generate_image, get_genai_client, get_image_client, get_image_model_name, resolve_image_model
 
 logger = logging.getLogger(__name__)
 
-# Gemini API konfigürasyonu
-genai.configure(api_key="GOOGLE_GEMINI_API_KEY")  # .env'den yüklenecek
-
 
 # ============================================================================
 # MAIN PIPELINE TASK
 # ============================================================================
 
+# Aynı görevde, aralarında broker'a dönmeden çalıştırılan ucuz (CPU / kısa DB) aşamalar.
+# Broker atlaması yalnızca I/O ağırlıklı aşamaların (içerik, medya, görsel) çevresinde kalır.
+PRE_GENERATION_STAGES = ("duplicate_check", "quality_filter", "classification", "author_selection")
+POST_MEDIA_STAGES = ("seo_optimization", "quality_assurance", "publishing")
+
+
+# Üretilen içerikten sonra birbirinin çıktısını kullanmayan, paralel çalışabilen aşamalar.
+# Birleştirilmiş düzende SEO milisaniyelik olduğu için ayrı dal yerine finalize içinde kalır.
+PARALLEL_STAGES = {
+    True: ("media_processing", "image_generation"),
+    False: ("media_processing", "image_generation", "seo_optimization"),
+}
+
+# Ölçüm komutlarındaki düzen adı -> (fused, parallel)
+PIPELINE_LAYOUTS = {
+    "chain": (False, False),
+    "chain-dag": (False, True),
+    "fused": (True, False),
+    "fused-dag": (True, True),
+}
+
+
+def is_stage_fusion_enabled() -> bool:
+    """
+    Ucuz aşamaların tek görevde birleştirilip birleştirilmeyeceğini ayarlardan al.
+
+    Returns:
+        bool: PIPELINE_FUSE_STAGES ayarı (varsayılan: True)
+    """
+    try:
+        fusion_setting = Setting.objects.get(key="PIPELINE_FUSE_STAGES")
+        return fusion_setting.value.lower().strip() in ("1", "true", "yes", "on")
+    except Setting.DoesNotExist:
+        return True
+
+
+def is_parallel_branches_enabled() -> bool:
+    """
+    Bağımsız aşamaların paralel (group + chord) çalışıp çalışmayacağını ayarlardan al.
+
+    Returns:
+        bool: PIPELINE_PARALLEL_BRANCHES ayarı (varsayılan: True)
+    """
+    try:
+        parallel_setting = Setting.objects.get(key="PIPELINE_PARALLEL_BRANCHES")
+        return parallel_setting.value.lower().strip() in ("1", "true", "yes", "on")
+    except Setting.DoesNotExist:
+        return True
+
+
+def get_pipeline_layout(fused: bool = True, parallel: bool = True) -> list:
+    """
+    Pipeline DAG'ını katmanlar halinde döndür.
+    Her katman tek bir görev ya da paralel çalışan görevlerin tuple'ıdır; paralel katmanı
+    izleyen görev chord callback'i olarak dalların sonuçlarını birleştirir.
+    """
+    if fused:
+        pre = [prepare_article_task]
+        post = [finalize_article_task]
+    else:
+        pre = [check_duplicate_task, filter_quality_task, classify_article_task, select_author_style_task]
+        post = [quality_assurance_task, publish_article_task]
+        if not parallel:
+            post.insert(0, optimize_seo_task)
+
+    branches = [process_media_task, generate_featured_image_task]
+    if not fused and parallel:
+        branches.append(optimize_seo_task)
+
+    middle = [tuple(branches)] if parallel else branches
+    return [*pre, generate_content_task, *middle, *post]
+
+
+def is_layer_completed(layer, completed) -> bool:
+    """
+    Katmandaki görevlerin tüm aşamaları tamamlanmış mı.
+    """
+    tasks = layer if isinstance(layer, tuple) else (layer,)
+    return all(stage in completed for task in tasks for stage in TASK_STAGES[task.name])
+
+
+def build_article_pipeline(article_data: dict, fused: bool = True, parallel: bool = True, completed=()):
+    """
+    Pipeline zincirini DAG düzeninden oluştur.
+
+    Args:
+        article_data: Haber verisi
+        fused: True ise ucuz aşamalar iki görevde birleştirilir, False ise her aşama ayrı görevdir
+        parallel: True ise bağımsız aşamalar group olarak paralel çalışır ve chord ile birleşir;
+            kritik yol dalların toplamı yerine en yavaş dal kadar olur
+        completed: Tamamlanmış aşamalar; baştaki tamamen tamamlanmış katmanlar atlanır
+            (devam ettirilen çalıştırmalar için)
+
+    Returns:
+        celery.chain: Çalıştırılmaya hazır zincir (çalışacak katman kalmadıysa None)
+    """
+    layers = get_pipeline_layout(fused, parallel)
+    while layers and is_layer_completed(layers[0], completed):
+        layers.pop(0)
+    if not layers:
+        return None
+
+    steps = []
+    index = 0
+    while index < len(layers):
+        layer = layers[index]
+        # Zincirin ilk görevi article_data'yı alır, sonrakiler önceki sonucu
+        args = () if steps else (article_data,)
+        if isinstance(layer, tuple):
+            # Paralel dallar ve ardından gelen birleştirme görevi
+            steps.append(chord(group(task.s(*args) for task in layer), layers[index + 1].s()))
+            index += 2
+        else:
+            steps.append(layer.s(*args))
+            index += 1
+
+    return chain(*steps)
+
 
 @shared_task
-def process_article_pipeline(article_data: dict) -> dict:
+def process_article_pipeline(article_data: dict, fused: bool | None = None, parallel: bool | None = None) -> dict:
     """
     Tüm içerik üretim pipeline'ını orchestrate et
 
@@ -50,28 +174,31 @@ def process_article_pipeline(article_data: dict) -> dict:
     8. SEO optimization
     9. Quality assurance
     10. Publishing
+
+    1-4 ve 8-10 varsayılan olarak birleştirilmiş görevlerde çalışır (bkz. PIPELINE_FUSE_STAGES).
+    6 ve 7 (ayrı görevli düzende 8 de) içerikten sonra paralel çalışır (bkz. PIPELINE_PARALLEL_BRANCHES).
+    Aşama süreleri article_data["stage_timings"] altında, uçtan uca süre yayında tutulur.
+    Her aşamanın çıktısı PipelineRun kontrol noktası olarak saklanır (bkz. resume_pipeline_run).
+    Görevler arasında tam veri yerine bağlam referansı taşınır (bkz. PIPELINE_SLIM_PAYLOADS,
+    news.pipeline_context).
     """
 
     try:
-        # Pipeline'ı chain olarak tanımla
-        pipeline = chain(
-            check_duplicate_task.s(article_data),
-            filter_quality_task.s(),
-            classify_article_task.s(),
-            select_author_style_task.s(),
-            generate_content_task.s(),
-            process_media_task.s(),
-            generate_featured_image_task.s(),
-            optimize_seo_task.s(),
-            quality_assurance_task.s(),
-            publish_article_task.s(),
-        )
+        if fused is None:
+            fused = is_stage_fusion_enabled()
+        if parallel is None:
+            parallel = is_parallel_branches_enabled()
+
+        article_data.setdefault("pipeline_started_at", time.time())
+        run_id = pipeline_runs.start_run(article_data, fused, parallel)
+        if pipeline_context.is_slim_payloads_enabled():
+            article_data = pipeline_context.create(article_data)
 
-        # Pipeline'ı çalıştır
-        result = pipeline.apply_async()
+        # Pipeline'ı DAG (chain + chord) olarak tanımla ve çalıştır
+        result = build_article_pipeline(article_data, fused=fused, parallel=parallel).apply_async()
 
-        logger.info(f"Article pipeline started: {result.id}")
-        return {"status": "processing", "task_id": result.id}
+        logger.info(f"Article pipeline started: {result.id} (run: {run_id}, fused: {fused}, parallel: {parallel})")
+        return {"status": "processing", "task_id": result.id, "run_id": run_id}
 
     except Exception as e:
         logger.error(f"Pipeline failed: {e!s}")
@@ -79,36 +206,169 @@ def process_article_pipeline(article_data: dict) -> dict:
 
 
 # ============================================================================
-# AŞAMA 1: DUPLICATE CHECK
+# FUSED STAGES
 # ============================================================================
 
 
-@shared_task(bind=True, max_retries=2)
-def check_duplicate_task(self, article_data: dict) -> dict:
+def merge_branch_results(results: list) -> dict:
     """
-    Benzer haberler var mı kontrol et
+    Paralel dalların çıktılarını tek article_data'da birleştir.
+    Dallar aynı girdiden başlar ve yalnızca kendi alanlarını ekler; aşama süreleri birleştirilir.
+    """
+    merged, timings = {}, {}
+    for result in results:
+        timings.update(result.get("stage_timings", {}))
+        merged.update(result)
+    merged["stage_timings"] = timings
+    return merged
+
+
+# Görevlerin retry'lar arasında beklediği en uzun süre (self.retry countdown'ları)
+MAX_RETRY_COUNTDOWN = 120
+
+
+def _stage_lease_seconds() -> int:
+    """
+    Çalışan görevin kalan retry'larıyla birlikte en kötü durumda sürebileceği süre (sn).
+    Görev dışında çağrıldıysa tek deneme için genel zaman sınırı.
+    """
+    time_limit = settings.CELERY_TASK_TIME_LIMIT
+    if not current_task or not current_task.request.id:
+        return time_limit
+    time_limit = current_task.time_limit or time_limit
+    remaining = max(0, (current_task.max_retries or 0) - current_task.request.retries)
+    return (remaining + 1) * time_limit + remaining * MAX_RETRY_COUNTDOWN
+
+
+def _retries_pending() -> bool:
+    """
+    Çalışan Celery görevinin retry hakkı kaldı mı (görev dışında çağrıldıysa False).
     """
+    if not current_task or not current_task.request.id:
+        return False
+    return current_task.max_retries is None or current_task.request.retries < current_task.max_retries
+
+
+def run_stage(stage: str, article_data: dict | list, *, fallback: dict | None = None) -> dict:
+    """
+    Aşamayı çalıştır, süresini article_data["stage_timings"] altına (ms) yaz, logla ve
+    değiştirdiği alanları kontrol noktası olarak kaydet.
+    Chord callback'i olarak liste halinde dal sonuçları gelirse önce birleştirilir.
+    stage_timings'te kaydı olan (tamamlanmış) aşama tekrar çalıştırılmaz; retry ve devam
+    ettirmede ücretli adımlar yinelenmez.
+    Bağlam referansı gelirse tam veri depodan kurulur ve yine referans döndürülür.
+    fallback verilirse (isteğe bağlı aşamalar) hata fırlatılmaz: alanlar article_data'ya
+    yazılır ve aşama aynı şekilde süresi ve kontrol noktasıyla tamamlanmış kaydedilir.
+    """
+    if isinstance(article_data, list):
+        article_data = merge_branch_results(article_data)
+
+    if stage in article_data.get("stage_timings", {}):
+        return article_data
+
+    # Aşama (ve retry'ları) bitene kadar çalıştırma takılmış sayılıp devam ettirilmez
+    pipeline_runs.extend_lease(article_data, _stage_lease_seconds())
+
+    ref = article_data if pipeline_context.is_ref(article_data) else None
+    if ref is not None:
+        article_data = pipeline_context.load(ref)
+
+    before = dict(article_data)
     start_time = time.time()
+    status = "completed"
 
     try:
-        title = article_data.get("title", "")
-        category = article_data.get("category", "Diğer")
+        article_data = STAGE_FUNCTIONS[stage](dict(article_data))
+    except Exception as exc:
+        if fallback is None:
+            # Retry hakkı varken çalıştırma "failed" sayılmaz; yoksa devam ettirme beat'i
+            # bekleyen retry ile aynı anda yeni zincir kurup ücretli aşamaları tekrarlar
+            if not _retries_pending():
+                pipeline_runs.mark_failed(stage, article_data, exc)
+            raise
+        logger.error(f"Stage {stage} failed, continuing with fallback: {exc!s}")
+        article_data = {**before, **fallback}
+        status = "failed"
+
+    duration = time.time() - start_time
+    article_data.setdefault("stage_timings", {})[stage] = round(duration * 1000, 2)
+    delta = pipeline_context.compute_delta(before, article_data, stage)
+    log_generation_step(stage, article_data, duration, status)
+    pipeline_runs.save_checkpoint(stage, article_data, delta)
+
+    if ref is not None:
+        return pipeline_context.advance(ref, stage, delta)
+    return article_data
+
+
+def run_stages(stages, article_data: dict | list) -> dict:
+    """
+    Aşamaları aynı görev içinde sırayla çalıştır.
+    """
+    for stage in stages:
+        article_data = run_stage(stage, article_data)
+    return article_data
 
-        # Duplicate kontrol
-        is_dup, similar_article = DuplicateDetector().find_similar_articles(title, category, days=7)
 
-        if is_dup:
-            logger.warning(f"Duplicate article found: {title}")
-            article_data["is_duplicate"] = True
-            article_data["duplicate_of"] = similar_article.id if similar_article else None
-        else:
-            article_data["is_duplicate"] = False
+@shared_task(bind=True, max_retries=2)
+def prepare_article_task(self, article_data: dict) -> dict:
+    """
+    Üretim öncesi ucuz aşamalar: duplicate check, kalite filtresi, sınıflandırma, yazar seçimi.
+    Aşamalar yalnızca article_data alanlarını yazdığı için retry'da baştan çalıştırılabilir.
+    """
+    try:
+        return run_stages(PRE_GENERATION_STAGES, article_data)
 
-        # Log
-        duration = time.time() - start_time
-        log_generation_step("duplicate_check", article_data, duration, "completed")
+    except Exception as exc:
+        logger.error(f"Article preparation failed: {exc!s}")
+        raise self.retry(exc=exc, countdown=60) from exc
+
+
+@shared_task(bind=True, max_retries=2)
+def finalize_article_task(self, article_data: dict) -> dict:
+    """
+    Medya sonrası ucuz aşamalar: SEO, kalite kontrol ve yayın.
+    """
+    try:
+        return run_stages(POST_MEDIA_STAGES, article_data)
+
+    except Exception as exc:
+        logger.error(f"Article finalization failed: {exc!s}")
+        raise self.retry(exc=exc, countdown=60) from exc
+
+
+# ============================================================================
+# AŞAMA 1: DUPLICATE CHECK
+# ============================================================================
 
-        return article_data
+
+def check_duplicate(article_data: dict) -> dict:
+    """
+    Benzer haberler var mı kontrol et
+    """
+    title = article_data.get("title", "")
+    category = article_data.get("category", "Diğer")
+
+    # Duplicate kontrol
+    similar_articles = DuplicateDetector.find_similar_articles(title, category, days=7)
+
+    if similar_articles:
+        logger.warning(f"Duplicate article found: {title}")
+        article_data["is_duplicate"] = True
+        article_data["duplicate_of"] = similar_articles[0].id
+    else:
+        article_data["is_duplicate"] = False
+
+    return article_data
+
+
+@shared_task(bind=True, max_retries=2)
+def check_duplicate_task(self, article_data: dict) -> dict:
+    """
+    Benzer haberler var mı kontrol et
+    """
+    try:
+        return run_stage("duplicate_check", article_data)
 
     except Exception as exc:
         logger.error(f"Duplicate check failed: {exc!s}")
@@ -120,35 +380,35 @@ def check_duplicate_task(self, article_data: dict) -> dict:
 # ============================================================================
 
 
-@shared_task(bind=True, max_retries=2)
-def filter_quality_task(self, article_data: dict) -> dict:
+def filter_quality(article_data: dict) -> dict:
     """
     Başlık ve özet kalitesini kontrol et
     """
-    start_time = time.time()
+    title = article_data.get("title", "")
 
-    try:
-        title = article_data.get("title", "")
-        article_data.get("summary", "")
+    # Kalite puanı hesapla
+    quality_score = ContentQualityScorer.score_headline(title)
 
-        # Kalite puanı hesapla
-        quality_score = ContentQualityScorer.score_headline(title)
+    article_data["quality_score"] = quality_score
 
-        article_data["quality_score"] = quality_score
+    # Düşük kaliteli haberleri filtrele
+    if quality_score < 40:
+        logger.warning(f"Low quality article: {title} (score: {quality_score})")
+        article_data["filtered_out"] = True
+        article_data["filter_reason"] = "low_quality"
+    else:
+        article_data["filtered_out"] = False
 
-        # Düşük kaliteli haberleri filtrele
-        if quality_score < 40:
-            logger.warning(f"Low quality article: {title} (score: {quality_score})")
-            article_data["filtered_out"] = True
-            article_data["filter_reason"] = "low_quality"
-        else:
-            article_data["filtered_out"] = False
+    return article_data
 
-        # Log
-        duration = time.time() - start_time
-        log_generation_step("quality_filter", article_data, duration, "completed")
 
-        return article_data
+@shared_task(bind=True, max_retries=2)
+def filter_quality_task(self, article_data: dict) -> dict:
+    """
+    Başlık ve özet kalitesini kontrol et
+    """
+    try:
+        return run_stage("quality_filter", article_data)
 
     except Exception as exc:
         logger.error(f"Quality filtering failed: {exc!s}")
@@ -160,29 +420,30 @@ def filter_quality_task(self, article_data: dict) -> dict:
 # ============================================================================
 
 
-@shared_task(bind=True, max_retries=2)
-def classify_article_task(self, article_data: dict) -> dict:
+def classify_article(article_data: dict) -> dict:
     """
     Makaleyi kategori ve alt kategoriye sınıflandır
     """
-    start_time = time.time()
+    title = article_data.get("title", "")
+    summary = article_data.get("summary", "")
 
-    try:
-        title = article_data.get("title", "")
-        summary = article_data.get("summary", "")
+    # Sınıflandır
+    classification = ArticleClassifier.classify_article(title, summary)
 
-        # Sınıflandır
-        classification = ArticleClassifier.classify_article(title, summary)
+    article_data.update(classification)
 
-        article_data.update(classification)
+    logger.info(f"Article classified: {title} -> {classification['category']}")
 
-        logger.info(f"Article classified: {title} -> {classification['category']}")
+    return article_data
 
-        # Log
-        duration = time.time() - start_time
-        log_generation_step("classification", article_data, duration, "completed")
 
-        return article_data
+@shared_task(bind=True, max_retries=2)
+def classify_article_task(self, article_data: dict) -> dict:
+    """
+    Makaleyi kategori ve alt kategoriye sınıflandır
+    """
+    try:
+        return run_stage("classification", article_data)
 
     except Exception as exc:
         logger.error(f"Classification failed: {exc!s}")
@@ -194,31 +455,32 @@ def classify_article_task(self, article_data: dict) -> dict:
 # ============================================================================
 
 
-@shared_task(bind=True, max_retries=2)
-def select_author_style_task(self, article_data: dict) -> dict:
+def select_author_style(article_data: dict) -> dict:
     """
     Kategori ve önem seviyesine göre yazar seç
     """
-    start_time = time.time()
+    category = article_data.get("category", "Diğer")
+    importance_level = article_data.get("importance_level", 1)
 
-    try:
-        category = article_data.get("category", "Diğer")
-        importance_level = article_data.get("importance_level", 1)
+    # Yazar ve stil seç
+    author, style = AuthorStyleSelector.select_author_and_style(category, importance_level)
 
-        # Yazar ve stil seç
-        author, style = AuthorStyleSelector.select_author_and_style(category, importance_level)
+    article_data["author_id"] = author.id
+    article_data["author_name"] = author.name
+    article_data["style"] = style
 
-        article_data["author_id"] = author.id
-        article_data["author_name"] = author.name
-        article_data["style"] = style
+    logger.info(f"Author selected: {author.name} for {category}")
 
-        logger.info(f"Author selected: {author.name} for {category}")
+    return article_data
 
-        # Log
-        duration = time.time() - start_time
-        log_generation_step("author_selection", article_data, duration, "completed")
 
-        return article_data
+@shared_task(bind=True, max_retries=2)
+def select_author_style_task(self, article_data: dict) -> dict:
+    """
+    Kategori ve önem seviyesine göre yazar seç
+    """
+    try:
+        return run_stage("author_selection", article_data)
 
     except Exception as exc:
         logger.error(f"Author selection failed: {exc!s}")
@@ -230,58 +492,71 @@ def select_author_style_task(self, article_data: dict) -> dict:
 # ============================================================================
 
 
-@shared_task(bind=True, max_retries=3, time_limit=900)  # 15 dakika timeout
-def generate_content_task(self, article_data: dict) -> dict:
+def generate_content(article_data: dict) -> dict:
     """
     Gemini API'yi kullanarak haber yazısı üret
     """
-    start_time = time.time()
-
-    try:
-        from authors.models import Author
-
-        # Yazar bilgisini al
-        author = Author.objects.get(id=article_data["author_id"])
-        style = article_data["style"]
-
-        # Prompt oluştur
-        prompt = PromptGenerator.generate_content_prompt(article_data, author, style)
-
-        # Model seç
-        importance_level = article_data.get("importance_level", 1)
-        model = "gemini-3-pro" if importance_level >= 4 else "gemini-2.5-flash"
-
-        # İçerik üret
-        client = genai.Client()
+    from authors.models import Author
+
+    # Yazar bilgisini al
+    author = Author.objects.get(id=article_data["author_id"])
+    style = article_data["style"]
+
+    # Prompt oluştur
+    prompt = PromptGenerator.generate_content_prompt(article_data, author, style)
+
+    # Model seç
+    importance_level = article_data.get("importance_level", 1)
+    model = "gemini-3-pro" if importance_level >= 4 else "gemini-2.5-flash"
+
+    # İçerik üret
+    from google.genai import types
+
+    client = get_genai_client()
+    with track_ai_call(
+        "generate_content_task",
+        model,
+        "text",
+        article_id=article_data.get("article_id"),
+        prompt_version=prompt.version,
+        pipeline_run_id=article_data.get("pipeline_run_id", ""),
+    ) as call:
         response = client.models.generate_content(
             model=model,
             contents=prompt,
-            generation_config=genai.types.GenerationConfig(
+            config=types.GenerateContentConfig(
                 temperature=0.7,
                 top_p=0.95,
                 top_k=40,
                 max_output_tokens=2000,
             ),
         )
+        call.set_response(response)
 
-        content = response.text
+    content = response.text
 
-        # Kalite kontrol
-        metrics = ReadabilityMetrics.calculate_content_metrics(content)
-        quality_score = min(100, metrics["word_count"] / 10)  # Basit kalite puanı
+    # Kalite kontrol
+    metrics = ReadabilityMetrics.calculate_content_metrics(content)
+    quality_score = min(100, metrics["word_count"] / 10)  # Basit kalite puanı
 
-        article_data["content"] = content
-        article_data["content_quality_score"] = quality_score
-        article_data["readability_metrics"] = metrics
-        article_data["model_used"] = model
+    article_data["content"] = content
+    article_data["content_quality_score"] = quality_score
+    article_data["readability_metrics"] = metrics
+    article_data["model_used"] = model
+    article_data["prompt_version"] = prompt.version
 
-        logger.info(f"Content generated: {article_data['title'][:50]} (quality: {quality_score})")
+    logger.info(f"Content generated: {article_data['title'][:50]} (quality: {quality_score})")
 
-        # Log
-        duration = time.time() - start_time
-        log_generation_step("content_generation", article_data, duration, "completed")
+    return article_data
 
-        return article_data
+
+@shared_task(bind=True, max_retries=3, time_limit=900)  # 15 dakika timeout
+def generate_content_task(self, article_data: dict) -> dict:
+    """
+    Gemini API'yi kullanarak haber yazısı üret
+    """
+    try:
+        return run_stage("content_generation", article_data)
 
     except Exception as exc:
         logger.error(f"Content generation failed: {exc!s}")
@@ -293,35 +568,32 @@ def generate_content_task(self, article_data: dict) -> dict:
 # ============================================================================
 
 
-@shared_task(bind=True, max_retries=2)
-def process_media_task(self, article_data: dict) -> dict:
+def process_media(article_data: dict) -> dict:
     """
     RSS kaynağından medya çıkar ve işle
     """
-    start_time = time.time()
+    source_url = article_data.get("source_url", "")
+    article_url = article_data.get("link", "")
 
-    try:
-        source_url = article_data.get("source_url", "")
-        article_url = article_data.get("link", "")
+    # RSS'den medya çıkar
+    media = RSSMediaExtractor.extract_media_from_rss(source_url, article_url)
 
-        # RSS'den medya çıkar
-        media = RSSMediaExtractor.extract_media_from_rss(source_url, article_url)
+    article_data["rss_media"] = media
 
-        article_data["rss_media"] = media
+    logger.info(f"Media extracted: {len(media['images'])} images, {len(media['videos'])} videos")
 
-        logger.info(f"Media extracted: {len(media['images'])} images, {len(media['videos'])} videos")
+    return article_data
 
-        # Log
-        duration = time.time() - start_time
-        log_generation_step("media_processing", article_data, duration, "completed")
-
-        return article_data
 
-    except Exception as exc:
-        logger.error(f"Media processing failed: {exc!s}")
-        # Medya işleme başarısız olsa da devam et
-        article_data["rss_media"] = {"images": [], "videos": [], "audio": []}
-        return article_data
+@shared_task(bind=True, max_retries=2)
+def process_media_task(self, article_data: dict) -> dict:
+    """
+    RSS kaynağından medya çıkar ve işle
+    """
+    # Medya işleme başarısız olsa da boş medya ile devam et
+    return run_stage(
+        "media_processing", article_data, fallback={"rss_media": {"images": [], "videos": [], "audio": []}}
+    )
 
 
 # ============================================================================
@@ -329,41 +601,49 @@ def process_media_task(self, article_data: dict) -> dict:
 # ============================================================================
 
 
-@shared_task(bind=True, max_retries=2, time_limit=300)  # 5 dakika timeout
-def generate_featured_image_task(self, article_data: dict) -> dict:
+def generate_featured_image(article_data: dict) -> dict:
     """
-    Haber başlığı için görsel üret (Imagen 3)
+    Haber başlığı için görsel üret (Vertex AI modunda Imagen, API anahtarıyla Gemini görsel modeli)
     """
-    start_time = time.time()
+    title = article_data.get("title", "")
+    category = article_data.get("category", "Diğer")
 
-    try:
-        title = article_data.get("title", "")
-        category = article_data.get("category", "Diğer")
+    # Prompt oluştur
+    image_prompt = PromptGenerator.generate_image_prompt(title, category)
 
-        # Prompt oluştur
-        PromptGenerator.generate_image_prompt(title, category)
+    client = get_image_client()
+    image_model = resolve_image_model(client, get_image_model_name())
+    with track_ai_call(
+        "generate_featured_image_task",
+        image_model,
+        "image",
+        article_id=article_data.get("article_id"),
+        pipeline_run_id=article_data.get("pipeline_run_id", ""),
+    ) as call:
+        response, image_bytes = generate_image(client, image_model, image_prompt)
+        call.set_response(response)
 
-        # Imagen 3 ile görsel üret
-        genai.Client()
+    if not image_bytes:
+        raise ValueError("Görsel API yanıtı boş")
 
-        # TODO: Imagen 3 API entegrasyonu yapılacak
-        # Şimdilik placeholder
-        article_data["featured_image_generated"] = True
-        article_data["featured_image_url"] = None  # Gerçek URL'ye güncellenecek
+    # Makale henüz oluşmadığı için görsel depoya yazılır, yolu sonraki aşamalara aktarılır
+    path = default_storage.save(f"articles/generated/{slugify(title)[:50]}.jpg", ContentFile(image_bytes))
 
-        logger.info(f"Featured image generation started: {title[:50]}")
+    article_data["featured_image_generated"] = True
+    article_data["featured_image_url"] = default_storage.url(path)
 
-        # Log
-        duration = time.time() - start_time
-        log_generation_step("image_generation", article_data, duration, "completed")
+    logger.info(f"Featured image generation started: {title[:50]}")
 
-        return article_data
+    return article_data
 
-    except Exception as exc:
-        logger.error(f"Image generation failed: {exc!s}")
-        # Görsel üretimi başarısız olsa da devam et
-        article_data["featured_image_generated"] = False
-        return article_data
+
+@shared_task(bind=True, max_retries=2, time_limit=300)  # 5 dakika timeout
+def generate_featured_image_task(self, article_data: dict) -> dict:
+    """
+    Haber başlığı için görsel üret
+    """
+    # Görsel üretimi başarısız olsa da devam et
+    return run_stage("image_generation", article_data, fallback={"featured_image_generated": False})
 
 
 # ============================================================================
@@ -371,47 +651,47 @@ def generate_featured_image_task(self, article_data: dict) -> dict:
 # ============================================================================
 
 
+def optimize_seo(article_data: dict) -> dict:
+    """
+    SEO optimizasyonu yap
+    """
+    title = article_data.get("title", "")
+    category = article_data.get("category", "")
+
+    # Meta description oluştur
+    summary = article_data.get("summary", "")
+    meta_description = summary[:160] if summary else title[:160]
+
+    # Meta keywords oluştur
+    keywords = [category]
+    if article_data.get("subcategory"):
+        keywords.append(article_data["subcategory"])
+    meta_keywords = ", ".join(keywords)
+
+    # Open Graph tags
+    og_title = title[:95]
+    og_description = summary[:200] if summary else title[:200]
+
+    article_data["seo"] = {
+        "meta_description": meta_description,
+        "meta_keywords": meta_keywords,
+        "og_title": og_title,
+        "og_description": og_description,
+        "canonical_url": article_data.get("link", ""),
+    }
+
+    logger.info(f"SEO optimization completed: {title[:50]}")
+
+    return article_data
+
+
 @shared_task(bind=True, max_retries=2)
 def optimize_seo_task(self, article_data: dict) -> dict:
     """
     SEO optimizasyonu yap
     """
-    start_time = time.time()
-
     try:
-        title = article_data.get("title", "")
-        article_data.get("content", "")
-        category = article_data.get("category", "")
-
-        # Meta description oluştur
-        summary = article_data.get("summary", "")
-        meta_description = summary[:160] if summary else title[:160]
-
-        # Meta keywords oluştur
-        keywords = [category]
-        if article_data.get("subcategory"):
-            keywords.append(article_data["subcategory"])
-        meta_keywords = ", ".join(keywords)
-
-        # Open Graph tags
-        og_title = title[:95]
-        og_description = summary[:200] if summary else title[:200]
-
-        article_data["seo"] = {
-            "meta_description": meta_description,
-            "meta_keywords": meta_keywords,
-            "og_title": og_title,
-            "og_description": og_description,
-            "canonical_url": article_data.get("link", ""),
-        }
-
-        logger.info(f"SEO optimization completed: {title[:50]}")
-
-        # Log
-        duration = time.time() - start_time
-        log_generation_step("seo_optimization", article_data, duration, "completed")
-
-        return article_data
+        return run_stage("seo_optimization", article_data)
 
     except Exception as exc:
         logger.error(f"SEO optimization failed: {exc!s}")
@@ -423,53 +703,54 @@ def optimize_seo_task(self, article_data: dict) -> dict:
 # ============================================================================
 
 
-@shared_task(bind=True, max_retries=2)
-def quality_assurance_task(self, article_data: dict) -> dict:
+def quality_assurance(article_data: dict) -> dict:
     """
     Kalite kontrol ve validasyon
     """
-    start_time = time.time()
+    content = article_data.get("content", "")
 
-    try:
-        content = article_data.get("content", "")
+    # Kalite metrikleri hesapla
+    metrics = ReadabilityMetrics.calculate_content_metrics(content)
 
-        # Kalite metrikleri hesapla
-        metrics = ReadabilityMetrics.calculate_content_metrics(content)
+    # Kalite puanı hesapla
+    quality_score = 0
 
-        # Kalite puanı hesapla
-        quality_score = 0
+    # Uzunluk kontrolü
+    if 400 <= metrics["word_count"] <= 1000:
+        quality_score += 25
 
-        # Uzunluk kontrolü
-        if 400 <= metrics["word_count"] <= 1000:
-            quality_score += 25
+    # Okunabilirlik
+    lix = metrics["lix_index"]
+    if 20 <= lix <= 50:
+        quality_score += 25
 
-        # Okunabilirlik
-        lix = metrics["lix_index"]
-        if 20 <= lix <= 50:
-            quality_score += 25
+    # Yapı kontrolü
+    if "<h2>" in content and "<p>" in content:
+        quality_score += 25
 
-        # Yapı kontrolü
-        if "<h2>" in content and "<p>" in content:
-            quality_score += 25
+    # Anahtar kelimeler
+    if content.count("<strong>") >= 3:
+        quality_score += 25
 
-        # Anahtar kelimeler
-        if content.count("<strong>") >= 3:
-            quality_score += 25
+    article_data["qa_quality_score"] = min(100, quality_score)
 
-        article_data["qa_quality_score"] = min(100, quality_score)
+    # Eğer kalite puanı düşükse, manual review'e gönder
+    if quality_score < 60:
+        article_data["requires_manual_review"] = True
+        logger.warning(f"Article requires manual review: {article_data['title'][:50]} (QA score: {quality_score})")
+    else:
+        article_data["requires_manual_review"] = False
 
-        # Eğer kalite puanı düşükse, manual review'e gönder
-        if quality_score < 60:
-            article_data["requires_manual_review"] = True
-            logger.warning(f"Article requires manual review: {article_data['title'][:50]} (QA score: {quality_score})")
-        else:
-            article_data["requires_manual_review"] = False
+    return article_data
 
-        # Log
-        duration = time.time() - start_time
-        log_generation_step("quality_assurance", article_data, duration, "completed")
 
-        return article_data
+@shared_task(bind=True, max_retries=2)
+def quality_assurance_task(self, article_data: dict) -> dict:
+    """
+    Kalite kontrol ve validasyon
+    """
+    try:
+        return run_stage("quality_assurance", article_data)
 
     except Exception as exc:
         logger.error(f"Quality assurance failed: {exc!s}")
@@ -481,18 +762,27 @@ def quality_assurance_task(self, article_data: dict) -> dict:
 # ============================================================================
 
 
-@shared_task(bind=True, max_retries=2)
-def publish_article_task(self, article_data: dict) -> dict:
+def publish_article(article_data: dict) -> dict:
     """
-    Makaleyi veritabanına kaydet ve yayınla
+    Makaleyi veritabanına kaydet ve yayınla.
+    Çalıştırma başına bir kez yayınlanır: çalıştırmanın makalesi varsa (örn. devam ettirilen
+    ikinci zincir) yeni makale oluşturulmaz, mevcut makale döndürülür.
     """
-    start_time = time.time()
-
-    try:
-        from authors.models import Author
-
-        # Makale oluştur
-        author = Author.objects.get(id=article_data["author_id"])
+    from authors.models import Author
+
+    # Makale oluştur
+    author = Author.objects.get(id=article_data["author_id"])
+    run_id = article_data.get("pipeline_run_id")
+
+    # Makale ve bağlı kayıtlar birlikte yazılır; yarıda kalan yayın retry'da tekrar denenebilir
+    with transaction.atomic():
+        # Çalıştırma satırı kilitlenir; aynı çalıştırmanın iki yayını sırayla çalışır
+        run = PipelineRun.objects.select_for_update().filter(run_id=run_id).first() if run_id else None
+        if run is not None and run.article_id:
+            article_data["article_id"] = run.article_id
+            article_data["published"] = True
+            logger.info(f"Article already published for run {run_id} (ID: {run.article_id})")
+            return article_data
 
         article = Article.objects.create(
             title=article_data["title"],
@@ -524,41 +814,221 @@ def publish_article_task(self, article_data: dict) -> dict:
                 article=article, featured_image_alt=article_data["title"], image_processing_status="completed"
             )
 
-        article_data["article_id"] = article.id
-        article_data["published"] = True
+        if run is not None:
+            PipelineRun.objects.filter(pk=run.pk).update(article=article)
 
-        logger.info(f"Article published: {article.title} (ID: {article.id})")
+    article_data["article_id"] = article.id
+    article_data["published"] = True
 
-        # Log
-        duration = time.time() - start_time
-        log_generation_step("publishing", article_data, duration, "completed")
+    # Yayından önceki AI çağrıları pipeline çalıştırma kimliğiyle kaydedildi; makaleye bağla
+    if run_id:
+        backfill_article(article.id, pipeline_run_id=run_id)
 
-        return article_data
+    # Uçtan uca süre: pipeline başlangıcından yayına
+    if "pipeline_started_at" in article_data:
+        article_data["pipeline_seconds"] = round(time.time() - article_data["pipeline_started_at"], 3)
+
+    logger.info(
+        f"Article published: {article.title} (ID: {article.id}, pipeline: {article_data.get('pipeline_seconds')}s)"
+    )
+
+    return article_data
+
+
+@shared_task(bind=True, max_retries=2)
+def publish_article_task(self, article_data: dict) -> dict:
+    """
+    Makaleyi veritabanına kaydet ve yayınla
+    """
+    try:
+        return run_stage("publishing", article_data)
 
     except Exception as exc:
         logger.error(f"Publishing failed: {exc!s}")
         raise self.retry(exc=exc, countdown=60) from exc
 
 
+STAGE_FUNCTIONS = {
+    "duplicate_check": check_duplicate,
+    "quality_filter": filter_quality,
+    "classification": classify_article,
+    "author_selection": select_author_style,
+    "content_generation": generate_content,
+    "media_processing": process_media,
+    "image_generation": generate_featured_image,
+    "seo_optimization": optimize_seo,
+    "quality_assurance": quality_assurance,
+    "publishing": publish_article,
+}
+
+# Görev adı -> görevin çalıştırdığı aşamalar (devam ettirmede tamamlanmış katmanları atlamak için)
+TASK_STAGES = {
+    prepare_article_task.name: PRE_GENERATION_STAGES,
+    finalize_article_task.name: POST_MEDIA_STAGES,
+    check_duplicate_task.name: ("duplicate_check",),
+    filter_quality_task.name: ("quality_filter",),
+    classify_article_task.name: ("classification",),
+    select_author_style_task.name: ("author_selection",),
+    generate_content_task.name: ("content_generation",),
+    process_media_task.name: ("media_processing",),
+    generate_featured_image_task.name: ("image_generation",),
+    optimize_seo_task.name: ("seo_optimization",),
+    quality_assurance_task.name: ("quality_assurance",),
+    publish_article_task.name: ("publishing",),
+}
+
+
+# ============================================================================
+# RESUME
+# ============================================================================
+
+
+def load_run_state(run: PipelineRun) -> dict:
+    """
+    Çalıştırmanın son durumunu kontrol noktalarından kur.
+    İlk veriden başlayıp kontrol noktaları aşama sırasıyla birleştirilir; paralel dalların
+    çıktıları ve aşama süreleri birlikte korunur.
+    """
+    checkpoints = pipeline_runs.load_checkpoints(run)
+    article_data = dict(run.input_data)
+    for stage in STAGE_FUNCTIONS:
+        if stage in checkpoints:
+            article_data = merge_branch_results([article_data, checkpoints[stage]])
+    return article_data
+
+
+def resume_run(run: PipelineRun) -> dict:
+    """
+    Çalıştırmayı ilk tamamlanmamış aşamadan devam ettir.
+
+    Returns:
+        dict: Devam ettirme sonucu (status: resumed / completed / skipped)
+    """
+    if run.status == "completed":
+        return {"status": "completed", "run_id": run.run_id}
+    if not pipeline_runs.claim_run(run):
+        return {"status": "skipped", "run_id": run.run_id}
+
+    article_data = load_run_state(run)
+    completed = article_data.get("stage_timings", {})
+    if pipeline_context.is_slim_payloads_enabled():
+        # Bağlam depoda yoksa ilk aşama kontrol noktalarından yeniden kurar
+        article_data = pipeline_context.make_ref(run.run_id, completed)
+    pipeline = build_article_pipeline(article_data, fused=run.fused, parallel=run.parallel, completed=completed)
+    if pipeline is None:
+        PipelineRun.objects.filter(pk=run.pk).update(status="completed")
+        return {"status": "completed", "run_id": run.run_id}
+
+    next_stage = next(stage for stage in STAGE_FUNCTIONS if stage not in completed)
+    checkpointed = len(completed)
+    result = pipeline.apply_async()
+
+    logger.info(f"Article pipeline resumed: {run.run_id} from {next_stage} ({checkpointed} stages checkpointed)")
+    return {"status": "resumed", "run_id": run.run_id, "task_id": result.id, "from_stage": next_stage}
+
+
+@shared_task
+def resume_pipeline_run(run_id: str) -> dict:
+    """
+    Tek bir pipeline çalıştırmasını kontrol noktalarından devam ettir.
+    """
+    try:
+        run = PipelineRun.objects.get(run_id=run_id)
+    except PipelineRun.DoesNotExist:
+        logger.warning(f"Pipeline run not found: {run_id}")
+        return {"status": "not_found", "run_id": run_id}
+
+    return resume_run(run)
+
+
+@shared_task
+def resume_pipeline_runs(limit: int = 50) -> dict:
+    """
+    Başarısız ve takılmış çalıştırmaları devam ettir; eski tamamlanmış çalıştırmaları temizle.
+    Kesinti sonrası birikmiş çalıştırmalar tamamlanan aşamaları tekrarlamadan boşaltılır.
+    """
+    results = [resume_run(run) for run in pipeline_runs.get_resumable_runs(limit=limit)]
+    resumed = sum(1 for result in results if result["status"] == "resumed")
+    pruned = pipeline_runs.prune_completed_runs()
+
+    if results or pruned:
+        logger.info(f"Pipeline runs resumed: {resumed}/{len(results)}, pruned: {pruned}")
+    return {"resumed": resumed, "checked": len(results), "pruned": pruned}
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
 
+# ContentGenerationLog.stage karşılıkları (modeldeki seçeneklerle eşleşen aşamalar);
+# diğer aşamalar kendi adıyla yazılır
+LOG_STAGES = {
+    "classification": "classify",
+    "content_generation": "generate",
+    "quality_assurance": "quality_check",
+    "image_generation": "image_generation",
+    "publishing": "publish",
+}
+
+
+class GenerationLogBuffer(BulkLogBuffer):
+    """
+    ContentGenerationLog kayıtları için tampon
+    (eşikler: GENERATION_LOG_BATCH_SIZE / GENERATION_LOG_FLUSH_SECONDS).
+    """
+
+    def __init__(self):
+        super().__init__("GENERATION_LOG", default_batch_size=100)
+
+    def write(self, records: list) -> int:
+        # Tampondayken silinen makalelerin kayıtları atlanır
+        article_ids = {record["article_id"] for record in records}
+        existing = set(Article.objects.filter(id__in=article_ids).values_list("id", flat=True))
+
+        objs = [ContentGenerationLog(**record) for record in records if record["article_id"] in existing]
+        ContentGenerationLog.objects.bulk_create(objs)
+        return len(objs)
+
+
+_generation_log_buffer = GenerationLogBuffer()
+
+
+def flush_generation_logs() -> int:
+    """
+    Tampondaki içerik üretim kayıtlarını hemen yaz.
+    """
+    return _generation_log_buffer.flush()
+
+
 def log_generation_step(step: str, article_data: dict, duration: float, status: str):
     """
-    İçerik üretim aşamasını log'a kaydet
+    İçerik üretim aşamasını log tamponuna ekle (aşama gecikmesine INSERT eklenmez).
+
+    Makale yayın aşamasında oluştuğu için önceki aşamaların süreleri article_data["stage_timings"]
+    altında bekler; makale kimliği belli olunca tüm aşamalar birlikte tampona eklenir.
     """
+    article_id = article_data.get("article_id")
+    if not article_id:
+        return
+
     try:
-        # Makale ID'si varsa log'u kaydet
-        if "article_id" in article_data:
-            ContentGenerationLog.objects.create(
-                article_id=article_data["article_id"],
-                step=step,
-                status=status,
-                duration=duration,
-                input_data=json.dumps(article_data, default=str)[:1000],
-                model_used=article_data.get("model_used", ""),
+        timings = {**article_data.get("stage_timings", {}), step: round(duration * 1000, 2)}
+        for stage, duration_ms in timings.items():
+            _generation_log_buffer.add(
+                {
+                    "article_id": article_id,
+                    "stage": LOG_STAGES.get(stage, stage),
+                    "status": status if stage == step else "completed",
+                    "duration": int(duration_ms),
+                    "input_data": {
+                        "pipeline_stage": stage,
+                        "pipeline_run_id": article_data.get("pipeline_run_id", ""),
+                    },
+                    "ai_model_used": article_data.get("model_used", "") if stage == "content_generation" else "",
+                },
+                flush=False,
             )
+        _generation_log_buffer.flush_if_due()
     except Exception as e:
         logger.error(f"Failed to log generation step: {e!s}")
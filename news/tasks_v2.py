@@ -3,6 +3,7 @@ Geliştirilmiş İçerik Üretim Sistemi - Yeni Görevler
 Başlık puanlaması, sınıflandırma ve kalite kontrolü
 """
 
+import json
 import logging
 import re
 import time
@@ -19,8 +20,13 @@ from celery import group, shared_task
 from core.models import Setting
 from core.tasks import log_error, log_info
 
+from .admission import admit
+from .ai_instrumentation import backfill_article, track_ai_call
+from .generation_queue import enqueue_generation
 from .models import Article, RssSource
 from .models_extended import ArticleClassification, ContentGenerationLog, ContentQualityMetrics, HeadlineScore
+from .prompt_registry import prompt_registry
+from .tasks import generate_image, get_genai_client, get_image_client, resolve_image_model
 
 logger = logging.getLogger(__name__)
 
@@ -131,10 +137,14 @@ def score_headlines():
                 logger.error(f"Başlık puanlaması hatası: {e!s}")
 
         # En iyi 10 başlığı seç ve sınıflandırmaya gönder
-        top_headlines = HeadlineScore.objects.filter(is_processed=False).order_by("-overall_score")[:10]
+        top_headlines = list(HeadlineScore.objects.filter(is_processed=False).order_by("-overall_score")[:10])
 
-        if top_headlines.exists():
-            headline_ids = [h.id for h in top_headlines]
+        # Sınıflandırma kuyruğu doluysa düşük puanlılar sonraki çalıştırmaya ertelenir / atılır
+        decision = admit("classification", [(h, h.overall_score) for h in top_headlines])
+        shed_headlines(decision["shed"])
+
+        if decision["admitted"]:
+            headline_ids = [h.id for h in decision["admitted"]]
             log_info("score_headlines", f"Top 10 başlık seçildi: {len(headline_ids)}")
 
             # Sınıflandırma görevini tetikle
@@ -188,6 +198,20 @@ def score_single_headline(headline_score):
     logger.info(f"Başlık puanlandı: {title[:50]} - Puan: {overall_score:.1f}")
 
 
+def score_title(title: str, category: str) -> float:
+    """
+    Kayıt oluşturmadan başlık puanı (RSS girdilerinin kabul sırası için).
+    score_single_headline ile aynı bileşenler; orijinallik, aynı başlıklı makale varsa 0, yoksa 30.
+    """
+    uniqueness = 0 if Article.objects.filter(title=title).exists() else 30
+    return float(
+        uniqueness
+        + calculate_engagement_score(title)
+        + calculate_keyword_relevance(title, category)
+        + calculate_structure_score(title)
+    )
+
+
 def calculate_uniqueness_score(headline_score):
     """
     Başlığın orijinalliğini puanla.
@@ -336,18 +360,43 @@ def has_power_words(title):
 @shared_task
 def classify_headlines(headline_ids):
     """
-    Başlıkları sınıflandır ve makale oluştur.
+    Başlıkları toplu olarak sınıflandır ve makale oluştur.
+
+    Başlıklar CLASSIFICATION_BATCH_SIZE'lık gruplar halinde tek istekte sınıflandırılır;
+    sonuçlar makale oluşturma görevlerine aktarılır. Toplu yanıtta eksik / geçersiz
+    dönen başlıklar classify_and_create_article içinde tek tek sınıflandırılır.
+
+    Üretim aşaması doluysa AI çağrısı yapılmadan önce düşük puanlı başlıklar ertelenir
+    (işlenmemiş kalır, sonraki puanlamada yeniden seçilir) veya atılır.
     """
     try:
-        headlines = HeadlineScore.objects.filter(id__in=headline_ids)
+        headlines = list(HeadlineScore.objects.filter(id__in=headline_ids).select_related("rss_source"))
+
+        decision = admit("generation", [(h, h.overall_score) for h in headlines])
+        shed_headlines(decision["shed"])
+        headlines = decision["admitted"]
+
+        start_time = time.time()
+        classifications, batch_calls = classify_headlines_in_batches(headlines, get_classification_batch_size())
+        duration = time.time() - start_time
+
+        if batch_calls:
+            rate = len(classifications) / duration if duration > 0 else 0.0
+            log_info(
+                "classify_headlines",
+                f"{len(classifications)}/{len(headlines)} başlık {batch_calls} çağrıda sınıflandırıldı "
+                f"({rate:.1f} başlık/sn, {len(classifications) - batch_calls} çağrı tasarruf)",
+            )
 
-        # Paralel olarak sınıflandırma yap
-        classification_tasks = group(classify_and_create_article.s(headline.id) for headline in headlines)
+        # Makaleleri paralel olarak oluştur
+        creation_tasks = group(
+            classify_and_create_article.s(headline.id, classifications.get(headline.id)) for headline in headlines
+        )
 
-        classification_tasks.apply_async()
+        creation_tasks.apply_async()
 
-        log_info("classify_headlines", f"{len(headline_ids)} başlık sınıflandırıldı")
-        return f"Başarılı: {len(headline_ids)} başlık sınıflandırıldı"
+        log_info("classify_headlines", f"{len(headlines)} başlık sınıflandırıldı")
+        return f"Başarılı: {len(headlines)} başlık sınıflandırıldı"
 
     except Exception as e:
         log_error("classify_headlines", f"Sınıflandırma görevinde hata: {e!s}", traceback=str(e))
@@ -355,15 +404,20 @@ def classify_headlines(headline_ids):
 
 
 @shared_task
-def classify_and_create_article(headline_id):
+def classify_and_create_article(headline_id, classification_data=None):
     """
     Tek bir başlığı sınıflandır ve makale oluştur.
+
+    Args:
+        headline_id: HeadlineScore ID'si
+        classification_data: Toplu sınıflandırma sonucu; yoksa başlık tek başına sınıflandırılır
     """
     try:
         headline = HeadlineScore.objects.get(id=headline_id)
 
-        # Başlığı sınıflandır (Gemini kullanarak)
-        classification_data = classify_headline_with_ai(headline)
+        # Başlığı sınıflandır (toplu sonuç yoksa Gemini ile tek tek)
+        if not classification_data:
+            classification_data = classify_headline_with_ai(headline)
 
         # Makale oluştur
         article = Article.objects.create(
@@ -396,10 +450,13 @@ def classify_and_create_article(headline_id):
         headline.article = article
         headline.save()
 
+        # Sınıflandırma çağrısı makale oluşmadan başlık ID'siyle kaydedildi; makaleye bağla
+        backfill_article(article.id, headline_id=headline.id)
+
         log_info("classify_and_create_article", f"Makale oluşturuldu: {article.title}", related_id=article.id)
 
-        # İçerik üretimini tetikle
-        transaction.on_commit(lambda: generate_ai_content_v2.delay(article.id))
+        # İçerik üretimi için puan / sınıflandırma önceliğiyle kuyruğa ekle
+        enqueue_generation(article, pipeline="v2")
 
         return f"Makale oluşturuldu: {article.title}"
 
@@ -408,6 +465,14 @@ def classify_and_create_article(headline_id):
         raise
 
 
+def shed_headlines(headlines):
+    """
+    Kabul kontrolünün attığı başlıkları işlenmiş say; kuyruğa tekrar girmezler.
+    """
+    if headlines:
+        HeadlineScore.objects.filter(id__in=[h.id for h in headlines]).update(is_processed=True)
+
+
 def classify_headline_with_ai(headline):
     """
     Başlığı Gemini API kullanarak sınıflandır.
@@ -422,10 +487,7 @@ def classify_headline_with_ai(headline):
         return get_default_classification()
 
     try:
-        import google.generativeai as genai
-
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-2.5-flash")
+        client = get_genai_client()
 
         prompt = f"""
 Aşağıdaki haber başlığını analiz et ve sınıflandır:
@@ -450,11 +512,13 @@ Lütfen aşağıdaki bilgileri JSON formatında döndür:
 Sadece JSON'u döndür, başka hiçbir şey ekleme.
         """
 
-        response = model.generate_content(prompt)
+        with track_ai_call(
+            "classify_headline_with_ai", "gemini-2.5-flash", "classify", headline_id=headline.id
+        ) as call:
+            response = client.models.generate_content(model="gemini-2.5-flash", contents=prompt)
+            call.set_response(response)
 
         if response and response.text:
-            import json
-
             try:
                 data = json.loads(response.text)
                 return data
@@ -467,6 +531,155 @@ Sadece JSON'u döndür, başka hiçbir şey ekleme.
     return get_default_classification()
 
 
+CLASSIFICATION_REQUIRED_KEYS = ("article_type", "confidence", "primary_category")
+
+
+def get_classification_batch_size() -> int:
+    """
+    Tek istekte sınıflandırılacak başlık sayısını ayarlardan al.
+    1 verilirse toplu sınıflandırma kapatılır.
+
+    Returns:
+        int: Grup boyutu (varsayılan: 10)
+    """
+    try:
+        batch_setting = Setting.objects.get(key="CLASSIFICATION_BATCH_SIZE")
+        return max(1, int(batch_setting.value))
+    except (Setting.DoesNotExist, ValueError):
+        return 10
+
+
+def build_batch_classification_prompt(headlines) -> str:
+    """
+    Birden fazla başlığı tek istekte sınıflandırmak için prompt oluştur.
+    Her başlık [id=N] etiketiyle verilir ve yanıtta aynı id ile döner.
+    """
+    lines = "\n".join(
+        f"[id={headline.id}] {headline.original_headline} (Kategori: {headline.rss_source.category})"
+        for headline in headlines
+    )
+
+    return f"""
+Aşağıdaki haber başlıklarının her birini analiz et ve sınıflandır:
+
+{lines}
+
+Her başlık için bir nesne içeren bir JSON dizisi döndür. Nesnelerin sırası önemli değil,
+ancak her nesnenin "id" alanı başlığın köşeli parantez içindeki id değeri olmalı:
+[
+    {{
+        "id": 0,
+        "article_type": "news|analysis|feature|opinion|tutorial|interview|breaking",
+        "confidence": 0.0-1.0,
+        "primary_category": "kategori adı",
+        "secondary_categories": ["kategori1", "kategori2"],
+        "research_depth": 0|1|2,
+        "ai_model": "gemini-2.5-flash|gemini-2.5-pro",
+        "is_time_sensitive": true|false,
+        "is_controversial": true|false,
+        "tone": "formal|casual|technical|emotional|neutral",
+        "summary": "kısa açıklama"
+    }}
+]
+
+Sadece JSON dizisini döndür, başka hiçbir şey ekleme.
+    """
+
+
+def parse_batch_classification(text: str, headline_ids) -> dict:
+    """
+    Toplu sınıflandırma yanıtını çözümle.
+    Bilinmeyen id'li veya zorunlu alanları eksik kayıtlar atlanır (tek tek sınıflandırılır).
+
+    Returns:
+        dict: Başlık ID'si -> sınıflandırma verisi
+    """
+    try:
+        data = json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+
+    if isinstance(data, dict):
+        data = data.get("classifications", [])
+    if not isinstance(data, list):
+        return {}
+
+    wanted = set(headline_ids)
+    results = {}
+    for item in data:
+        if not isinstance(item, dict) or not all(key in item for key in CLASSIFICATION_REQUIRED_KEYS):
+            continue
+        try:
+            headline_id = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if headline_id in wanted:
+            results[headline_id] = {key: value for key, value in item.items() if key != "id"}
+
+    return results
+
+
+def classify_headlines_batch_with_ai(headlines) -> dict:
+    """
+    Birden fazla başlığı tek Gemini isteğinde (JSON çıktı modu) sınıflandır.
+
+    Returns:
+        dict: Başarıyla sınıflandırılan başlık ID'si -> sınıflandırma verisi
+    """
+    try:
+        from google.genai import types
+
+        client = get_genai_client()
+        prompt = build_batch_classification_prompt(headlines)
+
+        # Çağrının token ve maliyeti başlıklara bölünür; her pay kendi makalesine bağlanır
+        with track_ai_call(
+            "classify_headlines_batch_with_ai",
+            "gemini-2.5-flash",
+            "classify",
+            headline_ids=[headline.id for headline in headlines],
+        ) as call:
+            response = client.models.generate_content(
+                model="gemini-2.5-flash",
+                contents=prompt,
+                config=types.GenerateContentConfig(response_mime_type="application/json"),
+            )
+            call.set_response(response)
+
+        if response and response.text:
+            return parse_batch_classification(response.text, [headline.id for headline in headlines])
+
+    except Exception as e:
+        logger.error(f"Toplu AI sınıflandırma hatası ({len(headlines)} başlık): {e!s}")
+
+    return {}
+
+
+def classify_headlines_in_batches(headlines, batch_size: int):
+    """
+    Başlıkları batch_size'lık gruplar halinde sınıflandır.
+    API anahtarı yoksa veya batch_size 1 ise çağrı yapılmaz; başlıklar tek tek sınıflandırılır.
+
+    Returns:
+        tuple: (başlık ID'si -> sınıflandırma verisi, yapılan toplu çağrı sayısı)
+    """
+    try:
+        api_key = Setting.objects.get(key="GOOGLE_GEMINI_API_KEY").value
+    except Setting.DoesNotExist:
+        api_key = ""
+
+    if not api_key or batch_size <= 1:
+        return {}, 0
+
+    classifications = {}
+    batch_calls = 0
+    for start in range(0, len(headlines), batch_size):
+        classifications.update(classify_headlines_batch_with_ai(headlines[start : start + batch_size]))
+        batch_calls += 1
+
+    return classifications, batch_calls
+
+
 def get_default_classification():
     """
     Varsayılan sınıflandırma bilgileri.
@@ -517,6 +730,7 @@ def generate_ai_content_v2(self, article_id):
 
         # Dinamik prompt oluştur
         prompt = create_dynamic_prompt(article, classification, research_data)
+        log_entry.input_data["prompt_version"] = prompt.version
 
         # AI modeli seç
         ai_model = classification.recommended_ai_model if classification else "gemini-2.5-flash"
@@ -568,134 +782,29 @@ def get_research_data(article):
     return {}
 
 
-def create_dynamic_prompt(article, classification, research_data):
-    """
-    Makale türüne göre dinamik prompt oluştur.
-    """
-    article_type = classification.article_type if classification else "news"
-
-    # Tür bazlı prompt şablonları
-    prompts = {
-        "news": create_news_prompt,
-        "analysis": create_analysis_prompt,
-        "feature": create_feature_prompt,
-        "opinion": create_opinion_prompt,
-        "tutorial": create_tutorial_prompt,
-    }
-
-    prompt_func = prompts.get(article_type, create_news_prompt)
-    return prompt_func(article, classification, research_data)
-
-
-def create_news_prompt(article, classification, research_data):
-    """
-    Haber türü için prompt.
-    """
-    return f"""
-Sen profesyonel bir haber yazarısın. Aşağıdaki başlık için hızlı, güncel ve doğru bir haber yazacaksın.
-
-Başlık: {article.title}
-Kategori: {article.category}
-
-YAZIM KURALLARI:
-1. Giriş: 5W1H (Kim, Ne, Nerede, Ne zaman, Neden, Nasıl) kuralına uy
-2. Uzunluk: 400-600 kelime
-3. Format: HTML (h2, h3, p, strong, em etiketleri)
-4. Stil: Objektif, tarafsız, profesyonel
-5. SEO: Ana anahtar kelimeleri doğal olarak kullan
-
-Sadece HTML formatında haber içeriğini yaz.
-    """
-
+# Kendi prompt şablonu olan makale türleri (son dakika / röportaj haber şablonunu kullanır)
+ARTICLE_PROMPT_TYPES = ("news", "analysis", "feature", "opinion", "tutorial")
 
-def create_analysis_prompt(article, classification, research_data):
-    """
-    Analiz türü için prompt.
-    """
-    return f"""
-Sen deneyimli bir analist yazarısın. Aşağıdaki başlık hakkında derinlemesine bir analiz yazacaksın.
-
-Başlık: {article.title}
-Kategori: {article.category}
-
-YAZIM KURALLARI:
-1. Giriş: Konunun önemini vurgula
-2. Arka Plan: Tarihçe ve bağlam
-3. Analiz: Farklı bakış açıları
-4. Sonuç: Etki ve çıkarımlar
-5. Uzunluk: 600-800 kelime
-6. Format: HTML (h2, h3, p, strong, em etiketleri)
-
-Sadece HTML formatında analiz yazacaksın.
-    """
 
-
-def create_feature_prompt(article, classification, research_data):
-    """
-    Röportaj türü için prompt.
-    """
-    return f"""
-Sen yaratıcı bir röportaj yazarısın. Aşağıdaki başlık için ilgi çekici bir röportaj yazacaksın.
-
-Başlık: {article.title}
-Kategori: {article.category}
-
-YAZIM KURALLARI:
-1. Giriş: Hikaye anlatıcı tarzı
-2. Detaylar: Somut örnekler ve tanıklamalar
-3. Derinlik: İnsan yönü vurgula
-4. Sonuç: Etkileyici kapanış
-5. Uzunluk: 700-900 kelime
-6. Format: HTML (h2, h3, p, strong, em etiketleri)
-
-Sadece HTML formatında röportajı yazacaksın.
-    """
-
-
-def create_opinion_prompt(article, classification, research_data):
-    """
-    Köşe yazısı türü için prompt.
-    """
-    return f"""
-Sen deneyimli bir köşe yazarısın. Aşağıdaki başlık hakkında düşünceli bir köşe yazısı yazacaksın.
-
-Başlık: {article.title}
-Kategori: {article.category}
-
-YAZIM KURALLARI:
-1. Giriş: Güçlü bir açıklama
-2. Argümanlar: Mantıksal ve ikna edici
-3. Karşı Görüşler: Adil bir şekilde ele al
-4. Sonuç: Çağrı hareketi
-5. Uzunluk: 500-700 kelime
-6. Format: HTML (h2, h3, p, strong, em etiketleri)
-7. Ton: Taraflı ama saygılı
-
-Sadece HTML formatında köşe yazısını yazacaksın.
+def create_dynamic_prompt(article, classification, research_data):
     """
+    Makale türüne ve tonuna göre derlenmiş şablondan prompt oluştur.
+    Tür için şablon yoksa haber şablonu, ton için şablon yoksa varsayılan şablon kullanılır.
 
-
-def create_tutorial_prompt(article, classification, research_data):
-    """
-    Rehber türü için prompt.
+    Returns:
+        RenderedPrompt: Prompt metni (şablon sürümüyle)
     """
-    return f"""
-Sen faydalı bir rehber yazarısın. Aşağıdaki başlık için adım adım bir rehber yazacaksın.
-
-Başlık: {article.title}
-Kategori: {article.category}
-
-YAZIM KURALLARI:
-1. Giriş: Rehberin faydalarını açıkla
-2. Adımlar: Numaralı, net ve açık
-3. Örnekler: Her adım için pratik örnek
-4. İpuçları: Faydalı tavsiyeler
-5. Sonuç: Özet ve sonraki adımlar
-6. Uzunluk: 500-800 kelime
-7. Format: HTML (h2, h3, p, strong, em, ol, li etiketleri)
+    article_type = classification.article_type if classification else "news"
+    if article_type not in ARTICLE_PROMPT_TYPES:
+        article_type = "news"
 
-Sadece HTML formatında rehberi yazacaksın.
-    """
+    return prompt_registry.render(
+        article_type,
+        variant=classification.tone if classification else None,
+        bucket=article.id,
+        title=article.title,
+        category=article.category,
+    )
 
 
 def generate_content_with_gemini(article, prompt, ai_model):
@@ -712,12 +821,16 @@ def generate_content_with_gemini(article, prompt, ai_model):
         return None
 
     try:
-        import google.generativeai as genai
-
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(ai_model)
-
-        response = model.generate_content(prompt)
+        client = get_genai_client()
+        with track_ai_call(
+            "generate_ai_content_v2",
+            ai_model,
+            "text",
+            article_id=article.id,
+            prompt_version=getattr(prompt, "version", ""),
+        ) as call:
+            response = client.models.generate_content(model=ai_model, contents=prompt)
+            call.set_response(response)
 
         if response and response.text:
             return response.text
@@ -865,10 +978,7 @@ def generate_article_image_v2(self, article_id):
             return
 
         try:
-            from google import genai
-            from google.genai import types
-
-            client = genai.Client(api_key=api_key)
+            client = get_image_client()
 
             image_prompt = f"""
 Professional news photography for: {article.title}
@@ -876,18 +986,13 @@ Category: {article.category}
 Style: Editorial, 16:9 aspect ratio, high quality, photorealistic
             """.strip()
 
-            response = client.models.generate_images(
-                model="imagen-4.0-ultra-generate-001",
-                prompt=image_prompt,
-                config=types.GenerateImagesConfig(number_of_images=1, aspect_ratio="16:9"),
-            )
-
-            if response.generated_images:
-                generated_image = response.generated_images[0]
+            image_model = resolve_image_model(client, "imagen-4.0-ultra-generate-001")
+            with track_ai_call("generate_article_image_v2", image_model, "image", article_id=article_id) as call:
+                response, image_bytes = generate_image(client, image_model, image_prompt)
+                call.set_response(response)
 
-                img_buffer = BytesIO()
-                generated_image.image._pil_image.save(img_buffer, format="JPEG", quality=95)
-                img_buffer.seek(0)
+            if image_bytes:
+                img_buffer = BytesIO(image_bytes)
 
                 filename = f"{article.slug}_ai_generated.jpg"
                 article.featured_image.save(filename, img_buffer, save=True)
@@ -0,0 +1,149 @@
+"""
+Pipeline kabul kontrolü testleri.
+Doluluk ölçümü, kabul / erteleme / atma kararları, metrikler ve gönderim noktaları.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+import pytest
+from prometheus_client import REGISTRY
+
+from core.models import Setting
+from news.admission import admit, get_stage_capacity
+from news.models import Article, RssSource
+from news.models_extended import GenerationQueueItem, HeadlineScore
+from news.tasks import fetch_single_rss
+from news.tasks_v2 import classify_headlines, score_headlines
+
+
+def admitted_total(stage, decision):
+    return REGISTRY.get_sample_value("habernexus_admission_items_total", {"stage": stage, "decision": decision}) or 0
+
+
+@pytest.mark.django_db
+class TestAdmissionDecisions(TestCase):
+    """Kabul kararı testleri."""
+
+    def setUp(self):
+        Setting.objects.create(key="ADMISSION_GENERATION_BACKLOG_LIMIT", value="2")
+
+    def fill_backlog(self, count):
+        for i in range(count):
+            article = Article.objects.create(title=f"Bekleyen {i}", slug=f"bekleyen-{i}", content="x")
+            GenerationQueueItem.objects.create(article=article, status="queued")
+
+    def test_free_capacity_is_filled_by_score(self):
+        self.fill_backlog(1)
+
+        decision = admit("generation", [("düşük", 30), ("yüksek", 65), ("orta", 50)])
+
+        assert get_stage_capacity("generation") == (1, 0.5)
+        assert decision["admitted"] == ["yüksek"]
+        assert decision["deferred"] == ["orta", "düşük"]
+        assert decision["shed"] == []
+
+    def test_saturated_stage_sheds_low_scores_and_keeps_top_stories(self):
+        self.fill_backlog(4)
+        before = {name: admitted_total("generation", name) for name in ("admitted", "deferred", "shed")}
+
+        decision = admit("generation", [("son dakika", 85), ("orta", 50), ("düşük", 30)])
+
+        assert decision["load"] == 2.0
+        assert (decision["admitted"], decision["deferred"], decision["shed"]) == (["son dakika"], ["orta"], ["düşük"])
+        for name in ("admitted", "deferred", "shed"):
+            assert admitted_total("generation", name) == before[name] + 1
+
+    def test_broker_queue_depth_limits_classification(self):
+        Setting.objects.create(key="ADMISSION_QUEUE_DEPTH_LIMIT", value="10")
+
+        with patch("news.admission.get_queue_depth", return_value=9):
+            decision = admit("classification", [("a", 50), ("b", 50)])
+
+        assert (decision["admitted"], decision["deferred"]) == (["a"], ["b"])
+
+    def test_disabled_admission_admits_everything(self):
+        self.fill_backlog(10)
+        Setting.objects.create(key="ADMISSION_ENABLED", value="false")
+
+        assert admit("generation", [("a", 10), ("b", 20)])["admitted"] == ["b", "a"]
+
+
+@pytest.mark.django_db
+class TestAdmissionDispatch(TestCase):
+    """Gönderim noktalarında kabul kontrolü testleri."""
+
+    def setUp(self):
+        Setting.objects.create(key="ADMISSION_GENERATION_BACKLOG_LIMIT", value="1")
+        self.source = RssSource.objects.create(name="Kaynak", url="https://example.com/rss", category="Teknoloji")
+        article = Article.objects.create(title="Üretimde", slug="uretimde", content="x")
+        GenerationQueueItem.objects.create(article=article, status="dispatched")
+
+    def headline(self, title, score):
+        return HeadlineScore.objects.create(rss_source=self.source, original_headline=title, overall_score=score)
+
+    def test_classify_headlines_skips_ai_for_deferred_and_shed_headlines(self):
+        GenerationQueueItem.objects.create(
+            article=Article.objects.create(title="Kuyrukta", slug="kuyrukta", content="x"), status="queued"
+        )
+        top = self.headline("Son dakika deprem", 90)
+        middle = self.headline("Orta haber", 55)
+        low = self.headline("Düşük haber", 20)
+
+        with (
+            patch("news.tasks_v2.classify_headlines_in_batches", return_value=({}, 0)) as batches,
+            patch("news.tasks_v2.group"),
+        ):
+            classify_headlines([top.id, middle.id, low.id])
+
+        assert batches.call_args.args[0] == [top]
+        middle.refresh_from_db()
+        low.refresh_from_db()
+        assert (middle.is_processed, low.is_processed) == (False, True)
+
+    @patch("news.tasks_v2.classify_headlines.delay")
+    def test_score_headlines_dispatches_only_admitted(self, classify_delay):
+        Setting.objects.create(key="ADMISSION_QUEUE_DEPTH_LIMIT", value="10")
+        top = self.headline("Son dakika deprem", 0)
+        self.headline("Orta haber", 0)
+
+        with (
+            patch("news.admission.get_queue_depth", return_value=10),
+            patch("news.tasks_v2.score_single_headline", side_effect=lambda h: None),
+        ):
+            HeadlineScore.objects.filter(pk=top.pk).update(overall_score=90)
+            with self.captureOnCommitCallbacks(execute=True):
+                score_headlines()
+
+        classify_delay.assert_called_once_with([top.id])
+
+    @patch("news.tasks.feedparser.parse")
+    def test_crawler_defers_entries_when_generation_is_full(self, mock_parse):
+        entry = MagicMock(link="https://example.com/yeni")
+        entry.get = lambda key, default="": {"title": "Yeni haber"}.get(key, default)
+        mock_parse.return_value = MagicMock(bozo=False, entries=[entry])
+
+        assert fetch_single_rss(self.source) == 0
+        assert not Article.objects.filter(original_url="https://example.com/yeni").exists()
+
+        GenerationQueueItem.objects.update(status="completed")
+        assert fetch_single_rss(self.source) == 1
+
+    @patch("news.tasks.feedparser.parse")
+    def test_crawler_admits_best_scored_entries_not_feed_order(self, mock_parse):
+        def entry(link, title):
+            item = MagicMock(link=link, media_content=None)
+            item.get = lambda key, default="": {"title": title}.get(key, default)
+            return item
+
+        Setting.objects.filter(key="ADMISSION_GENERATION_BACKLOG_LIMIT").update(value="2")
+        weak = entry("https://example.com/zayif", "kısa")
+        strong = entry("https://example.com/guclu", "Yapay zeka yazılım pazarında 5 yeni devrim nasıl başladı?")
+        mock_parse.return_value = MagicMock(bozo=False, entries=[weak, strong])
+
+        assert fetch_single_rss(self.source) == 1
+
+        article = Article.objects.get(original_url="https://example.com/guclu")
+        assert not Article.objects.filter(original_url="https://example.com/zayif").exists()
+        assert article.generation_queue_item.score > 50
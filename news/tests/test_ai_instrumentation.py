@@ -0,0 +1,224 @@
+"""
+Gen AI çağrı enstrümantasyonu testleri.
+track_ai_call, maliyet tahmini, AICallLogBuffer ve AIUsageMetrics.
+"""
+
+import json
+from io import StringIO
+from unittest.mock import MagicMock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+import pytest
+
+from core.models import Setting
+from news.ai_instrumentation import (
+    AICallLogBuffer,
+    backfill_article,
+    classify_error,
+    estimate_cost,
+    flush_ai_call_logs,
+    get_model_pricing,
+    track_ai_call,
+)
+from news.models import Article
+from news.models_extended import AICallLog
+from news.monitoring import AIUsageMetrics
+from news.tasks import stream_generate_content
+
+
+def response_with_usage(text="<p>metin</p>", prompt=100, output=200, thinking=50):
+    response = MagicMock(text=text)
+    response.usage_metadata.prompt_token_count = prompt
+    response.usage_metadata.candidates_token_count = output
+    response.usage_metadata.thoughts_token_count = thinking
+    return response
+
+
+@pytest.mark.django_db
+class TestTrackAICall(TestCase):
+    """track_ai_call testleri."""
+
+    def setUp(self):
+        self.article = Article.objects.create(title="Test Makale", slug="test-makale", content="Kaynak")
+
+    def test_success_records_tokens_and_cost(self):
+        with track_ai_call("gorev", "gemini-2.5-flash", "text", article_id=self.article.id) as call:
+            call.set_response(response_with_usage())
+
+        log = AICallLog.objects.get()
+        assert log.outcome == "success"
+        assert log.article == self.article
+        assert (log.prompt_tokens, log.output_tokens, log.thinking_tokens, log.total_tokens) == (100, 200, 50, 350)
+        assert log.cost_usd == pytest.approx((100 * 0.30 + 250 * 2.50) / 1_000_000)
+
+    def test_retries_are_counted(self):
+        attempts = iter([RuntimeError("geçici"), RuntimeError("geçici"), response_with_usage()])
+
+        def flaky():
+            result = next(attempts)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with track_ai_call("gorev", "gemini-2.5-flash", "text") as call:
+            wrapped = call.attempt(flaky)
+            for _ in range(3):
+                try:
+                    response = wrapped()
+                    break
+                except RuntimeError:
+                    continue
+            call.set_response(response)
+
+        assert AICallLog.objects.get().retries == 2
+
+    def test_empty_response(self):
+        with track_ai_call("gorev", "imagen-4.0-generate-001", "image") as call:
+            call.set_response(MagicMock(generated_images=[]))
+
+        assert AICallLog.objects.get().outcome == "empty"
+
+    def test_exception_is_recorded_and_reraised(self):
+        with pytest.raises(RuntimeError), track_ai_call("gorev", "gemini-2.5-flash", "text"):
+            raise RuntimeError("429 RESOURCE_EXHAUSTED")
+
+        log = AICallLog.objects.get()
+        assert log.outcome == "rate_limited"
+        assert "RESOURCE_EXHAUSTED" in log.error_message
+        assert classify_error(ValueError("bozuk")) == "error"
+
+    def test_calls_made_before_publish_are_backfilled(self):
+        with track_ai_call("generate_content_task", "gemini-2.5-flash", "text", pipeline_run_id="run-1"):
+            pass
+        with override_settings(AI_CALL_LOG_BATCH_SIZE=1000, AI_CALL_LOG_FLUSH_SECONDS=3600):
+            with track_ai_call(
+                "generate_featured_image_task", "gemini-2.5-flash-image", "image", pipeline_run_id="run-1"
+            ):
+                pass
+            with track_ai_call("generate_content_task", "gemini-2.5-flash", "text", pipeline_run_id="run-2"):
+                pass
+
+            assert backfill_article(self.article.id, pipeline_run_id="run-1") == 2
+        flush_ai_call_logs()
+
+        linked = dict(AICallLog.objects.values_list("pipeline_run_id", "article_id").order_by("pipeline_run_id"))
+        assert linked == {"run-1": self.article.id, "run-2": None}
+        assert AICallLog.objects.filter(article=self.article).count() == 2
+        assert backfill_article(self.article.id) == 0
+
+    def test_batch_call_is_split_per_headline(self):
+        with track_ai_call("gorev", "gemini-2.5-flash", "classify", headline_ids=[11, 12, 13]) as call:
+            call.set_response(response_with_usage(prompt=100, output=200, thinking=50))
+
+        logs = list(AICallLog.objects.order_by("headline_id"))
+        assert [log.headline_id for log in logs] == [11, 12, 13]
+        assert [log.prompt_tokens for log in logs] == [34, 33, 33]
+        assert sum(log.total_tokens for log in logs) == 350
+        assert sum(log.cost_usd for log in logs) == pytest.approx((100 * 0.30 + 250 * 2.50) / 1_000_000, abs=1e-5)
+
+        assert backfill_article(self.article.id, headline_id=12) == 1
+        assert AICallLog.objects.get(article=self.article).headline_id == 12
+
+    def test_aborted_stream(self):
+        client = MagicMock()
+        client.models.generate_content_stream.return_value = iter([MagicMock(text="Üzgünüm, yardımcı olamam.")])
+
+        with pytest.raises(Exception, match="reddetti"):
+            stream_generate_content(client, "gemini-2.5-flash", "prompt", None, self.article)
+
+        log = AICallLog.objects.get()
+        assert log.call_type == "stream"
+        assert log.outcome == "aborted"
+
+
+@pytest.mark.django_db
+class TestPricingAndBuffer(TestCase):
+    """Maliyet tahmini ve toplu yazma tamponu testleri."""
+
+    def record(self, **overrides):
+        record = {
+            "article_id": None,
+            "task_name": "gorev",
+            "call_type": "text",
+            "model": "gemini-2.5-flash-lite-preview",
+            "outcome": "success",
+            "prompt_tokens": 1_000_000,
+            "output_tokens": 1_000_000,
+            "thinking_tokens": 0,
+            "total_tokens": 2_000_000,
+            "images": 0,
+            "latency_ms": 10,
+            "retries": 0,
+            "error_message": "",
+        }
+        record.update(overrides)
+        return record
+
+    def test_longest_prefix_wins(self):
+        assert estimate_cost(self.record(), get_model_pricing()) == pytest.approx(0.50)
+        assert estimate_cost(self.record(model="bilinmeyen"), get_model_pricing()) == 0.0
+
+    def test_pricing_setting_overrides_defaults(self):
+        Setting.objects.create(key="AI_MODEL_PRICING", value=json.dumps({"gemini-2.5-flash-lite": {"input": 1}}))
+
+        assert estimate_cost(self.record(), get_model_pricing()) == pytest.approx(1.0)
+
+    def test_flush_batches_and_drops_deleted_articles(self):
+        article = Article.objects.create(title="Silinecek", slug="silinecek", content="x")
+        buffer = AICallLogBuffer()
+        buffer.add(self.record(article_id=article.id), flush=False)
+        buffer.add(self.record(article_id=article.id + 1000), flush=False)
+        assert AICallLog.objects.count() == 0
+
+        assert buffer.flush() == 2
+        assert len(buffer) == 0
+        assert set(AICallLog.objects.values_list("article_id", flat=True)) == {article.id, None}
+
+
+@pytest.mark.django_db
+class TestAIUsageMetrics(TestCase):
+    """AIUsageMetrics ve ai_usage_report testleri."""
+
+    def setUp(self):
+        self.article = Article.objects.create(title="Test Makale", slug="test-makale", content="Kaynak")
+        for model, outcome, cost in (
+            ("gemini-2.5-flash", "success", 0.01),
+            ("gemini-2.5-flash", "rate_limited", 0.0),
+            ("imagen-4.0-generate-001", "success", 0.04),
+        ):
+            AICallLog.objects.create(
+                article=self.article,
+                task_name="gorev",
+                call_type="text",
+                model=model,
+                outcome=outcome,
+                total_tokens=100,
+                retries=1,
+                latency_ms=1000,
+                cost_usd=cost,
+            )
+
+    def test_rollup_by_model(self):
+        rows = {row["model"]: row for row in AIUsageMetrics.get_rollup(group_by=("model",))}
+
+        flash = rows["gemini-2.5-flash"]
+        assert flash["calls"] == 2
+        assert flash["failures"] == 1
+        assert flash["rate_limited"] == 1
+        assert flash["retries"] == 2
+        assert flash["total_tokens"] == 200
+        assert rows["imagen-4.0-generate-001"]["cost_usd"] == pytest.approx(0.04)
+
+    def test_article_cost_and_invalid_group(self):
+        assert AIUsageMetrics.get_article_cost(self.article.id)["cost_usd"] == pytest.approx(0.05)
+        with pytest.raises(ValueError):
+            AIUsageMetrics.get_rollup(group_by=("hafta",))
+
+    def test_report_command(self):
+        out = StringIO()
+        call_command("ai_usage_report", "--by", "day,model,article", stdout=out)
+
+        assert "gemini-2.5-flash" in out.getvalue()
+        assert "Toplam: 3 çağrı, $0.0500" in out.getvalue()
@@ -0,0 +1,489 @@
+"""
+Gelişmiş pipeline (tasks_advanced) testleri.
+Ucuz aşamaların birleştirilmesi, bağımsız aşamaların paralel çalışması, görev sayısı, aşama süreleri
+kontrol noktalarından devam ettirme, tamponlu aşama kayıtları ve bağlam referanslı görev verisi.
+"""
+
+import json
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+import pytest
+from celery.exceptions import Retry
+from celery.signals import task_prerun, worker_shutdown
+
+from authors.models import Author
+from core.models import Setting
+from news import pipeline_context
+from news.models import Article
+from news.models_extended import ContentGenerationLog, PipelineRun
+from news.pipeline_runs import extend_lease, get_resumable_runs, save_checkpoint, start_run
+from news.tasks_advanced import (
+    POST_MEDIA_STAGES,
+    PRE_GENERATION_STAGES,
+    STAGE_FUNCTIONS,
+    _stage_lease_seconds,
+    build_article_pipeline,
+    finalize_article_task,
+    flush_generation_logs,
+    get_pipeline_layout,
+    is_parallel_branches_enabled,
+    is_stage_fusion_enabled,
+    load_run_state,
+    merge_branch_results,
+    prepare_article_task,
+    process_article_pipeline,
+    publish_article,
+    resume_pipeline_run,
+    run_stage,
+)
+
+CONTENT = "<h2>Başlık</h2><p>" + "Yapay zeka yatırımları artıyor. " * 80 + "</p>"
+
+
+def fake_generate_content(article_data):
+    article_data["content"] = CONTENT
+    article_data["model_used"] = "gemini-2.5-flash"
+    return article_data
+
+
+def fake_process_media(article_data):
+    article_data["rss_media"] = {"images": [], "videos": [], "audio": []}
+    return article_data
+
+
+def fake_generate_featured_image(article_data):
+    article_data["featured_image_generated"] = False
+    return article_data
+
+
+@pytest.mark.django_db
+class TestStageFusion(TestCase):
+    """Birleştirilmiş aşama testleri."""
+
+    def setUp(self):
+        Author.objects.create(name="Yazar", slug="yazar", expertise="Teknoloji", is_active=True)
+
+    def article_data(self, suffix):
+        return {
+            "title": f"Yapay zeka ile yeni dönem başlıyor {suffix}",
+            "summary": "Teknoloji şirketleri yapay zeka yatırımlarını artırıyor.",
+            "category": "Teknoloji",
+            "link": f"https://example.com/haber/{suffix}",
+        }
+
+    def test_fused_pipeline_keeps_hops_only_around_io_stages(self):
+        fused = [sig.task for sig in build_article_pipeline({}, fused=True, parallel=False).tasks]
+        chained = [sig.task for sig in build_article_pipeline({}, fused=False, parallel=False).tasks]
+
+        assert len(chained) == 10
+        assert [name.rsplit(".", 1)[-1] for name in fused] == [
+            "prepare_article_task",
+            "generate_content_task",
+            "process_media_task",
+            "generate_featured_image_task",
+            "finalize_article_task",
+        ]
+
+    def test_prepare_runs_cheap_stages_in_one_task_with_timings(self):
+        data = prepare_article_task.apply(args=[self.article_data("hazırlık")]).get()
+
+        assert list(data["stage_timings"]) == list(PRE_GENERATION_STAGES)
+        assert data["author_name"] == "Yazar"
+        assert data["is_duplicate"] is False
+        assert "style" in data
+
+    def test_fused_and_chained_pipelines_publish_the_same_article(self):
+        task_names = []
+
+        def on_prerun(task=None, **kwargs):
+            task_names.append(task.name)
+
+        fakes = {
+            "content_generation": fake_generate_content,
+            "media_processing": fake_process_media,
+            "image_generation": fake_generate_featured_image,
+        }
+        task_prerun.connect(on_prerun, weak=False)
+        try:
+            with patch.dict(STAGE_FUNCTIONS, fakes):
+                for fused in (True, False):
+                    process_article_pipeline.delay(self.article_data(f"fused={fused}"), fused=fused, parallel=False)
+        finally:
+            task_prerun.disconnect(on_prerun)
+
+        # Orkestrasyon + 5 görev / orkestrasyon + 10 görev
+        assert len(task_names) == 6 + 11
+        assert Article.objects.filter(status="published", content=CONTENT).count() == 2
+        assert set(PRE_GENERATION_STAGES + POST_MEDIA_STAGES) <= set(STAGE_FUNCTIONS)
+
+    def test_publish_records_end_to_end_latency(self):
+        data = self.article_data("süre")
+        data["pipeline_started_at"] = 0.0
+
+        data = prepare_article_task.apply(args=[data]).get()
+        data = fake_generate_content(data)
+        data = finalize_article_task.apply(args=[data]).get()
+
+        assert data["published"] is True
+        assert data["pipeline_seconds"] > 0
+        assert list(data["stage_timings"]) == [*PRE_GENERATION_STAGES, *POST_MEDIA_STAGES]
+
+    def test_fusion_setting(self):
+        assert is_stage_fusion_enabled() is True
+
+        Setting.objects.create(key="PIPELINE_FUSE_STAGES", value="false")
+        assert is_stage_fusion_enabled() is False
+
+
+@pytest.mark.django_db
+class TestParallelBranches(TestCase):
+    """Bağımsız aşamaların paralel (chord) çalışması testleri."""
+
+    def setUp(self):
+        Author.objects.create(name="Yazar", slug="yazar", expertise="Teknoloji", is_active=True)
+
+    def test_layout_groups_independent_stages(self):
+        def names(layer):
+            if isinstance(layer, tuple):
+                return tuple(names(task) for task in layer)
+            return layer.name.rsplit(".", 1)[-1]
+
+        assert [names(layer) for layer in get_pipeline_layout(fused=True, parallel=True)] == [
+            "prepare_article_task",
+            "generate_content_task",
+            ("process_media_task", "generate_featured_image_task"),
+            "finalize_article_task",
+        ]
+        unfused = [names(layer) for layer in get_pipeline_layout(fused=False, parallel=True)]
+        assert unfused[5] == ("process_media_task", "generate_featured_image_task", "optimize_seo_task")
+        assert unfused[6:] == ["quality_assurance_task", "publish_article_task"]
+
+    def test_branch_results_are_merged(self):
+        base = {"title": "Başlık", "stage_timings": {"content_generation": 5.0}}
+        media = {**base, "rss_media": {"images": []}, "stage_timings": {"content_generation": 5.0, "media": 2.0}}
+        image = {**base, "featured_image_generated": False, "stage_timings": {"content_generation": 5.0, "image": 3.0}}
+
+        merged = merge_branch_results([media, image])
+
+        assert merged["rss_media"] == {"images": []}
+        assert merged["featured_image_generated"] is False
+        assert merged["stage_timings"] == {"content_generation": 5.0, "media": 2.0, "image": 3.0}
+
+    def test_parallel_pipelines_publish_articles(self):
+        task_names = []
+
+        def on_prerun(task=None, **kwargs):
+            task_names.append(task.name)
+
+        fakes = {
+            "content_generation": fake_generate_content,
+            "media_processing": fake_process_media,
+            "image_generation": fake_generate_featured_image,
+        }
+        task_prerun.connect(on_prerun, weak=False)
+        try:
+            with patch.dict(STAGE_FUNCTIONS, fakes):
+                for fused in (True, False):
+                    data = {
+                        "title": f"Paralel dallarla yeni dönem başlıyor {fused}",
+                        "summary": "Teknoloji şirketleri yapay zeka yatırımlarını artırıyor.",
+                        "category": "Teknoloji",
+                        "link": f"https://example.com/paralel/{fused}",
+                    }
+                    process_article_pipeline.delay(data, fused=fused, parallel=True)
+        finally:
+            task_prerun.disconnect(on_prerun)
+
+        # Paralel düzenlerde de görev sayısı değişmez, yalnızca bekleme kısalır
+        assert len(task_names) == 6 + 11
+        articles = Article.objects.filter(status="published", content=CONTENT)
+        assert articles.count() == 2
+
+    def test_parallel_setting(self):
+        assert is_parallel_branches_enabled() is True
+
+        Setting.objects.create(key="PIPELINE_PARALLEL_BRANCHES", value="false")
+        assert is_parallel_branches_enabled() is False
+
+
+@pytest.mark.django_db
+class TestPipelineCheckpoints(TestCase):
+    """Kontrol noktası ve devam ettirme testleri."""
+
+    def setUp(self):
+        Author.objects.create(name="Yazar", slug="yazar", expertise="Teknoloji", is_active=True)
+        self.calls = []
+
+        def counting(stage, func):
+            def wrapper(article_data):
+                self.calls.append(stage)
+                return func(article_data)
+
+            return wrapper
+
+        self.fakes = {
+            "content_generation": counting("content_generation", fake_generate_content),
+            "media_processing": fake_process_media,
+            "image_generation": fake_generate_featured_image,
+            "seo_optimization": counting("seo_optimization", STAGE_FUNCTIONS["seo_optimization"]),
+        }
+
+    def article_data(self, suffix):
+        return {
+            "title": f"Kontrol noktalı yapay zeka haberi {suffix}",
+            "summary": "Teknoloji şirketleri yapay zeka yatırımlarını artırıyor.",
+            "category": "Teknoloji",
+            "link": f"https://example.com/kontrol/{suffix}",
+        }
+
+    def test_each_stage_is_checkpointed(self):
+        with patch.dict(STAGE_FUNCTIONS, self.fakes):
+            result = process_article_pipeline.delay(self.article_data("tam"), fused=True, parallel=True).get()
+
+        run = PipelineRun.objects.get(run_id=result["run_id"])
+        assert run.status == "completed"
+        assert run.article.content == CONTENT
+        assert set(run.checkpoints.values_list("stage", flat=True)) == set(STAGE_FUNCTIONS)
+
+    def test_failed_run_resumes_without_repeating_completed_stages(self):
+        def broken_qa(article_data):
+            raise RuntimeError("QA servisi yanıt vermiyor")
+
+        # Retry hakkı tükenmiş: çalıştırma "failed" işaretlenir ve hata çağırana kadar çıkar
+        with (
+            patch.dict(STAGE_FUNCTIONS, {**self.fakes, "quality_assurance": broken_qa}),
+            patch.object(finalize_article_task, "max_retries", 0),
+            pytest.raises((RuntimeError, Retry)),
+        ):
+            process_article_pipeline.delay(self.article_data("hata"), fused=True, parallel=True)
+
+        run = PipelineRun.objects.get()
+        assert (run.status, run.failed_stage) == ("failed", "quality_assurance")
+        assert not Article.objects.exists()
+
+        with patch.dict(STAGE_FUNCTIONS, self.fakes):
+            result = resume_pipeline_run.delay(run.run_id).get()
+
+        run.refresh_from_db()
+        assert result["from_stage"] == "quality_assurance"
+        assert (run.status, run.resume_count) == ("completed", 1)
+        assert Article.objects.get().content == CONTENT
+        # İçerik bir kez üretildi; finalize retry'ları ve devam ettirme SEO'yu tekrarlamadı
+        assert self.calls == ["content_generation", "seo_optimization"]
+
+    def test_stage_failure_with_retries_left_keeps_run_running(self):
+        def broken_seo(article_data):
+            raise RuntimeError("SEO servisi yanıt vermiyor")
+
+        article_data = self.article_data("retry")
+        start_run(article_data, fused=True, parallel=True)
+        task = Mock(time_limit=None, max_retries=2, request=Mock(id="gorev", retries=0))
+
+        with (
+            patch.dict(STAGE_FUNCTIONS, {"seo_optimization": broken_seo}),
+            patch("news.tasks_advanced.current_task", task),
+        ):
+            with pytest.raises(RuntimeError):
+                run_stage("seo_optimization", dict(article_data))
+            assert PipelineRun.objects.get().status == "running"
+            assert not get_resumable_runs()
+
+            task.request.retries = 2
+            with pytest.raises(RuntimeError):
+                run_stage("seo_optimization", dict(article_data))
+            assert PipelineRun.objects.get().status == "failed"
+
+    def test_optional_stage_fallback_is_checkpointed(self):
+        def broken_image(article_data):
+            self.calls.append("image_generation")
+            raise RuntimeError("Görsel servisi yanıt vermiyor")
+
+        with patch.dict(STAGE_FUNCTIONS, {**self.fakes, "image_generation": broken_image}):
+            result = process_article_pipeline.delay(self.article_data("gorsel"), fused=True, parallel=True).get()
+
+        run = PipelineRun.objects.get(run_id=result["run_id"])
+        assert run.status == "completed"
+        checkpoint = run.checkpoints.get(stage="image_generation")
+        assert checkpoint.data["featured_image_generated"] is False
+        assert "image_generation" in checkpoint.data["stage_timings"]
+
+        # Yedek değerle tamamlanan aşama retry / devam ettirmede yeniden çalıştırılmaz
+        with patch.dict(STAGE_FUNCTIONS, {"image_generation": broken_image}):
+            article_data = run_stage("image_generation", {"title": "x"}, fallback={"featured_image_generated": False})
+            run_stage("image_generation", article_data, fallback={"featured_image_generated": False})
+        assert self.calls == ["content_generation", "image_generation", "seo_optimization", "image_generation"]
+
+    def test_run_with_live_lease_is_not_resumed(self):
+        stale = timezone.now() - timedelta(hours=3)
+        article_data = self.article_data("kira")
+        run_id = start_run(article_data, fused=True, parallel=True)
+        # İçerik görevi retry'larıyla 66 dakikaya kadar kontrol noktası yazmadan sürebilir
+        task = Mock(time_limit=900, max_retries=3, request=Mock(id="gorev", retries=0))
+
+        with patch("news.tasks_advanced.current_task", task):
+            assert _stage_lease_seconds() == 4 * 900 + 3 * 120
+            extend_lease(article_data, _stage_lease_seconds())
+        PipelineRun.objects.filter(run_id=run_id).update(updated_at=stale)
+        assert not get_resumable_runs()
+
+        PipelineRun.objects.filter(run_id=run_id).update(lease_expires_at=stale)
+        assert [run.run_id for run in get_resumable_runs()] == [run_id]
+
+    def test_publish_is_idempotent_per_run(self):
+        with patch.dict(STAGE_FUNCTIONS, self.fakes):
+            result = process_article_pipeline.delay(self.article_data("tek"), fused=True, parallel=True).get()
+        run = PipelineRun.objects.get(run_id=result["run_id"])
+
+        # Geç kalan ikinci zincir yeni makale oluşturmaz ve tamamlanmış çalıştırmayı geri açmaz
+        article_data = publish_article(load_run_state(run))
+        save_checkpoint("publishing", article_data)
+
+        run.refresh_from_db()
+        assert article_data["article_id"] == run.article_id == Article.objects.get().id
+        assert run.status == "completed"
+
+    def test_completed_layers_are_skipped(self):
+        completed = dict.fromkeys((*PRE_GENERATION_STAGES, "content_generation", "media_processing"), 1.0)
+
+        pipeline = build_article_pipeline({"title": "x"}, fused=True, parallel=True, completed=completed)
+
+        # Medya tamamlanmış olsa da paralel katman birlikte yeniden kurulur; medya dalı kendini atlar
+        header = pipeline.tasks[0]
+        assert [sig.task.rsplit(".", 1)[-1] for sig in header.tasks] == [
+            "process_media_task",
+            "generate_featured_image_task",
+        ]
+        assert header.tasks[0].args == ({"title": "x"},)
+        assert build_article_pipeline({}, completed=dict.fromkeys(STAGE_FUNCTIONS, 1.0)) is None
+
+    def test_resumable_runs(self):
+        stale = timezone.now() - timedelta(hours=3)
+        PipelineRun.objects.create(run_id="basarisiz", status="failed")
+        PipelineRun.objects.create(run_id="taze", status="running")
+        PipelineRun.objects.create(run_id="tukenmis", status="failed", resume_count=3)
+        PipelineRun.objects.create(run_id="bitti", status="completed")
+        PipelineRun.objects.create(run_id="takili", status="running")
+        PipelineRun.objects.filter(run_id="takili").update(updated_at=stale)
+
+        assert {run.run_id for run in get_resumable_runs()} == {"basarisiz", "takili"}
+
+
+@pytest.mark.django_db
+class TestGenerationLogging(TestCase):
+    """Tamponlu ContentGenerationLog yazımı testleri."""
+
+    def setUp(self):
+        Author.objects.create(name="Yazar", slug="yazar", expertise="Teknoloji", is_active=True)
+        self.fakes = {
+            "content_generation": fake_generate_content,
+            "media_processing": fake_process_media,
+            "image_generation": fake_generate_featured_image,
+        }
+
+    def publish(self, suffix):
+        data = {
+            "title": f"Kayıtlı yapay zeka haberi {suffix}",
+            "summary": "Teknoloji şirketleri yapay zeka yatırımlarını artırıyor.",
+            "category": "Teknoloji",
+            "link": f"https://example.com/kayit/{suffix}",
+        }
+        with patch.dict(STAGE_FUNCTIONS, self.fakes):
+            process_article_pipeline.delay(data, fused=True, parallel=True)
+        return Article.objects.get(title=data["title"])
+
+    def test_all_stages_are_written_in_one_batch_after_publish(self):
+        article = self.publish("tek")
+
+        logs = ContentGenerationLog.objects.filter(article=article)
+        assert logs.count() == len(STAGE_FUNCTIONS)
+        assert {log.input_data["pipeline_stage"] for log in logs} == set(STAGE_FUNCTIONS)
+        generate = logs.get(stage="generate")
+        assert (generate.status, generate.ai_model_used) == ("completed", "gemini-2.5-flash")
+        assert logs.get(stage="publish").input_data["pipeline_run_id"] == article.pipeline_runs.get().run_id
+
+    @override_settings(GENERATION_LOG_BATCH_SIZE=1000, GENERATION_LOG_FLUSH_SECONDS=3600)
+    def test_records_are_buffered_until_threshold_or_shutdown(self):
+        article = self.publish("tampon")
+        assert not ContentGenerationLog.objects.filter(article=article).exists()
+
+        worker_shutdown.send(sender=None)
+
+        assert ContentGenerationLog.objects.filter(article=article).count() == len(STAGE_FUNCTIONS)
+        assert flush_generation_logs() == 0
+
+
+@pytest.mark.django_db
+class TestSlimPayloads(TestCase):
+    """Bağlam deposu ve referanslı görev verisi testleri."""
+
+    def setUp(self):
+        cache.clear()
+        Author.objects.create(name="Yazar", slug="yazar", expertise="Teknoloji", is_active=True)
+        self.fakes = {
+            "content_generation": fake_generate_content,
+            "media_processing": fake_process_media,
+            "image_generation": fake_generate_featured_image,
+        }
+
+    def start(self, suffix):
+        data = {
+            "title": f"Referanslı yapay zeka haberi {suffix}",
+            "summary": "Teknoloji şirketleri yapay zeka yatırımlarını artırıyor.",
+            "category": "Teknoloji",
+            "link": f"https://example.com/referans/{suffix}",
+        }
+        run_id = start_run(data, fused=True, parallel=True)
+        return run_id, pipeline_context.create(data)
+
+    def test_tasks_pass_small_refs_and_publish(self):
+        run_id, ref = self.start("tam")
+
+        with patch.dict(STAGE_FUNCTIONS, self.fakes):
+            result = build_article_pipeline(ref, fused=True, parallel=True).apply_async().get()
+
+        assert pipeline_context.is_ref(result)
+        assert len(json.dumps(result)) < 1000 < len(CONTENT)
+        assert result["published"] is True
+        assert set(result["stage_timings"]) == set(STAGE_FUNCTIONS)
+        assert Article.objects.get(pk=result["article_id"]).content == CONTENT
+        # Yayından sonra bağlam cache'ten silinir
+        assert cache.get(f"pipeline:ctx:{run_id}:input") is None
+
+    def test_checkpoints_store_only_stage_changes(self):
+        run_id, ref = self.start("delta")
+
+        with patch.dict(STAGE_FUNCTIONS, self.fakes):
+            build_article_pipeline(ref, fused=True, parallel=True).apply_async()
+
+        checkpoint = PipelineRun.objects.get(run_id=run_id).checkpoints.get(stage="content_generation")
+        assert set(checkpoint.data) == {"content", "model_used", "stage_timings"}
+
+    def test_context_is_rebuilt_from_checkpoints_when_cache_is_lost(self):
+        _, ref = self.start("kayip")
+        ref = prepare_article_task.apply(args=[ref]).get()
+        # Kontrol noktaları JSON'dan okunur (tuple'lar liste olur)
+        expected = json.loads(json.dumps(pipeline_context.load(ref)))
+
+        cache.clear()
+
+        assert pipeline_context.load(ref) == expected
+        assert expected["author_name"] == "Yazar"
+        assert (
+            len(cache.get_many([f"pipeline:ctx:{ref['pipeline_run_id']}:{stage}" for stage in ref["stage_timings"]]))
+            == 4
+        )
+
+    def test_full_payloads_when_disabled(self):
+        assert pipeline_context.is_slim_payloads_enabled() is True
+        Setting.objects.create(key="PIPELINE_SLIM_PAYLOADS", value="false")
+        assert pipeline_context.is_slim_payloads_enabled() is False
+
+        with patch.dict(STAGE_FUNCTIONS, self.fakes):
+            process_article_pipeline.delay({"title": "Tam veriyle yapay zeka haberi", "category": "Teknoloji"})
+
+        assert Article.objects.get().content == CONTENT
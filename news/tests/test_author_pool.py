@@ -0,0 +1,101 @@
+"""
+Ağırlıklı yazar havuzu testleri.
+AliasSampler dağılımı, kategori havuzları, sorgusuz seçim ve geçersiz kılma.
+"""
+
+import random
+from collections import Counter
+
+from django.core.cache import cache
+from django.test import TestCase
+
+import pytest
+
+from authors.models import Author
+from news.author_pool import POOL_VERSION_KEY, AliasSampler, get_author_pool, select_author
+from news.content_utils import AuthorStyleSelector
+from news.models_advanced import AuthorCategoryMapping
+
+
+class TestAliasSampler(TestCase):
+    """AliasSampler testleri."""
+
+    def test_distribution_follows_weights(self):
+        sampler = AliasSampler(["a", "b", "c"], [1, 3, 6])
+        rng = random.Random(42)
+
+        counts = Counter(sampler.sample(rng) for _ in range(20000))
+
+        assert abs(counts["a"] / 20000 - 0.1) < 0.01
+        assert abs(counts["b"] / 20000 - 0.3) < 0.015
+        assert abs(counts["c"] / 20000 - 0.6) < 0.015
+
+    def test_zero_weights_are_uniform_and_empty_rejected(self):
+        sampler = AliasSampler(["a", "b"], [0, 0])
+        assert sampler.prob == [1.0, 1.0]
+
+        with pytest.raises(ValueError):
+            AliasSampler([], [])
+
+
+@pytest.mark.django_db
+class TestAuthorPool(TestCase):
+    """Kategori havuzu ve geçersiz kılma testleri."""
+
+    def setUp(self):
+        self.expert = Author.objects.create(name="Uzman", slug="uzman", expertise="Teknoloji")
+        self.junior = Author.objects.create(name="Yeni", slug="yeni", expertise="Teknoloji")
+        self.sports = Author.objects.create(name="Sporcu", slug="sporcu", expertise="Spor")
+        AuthorCategoryMapping.objects.create(
+            author=self.expert, category="Teknoloji", expertise_level=5, is_primary=True, preferred_tone="formal"
+        )
+        AuthorCategoryMapping.objects.create(author=self.junior, category="Teknoloji", expertise_level=1)
+
+    def test_category_pool_is_weighted_and_query_free(self):
+        pool = get_author_pool()
+        rng = random.Random(1)
+
+        with self.assertNumQueries(0):
+            picks = Counter(pool.select("Teknoloji", rng)[0].name for _ in range(5500))
+            select_author("Teknoloji")
+
+        # Ağırlıklar 10:1
+        assert picks.keys() == {"Uzman", "Yeni"}
+        assert 0.88 < picks["Uzman"] / 5500 < 0.94
+
+    def test_unmapped_category_uses_all_active_authors(self):
+        rng = random.Random(3)
+        picks = {get_author_pool().select("Magazin", rng) for _ in range(200)}
+
+        assert picks == {(self.expert, None), (self.junior, None), (self.sports, None)}
+
+    def test_changes_invalidate_pool(self):
+        get_author_pool()
+
+        AuthorCategoryMapping.objects.create(author=self.sports, category="Spor", expertise_level=3)
+        assert select_author("Spor")[0] == self.sports
+
+        self.sports.is_active = False
+        self.sports.save()
+        assert self.sports not in {get_author_pool().select("Spor")[0] for _ in range(50)}
+
+    def test_version_bump_from_other_process_rebuilds(self):
+        pool = get_author_pool()
+
+        cache.incr(POOL_VERSION_KEY)
+
+        assert get_author_pool() is not pool
+
+    def test_no_active_authors(self):
+        Author.objects.all().update(is_active=False)
+        cache.incr(POOL_VERSION_KEY)
+
+        assert select_author("Teknoloji") == (None, None)
+
+    def test_style_selector_uses_mapping_tone(self):
+        AuthorCategoryMapping.objects.filter(author=self.junior).delete()
+
+        author, style = AuthorStyleSelector.select_author_and_style("Teknoloji", 4)
+
+        assert author == self.expert
+        assert style["voice"] == "formal"
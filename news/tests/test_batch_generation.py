@@ -0,0 +1,216 @@
+"""
+Eşzamanlı toplu içerik üretimi testleri.
+batch_generate_content ve generate_contents_concurrently.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from django.test import TestCase, override_settings
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+
+from authors.models import Author
+from core.models import Setting
+from news.models import Article
+from news.tasks import (
+    batch_generate_content,
+    batch_regenerate_content,
+    generate_contents_concurrently,
+    get_batch_concurrency,
+    get_requests_per_minute,
+)
+
+
+def make_client(texts_by_prompt=None, default_text="<p>AI içerik</p>"):
+    """Async generate_content'i taklit eden sahte client."""
+    texts_by_prompt = texts_by_prompt or {}
+
+    async def generate_content(model, contents, config):
+        await asyncio.sleep(0)
+        for marker, text in texts_by_prompt.items():
+            if marker in contents:
+                return MagicMock(text=text)
+        return MagicMock(text=default_text)
+
+    client = MagicMock()
+    client.aio.models.generate_content = AsyncMock(side_effect=generate_content)
+    return client
+
+
+@pytest.mark.django_db
+class TestBatchGenerateContent(TestCase):
+    """batch_generate_content task testleri."""
+
+    def setUp(self):
+        Author.objects.create(name="Test Yazar", slug="test-yazar", expertise="Teknoloji", is_active=True)
+        self.articles = [
+            Article.objects.create(
+                title=f"Test Makale {i}", slug=f"test-makale-{i}", content=f"Kaynak {i}", category="Teknoloji"
+            )
+            for i in range(4)
+        ]
+        self.article_ids = [a.id for a in self.articles]
+
+    @patch("news.tasks.transaction.on_commit")
+    @patch("news.tasks.build_generation_config", return_value={})
+    @patch("news.tasks.get_genai_client")
+    def test_all_articles_generated_and_bulk_written(self, mock_client, mock_config, mock_on_commit):
+        """Tüm makaleler üretilir ve tek seferde yazılır."""
+        mock_client.return_value = make_client()
+
+        summary = batch_generate_content(self.article_ids)
+
+        assert summary["total"] == 4
+        assert summary["succeeded"] == 4
+        assert summary["failed"] == 0
+        assert summary["wall_time"] >= 0
+        assert {item["article_id"] for item in summary["items"]} == set(self.article_ids)
+        assert Article.objects.filter(status="published", is_ai_generated=True).count() == 4
+        assert Article.objects.filter(author__isnull=True).count() == 0
+        assert mock_on_commit.call_count == 4
+
+    @patch("news.tasks.transaction.on_commit")
+    @patch("news.tasks.build_generation_config", return_value={})
+    @patch("news.tasks.get_genai_client")
+    def test_per_item_status_on_empty_response(self, mock_client, mock_config, mock_on_commit):
+        """Boş yanıt dönen makale başarısız olarak raporlanır, diğerleri yazılır."""
+        mock_client.return_value = make_client({"Test Makale 2": None})
+
+        summary = batch_generate_content(self.article_ids)
+
+        failed = [item for item in summary["items"] if item["status"] == "failed"]
+        assert summary["succeeded"] == 3
+        assert len(failed) == 1
+        assert failed[0]["article_id"] == self.articles[2].id
+        assert failed[0]["error"] == "AI yanıt boş"
+
+        self.articles[2].refresh_from_db()
+        assert self.articles[2].status == "draft"
+
+    @patch("news.tasks.build_generation_config", return_value={})
+    @patch("news.tasks.get_genai_client")
+    def test_skips_missing_and_already_published(self, mock_client, mock_config):
+        """Bulunamayan ve zaten yayınlanmış makaleler atlanır."""
+        Article.objects.filter(id__in=self.article_ids).update(is_ai_generated=True, status="published")
+
+        summary = batch_generate_content([*self.article_ids, 99999])
+
+        assert summary["skipped"] == 5
+        mock_client.assert_not_called()
+
+    @patch("news.tasks.time.sleep")
+    @patch("news.tasks.transaction.on_commit")
+    @patch("news.tasks.build_generation_config", return_value={})
+    @patch("news.tasks.get_genai_client")
+    def test_chunks_share_one_event_loop_and_are_paced(self, mock_client, mock_config, mock_on_commit, mock_sleep):
+        """Parçalar aynı event loop'ta çalışır, aralarında RPM beklemesi yapılır, her parça ayrı yazılır."""
+        Setting.objects.create(key="AI_REQUESTS_PER_MINUTE", value="2")
+        loops, published_before_call = set(), []
+
+        async def generate_content(model, contents, config):
+            loops.add(id(asyncio.get_running_loop()))
+            return MagicMock(text="<p>AI içerik</p>")
+
+        def sleep(seconds):
+            published_before_call.append(Article.objects.filter(status="published").count())
+
+        client = MagicMock()
+        client.aio.models.generate_content = AsyncMock(side_effect=generate_content)
+        mock_client.return_value = client
+        mock_sleep.side_effect = sleep
+
+        summary = batch_generate_content(self.article_ids)
+
+        assert summary["succeeded"] == 4
+        assert len(loops) == 1
+        mock_sleep.assert_called_once()
+        assert 59 < mock_sleep.call_args.args[0] <= 60
+        # İlk parça ikinci parça başlamadan yazıldı
+        assert published_before_call == [2]
+
+    @override_settings(CELERY_TASK_SOFT_TIME_LIMIT=120)
+    @patch("news.tasks.batch_generate_content.apply_async")
+    @patch("news.tasks.transaction.on_commit")
+    @patch("news.tasks.build_generation_config", return_value={})
+    @patch("news.tasks.get_genai_client")
+    def test_articles_beyond_time_limit_are_deferred(self, mock_client, mock_config, mock_on_commit, mock_apply):
+        """Süre limitine sığmayan parçalar, bu görevin parçaları bittikten sonra RPM aralığıyla devredilir."""
+        Setting.objects.create(key="AI_REQUESTS_PER_MINUTE", value="2")
+        mock_client.return_value = make_client()
+
+        def deferred_after_generation(*args, **kwargs):
+            assert Article.objects.filter(status="published").count() == 2
+
+        mock_apply.side_effect = deferred_after_generation
+
+        summary = batch_generate_content(self.article_ids, concurrency=2)
+
+        assert summary["succeeded"] == 2
+        assert summary["deferred"] == 2
+        mock_apply.assert_called_once_with((self.article_ids[2:], 2), countdown=60)
+        assert Article.objects.filter(status="published").count() == 2
+
+    @patch("news.tasks.transaction.on_commit")
+    @patch("news.tasks.build_generation_config", return_value={})
+    @patch("news.tasks.get_genai_client")
+    def test_completed_chunks_survive_interruption(self, mock_client, mock_config, mock_on_commit):
+        """Görev ikinci parçada kesilirse ilk parçanın üretimleri yazılmış kalır."""
+        Setting.objects.create(key="AI_REQUESTS_PER_MINUTE", value="2")
+        mock_client.return_value = make_client()
+
+        with patch("news.tasks.time.sleep", side_effect=SoftTimeLimitExceeded), pytest.raises(SoftTimeLimitExceeded):
+            batch_generate_content(self.article_ids)
+
+        assert Article.objects.filter(status="published").count() == 2
+
+    @patch("news.tasks.batch_generate_content.delay")
+    def test_batch_regenerate_concurrent_mode(self, mock_delay):
+        """concurrent=True toplu üretimi tek görev olarak başlatır."""
+        result = batch_regenerate_content(self.article_ids, concurrent=True)
+
+        mock_delay.assert_called_once_with(self.article_ids)
+        assert "4 makale" in result
+
+
+class TestGenerateContentsConcurrently(TestCase):
+    """generate_contents_concurrently testleri."""
+
+    def test_concurrency_is_bounded(self):
+        """Aynı anda açık istek sayısı semaphore ile sınırlanır."""
+        in_flight = 0
+        peak = 0
+
+        async def generate_content(model, contents, config):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock(text=contents)
+
+        client = MagicMock()
+        client.aio.models.generate_content = AsyncMock(side_effect=generate_content)
+        jobs = [(i, f"prompt {i}") for i in range(10)]
+
+        results = asyncio.run(generate_contents_concurrently(client, "model", jobs, None, concurrency=3))
+
+        assert peak == 3
+        assert [r["text"] for r in results] == [f"prompt {i}" for i in range(10)]
+        assert all(r["status"] == "succeeded" for r in results)
+
+
+@pytest.mark.django_db
+class TestBatchSettings(TestCase):
+    """Toplu üretim ayar yardımcıları testleri."""
+
+    def test_defaults(self):
+        assert get_batch_concurrency() == 5
+        assert get_requests_per_minute() == 60
+
+    def test_from_settings(self):
+        Setting.objects.create(key="AI_BATCH_CONCURRENCY", value="8")
+        Setting.objects.create(key="AI_REQUESTS_PER_MINUTE", value="invalid")
+        assert get_batch_concurrency() == 8
+        assert get_requests_per_minute() == 60
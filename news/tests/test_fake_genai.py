@@ -0,0 +1,196 @@
+"""
+Sahte Gen AI sunucusu ve yük testi yardımcıları testleri.
+FakeGenAIServer, StageTimer, MessageMeter, QueryCounter ve percentile.
+"""
+
+import base64
+import json
+from io import BytesIO
+from unittest.mock import MagicMock
+
+from django.test import TestCase
+
+import feedparser
+import requests
+from PIL import Image
+
+from core.models import Setting
+from news.fake_genai import FakeGenAIConfig, FakeGenAIServer, estimate_tokens
+from news.load_testing import MessageMeter, QueryCounter, StageTimer
+from news.stats_utils import percentile
+
+
+class TestFakeGenAIServer(TestCase):
+    """FakeGenAIServer uç nokta testleri."""
+
+    def setUp(self):
+        self.server = FakeGenAIServer(FakeGenAIConfig(latency_ms=0, image_latency_ms=0, seed=1)).start()
+        self.addCleanup(self.server.stop)
+
+    def post(self, path, payload):
+        return requests.post(f"{self.server.url}{path}", json=payload, timeout=5)
+
+    def test_generate_content_returns_text_and_usage(self):
+        response = self.post(
+            "/v1beta/models/gemini-2.5-flash:generateContent",
+            {"contents": [{"parts": [{"text": "Haber yaz"}]}], "generationConfig": {"thinkingConfig": {}}},
+        )
+
+        data = response.json()
+        text = data["candidates"][0]["content"]["parts"][0]["text"]
+        usage = data["usageMetadata"]
+        assert response.status_code == 200
+        assert text.startswith("<h2>")
+        assert usage["promptTokenCount"] == estimate_tokens("Haber yaz")
+        assert usage["candidatesTokenCount"] == estimate_tokens(text)
+        assert usage["thoughtsTokenCount"] == 256
+        assert self.server.stats.as_dict()["total_tokens"] == usage["totalTokenCount"]
+
+    def test_json_prompt_returns_classification(self):
+        response = self.post(
+            "/v1beta/models/gemini-2.5-flash:generateContent",
+            {"contents": [{"parts": [{"text": "JSON formatında döndür"}]}]},
+        )
+
+        text = response.json()["candidates"][0]["content"]["parts"][0]["text"]
+        assert json.loads(text)["article_type"] == "news"
+
+    def test_batch_json_prompt_returns_array(self):
+        response = self.post(
+            "/v1beta/models/gemini-2.5-flash:generateContent",
+            {"contents": [{"parts": [{"text": "[id=7] Başlık\n[id=9] Başlık\nJSON dizisi döndür"}]}]},
+        )
+
+        items = json.loads(response.json()["candidates"][0]["content"]["parts"][0]["text"])
+        assert [item["id"] for item in items] == [7, 9]
+
+    def test_stream_generate_content_sends_chunks(self):
+        response = self.post(
+            "/v1beta/models/gemini-2.5-flash:streamGenerateContent?alt=sse",
+            {"contents": [{"parts": [{"text": "Haber yaz"}]}]},
+        )
+
+        events = [json.loads(line[6:]) for line in response.text.splitlines() if line.startswith("data: ")]
+        assert len(events) == self.server.config.stream_chunks
+        assert "usageMetadata" in events[-1]
+        assert events[-1]["candidates"][0]["finishReason"] == "STOP"
+
+    def test_predict_returns_jpeg(self):
+        response = self.post(
+            "/v1beta1/publishers/google/models/imagen-4.0-generate-001:predict",
+            {"instances": [{"prompt": "x"}], "parameters": {"sampleCount": 2}},
+        )
+
+        predictions = response.json()["predictions"]
+        image = Image.open(BytesIO(base64.b64decode(predictions[0]["bytesBase64Encoded"])))
+        assert len(predictions) == 2
+        assert image.size == (1280, 720)
+        assert self.server.stats.as_dict()["images"] == 2
+
+    def test_predict_is_rejected_in_developer_api_mode(self):
+        response = self.post("/v1beta/models/imagen-4.0-generate-001:predict", {"instances": [{"prompt": "x"}]})
+
+        assert response.status_code == 400
+        assert "only supported in Gemini Enterprise Agent Platform mode" in response.json()["error"]["message"]
+
+    def test_generate_content_with_image_modality_returns_inline_image(self):
+        response = self.post(
+            "/v1beta/models/gemini-2.5-flash-image:generateContent",
+            {
+                "contents": [{"parts": [{"text": "Haber görseli"}]}],
+                "generationConfig": {"responseModalities": ["IMAGE"]},
+            },
+        )
+
+        part = response.json()["candidates"][0]["content"]["parts"][0]
+        image = Image.open(BytesIO(base64.b64decode(part["inlineData"]["data"])))
+        assert image.size == (1280, 720)
+        assert self.server.stats.as_dict()["images"] == 1
+
+    def test_rate_limit_and_error_injection(self):
+        self.server.config.rate_limit_rate = 1.0
+        response = self.post("/v1beta/models/m:generateContent", {})
+        assert response.status_code == 429
+        assert response.json()["error"]["status"] == "RESOURCE_EXHAUSTED"
+
+        self.server.config.rate_limit_rate = 0.0
+        self.server.config.error_rate = 1.0
+        response = self.post("/v1beta/models/m:generateContent", {})
+        assert response.status_code == 500
+
+        assert self.server.stats.as_dict()["status_codes"] == {"429": 1, "500": 1}
+
+    def test_unknown_endpoint(self):
+        assert self.post("/v1beta/models/m:countTokens", {}).status_code == 404
+
+    def test_rss_feed_generates_requested_items(self):
+        feed = feedparser.parse(requests.get(f"{self.server.url}/rss?feed=Kaynak A&items=3", timeout=5).content)
+
+        links = [entry.link for entry in feed.entries]
+        assert not feed.bozo
+        assert len(links) == len(set(links)) == 3
+        assert feed.entries[0].title.startswith("Kaynak A 0:")
+
+
+class TestStageTimer(TestCase):
+    """StageTimer ve percentile testleri."""
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) == 0.0
+
+    def test_nested_tasks_record_exclusive_time_and_retries(self):
+        timer = StageTimer()
+        outer, inner = MagicMock(), MagicMock()
+        outer.name, inner.name = "outer", "inner"
+
+        timer._on_prerun(task_id="a", task=outer)
+        timer._on_prerun(task_id="b", task=inner)
+        # Eager retry: aynı task_id ile iç içe ikinci deneme
+        timer._on_prerun(task_id="b", task=inner)
+        timer._on_postrun(task_id="b", task=inner, state="SUCCESS")
+        timer._on_postrun(task_id="b", task=inner, state="RETRY")
+        timer._on_postrun(task_id="a", task=outer, state="SUCCESS")
+
+        summary = timer.stage_summary()
+        assert summary["inner"]["count"] == 1
+        assert summary["inner"]["retries"] == 1
+        assert summary["inner"]["failures"] == 0
+        assert summary["outer"]["count"] == 1
+        inner_record, outer_record = timer.records
+        assert outer_record["duration"] < sum(timer.busy_by_thread.values())
+        assert inner_record["outcome"] == "SUCCESS"
+        assert timer.worker_utilization(workers=1, wall_time=1e-9) == 1.0
+
+
+class TestMeters(TestCase):
+    """MessageMeter ve QueryCounter testleri."""
+
+    def test_message_meter_totals(self):
+        meter = MessageMeter()
+        meter._on_publish(sender="news.a", body=[["x" * 100], {}, {}])
+        meter._on_publish(sender="news.a", body=[[], {}, {}])
+        task = MagicMock(ignore_result=False)
+        task.name = "news.a"
+        meter._on_postrun(task=task, retval={"ok": True})
+
+        totals = meter.totals()
+        assert (totals["messages"], totals["results"]) == (2, 1)
+        assert meter.messages["news.a"]["max_bytes"] > 100
+        assert totals["message_bytes"] == meter.messages["news.a"]["bytes"]
+
+        meter.reset()
+        assert meter.totals()["messages"] == 0
+
+    def test_query_counter_counts_only_while_connected(self):
+        with QueryCounter() as queries:
+            Setting.objects.filter(key="A").exists()
+            Setting.objects.create(key="A", value="1")
+
+        assert queries.count >= 2
+        counted = queries.count
+        Setting.objects.count()
+        assert queries.count == counted
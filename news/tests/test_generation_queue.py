@@ -0,0 +1,162 @@
+"""
+Skor öncelikli üretim kuyruğu testleri.
+Öncelik hesaplama, yaşlandırma, eşzamanlı üretim sınırı ve yayın süresi raporu.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+import pytest
+
+from core.models import Setting
+from news.generation_queue import (
+    DISPATCH_LOCK_KEY,
+    DISPATCH_RETRY_KEY,
+    DISPATCH_RETRY_SECONDS,
+    IN_FLIGHT_TIMEOUT,
+    compute_sort_key,
+    dispatch_generation_queue,
+    enqueue_generation,
+    get_generation_priority,
+    mark_generation_finished,
+    to_celery_priority,
+)
+from news.models import Article, RssSource
+from news.models_extended import ArticleClassification, GenerationQueueItem, HeadlineScore
+from news.monitoring import GenerationQueueMetrics
+
+
+@pytest.mark.django_db
+class TestGenerationPriority(TestCase):
+    """Öncelik ve sıralama anahtarı testleri."""
+
+    def setUp(self):
+        self.source = RssSource.objects.create(name="Kaynak", url="https://example.com/rss", category="Gündem")
+        self.article = Article.objects.create(title="Deprem", slug="deprem", content="x")
+
+    def test_headline_score_and_breaking_bonus(self):
+        assert get_generation_priority(self.article) == 50.0
+
+        HeadlineScore.objects.create(
+            rss_source=self.source, original_headline="Deprem", overall_score=60, article=self.article
+        )
+        ArticleClassification.objects.create(
+            article=self.article, article_type="breaking", primary_category="Gündem", is_time_sensitive=True
+        )
+
+        assert get_generation_priority(self.article) == 90.0
+
+    def test_aging_lets_old_low_scores_overtake(self):
+        now = timezone.now()
+        old_low = compute_sort_key(10, now - timedelta(hours=2), aging_rate=1.0)
+        fresh_high = compute_sort_key(80, now, aging_rate=1.0)
+
+        assert old_low > fresh_high
+        assert compute_sort_key(10, now - timedelta(hours=2), aging_rate=0) < compute_sort_key(80, now, aging_rate=0)
+
+    def test_celery_priority_mapping(self):
+        assert to_celery_priority(100) == 0
+        assert to_celery_priority(0) == 9
+
+
+@pytest.mark.django_db
+class TestGenerationQueueDispatch(TestCase):
+    """Kuyruk dağıtımı ve yayın süresi testleri."""
+
+    def setUp(self):
+        Setting.objects.create(key="GENERATION_MAX_IN_FLIGHT", value="2")
+        self.articles = {
+            score: Article.objects.create(title=f"Haber {score}", slug=f"haber-{score}", content="x")
+            for score in (20, 90, 55)
+        }
+        for score, article in self.articles.items():
+            enqueue_generation(article, score=score, dispatch=False)
+
+    @patch("news.tasks.generate_ai_content.apply_async")
+    def test_dispatches_best_first_up_to_cap(self, mock_apply):
+        with self.captureOnCommitCallbacks(execute=True):
+            assert dispatch_generation_queue() == 2
+
+        sent = [call.kwargs["args"][0] for call in mock_apply.call_args_list]
+        assert sent == [self.articles[90].id, self.articles[55].id]
+        assert mock_apply.call_args_list[0].kwargs["priority"] == 0
+        assert GenerationQueueItem.objects.filter(status="queued").get().article == self.articles[20]
+
+        # Sınır doluyken yeni gönderim yapılmaz
+        assert dispatch_generation_queue() == 0
+
+    @patch("news.generation_queue.dispatch_generation_queue.apply_async")
+    def test_wakeup_during_held_lock_is_rescheduled_once(self, mock_retry):
+        cache.add(DISPATCH_LOCK_KEY, 1)
+        self.addCleanup(cache.delete_many, [DISPATCH_LOCK_KEY, DISPATCH_RETRY_KEY])
+
+        assert dispatch_generation_queue() == 0
+        assert dispatch_generation_queue() == 0
+
+        mock_retry.assert_called_once_with(countdown=DISPATCH_RETRY_SECONDS)
+
+    @patch("news.tasks.generate_ai_content.apply_async")
+    def test_finished_generation_frees_slot_and_reports_latency(self, mock_apply):
+        with self.captureOnCommitCallbacks(execute=True):
+            dispatch_generation_queue()
+
+        top = self.articles[90]
+        GenerationQueueItem.objects.filter(article=top).update(enqueued_at=timezone.now() - timedelta(seconds=120))
+        Article.objects.filter(pk=top.pk).update(status="published", published_at=timezone.now())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_generation_finished(top.id)
+
+        assert GenerationQueueItem.objects.get(article=top).status == "completed"
+        assert mock_apply.call_args_list[-1].kwargs["args"] == [self.articles[20].id]
+
+        stats = GenerationQueueMetrics.get_time_to_publish_stats()
+        assert stats["top"]["count"] == 1
+        assert 119 <= stats["top"]["p95"] <= 125
+        assert stats["other"]["count"] == 0
+        assert GenerationQueueMetrics.get_queue_status()["dispatched"] == 2
+
+    @patch("news.tasks.generate_ai_content.apply_async")
+    def test_timed_out_items_are_requeued_until_attempts_run_out(self, mock_apply):
+        Setting.objects.create(key="GENERATION_MAX_ATTEMPTS", value="2")
+        GenerationQueueItem.objects.exclude(article=self.articles[90]).delete()
+        stale = timezone.now() - IN_FLIGHT_TIMEOUT - timedelta(minutes=1)
+
+        for attempt in (1, 2):
+            with self.captureOnCommitCallbacks(execute=True):
+                assert dispatch_generation_queue() == 1
+            item = GenerationQueueItem.objects.get()
+            assert (item.status, item.attempts) == ("dispatched", attempt)
+            GenerationQueueItem.objects.update(dispatched_at=stale)
+
+        assert dispatch_generation_queue() == 0
+        item.refresh_from_db()
+        assert (item.status, item.attempts) == ("failed", 2)
+        assert mock_apply.call_count == 2
+
+    @patch("news.tasks.generate_ai_content.apply_async", side_effect=ConnectionError("broker yok"))
+    def test_unsent_dispatch_does_not_use_an_attempt(self, mock_apply):
+        with self.captureOnCommitCallbacks(execute=True):
+            dispatch_generation_queue()
+
+        assert set(GenerationQueueItem.objects.values_list("status", "attempts")) == {("queued", 0)}
+
+    def test_requeue_keeps_wait_time_for_queued_items(self):
+        item = GenerationQueueItem.objects.get(article=self.articles[20])
+        enqueue_generation(self.articles[20], score=40, dispatch=False)
+
+        item.refresh_from_db()
+        assert item.score == 40
+        assert GenerationQueueItem.objects.get(article=self.articles[20]).enqueued_at == item.enqueued_at
+
+    def test_eager_generation_closes_queue_item(self):
+        # Aktif yazar olmadığı için üretimler yayın yapmadan biter; her biten üretim
+        # boşalan yere sıradakini gönderdiği için kuyruk tamamen boşalır
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_generation(self.articles[90], score=90)
+
+        assert set(GenerationQueueItem.objects.values_list("status", flat=True)) == {"failed"}
@@ -0,0 +1,141 @@
+"""
+Toplu başlık sınıflandırma testleri.
+parse_batch_classification ve classify_headlines toplu / tek tek yedek akışı.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+import pytest
+
+from core.models import Setting
+from news.models import RssSource
+from news.models_extended import AICallLog, ArticleClassification, HeadlineScore
+from news.tasks_v2 import (
+    build_batch_classification_prompt,
+    classify_headlines,
+    classify_headlines_batch_with_ai,
+    get_default_classification,
+    parse_batch_classification,
+)
+
+
+def classification(**overrides):
+    return {**get_default_classification(), "primary_category": "Teknoloji", **overrides}
+
+
+class TestParseBatchClassification(TestCase):
+    """parse_batch_classification testleri."""
+
+    def test_valid_items_are_mapped_by_id(self):
+        text = json.dumps([{"id": 1, **classification()}, {"id": "2", **classification(article_type="breaking")}])
+
+        results = parse_batch_classification(text, [1, 2])
+
+        assert set(results) == {1, 2}
+        assert results[2]["article_type"] == "breaking"
+        assert "id" not in results[1]
+
+    def test_invalid_items_are_skipped(self):
+        text = json.dumps(
+            {
+                "classifications": [
+                    {"id": 1, "article_type": "news"},  # zorunlu alanlar eksik
+                    {"id": 99, **classification()},  # istenmeyen id
+                    {"id": None, **classification()},
+                    "bozuk",
+                    {"id": 3, **classification()},
+                ]
+            }
+        )
+
+        assert set(parse_batch_classification(text, [1, 2, 3])) == {3}
+        assert parse_batch_classification("JSON değil", [1]) == {}
+
+
+@pytest.mark.django_db
+class TestClassifyHeadlinesBatch(TestCase):
+    """classify_headlines toplu sınıflandırma testleri."""
+
+    def setUp(self):
+        Setting.objects.create(key="GOOGLE_GEMINI_API_KEY", value="test-key")
+        Setting.objects.create(key="CLASSIFICATION_BATCH_SIZE", value="2")
+        source = RssSource.objects.create(name="Kaynak", url="https://example.com/rss", category="Teknoloji")
+        self.headlines = [
+            HeadlineScore.objects.create(rss_source=source, original_headline=f"Başlık {i}") for i in range(3)
+        ]
+
+    @patch("news.tasks_v2.get_genai_client")
+    def test_single_request_per_batch(self, mock_client):
+        client = mock_client.return_value
+        client.models.generate_content.return_value = MagicMock(
+            text=json.dumps([{"id": h.id, **classification()} for h in self.headlines[:2]])
+        )
+
+        results = classify_headlines_batch_with_ai(self.headlines[:2])
+
+        assert set(results) == {h.id for h in self.headlines[:2]}
+        assert client.models.generate_content.call_count == 1
+        prompt = client.models.generate_content.call_args.kwargs["contents"]
+        assert prompt == build_batch_classification_prompt(self.headlines[:2])
+        assert f"[id={self.headlines[0].id}]" in prompt
+
+    @patch("news.tasks_v2.classify_headline_with_ai")
+    @patch("news.tasks_v2.classify_headlines_batch_with_ai")
+    def test_falls_back_per_item_only_for_failures(self, mock_batch, mock_single):
+        first, second, third = self.headlines
+        # İlk grupta ikinci başlık eksik döner, ikinci grup tamamen başarılı
+        mock_batch.side_effect = [
+            {first.id: classification(article_type="analysis")},
+            {third.id: classification()},
+        ]
+        mock_single.return_value = classification(article_type="breaking")
+
+        classify_headlines([h.id for h in self.headlines])
+
+        assert mock_batch.call_count == 2
+        mock_single.assert_called_once()
+        assert mock_single.call_args.args[0].id == second.id
+        types = dict(ArticleClassification.objects.values_list("article__title", "article_type"))
+        assert types == {"Başlık 0": "analysis", "Başlık 1": "breaking", "Başlık 2": "news"}
+
+    @patch("news.tasks_v2.classify_headlines_batch_with_ai")
+    def test_batching_disabled_without_api_key(self, mock_batch):
+        Setting.objects.filter(key="GOOGLE_GEMINI_API_KEY").delete()
+
+        classify_headlines([h.id for h in self.headlines])
+
+        mock_batch.assert_not_called()
+        assert ArticleClassification.objects.count() == 3
+
+    @patch("news.tasks_v2.get_genai_client")
+    def test_single_classification_call_is_linked_to_created_article(self, mock_client):
+        Setting.objects.filter(key="CLASSIFICATION_BATCH_SIZE").update(value="1")
+        mock_client.return_value.models.generate_content.return_value = MagicMock(text=json.dumps(classification()))
+        headline = self.headlines[0]
+
+        classify_headlines([headline.id])
+
+        headline.refresh_from_db()
+        log = AICallLog.objects.get(task_name="classify_headline_with_ai")
+        assert log.headline_id == headline.id
+        assert log.article_id == headline.article_id
+
+    @patch("news.tasks_v2.get_genai_client")
+    def test_batch_classification_call_is_linked_to_each_created_article(self, mock_client):
+        response = MagicMock(text=json.dumps([{"id": h.id, **classification()} for h in self.headlines[:2]]))
+        response.usage_metadata.prompt_token_count = 400
+        response.usage_metadata.candidates_token_count = 200
+        response.usage_metadata.thoughts_token_count = 0
+        mock_client.return_value.models.generate_content.return_value = response
+
+        classify_headlines([h.id for h in self.headlines[:2]])
+
+        logs = AICallLog.objects.filter(task_name="classify_headlines_batch_with_ai")
+        linked = {
+            headline.article_id for headline in HeadlineScore.objects.filter(id__in=[h.id for h in self.headlines[:2]])
+        }
+        assert set(logs.values_list("article_id", flat=True)) == linked
+        assert list(logs.values_list("total_tokens", flat=True)) == [300, 300]
@@ -0,0 +1,98 @@
+"""
+Sınırlı bellekle görsel alımı testleri.
+Bayt sınırı, piksel sınırı (dekompresyon bombası) ve JPEG draft ile küçültülerek çözme.
+"""
+
+from io import BytesIO
+from unittest.mock import Mock
+
+from django.test import TestCase
+
+import pytest
+from PIL import Image
+
+from core.models import Setting
+from news import image_ingest
+
+
+def encoded(image, fmt="JPEG", **options):
+    buffer = BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def streamed_response(data, headers=None, chunk=1024):
+    response = Mock(headers=headers or {})
+    response.iter_content.return_value = [data[i : i + chunk] for i in range(0, len(data), chunk)]
+    return response
+
+
+@pytest.mark.django_db
+class TestReadResponse(TestCase):
+    """Bayt sınırlı indirme testleri."""
+
+    def test_reads_chunks_and_closes_response(self):
+        data = bytes(range(256)) * 20
+        response = streamed_response(data)
+
+        assert image_ingest.read_response(response, max_bytes=len(data)) == data
+        response.close.assert_called_once()
+
+    def test_content_length_over_limit_is_rejected_before_reading(self):
+        response = streamed_response(b"x" * 10, headers={"Content-Length": "5000"})
+
+        with pytest.raises(image_ingest.ImageTooLargeError):
+            image_ingest.read_response(response, max_bytes=4096)
+
+        response.iter_content.assert_not_called()
+        response.close.assert_called_once()
+
+    def test_stream_over_limit_is_cut_without_content_length(self):
+        response = streamed_response(b"x" * 10_000)
+
+        with pytest.raises(image_ingest.ImageTooLargeError):
+            image_ingest.read_response(response, max_bytes=4096)
+
+    def test_limit_is_read_from_settings(self):
+        Setting.objects.create(key="IMAGE_MAX_DOWNLOAD_BYTES", value="100")
+
+        with pytest.raises(image_ingest.ImageTooLargeError):
+            image_ingest.read_response(streamed_response(b"x" * 101))
+
+
+@pytest.mark.django_db
+class TestOpenImage(TestCase):
+    """Sınırlı bellekle çözme testleri."""
+
+    def test_jpeg_is_downscaled_while_decoding(self):
+        data = encoded(Image.linear_gradient("L").resize((4000, 3000)).convert("RGB"))
+
+        image, stats = image_ingest.open_image(data, max_size=(1920, 1080))
+
+        assert image.width <= 1920 and image.height <= 1080
+        assert stats["source_size"] == (4000, 3000)
+        # draft 1/2 ölçekte çözer; tam boyut tampon hiç oluşturulmaz
+        assert stats["decoded_size"] == (2000, 1500)
+        assert stats["peak_bytes"] < 4000 * 3000 * 4
+
+    def test_pixel_limit_rejects_image_before_decoding(self):
+        data = encoded(Image.new("RGB", (3000, 3000)), "PNG")
+
+        with pytest.raises(image_ingest.ImageTooLargeError):
+            image_ingest.open_image(data, max_pixels=1_000_000)
+
+    def test_pixel_limit_applies_after_jpeg_draft(self):
+        data = encoded(Image.new("RGB", (3000, 3000)))
+
+        image, _ = image_ingest.open_image(data, max_size=(500, 500), max_pixels=1_000_000)
+
+        assert image.size == (500, 500)
+
+    def test_animated_gif_decodes_first_frame(self):
+        frames = [Image.new("P", (64, 64), color) for color in (1, 2, 3)]
+        data = encoded(frames[0], "GIF", save_all=True, append_images=frames[1:])
+
+        image, stats = image_ingest.open_image(data, max_size=(32, 32))
+
+        assert image.size == (32, 32)
+        assert stats["decoded_bytes"] == 64 * 64
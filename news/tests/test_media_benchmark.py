@@ -0,0 +1,125 @@
+"""
+Medya ölçüm yardımcıları testleri.
+Sentetik girdiler, ayrı süreçte ölçüm (süre, RSS, formata göre çıktı baytı) ve karşılaştırma.
+"""
+
+import shutil
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from news.media_benchmark import compare, measure, output_bytes, synthetic_image_bytes
+
+
+class TestSyntheticInputs:
+    """Sentetik girdi testleri."""
+
+    @pytest.mark.parametrize(
+        ("kind", "fmt", "mode"), [("jpeg", "JPEG", "RGB"), ("png", "PNG", "RGB"), ("rgba", "PNG", "RGBA")]
+    )
+    def test_images_have_requested_format_and_size(self, kind, fmt, mode):
+        image = Image.open(BytesIO(synthetic_image_bytes(kind, (320, 180))))
+
+        assert (image.format, image.mode, image.size) == (fmt, mode, (320, 180))
+
+    def test_gif_is_animated(self):
+        image = Image.open(BytesIO(synthetic_image_bytes("gif", (64, 48))))
+
+        assert image.format == "GIF"
+        assert image.n_frames > 1
+
+    def test_unknown_kind_is_rejected(self):
+        with pytest.raises(ValueError):
+            synthetic_image_bytes("bmp", (8, 8))
+
+
+class TestMeasure:
+    """Ayrı süreçte ölçüm testleri."""
+
+    def setup_method(self):
+        self.root = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_reports_time_memory_growth_and_bytes_per_format(self):
+        def job(root):
+            buffer = bytearray(64 * 1024 * 1024)
+            buffer[::4096] = b"\x01" * len(buffer[::4096])
+            Path(root, "a.webp").write_bytes(b"x" * 100)
+            Path(root, "sub").mkdir()
+            Path(root, "sub", "b.webp").write_bytes(b"x" * 50)
+            Path(root, "c.avif").write_bytes(b"x" * 30)
+            Path(root, "original.mp4").write_bytes(b"x" * 1000)
+
+        result = measure(job, self.root)
+
+        assert result["error"] == ""
+        assert result["seconds"] > 0
+        assert result["rss_growth_mb"] >= 60
+        assert result["output_bytes"] == {"avif": 30, "webp": 150}
+        assert result["total_output_bytes"] == 180
+
+    def test_error_in_job_is_reported(self):
+        def job(root):
+            raise RuntimeError("encoder çöktü")
+
+        result = measure(job, self.root)
+
+        assert "encoder çöktü" in result["error"]
+        assert result["total_output_bytes"] == 0
+
+    def test_output_bytes_ignores_source_copies(self):
+        Path(self.root, "original.jpg").write_bytes(b"x" * 10)
+        Path(self.root, "playlist.m3u8").write_bytes(b"x" * 5)
+
+        assert output_bytes(self.root) == {"m3u8": 5}
+
+
+class TestCompare:
+    """Rapor karşılaştırma testleri."""
+
+    def test_changes_are_relative_to_baseline(self):
+        baseline = [
+            {
+                "case": "optimize",
+                "input": "jpeg 640x360",
+                "seconds": 2.0,
+                "rss_growth_mb": 10.0,
+                "total_output_bytes": 1000,
+                "error": "",
+            }
+        ]
+        current = [
+            {
+                "case": "optimize",
+                "input": "jpeg 640x360",
+                "seconds": 3.0,
+                "rss_growth_mb": 10.0,
+                "total_output_bytes": 900,
+                "error": "",
+            },
+            {
+                "case": "video",
+                "input": "mp4 1280x720",
+                "seconds": 9.0,
+                "rss_growth_mb": 1.0,
+                "total_output_bytes": 1,
+                "error": "",
+            },
+        ]
+
+        changes = compare(current, baseline)
+
+        assert changes == [
+            {
+                "case": "optimize",
+                "input": "jpeg 640x360",
+                "seconds_change": 0.5,
+                "rss_change": 0.0,
+                "bytes_change": -0.1,
+            }
+        ]
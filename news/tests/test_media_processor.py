@@ -0,0 +1,306 @@
+"""
+Görsel işleme testleri.
+ImageEncoder havuzu, süre sınırı, ImageProcessor format × boyut matrisi ve VideoProcessor
+tek geçişli encoding.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from django.test import TestCase
+
+import pytest
+from PIL import Image, ImageChops, ImageStat
+
+from core.models import Setting
+from news.image_encoding import ImageEncoder, encode_job
+from news.media_processor import ImageProcessor, VideoProcessor
+from news.media_scheduler import VIDEO_ENCODE_TIMEOUT
+
+
+def sample_image(size=(320, 180)):
+    return Image.merge(
+        "RGB", [Image.effect_noise(size, 40), Image.linear_gradient("L").resize(size), Image.new("L", size, 90)]
+    )
+
+
+class SlowImage:
+    """save çağrısını geciktiren görsel (süre sınırı testi için)."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def save(self, path, format, **options):
+        time.sleep(self.seconds)
+        sample_image().save(path, format, **options)
+
+
+class TestImageEncoder(TestCase):
+    """ImageEncoder testleri."""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, True)
+
+    def job(self, key, image, fmt="JPEG"):
+        return {"key": key, "image": image, "format": fmt, "path": os.path.join(self.output_dir, f"{key}.img")}
+
+    def test_thread_pool_encodes_all_jobs(self):
+        jobs = [self.job(name, sample_image(), fmt) for name, fmt in (("jpeg", "JPEG"), ("webp", "WEBP"))]
+
+        report = ImageEncoder(workers=2, executor="thread").encode(jobs)
+
+        assert report["executor"] == "thread"
+        assert report["errors"] == {}
+        assert set(report["results"]) == {"jpeg", "webp"}
+        assert all(result["bytes"] > 0 for result in report["results"].values())
+        assert Image.open(report["results"]["webp"]["path"]).format == "WEBP"
+
+    def test_deadline_drops_slow_job(self):
+        jobs = [self.job("slow", SlowImage(1.0)), self.job("fast", sample_image())]
+
+        report = ImageEncoder(workers=2, deadline=0.3, executor="thread").encode(jobs)
+
+        assert report["errors"] == {"slow": "deadline"}
+        assert list(report["results"]) == ["fast"]
+        assert report["wall_seconds"] < 1.0
+
+        # Süresi dolan iş arka planda bitse de dosyayı yerine taşımaz
+        time.sleep(1.0)
+        assert not Path(self.output_dir, "slow.img").exists()
+        assert list(Path(self.output_dir).glob("*.tmp")) == []
+
+    def test_job_past_its_deadline_does_not_start(self):
+        image = Mock()
+
+        with pytest.raises(TimeoutError):
+            encode_job(self.job("late", image), expires_at=time.time() - 1)
+
+        image.save.assert_not_called()
+
+    def test_single_worker_runs_serially_and_reports_errors(self):
+        jobs = [self.job("bad", sample_image(), "NOPE"), self.job("ok", sample_image())]
+
+        report = ImageEncoder(workers=1).encode(jobs)
+
+        assert report["executor"] == "serial"
+        assert list(report["results"]) == ["ok"]
+        assert "bad" in report["errors"]
+        assert list(Path(self.output_dir).glob("*.tmp")) == []
+
+
+@pytest.mark.django_db
+class TestImageProcessorEncoding(TestCase):
+    """ImageProcessor format × boyut matrisi testleri."""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, True)
+        self.processor = ImageProcessor(self.output_dir, encoder=ImageEncoder(workers=2, executor="thread"))
+
+    def test_encode_article_images_runs_featured_and_responsive_matrix(self):
+        encoded = self.processor.encode_article_images(sample_image(), "42", "medium", sizes=[(160, 90), (320, 180)])
+
+        assert set(encoded["formats"]) == {"avif", "webp", "jpeg"}
+        assert set(encoded["responsive"]["160x90"]) == {"avif", "webp", "dimensions"}
+        assert encoded["encoding"]["errors"] == {}
+        assert encoded["formats"]["jpeg"].endswith("articles/42/featured/featured.jpg")
+
+    def test_responsive_sizes_are_resized_from_original(self):
+        path = os.path.join(self.output_dir, "source.png")
+        sample_image((640, 360)).save(path)
+
+        images = self.processor.create_responsive_images(path, "7", sizes=[(160, 90), (320, 180)])
+
+        # Küçük boyut büyük boyutun girdisini küçültmemeli
+        with Image.open(images["320x180"]["webp"]) as large:
+            assert large.size == (320, 180)
+            assert large.getpixel((0, 0)) != (255, 255, 255)
+
+    def test_resize_pyramid_matches_direct_resize(self):
+        image = sample_image((1920, 1080))
+        sizes = [(600, 400), (1920, 1080), (1024, 683)]
+
+        pyramid = self.processor._resize_pyramid(image, sizes)
+        self.processor.RESIZE_PYRAMID = False
+        direct = self.processor._resize_pyramid(image, sizes)
+
+        assert list(pyramid) == [(1920, 1080), (1024, 683), (600, 400)]
+        for size in sizes:
+            assert pyramid[size].size == size
+            difference = ImageStat.Stat(ImageChops.difference(pyramid[size], direct[size])).mean
+            assert max(difference) < 3
+
+    def test_featured_size_is_first_pyramid_level(self):
+        encoded = self.processor.encode_article_images(
+            sample_image((800, 600)), "8", "low", sizes=[(160, 90)], featured_size=(320, 180)
+        )
+
+        assert encoded["featured_image"].size == (320, 180)
+        assert encoded["encoding"]["resize_seconds"] >= 0
+        with Image.open(encoded["formats"]["jpeg"]) as featured:
+            assert featured.size == (320, 180)
+
+    def test_encoder_settings_are_read_from_settings(self):
+        Setting.objects.create(key="IMAGE_ENCODING_WORKERS", value="3")
+        Setting.objects.create(key="IMAGE_ENCODING_DEADLINE", value="12.5")
+
+        encoder = ImageProcessor(self.output_dir).encoder
+
+        assert (encoder.workers, encoder.deadline) == (3, 12.5)
+
+
+class TestVideoProcessorEncoding(TestCase):
+    """VideoProcessor tek geçişli çoklu profil encoding ve HLS paketleme testleri."""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, True)
+        self.processor = VideoProcessor(self.output_dir)
+
+    @patch("news.media_processor.subprocess.run")
+    def test_all_profiles_are_encoded_in_one_ffmpeg_run(self, mock_run):
+        mock_run.return_value = Mock(returncode=0, stderr="")
+
+        encoded = self.processor._encode_video("/tmp/kaynak.mp4", "5", ["1080p", "720p", "480p"])
+
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args.args[0]
+        assert cmd.count("-i") == 1
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert graph.startswith("[0:v]split=3[v0in][v1in][v2in];")
+        assert "[v1in]scale=1280:720,fps=30[v1]" in graph
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-preset"] == ["faster", "faster", "veryfast"]
+        assert list(encoded) == ["1080p", "720p", "480p"]
+        assert cmd[-1].endswith(f"|[f=mp4:movflags=+faststart]{encoded['480p']}")
+
+    @patch("news.media_processor.subprocess.run")
+    def test_thread_limit_is_passed_to_ffmpeg(self, mock_run):
+        mock_run.return_value = Mock(returncode=0, stderr="")
+        processor = VideoProcessor(self.output_dir, threads=2)
+
+        processor._encode_video("/tmp/kaynak.mp4", "5", ["720p", "480p"])
+
+        cmd = mock_run.call_args.args[0]
+        assert cmd[cmd.index("-filter_complex_threads") + 1] == "2"
+        assert cmd.count("-threads") == 2
+
+    @patch("news.media_processor.subprocess.run")
+    def test_each_rendition_is_packaged_as_aligned_hls_segments(self, mock_run):
+        mock_run.return_value = Mock(returncode=0, stderr="")
+
+        encoded = self.processor._encode_video("/tmp/kaynak.mp4", "6", ["1080p", "480p"])
+
+        cmd = mock_run.call_args.args[0]
+        outputs = [cmd[i + 2] for i, arg in enumerate(cmd) if arg == "-f"]
+        hls_dir = os.path.join(self.output_dir, "articles/6/video/480p")
+        assert outputs[1].startswith("[f=hls:hls_time=4:hls_playlist_type=vod:hls_segment_type=fmp4:")
+        assert f"hls_segment_filename={hls_dir}/segment_%05d.m4s]{hls_dir}/playlist.m3u8|" in outputs[1]
+        assert Path(hls_dir).is_dir()
+        # Anahtar kareler 4 saniyede bir: 30 fps -> 120, 24 fps -> 96 kare
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-g"] == ["120", "96"]
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-maxrate"] == ["5128k", "1064k"]
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-flags"] == ["+global_header"] * 2
+        assert set(encoded) == {"1080p", "480p"}
+
+    def test_master_playlist_lists_packaged_renditions_by_bandwidth(self):
+        video_dir = Path(self.output_dir, "articles/7/video")
+        encoded = {profile: str(video_dir / f"summary-{profile}.mp4") for profile in ("480p", "1080p", "720p")}
+        for profile in ("480p", "1080p"):
+            (video_dir / profile).mkdir(parents=True)
+            (video_dir / profile / "playlist.m3u8").write_text("#EXTM3U\n")
+
+        manifest = Path(self.processor._create_hls_manifest(encoded, "7")).read_text()
+
+        assert manifest.splitlines()[:3] == ["#EXTM3U", "#EXT-X-VERSION:7", "#EXT-X-INDEPENDENT-SEGMENTS"]
+        assert "BANDWIDTH=5256000,RESOLUTION=1920x1080,FRAME-RATE=30.000\n1080p/playlist.m3u8" in manifest
+        assert manifest.index("1080p/") < manifest.index("480p/")
+        assert "720p" not in manifest
+
+    @patch("news.media_processor.subprocess.run")
+    def test_failed_single_pass_falls_back_to_per_profile_runs(self, mock_run):
+        mock_run.side_effect = [
+            Mock(returncode=1, stderr="hata"),
+            Mock(returncode=0, stderr=""),
+            Mock(returncode=1, stderr="bozuk profil"),
+        ]
+
+        encoded = self.processor._encode_video("/tmp/kaynak.mp4", "5", ["720p", "bilinmeyen", "360p"])
+
+        assert mock_run.call_count == 3
+        assert list(encoded) == ["720p"]
+        assert "-vf" in mock_run.call_args_list[1].args[0]
+
+    @patch("news.media_processor.time.monotonic")
+    @patch("news.media_processor.subprocess.run")
+    def test_fallback_runs_share_the_encode_budget(self, mock_run, mock_monotonic):
+        # Tek geçiş bütçenin tamamını tüketti; yedek profil denemeleri başlatılmaz
+        mock_monotonic.side_effect = [0.0, 10.0, VIDEO_ENCODE_TIMEOUT, VIDEO_ENCODE_TIMEOUT]
+        mock_run.return_value = Mock(returncode=1, stderr="hata")
+
+        encoded = self.processor._encode_video("/tmp/kaynak.mp4", "5", ["720p", "480p"])
+
+        mock_run.assert_called_once()
+        assert mock_run.call_args.kwargs["timeout"] == VIDEO_ENCODE_TIMEOUT - 10
+        assert encoded == {}
+
+
+@pytest.mark.skipif(
+    shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None, reason="ffmpeg/ffprobe kurulu değil"
+)
+class TestVideoProcessorIntegration(TestCase):
+    """Gerçek ffmpeg ile kısa bir lavfi klibinden HLS + MP4 üretimi."""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, True)
+        self.source = os.path.join(self.output_dir, "kaynak.mp4")
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-y",
+                "-f",
+                "lavfi",
+                "-i",
+                "testsrc=duration=6:size=320x240:rate=30",
+                "-f",
+                "lavfi",
+                "-i",
+                "sine=duration=6",
+                "-shortest",
+                self.source,
+            ],
+            check=True,
+            capture_output=True,
+        )
+
+    @staticmethod
+    def probe_streams(path: str) -> list[str]:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "stream=codec_name", "-of", "csv=p=0", path],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return sorted(result.stdout.split())
+
+    def test_single_pass_outputs_are_playable(self):
+        encoded = VideoProcessor(self.output_dir)._encode_video(self.source, "9", ["480p", "360p"])
+
+        assert set(encoded) == {"480p", "360p"}
+        for profile, output_path in encoded.items():
+            assert self.probe_streams(output_path) == ["aac", "h264"]
+
+            hls_dir = Path(output_path).parent / profile
+            playlist = (hls_dir / "playlist.m3u8").read_text()
+            assert '#EXT-X-MAP:URI="init.mp4"' in playlist
+            assert "#EXT-X-ENDLIST" in playlist
+            segments = sorted(hls_dir.glob("segment_*.m4s"))
+            assert len(segments) >= 2
+            assert self.probe_streams(str(hls_dir / "playlist.m3u8")) == ["aac", "h264"]
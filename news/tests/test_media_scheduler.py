@@ -0,0 +1,178 @@
+"""
+Medya işi zamanlayıcısı testleri.
+CPU / bellek kabulü, kira süresi, bekleme ve işleme süreleri ve video görevi.
+"""
+
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+import pytest
+from celery.exceptions import Retry
+
+from core.models import Setting
+from news import media_scheduler
+from news.media_processor import VideoProcessor
+from news.media_scheduler import MediaJobTooLargeError, estimate_video_memory_mb, get_usage, release, try_acquire
+from news.models import Article
+from news.models_advanced import MediaProcessingLog
+from news.tasks import process_video_content
+
+
+@pytest.mark.django_db
+class TestMediaScheduler(TestCase):
+    """Kaynak kabulü testleri."""
+
+    def setUp(self):
+        cache.clear()
+        Setting.objects.create(key="MEDIA_CPU_SLOTS", value="4")
+        Setting.objects.create(key="MEDIA_MEMORY_MB", value="1000")
+
+    def test_jobs_are_admitted_until_cpu_slots_are_full(self):
+        assert try_acquire("a", cpu=2, memory_mb=100)
+        assert try_acquire("b", cpu=2, memory_mb=100)
+        assert not try_acquire("c", cpu=1, memory_mb=100)
+
+        release("a")
+
+        assert try_acquire("c", cpu=1, memory_mb=100)
+        assert get_usage()["cpu_used"] == 3
+
+    def test_memory_budget_limits_admission(self):
+        assert try_acquire("a", cpu=1, memory_mb=700)
+
+        assert not try_acquire("b", cpu=1, memory_mb=400)
+        assert try_acquire("c", cpu=1, memory_mb=300)
+
+    def test_job_larger_than_capacity_is_rejected_up_front(self):
+        with pytest.raises(MediaJobTooLargeError):
+            try_acquire("büyük", cpu=8, memory_mb=100)
+        with pytest.raises(MediaJobTooLargeError):
+            try_acquire("büyük", cpu=1, memory_mb=5000)
+
+        assert get_usage()["jobs"] == {}
+
+    def test_expired_lease_frees_resources(self):
+        assert try_acquire("çöken", cpu=4, memory_mb=100)
+        leases = cache.get(media_scheduler.LEASES_KEY)
+        leases["çöken"]["expires_at"] = time.time() - 1
+        cache.set(media_scheduler.LEASES_KEY, leases)
+
+        assert try_acquire("yeni", cpu=4, memory_mb=100)
+
+    def test_lock_taken_over_by_another_worker_is_not_released(self):
+        lock = media_scheduler._LedgerLock()
+        with lock:
+            # Kilit süresi doldu ve başka worker aldı
+            cache.set(media_scheduler.LOCK_KEY, "başka-worker")
+
+        assert cache.get(media_scheduler.LOCK_KEY) == "başka-worker"
+
+    def test_release_reports_queue_wait_and_run_time(self):
+        assert try_acquire("a", cpu=1, memory_mb=100, enqueued_at=time.time() - 30)
+
+        timings = release("a")
+
+        assert 29 < timings["queue_wait_seconds"] < 31
+        assert 0 <= timings["run_seconds"] < 1
+        assert release("a") is None
+
+    def test_video_memory_estimate_grows_with_resolution(self):
+        profiles = VideoProcessor.ENCODING_PROFILES
+
+        full_hd = estimate_video_memory_mb({"1080p": profiles["1080p"]})
+        mobile = estimate_video_memory_mb({"480p": profiles["480p"]})
+
+        assert media_scheduler.VIDEO_BASE_MEMORY_MB < mobile < full_hd
+        assert estimate_video_memory_mb(profiles) > full_hd
+
+
+@pytest.mark.django_db
+class TestProcessVideoContent(TestCase):
+    """Zamanlayıcıya bağlı video görevi testleri."""
+
+    def setUp(self):
+        cache.clear()
+        Setting.objects.create(key="MEDIA_CPU_SLOTS", value="4")
+        Setting.objects.create(key="MEDIA_MEMORY_MB", value="4000")
+        self.article = Article.objects.create(title="Video Haber", slug="video-haber", content="x")
+
+    def test_time_limits_cover_encode_budget_and_lease_outlives_task(self):
+        budget = media_scheduler.VIDEO_ENCODE_TIMEOUT + media_scheduler.VIDEO_DOWNLOAD_MARGIN
+
+        assert process_video_content.soft_time_limit >= budget
+        assert process_video_content.time_limit > process_video_content.soft_time_limit
+        assert process_video_content.time_limit < media_scheduler.LEASE_TIMEOUT
+
+    def test_job_waits_when_resources_are_busy(self):
+        try_acquire("diğer", cpu=4, memory_mb=100)
+        enqueued_at = time.time() - 5
+
+        with (
+            patch.object(process_video_content, "retry", side_effect=Retry()) as mock_retry,
+            patch("news.media_processor.VideoProcessor.download_and_encode") as mock_encode,
+            pytest.raises(Retry),
+        ):
+            process_video_content.run(self.article.id, "https://example.com/v.mp4", enqueued_at=enqueued_at)
+
+        mock_encode.assert_not_called()
+        assert mock_retry.call_args.kwargs["countdown"] == 15
+        assert mock_retry.call_args.kwargs["kwargs"]["enqueued_at"] == enqueued_at
+        assert MediaProcessingLog.objects.count() == 0
+
+    def test_job_fails_after_max_queue_wait(self):
+        Setting.objects.create(key="MEDIA_MAX_QUEUE_WAIT", value="60")
+        try_acquire("diğer", cpu=4, memory_mb=100)
+
+        with patch.object(process_video_content, "retry") as mock_retry:
+            result = process_video_content.run(
+                self.article.id, "https://example.com/v.mp4", enqueued_at=time.time() - 61
+            )
+
+        assert result.startswith("Hata: Kaynak bekleme süresi aşıldı")
+        mock_retry.assert_not_called()
+        log = MediaProcessingLog.objects.get(article=self.article)
+        assert log.status == "failed"
+        assert log.queue_wait_time > 60
+        assert log.processing_time == 0
+
+    def test_job_that_never_fits_fails_without_retrying(self):
+        Setting.objects.create(key="MEDIA_VIDEO_JOB_CPU", value="2")
+        Setting.objects.filter(key="MEDIA_MEMORY_MB").update(value="100")
+
+        with patch.object(process_video_content, "retry") as mock_retry:
+            result = process_video_content.run(self.article.id, "https://example.com/v.mp4")
+
+        assert result.startswith("Hata: Medya işi kapasiteyi aşıyor")
+        mock_retry.assert_not_called()
+
+    def test_admitted_job_runs_with_granted_threads_and_logs_timings(self):
+        processors = []
+
+        def download_and_encode(processor, *args, **kwargs):
+            processors.append(processor)
+            assert get_usage()["cpu_used"] == 2
+            return {"download": {"bytes": 1000}, "encoded_videos": {}}
+
+        with patch.object(VideoProcessor, "download_and_encode", autospec=True, side_effect=download_and_encode):
+            result = process_video_content.run(
+                self.article.id, "https://example.com/v.mp4", enqueued_at=time.time() - 12
+            )
+
+        assert result.startswith("Video işleme tamamlandı")
+        assert processors[0].threads == 2
+        assert get_usage()["jobs"] == {}
+        log = MediaProcessingLog.objects.get(article=self.article)
+        assert (log.media_type, log.status, log.original_size) == ("video", "completed", 1000)
+        assert 11 < log.queue_wait_time < 13
+        assert log.processing_time < 1
+
+    def test_failed_job_releases_resources(self):
+        with patch.object(VideoProcessor, "download_and_encode", side_effect=RuntimeError("ffmpeg yok")):
+            result = process_video_content.run(self.article.id, "https://example.com/v.mp4")
+
+        assert result == "Hata: ffmpeg yok"
+        assert get_usage()["cpu_used"] == 0
+        assert MediaProcessingLog.objects.get(article=self.article).status == "failed"
@@ -0,0 +1,325 @@
+"""
+İçerik adresli medya deposu testleri.
+SHA-256 / pHash tekilleştirme, varyantlar, referans sayımı, temizlik ve istek üzerine
+üretilen varyantlar.
+"""
+
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+
+from news import media_store, media_variants
+from news.image_encoding import ImageEncoder
+from news.media_processor import ImageProcessor
+from news.models import Article
+from news.models_extended import MediaAsset
+from news.tasks import cleanup_unused_media_assets, download_article_image
+
+
+def photo(seed=1, size=(640, 420)):
+    image = Image.merge(
+        "RGB",
+        [
+            Image.linear_gradient("L").resize(size).rotate(seed * 50),
+            Image.radial_gradient("L").resize(size),
+            Image.linear_gradient("L").transpose(Image.Transpose.ROTATE_90).resize(size),
+        ],
+    )
+    draw = ImageDraw.Draw(image)
+    for i in range(5):
+        x, y = (seed * 97 + i * 113) % (size[0] - 160), (seed * 61 + i * 71) % (size[1] - 160)
+        draw.ellipse([x, y, x + 160, y + 160], fill=((i * 40) % 255, (seed * 30) % 255, 200))
+    return image
+
+
+def jpeg_bytes(image, quality=90):
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def content_box(image):
+    """Beyaz zemin dışındaki içeriğin sınırları (JPEG gürültüsü hariç)."""
+    difference = ImageChops.difference(image, Image.new("RGB", image.size, (255, 255, 255))).convert("L")
+    return difference.point(lambda value: 255 if value > 24 else 0).getbbox()
+
+
+class MediaStoreTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def article(self, slug):
+        return Article.objects.create(title=f"Haber {slug}", slug=slug, content="x")
+
+
+@pytest.mark.django_db
+class TestMediaStoreRegister(MediaStoreTestCase):
+    """Kayıt ve tekilleştirme testleri."""
+
+    def test_same_bytes_return_same_asset_without_decoding(self):
+        data = jpeg_bytes(photo())
+        asset, created = media_store.register(data, source_url="https://ajans.example/1.jpg")
+
+        with patch("news.media_store.Image.open") as image_open:
+            again, created_again = media_store.register(data)
+
+        assert (created, created_again) == (True, False)
+        assert again.pk == asset.pk
+        image_open.assert_not_called()
+        assert (asset.width, asset.height, asset.byte_size) == (640, 420, len(data))
+
+    def test_near_duplicate_is_aliased_to_canonical(self):
+        original, _ = media_store.register(jpeg_bytes(photo(), quality=90))
+        cropped = photo().crop((5, 5, 635, 415))
+
+        asset, created = media_store.register(jpeg_bytes(cropped, quality=60))
+
+        assert created is False
+        assert asset.pk == original.pk
+        assert original.aliases.count() == 1
+        assert media_store.register(jpeg_bytes(photo(2)))[1] is True
+
+    def test_smaller_copy_does_not_replace_larger_image(self):
+        small, _ = media_store.register(jpeg_bytes(photo().resize((320, 210))))
+
+        large, created = media_store.register(jpeg_bytes(photo()))
+
+        assert created is True
+        assert large.pk != small.pk
+
+    def test_phash_is_stable_under_reencoding(self):
+        image = photo()
+        reencoded = Image.open(BytesIO(jpeg_bytes(image, quality=40)))
+
+        assert media_store.hamming_distance(media_store.compute_phash(image), media_store.compute_phash(reencoded)) <= 2
+        assert media_store.hamming_distance(media_store.compute_phash(image), media_store.compute_phash(photo(3))) > 10
+
+
+@pytest.mark.django_db
+class TestMediaStoreReferences(MediaStoreTestCase):
+    """Referans sayımı ve temizlik testleri."""
+
+    def test_attach_release_and_article_delete_update_ref_count(self):
+        asset, _ = media_store.register(jpeg_bytes(photo()))
+        first, second = self.article("bir"), self.article("iki")
+
+        assert media_store.attach(asset, first) is True
+        assert media_store.attach(asset, first) is False
+        media_store.attach(asset, second)
+        asset.refresh_from_db()
+        assert asset.ref_count == 2
+
+        first.delete()
+        media_store.release(second)
+        asset.refresh_from_db()
+        assert asset.ref_count == 0
+
+    def test_exclusive_attach_releases_previous_image(self):
+        old, _ = media_store.register(jpeg_bytes(photo(1)))
+        new, _ = media_store.register(jpeg_bytes(photo(2)))
+        article = self.article("degisen")
+
+        media_store.attach(old, article, exclusive=True)
+        media_store.attach(new, article, exclusive=True)
+
+        old.refresh_from_db()
+        new.refresh_from_db()
+        assert (old.ref_count, new.ref_count) == (0, 1)
+
+    def test_cleanup_deletes_unreferenced_assets_after_grace(self):
+        unused, _ = media_store.register(jpeg_bytes(photo(1)))
+        used, _ = media_store.register(jpeg_bytes(photo(2)))
+        path = media_store.save_variant(unused, "featured.webp", b"webp")
+        media_store.attach(used, self.article("kullanan"))
+        MediaAsset.objects.update(last_used_at=timezone.now() - timedelta(days=2))
+
+        result = cleanup_unused_media_assets()
+
+        assert result == "1 görsel, 1 dosya silindi"
+        assert list(MediaAsset.objects.values_list("pk", flat=True)) == [used.pk]
+        assert not default_storage.exists(path)
+
+
+@pytest.mark.django_db
+class TestMediaStoreIntegration(MediaStoreTestCase):
+    """download_article_image ve ImageProcessor entegrasyon testleri."""
+
+    @patch("news.tasks.requests.get")
+    def test_download_article_image_shares_variant_between_articles(self, mock_get):
+        mock_get.return_value = Mock(headers={}, iter_content=Mock(return_value=[jpeg_bytes(photo())]))
+        first, second = self.article("ajans-1"), self.article("ajans-2")
+
+        with patch("news.tasks._encode_featured_webp", return_value=b"webp") as encode:
+            download_article_image(first, "https://ajans.example/foto.jpg")
+            download_article_image(second, "https://baska.example/foto.jpg")
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert encode.call_count == 1
+        assert first.featured_image.name == second.featured_image.name
+        assert first.featured_image.name.startswith("v/")
+        assert MediaAsset.objects.get().ref_count == 2
+
+    def test_image_processor_reuses_store_variants(self):
+        processor = ImageProcessor(self.media_root, encoder=ImageEncoder(workers=1))
+        asset, _ = media_store.register(jpeg_bytes(photo()))
+
+        first = processor.encode_article_images(photo(), "1", "medium", sizes=[(160, 90)], asset=asset)
+        second = processor.encode_article_images(photo(), "2", "medium", sizes=[(160, 90)], asset=asset)
+
+        # 3 ana görsel formatı + 160x90 WebP / AVIF + padding'siz ana kopya
+        assert (first["encoding"]["reused"], second["encoding"]["reused"]) == (0, 6)
+        assert second["formats"] == first["formats"]
+        assert Path(first["formats"]["avif"]).parent == Path(self.media_root, "v", asset.sha256)
+        asset.refresh_from_db()
+        assert asset.variants["featured-medium.avif"] == f"v/{asset.sha256}/featured-medium.avif"
+
+
+@pytest.mark.django_db
+class TestMediaVariants(MediaStoreTestCase):
+    """İstek üzerine üretilen görsel varyantı testleri."""
+
+    def setUp(self):
+        super().setUp()
+        self.asset, _ = media_store.register(jpeg_bytes(photo()))
+        media_variants.ensure_master(self.asset, photo())
+        cache.clear()
+
+    def test_variant_is_rendered_on_first_request_then_reused(self):
+        url = media_variants.variant_url(self.asset, 600, 400, "webp")
+
+        first = self.client.get(url)
+        with patch("news.media_variants.render_variant") as render:
+            second = self.client.get(url)
+
+        assert url == f"/media/v/{self.asset.sha256}/600x400.webp"
+        assert (first.status_code, second.status_code) == (200, 200)
+        assert first["Content-Type"] == "image/webp"
+        assert "immutable" in first["Cache-Control"]
+        render.assert_not_called()
+        with Image.open(Path(self.media_root, "v", self.asset.sha256, "600x400.webp")) as variant:
+            assert variant.size == (600, 400)
+
+    def test_unknown_asset_and_unsupported_variants_return_404(self):
+        sha = self.asset.sha256
+
+        assert self.client.get(f"/media/v/{'0' * 64}/600x400.webp").status_code == 404
+        assert self.client.get(f"/media/v/{sha}/601x400.webp").status_code == 404
+        assert self.client.get(f"/media/v/{sha}/600x400.gif").status_code == 404
+        assert not Path(self.media_root, "v", sha, "601x400.webp").exists()
+
+    def test_alias_redirects_to_canonical_variant(self):
+        alias = MediaAsset.objects.create(sha256="a" * 64, canonical=self.asset)
+
+        response = self.client.get(f"/media/v/{alias.sha256}/600x400.jpg")
+
+        assert response.status_code == 301
+        assert response["Location"] == f"/media/v/{self.asset.sha256}/600x400.jpg"
+
+    def test_concurrent_request_waits_for_render_in_progress(self):
+        lock_key = f"media_variant:{self.asset.sha256}:600x400.webp"
+        cache.add(lock_key, 1)
+
+        def other_request_finishes(_):
+            media_store.save_variant(self.asset, "600x400.webp", b"webp")
+            cache.delete(lock_key)
+
+        with (
+            patch("news.media_variants.time.sleep", side_effect=other_request_finishes),
+            patch("news.media_variants.render_variant") as render,
+        ):
+            path = media_variants.get_or_render(self.asset, 600, 400, "webp")
+
+        render.assert_not_called()
+        assert path == f"v/{self.asset.sha256}/600x400.webp"
+
+    def test_render_timeout_returns_503(self):
+        cache.add(f"media_variant:{self.asset.sha256}:600x400.webp", 1)
+
+        with patch("news.media_variants.RENDER_LOCK_TIMEOUT", 0), patch("news.media_variants.time.sleep"):
+            response = self.client.get(media_variants.variant_url(self.asset, 600, 400, "webp"))
+
+        assert response.status_code == 503
+        assert response["Retry-After"] == "1"
+
+    def test_create_responsive_images_defers_encoding_to_first_request(self):
+        path = Path(self.media_root, "kaynak.jpg")
+        path.write_bytes(jpeg_bytes(photo(4)))
+        processor = ImageProcessor(self.media_root, encoder=ImageEncoder(workers=1))
+
+        with patch.object(processor.encoder, "encode") as encode:
+            images = processor.create_responsive_images(str(path), "9", article=self.article("duyarli"))
+
+        encode.assert_not_called()
+        asset = MediaAsset.objects.get(sha256=media_store.sha256_digest(path.read_bytes()))
+        assert images["600x400"]["avif"] == f"/media/v/{asset.sha256}/600x400.avif"
+        assert sorted(p.name for p in Path(self.media_root, "v", asset.sha256).iterdir()) == ["featured.webp"]
+        # Haber görsele bağlandı; temizlik görevi dosyaları silmez
+        assert asset.ref_count == 1
+        media_store.collect_unreferenced(grace_hours=0)
+        assert MediaAsset.objects.filter(pk=asset.pk).exists()
+
+    def test_store_is_used_only_with_owner_article_under_media_root(self):
+        path = Path(self.media_root, "kaynak.jpg")
+        path.write_bytes(jpeg_bytes(photo(5)))
+        other_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other_root, True)
+
+        ImageProcessor(self.media_root, encoder=ImageEncoder(workers=1)).create_responsive_images(str(path), "9")
+        ImageProcessor(other_root, encoder=ImageEncoder(workers=1)).create_responsive_images(
+            str(path), "9", article=self.article("baska-kok")
+        )
+
+        assert not MediaAsset.objects.filter(sha256=media_store.sha256_digest(path.read_bytes())).exists()
+        assert Path(other_root, "articles", "9", "featured").is_dir()
+
+    def test_variants_of_processed_images_are_padded_once(self):
+        square = photo(6, size=(800, 800))
+        asset, _ = media_store.register(jpeg_bytes(square))
+        processor = ImageProcessor(self.media_root, encoder=ImageEncoder(workers=1))
+        processor.encode_article_images(square, "4", "high", sizes=[], asset=asset, featured_size=(1920, 1080))
+
+        with default_storage.open(media_variants.render_variant(asset, 600, 400, "jpg"), "rb") as f:
+            variant = Image.open(f).convert("RGB")
+
+        # Kare görsel 400x400 olarak ortalanır; yalnızca yanlarda bant kalır
+        left, top, right, bottom = content_box(variant)
+        assert (top, bottom) == (0, 400)
+        assert 395 <= right - left <= 405
+
+    def test_legacy_padded_master_is_trimmed_before_fitting(self):
+        legacy, _ = media_store.register(jpeg_bytes(photo(7, size=(800, 800))))
+        padded = Image.new("RGB", (1920, 1080), (255, 255, 255))
+        padded.paste(photo(7, size=(1080, 1080)), (420, 0))
+        media_store.save_variant(legacy, "featured-high.jpg", jpeg_bytes(padded))
+
+        with default_storage.open(media_variants.render_variant(legacy, 600, 400, "jpg"), "rb") as f:
+            variant = Image.open(f).convert("RGB")
+
+        left, top, right, bottom = content_box(variant)
+        assert bottom - top == 400
+        assert 395 <= right - left <= 405
+
+    def test_image_processor_returns_lazy_urls_for_variant_sizes(self):
+        processor = ImageProcessor(self.media_root, encoder=ImageEncoder(workers=1))
+
+        encoded = processor.encode_article_images(photo(), "3", "low", sizes=[(600, 400), (160, 90)], asset=self.asset)
+
+        assert encoded["responsive"]["600x400"]["webp"] == f"/media/v/{self.asset.sha256}/600x400.webp"
+        assert Path(encoded["responsive"]["160x90"]["webp"]).exists()
+        assert not Path(self.media_root, "v", self.asset.sha256, "600x400.webp").exists()
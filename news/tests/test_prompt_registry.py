@@ -0,0 +1,114 @@
+"""
+Derlenmiş prompt kayıt defteri testleri.
+Yerleşik şablonlar, veritabanı şablonları, geçersiz kılma, A/B dağıtımı ve sürüm kaydı.
+"""
+
+from types import SimpleNamespace
+
+from django.test import TestCase
+
+import pytest
+
+from news.ai_instrumentation import flush_ai_call_logs, track_ai_call
+from news.content_utils import PromptGenerator
+from news.models_advanced import PromptTemplate
+from news.models_extended import AICallLog
+from news.prompt_registry import CompiledPrompt, prompt_registry
+from news.prompt_templates import BUILTIN_VERSION
+from news.tasks import build_article_prompt
+from news.tasks_v2 import create_dynamic_prompt
+
+ARTICLE_DATA = {
+    "title": "Yeni işlemci",
+    "category": "Teknoloji",
+    "summary": "Özet",
+    "link": "https://example.com/x",
+    "importance_level": 3,
+}
+STYLE = {"tone": "formal", "word_count": (800, 1000), "complexity": "high", "voice": "professional"}
+AUTHOR = SimpleNamespace(name="Ayşe", expertise="Teknoloji")
+
+
+class TestCompiledPrompt(TestCase):
+    """Şablon derleme testleri."""
+
+    def test_fields_are_extracted_and_braces_in_values_are_kept(self):
+        prompt = CompiledPrompt("news", "default", 2, "  Başlık: {title}\nKategori: {category}  ")
+
+        assert prompt.fields == {"title", "category"}
+        rendered = prompt.render(title="A {x}", category="Spor")
+        assert rendered == "Başlık: A {x}\nKategori: Spor"
+        assert rendered.version == "news:default:v2"
+
+    def test_unsupported_fields_are_rejected(self):
+        for text in ("{0}", "{article.title}", "{data[title]}"):
+            with pytest.raises(ValueError):
+                CompiledPrompt("news", "default", 1, text)
+
+
+@pytest.mark.django_db
+class TestPromptRegistry(TestCase):
+    """Kayıt defteri testleri."""
+
+    def test_builtin_prompts_carry_version(self):
+        article = SimpleNamespace(id=7, title="Başlık", category="Spor", content="İçerik " * 300)
+
+        prompt = build_article_prompt(article, AUTHOR)
+        assert prompt.startswith("Sen Ayşe isimli deneyimli bir Teknoloji yazarısın.")
+        assert f"Kaynak İçerik: {article.content[:800]}\n" in prompt
+        assert prompt.version == f"rss_article:default:v{BUILTIN_VERSION}"
+
+        for article_type, kind in (("analysis", "analysis"), ("breaking", "news")):
+            classification = SimpleNamespace(article_type=article_type, tone="neutral")
+            prompt = create_dynamic_prompt(article, classification, {})
+            assert prompt.version == f"{kind}:default:v{BUILTIN_VERSION}"
+            assert "Başlık: Başlık\nKategori: Spor" in prompt
+
+        prompt = PromptGenerator.generate_content_prompt(ARTICLE_DATA, AUTHOR, STYLE)
+        assert "2. Gelişme (750-850 kelime)" in prompt
+        assert prompt.version == f"article:default:v{BUILTIN_VERSION}"
+
+    def test_database_template_is_compiled_once_and_invalidated_on_save(self):
+        template = PromptTemplate.objects.create(
+            name="Teknoloji", category="Teknoloji", template_content="{author_name}: {title} ({word_count})"
+        )
+
+        assert PromptGenerator.generate_content_prompt(ARTICLE_DATA, AUTHOR, STYLE) == "Ayşe: Yeni işlemci (800)"
+        with self.assertNumQueries(0):
+            prompt = PromptGenerator.generate_content_prompt(ARTICLE_DATA, AUTHOR, STYLE)
+        assert prompt.version == "article:Teknoloji:v1"
+
+        template.template_content = "{title} - {tone}"
+        template.version = 2
+        template.save()
+
+        prompt = PromptGenerator.generate_content_prompt(ARTICLE_DATA, AUTHOR, STYLE)
+        assert (prompt, prompt.version) == ("Yeni işlemci - formal", "article:Teknoloji:v2")
+
+    def test_unrenderable_template_falls_back_to_builtin(self):
+        PromptTemplate.objects.create(name="Bozuk", category="Teknoloji", template_content="{title} {bilinmeyen}")
+
+        prompt = PromptGenerator.generate_content_prompt(ARTICLE_DATA, AUTHOR, STYLE)
+        assert prompt.version == f"article:default:v{BUILTIN_VERSION}"
+
+    def test_active_versions_are_split_by_bucket(self):
+        PromptTemplate.objects.create(name="A", category="Spor", template_content="A {title}", version=1)
+        PromptTemplate.objects.create(name="B", category="Spor", template_content="B {title}", version=2)
+        PromptTemplate.objects.create(name="C", category="Spor", template_content="C", version=3, is_active=False)
+
+        versions = {prompt_registry.get("article", "Spor", bucket=bucket).version for bucket in range(10)}
+        assert versions == {1, 2}
+        assert (
+            prompt_registry.get("article", "Spor", bucket=5).version
+            == prompt_registry.get("article", "Spor", bucket=5).version
+        )
+        assert prompt_registry.get("article", "Spor").version == 2
+
+    def test_version_is_recorded_on_ai_calls(self):
+        prompt = prompt_registry.render("news", title="T", category="Spor")
+
+        with track_ai_call("gorev", "gemini-2.5-flash", "text", prompt_version=prompt.version):
+            pass
+        flush_ai_call_logs()
+
+        assert AICallLog.objects.get().prompt_version == f"news:default:v{BUILTIN_VERSION}"
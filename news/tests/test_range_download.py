@@ -0,0 +1,156 @@
+"""
+Devam ettirilebilir, aralıklı indirme testleri.
+RangeDownloader FakeMediaServer'a karşı: paralel aralıklar, kesilen bağlantıdan devam,
+önceki çalıştırmadan devam, değişen dosyada baştan indirme ve VideoProcessor indirmesi.
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import TestCase
+
+import pytest
+import requests
+
+from core.models import Setting
+from news import range_download
+from news.fake_media import FakeMediaServer
+from news.media_processor import VideoProcessor
+from news.range_download import RangeDownloader
+
+SIZE = 3 * 1024 * 1024 + 123
+
+
+def payload(size=SIZE, seed=1):
+    return random.Random(seed).randbytes(size)
+
+
+class RangeDownloadTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeMediaServer().start()
+        self.addCleanup(self.server.stop)
+        self.data = payload()
+        self.url = self.server.add("/video.mp4", self.data, content_type="video/mp4")
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.path = os.path.join(self.tmp, "original.mp4")
+        # Küçük test dosyası da paralel aralıklara bölünsün
+        patcher = patch.object(range_download, "MIN_PART_SIZE", 512 * 1024)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def downloader(self, **kwargs):
+        kwargs.setdefault("chunk_size", 64 * 1024)
+        return RangeDownloader(**kwargs)
+
+
+class TestFakeMediaServer(RangeDownloadTestCase):
+    """FakeMediaServer Range / ETag davranışı testleri."""
+
+    def test_head_advertises_length_etag_and_ranges(self):
+        response = requests.head(self.url, timeout=5)
+
+        assert response.headers["Content-Length"] == str(SIZE)
+        assert response.headers["Accept-Ranges"] == "bytes"
+        assert response.headers["ETag"].startswith('"')
+
+    def test_range_request_returns_partial_content(self):
+        response = requests.get(self.url, headers={"Range": "bytes=100-199"}, timeout=5)
+
+        assert response.status_code == 206
+        assert response.headers["Content-Range"] == f"bytes 100-199/{SIZE}"
+        assert response.content == self.data[100:200]
+
+    def test_stale_if_range_returns_whole_file(self):
+        response = requests.get(self.url, headers={"Range": "bytes=100-199", "If-Range": '"eski"'}, timeout=5)
+
+        assert response.status_code == 200
+        assert len(response.content) == SIZE
+
+
+class TestRangeDownloader(RangeDownloadTestCase):
+    """RangeDownloader testleri."""
+
+    def test_parallel_parts_reassemble_identical_file(self):
+        stats = self.downloader(parts=4).download(self.url, self.path)
+
+        assert Path(self.path).read_bytes() == self.data
+        assert stats["parts"] == 4
+        assert stats["downloaded_bytes"] == SIZE
+        assert self.server.stats.as_dict()["requests"]["GET 206"] == 4
+        assert not Path(f"{self.path}.part").exists()
+        assert not Path(f"{self.path}.part.json").exists()
+
+    def test_dropped_connection_resumes_instead_of_restarting(self):
+        self.server.config.drop_after_bytes, self.server.config.drop_responses = 300 * 1024, 1
+
+        stats = self.downloader(parts=1).download(self.url, self.path)
+
+        assert Path(self.path).read_bytes() == self.data
+        assert stats["retries"] == 1
+        assert stats["wasted_bytes"] == 0
+        # Yazılan baytlar tekrar indirilmez; kalan kısım tek Range isteğiyle gelir
+        assert stats["downloaded_bytes"] == SIZE
+        assert self.server.stats.as_dict()["requests"] == {"HEAD 200": 1, "GET 200": 1, "GET 206": 1}
+        assert self.server.stats.as_dict()["bytes_sent"] < SIZE + 300 * 1024
+
+    def test_next_run_continues_from_saved_state(self):
+        self.server.config.drop_after_bytes, self.server.config.drop_responses = 1024 * 1024, 1
+        with pytest.raises(requests.RequestException):
+            self.downloader(parts=1, max_retries=1).download(self.url, self.path)
+        assert json.loads(Path(f"{self.path}.part.json").read_text())["segments"][0][2] == 1024 * 1024
+
+        stats = self.downloader(parts=1).download(self.url, self.path)
+
+        assert Path(self.path).read_bytes() == self.data
+        assert stats["resumed_bytes"] == 1024 * 1024
+        assert stats["downloaded_bytes"] == SIZE - 1024 * 1024
+
+    def test_changed_file_restarts_download(self):
+        self.server.config.drop_after_bytes, self.server.config.drop_responses = 1024 * 1024, 1
+        with pytest.raises(requests.RequestException):
+            self.downloader(parts=1, max_retries=1).download(self.url, self.path)
+        new_data = payload(seed=2)
+        self.server.add("/video.mp4", new_data)
+
+        stats = self.downloader(parts=1).download(self.url, self.path)
+
+        assert Path(self.path).read_bytes() == new_data
+        assert stats["resumed_bytes"] == 0
+
+    def test_server_without_ranges_downloads_in_one_part(self):
+        self.server.config.ranges = False
+
+        stats = self.downloader(parts=4).download(self.url, self.path)
+
+        assert Path(self.path).read_bytes() == self.data
+        assert stats["parts"] == 1
+        assert self.server.stats.as_dict()["requests"] == {"HEAD 200": 1, "GET 200": 1}
+
+    def test_progress_reports_downloaded_and_total_bytes(self):
+        calls = []
+
+        self.downloader(parts=2, progress=lambda done, total: calls.append((done, total))).download(self.url, self.path)
+
+        assert calls[-1] == (SIZE, SIZE)
+        assert [done for done, _ in calls] == sorted(done for done, _ in calls)
+
+
+@pytest.mark.django_db
+class TestVideoDownload(RangeDownloadTestCase):
+    """VideoProcessor indirme testleri."""
+
+    def test_video_is_downloaded_in_parallel_parts_from_settings(self):
+        Setting.objects.create(key="VIDEO_DOWNLOAD_PARTS", value="2")
+        processor = VideoProcessor(self.tmp)
+
+        video_path, stats = processor._download_video(self.url, "7")
+
+        assert video_path == os.path.join(self.tmp, "articles/7/video/original.mp4")
+        assert Path(video_path).read_bytes() == self.data
+        assert stats["parts"] == 2
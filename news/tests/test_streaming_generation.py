@@ -0,0 +1,198 @@
+"""
+Akışlı (streaming) içerik üretimi testleri.
+StreamingContentValidator, stream_generate_content ve generate_ai_content akış yolu.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+import pytest
+
+from authors.models import Author
+from core.models import Setting
+from news.content_utils import StreamingContentValidator
+from news.models import Article
+from news.models_extended import GenerationDraft
+from news.tasks import GenerationAborted, generate_ai_content, stream_generate_content
+
+VALID_HTML = (
+    "<h2>Yapay zeka alanında yeni gelişme</h2>"
+    "<p>Teknoloji dünyası bu hafta önemli bir gelişme ile çalkalandı. Araştırmacılar, daha hızlı ve "
+    "daha verimli çalışan yeni bir model geliştirdiklerini açıkladı. Bu model, özellikle Türkçe gibi "
+    "diller için çok daha iyi sonuçlar veriyor ve günlük kullanımda ciddi bir fark yaratıyor.</p>"
+    "<p>Uzmanlar, bu gelişmenin <strong>eğitim</strong> ve <em>sağlık</em> gibi alanlarda da etkili "
+    "olacağını düşünüyor. Şirketler ise yeni modeli kendi ürünlerine entegre etmek için çalışmalara "
+    "başladı ve ilk sonuçların önümüzdeki aylarda görülmesi bekleniyor.</p>"
+)
+
+
+def chunks_of(text, size=60):
+    return [MagicMock(text=text[i : i + size]) for i in range(0, len(text), size)]
+
+
+class TestStreamingContentValidator(TestCase):
+    """StreamingContentValidator testleri."""
+
+    def feed_all(self, validator, text, size=60):
+        for i in range(0, len(text), size):
+            reason = validator.feed(text[i : i + size])
+            if reason:
+                return reason
+        return validator.finish()
+
+    def test_valid_html_passes(self):
+        assert self.feed_all(StreamingContentValidator(), VALID_HTML) is None
+
+    def test_tag_split_across_chunks(self):
+        """Parça sınırında bölünen etiketler hata üretmez."""
+        assert self.feed_all(StreamingContentValidator(), VALID_HTML, size=7) is None
+
+    def test_refusal_aborts_early(self):
+        validator = StreamingContentValidator()
+        assert validator.feed("Üzgünüm, bu konuda") == "Model isteği reddetti"
+
+    def test_english_refusal_aborts(self):
+        validator = StreamingContentValidator()
+        assert validator.feed("I'm sorry, but I cannot write") == "Model isteği reddetti"
+
+    def test_refusal_wrapped_in_html_aborts(self):
+        assert StreamingContentValidator().feed("<h2>Maalesef</h2><p>bu") == "Model isteği reddetti"
+        assert StreamingContentValidator().feed("<p>Üzgünüm, bu haberi yazamam.</p>") == "Model isteği reddetti"
+
+    def test_news_mentioning_a_request_is_not_a_refusal(self):
+        validator = StreamingContentValidator()
+        assert validator.feed("<p>Bakanlık bu isteği reddetti ve bu konuda açıklama yaptı.</p>") is None
+        assert StreamingContentValidator().feed("<p>Üzgünüz, bu isteği yerine getiremem.</p>") == (
+            "Model isteği reddetti"
+        )
+
+    def test_refusal_in_large_first_chunk_aborts(self):
+        """Baş penceresinden uzun ilk parça ret kontrolünü atlatmaz."""
+        validator = StreamingContentValidator(probe_length=50)
+        assert validator.feed("<p>Üzgünüm, bu haberi yazamam.</p>" + "<p>Metin ve bir paragraf.</p>" * 10) == (
+            "Model isteği reddetti"
+        )
+
+    def test_head_is_checked_once_window_is_full(self):
+        validator = StreamingContentValidator(probe_length=50)
+        validator.feed(VALID_HTML[:150])
+        assert validator._head_checked
+        with patch.object(validator, "LEADING_TAGS_PATTERN") as pattern:
+            validator.feed(VALID_HTML[150:200])
+        pattern.sub.assert_not_called()
+
+    def test_unopened_closing_tag_aborts(self):
+        validator = StreamingContentValidator()
+        assert "Geçersiz HTML" in validator.feed("<p>Metin</p></h2>")
+
+    def test_plain_text_aborts_after_probe(self):
+        validator = StreamingContentValidator(probe_length=50)
+        assert self.feed_all(validator, "Bu bir düz metin ve hiç etiket içermiyor. " * 5) == (
+            "Çıktı HTML formatında değil"
+        )
+
+    def test_wrong_language_aborts_after_probe(self):
+        validator = StreamingContentValidator(probe_length=50)
+        text = "<p>This article is written in English and talks about the economy at length.</p>" * 3
+        assert self.feed_all(validator, text) == "Çıktı dili Türkçe değil"
+
+    def test_empty_output_fails_on_finish(self):
+        validator = StreamingContentValidator()
+        validator.feed("<p></p>")
+        assert validator.finish() == "Çıktı boş veya çok kısa"
+
+
+@pytest.mark.django_db
+class TestStreamGenerateContent(TestCase):
+    """stream_generate_content testleri."""
+
+    def setUp(self):
+        self.article = Article.objects.create(
+            title="Test Makale", slug="test-makale", content="Kaynak", category="Teknoloji"
+        )
+        self.client_mock = MagicMock()
+
+    def test_completed_stream_saves_draft(self):
+        self.client_mock.models.generate_content_stream.return_value = iter(chunks_of(VALID_HTML))
+
+        text = stream_generate_content(self.client_mock, "model", "prompt", None, self.article)
+
+        draft = GenerationDraft.objects.get(article=self.article)
+        assert text == VALID_HTML
+        assert draft.status == "completed"
+        assert draft.content == VALID_HTML
+        assert draft.chunk_count == len(chunks_of(VALID_HTML))
+
+    def test_refusal_aborts_and_closes_stream(self):
+        stream = MagicMock()
+        stream.__iter__.return_value = iter([MagicMock(text="Üzgünüm, yardımcı olamam."), MagicMock(text="x" * 5000)])
+        self.client_mock.models.generate_content_stream.return_value = stream
+
+        with pytest.raises(GenerationAborted):
+            stream_generate_content(self.client_mock, "model", "prompt", None, self.article)
+
+        draft = GenerationDraft.objects.get(article=self.article)
+        assert draft.status == "aborted"
+        assert draft.abort_reason == "Model isteği reddetti"
+        assert draft.chunk_count == 1
+        stream.close.assert_called_once()
+
+    def test_completed_draft_reused_without_api_call(self):
+        GenerationDraft.objects.create(article=self.article, content=VALID_HTML, status="completed")
+
+        text = stream_generate_content(self.client_mock, "model", "prompt", None, self.article)
+
+        assert text == VALID_HTML
+        self.client_mock.models.generate_content_stream.assert_not_called()
+
+    def test_partial_draft_is_continued(self):
+        half = len(VALID_HTML) // 2
+        GenerationDraft.objects.create(article=self.article, content=VALID_HTML[:half], status="streaming")
+        self.client_mock.models.generate_content_stream.return_value = iter(chunks_of(VALID_HTML[half:]))
+
+        text = stream_generate_content(self.client_mock, "model", "prompt", None, self.article)
+
+        contents = self.client_mock.models.generate_content_stream.call_args.kwargs["contents"]
+        assert "DEVAM" in contents
+        assert VALID_HTML[:half] in contents
+        assert text == VALID_HTML
+
+
+@pytest.mark.django_db
+class TestGenerateAIContentStreaming(TestCase):
+    """generate_ai_content akış yolu testleri."""
+
+    def setUp(self):
+        Author.objects.create(name="Test Yazar", slug="test-yazar", expertise="Teknoloji", is_active=True)
+        Setting.objects.create(key="AI_STREAMING_ENABLED", value="true")
+        self.article = Article.objects.create(
+            title="Test Makale", slug="test-makale", content="Kaynak", category="Teknoloji"
+        )
+
+    @patch("news.tasks.transaction.on_commit")
+    @patch("news.tasks.build_generation_config", return_value={})
+    @patch("news.tasks.get_genai_client")
+    def test_streaming_publishes_and_clears_draft(self, mock_client, mock_config, mock_on_commit):
+        mock_client.return_value.models.generate_content_stream.return_value = iter(chunks_of(VALID_HTML))
+
+        result = generate_ai_content(self.article.id)
+
+        self.article.refresh_from_db()
+        assert "Başarılı" in result
+        assert self.article.content == VALID_HTML
+        assert self.article.status == "published"
+        assert not GenerationDraft.objects.filter(article=self.article).exists()
+
+    @patch("news.tasks.build_generation_config", return_value={})
+    @patch("news.tasks.get_genai_client")
+    def test_streaming_abort_returns_error(self, mock_client, mock_config):
+        mock_client.return_value.models.generate_content_stream.return_value = iter(
+            [MagicMock(text="As an AI, I cannot help with that.")]
+        )
+
+        result = generate_ai_content(self.article.id)
+
+        self.article.refresh_from_db()
+        assert "erken durduruldu" in result
+        assert self.article.status == "draft"
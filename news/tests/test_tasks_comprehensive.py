@@ -6,17 +6,21 @@ Author: Salih TANRISEVEN
 Updated: December 2025
 """
 
+import sys
 from io import BytesIO
 from unittest.mock import MagicMock, Mock, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
+import google
 import pytest
+from google import genai
 from PIL import Image
 
 from authors.models import Author
 from core.models import Setting
+from news.fake_genai import FakeGenAIConfig, FakeGenAIServer
 from news.models import Article, RssSource
 from news.tasks import (
     batch_regenerate_content,
@@ -26,11 +30,14 @@ from news.tasks import (
     fetch_rss_feeds,
     generate_ai_content,
     generate_article_image,
+    generate_image,
     get_ai_model_name,
     get_genai_client,
+    get_image_client,
     get_image_model_name,
     get_thinking_budget,
     get_thinking_level,
+    resolve_image_model,
     retry_with_backoff,
 )
 
@@ -305,8 +312,8 @@ class TestDownloadArticleImage(TestCase):
         img.save(img_buffer, format="JPEG")
         img_buffer.seek(0)
 
-        mock_response = Mock()
-        mock_response.content = img_buffer.getvalue()
+        mock_response = Mock(headers={})
+        mock_response.iter_content.return_value = [img_buffer.getvalue()]
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -324,8 +331,8 @@ class TestDownloadArticleImage(TestCase):
         img.save(img_buffer, format="PNG")
         img_buffer.seek(0)
 
-        mock_response = Mock()
-        mock_response.content = img_buffer.getvalue()
+        mock_response = Mock(headers={})
+        mock_response.iter_content.return_value = [img_buffer.getvalue()]
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -453,6 +460,53 @@ class TestGenerateArticleImage(TestCase):
         assert "zaten mevcut" in result
 
 
+@pytest.mark.django_db
+class TestImageGenerationModes(TestCase):
+    """API anahtarı ve Vertex AI modlarında görsel üretimi (gerçek SDK + sahte sunucu)."""
+
+    def setUp(self):
+        # test_tasks_genai google.genai'yi sys.modules'ta mock'lar; bu testler gerçek SDK'yı kullanır
+        sdk_modules = patch.dict(
+            sys.modules, {"google": google, "google.genai": genai, "google.genai.types": genai.types}
+        )
+        sdk_modules.start()
+        self.addCleanup(sdk_modules.stop)
+        Setting.objects.create(key="GOOGLE_GEMINI_API_KEY", value="test-key")
+        self.server = FakeGenAIServer(FakeGenAIConfig(latency_ms=0, image_latency_ms=0, seed=1)).start()
+        self.article = Article.objects.create(
+            title="Görsel Haber", slug="gorsel-haber", content="İçerik", category="Teknoloji", status="published"
+        )
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_api_key_client_rejects_imagen_like_the_sdk(self):
+        with override_settings(GENAI_BASE_URL=self.server.url):
+            client = get_image_client()
+
+        with pytest.raises(ValueError, match="only supported in Gemini Enterprise Agent Platform mode"):
+            client.models.generate_images(model="imagen-4.0-generate-001", prompt="x")
+        assert resolve_image_model(client, "imagen-4.0-generate-001") == "gemini-2.5-flash-image"
+
+    def test_api_key_mode_generates_image_with_gemini_image_model(self):
+        with override_settings(GENAI_BASE_URL=self.server.url):
+            result = generate_article_image(self.article.id)
+
+        self.article.refresh_from_db()
+        assert result.startswith("Görsel oluşturuldu")
+        assert self.article.is_ai_image
+        assert self.server.stats.as_dict()["requests"] == {"generateContent": 1}
+
+    def test_vertex_mode_uses_imagen(self):
+        client = genai.Client(vertexai=True, api_key="test-key", http_options={"base_url": self.server.url})
+
+        response, image_bytes = generate_image(client, resolve_image_model(client, "imagen-4.0-generate-001"), "x")
+
+        assert response.generated_images
+        assert Image.open(BytesIO(image_bytes)).format == "JPEG"
+        assert self.server.stats.as_dict()["requests"] == {"predict": 1}
+
+
 # =============================================================================
 # Batch Processing Tests
 # =============================================================================
@@ -31,6 +31,12 @@ urlpatterns = [
     path("iletisim/", views.contact, name="contact"),
     path("gizlilik-politikasi/", views.privacy_policy, name="privacy_policy"),
     path("kullanim-kosullari/", views.terms_of_service, name="terms_of_service"),
+    # Görsel varyantları (dosya yoksa ilk istekte üretilir)
+    path(
+        "media/v/<str:sha256>/<int:width>x<int:height>.<str:fmt>",
+        views.media_variant,
+        name="media_variant",
+    ),
     # Sitemap
     path("sitemap.xml", sitemap, {"sitemaps": sitemaps}, name="sitemap"),
     # Newsletter
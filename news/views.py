@@ -1,9 +1,13 @@
+from django.core.files.storage import default_storage
 from django.core.paginator import Paginator
 from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse, HttpResponsePermanentRedirect
 from django.shortcuts import get_object_or_404, render
 from django.views.generic import DetailView, ListView
 
+from . import media_variants
 from .models import Article
+from .models_extended import MediaAsset
 
 
 class ArticleListView(ListView):
@@ -236,3 +240,29 @@ def terms_of_service(request):
     Kullanım Koşulları sayfası.
     """
     return render(request, "terms_of_service.html")
+
+
+def media_variant(_request, sha256, width, height, fmt):
+    """
+    Görsel varyantı (/media/v/<sha256>/<G>x<Y>.<format>).
+    Dosya henüz yoksa ilk istekte ana kopyadan üretilir; sonraki istekleri Nginx statik sunar.
+    """
+    asset = MediaAsset.objects.select_related("canonical").filter(sha256=sha256).first()
+    if asset is None:
+        raise Http404("Görsel bulunamadı")
+    if asset.canonical is not None:
+        return HttpResponsePermanentRedirect(media_variants.variant_url(asset.canonical, width, height, fmt))
+
+    try:
+        path = media_variants.get_or_render(asset, width, height, fmt)
+    except media_variants.VariantNotFoundError as e:
+        raise Http404(str(e)) from e
+    except media_variants.VariantRenderTimeoutError:
+        response = HttpResponse("Görsel hazırlanıyor", status=503, content_type="text/plain; charset=utf-8")
+        response["Retry-After"] = "1"
+        return response
+
+    response = FileResponse(default_storage.open(path, "rb"), content_type=media_variants.VARIANT_FORMATS[fmt][2])
+    # İçerik adresli: aynı URL'in içeriği değişmez
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response